@@ -1,6 +1,6 @@
 'use client';
 
-import { Fragment, useState, useEffect, useCallback } from 'react';
+import { Fragment, useState, useEffect, useCallback, useRef } from 'react';
 import { useRouter, useSearchParams } from 'next/navigation';
 import { useTranslations } from 'next-intl';
 import { Button, Card } from '@/components/ui';
@@ -245,6 +245,9 @@ export default function CostExplorerPage() {
   const [expandedRowIds, setExpandedRowIds] = useState<Set<string>>(new Set());
   const [uploading, setUploading] = useState(false);
   const [extracting, setExtracting] = useState(false);
+  const [extractPercent, setExtractPercent] = useState<number | null>(null);
+  const [extractJobId, setExtractJobId] = useState<string | null>(null);
+  const [extractQueued, setExtractQueued] = useState(false);
   const [uploadedFiles, setUploadedFiles] = useState<string[]>([]);
   const [selectedPdf, setSelectedPdf] = useState<string>('');
   const [uploadedFilename, setUploadedFilename] = useState<string | null>(null);
@@ -584,31 +587,79 @@ export default function CostExplorerPage() {
     loadRows();
   }, [loadRows]);
 
+  // Stops the handleExtract polling loop when the page unmounts
+  const extractAbortRef = useRef<AbortController | null>(null);
+  useEffect(() => () => extractAbortRef.current?.abort(), []);
+
   const handleExtract = useCallback(async () => {
+    extractAbortRef.current?.abort();
+    const controller = new AbortController();
+    extractAbortRef.current = controller;
+    const { signal } = controller;
     setExtracting(true);
+    setExtractPercent(null);
     setExtractMessage(null);
     try {
-      const body: { pdfPath?: string } = {};
+      // Runs as a background job; poll its status file instead of holding the request open
+      const body: { pdfPath?: string; async: boolean } = { async: true };
       if (selectedPdf) body.pdfPath = selectedPdf;
       const r = await fetch('/api/admin/cce-extract', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(body),
+        signal,
       });
-      const data = await r.json();
-      if (data.success) {
-        setExtractMessage({ type: 'success', text: data.message || t('upload.extractionSuccess') });
-        loadRows();
-      } else {
-        setExtractMessage({ type: 'error', text: data.error || t('upload.extractionError') });
+      const started = await r.json();
+      if (!started.success || !started.statusUrl) {
+        setExtractMessage({ type: 'error', text: started.error || t('upload.extractionError') });
+        return;
+      }
+      setExtractJobId(started.jobId);
+      let missing = 0;
+      for (;;) {
+        await new Promise((done) => setTimeout(done, 2000));
+        if (signal.aborted) return;
+        const s = await fetch(started.statusUrl, { signal });
+        if (s.status === 404 && ++missing < 15) continue; // status file not written yet
+        if (!s.ok) {
+          setExtractMessage({ type: 'error', text: t('upload.extractionError') });
+          return;
+        }
+        const status = await s.json();
+        setExtractQueued(status.status === 'queued');
+        if (typeof status.percent === 'number') setExtractPercent(status.percent);
+        if (status.status === 'completed') {
+          setExtractMessage({ type: 'success', text: t('upload.extractionSuccess') });
+          loadRows();
+          return;
+        }
+        if (status.status === 'cancelled') {
+          setExtractMessage({ type: 'error', text: t('upload.extractionCancelled') });
+          return;
+        }
+        if (status.status === 'failed') {
+          setExtractMessage({ type: 'error', text: status.error || t('upload.extractionError') });
+          return;
+        }
       }
     } catch {
-      setExtractMessage({ type: 'error', text: t('upload.extractionError') });
+      if (!signal.aborted) setExtractMessage({ type: 'error', text: t('upload.extractionError') });
     } finally {
-      setExtracting(false);
+      if (!signal.aborted) {
+        setExtracting(false);
+        setExtractPercent(null);
+        setExtractJobId(null);
+        setExtractQueued(false);
+      }
     }
   }, [selectedPdf, loadRows]);
 
+  const handleCancelExtract = useCallback(async () => {
+    if (!extractJobId) return;
+    // The polling loop in handleExtract picks up the cancelled status
+    await fetch(`/api/admin/cce-extract?jobId=${encodeURIComponent(extractJobId)}`, { method: 'DELETE' }).catch(() => {});
+  }, [extractJobId]);
+
   const resetPageOnFilter = () => setPage(1);
 
   const hasFilters =
@@ -781,8 +832,17 @@ export default function CostExplorerPage() {
                 }`}
               >
                 {extracting ? <Loader2 className="w-4 h-4 animate-spin shrink-0" /> : null}
-                {extracting ? t('upload.extracting') : t('upload.runExtraction')}
+                {extracting
+                  ? extractQueued
+                    ? t('upload.extractionQueued')
+                    : `${t('upload.extracting')}${extractPercent !== null ? ` ${Math.round(extractPercent)}%` : ''}`
+                  : t('upload.runExtraction')}
               </Button>
+              {extracting && extractJobId && (
+                <Button variant="ghost" size="sm" onClick={handleCancelExtract}>
+                  {t('upload.cancelExtraction')}
+                </Button>
+              )}
               <span className="text-[10px] text-gray-400 dark:text-gray-500">
                 {t('upload.extractionEstimate')}
               </span>
@@ -2,29 +2,123 @@
  * API Route: Trigger CCE PDF extraction
  * POST /api/admin/cce-extract
  *
- * Spawns the Python extraction script. Body: { pdfPath?: string, incremental?: boolean }
+ * Queues the Python extraction script with scripts/cce_job_runner.py (one worker process, one writer
+ * per table, identical queued / running requests share a job). Body: { pdfPath?: string, incremental?: boolean, diff?: boolean, async?: boolean }
  * If pdfPath omitted, uses CCE_PDF_PATH or local_data/CCE_March_2026.pdf
+ * diff: compare page fingerprints with the previous edition and rewrite only changed pages
+ * (falls back to the full clear + reload when no edition has been fingerprinted yet)
+ * async: return 202 { jobId } right away; poll GET ?jobId= for progress instead of waiting
+ * Without async the request waits for the job, up to CCE_EXTRACT_SYNC_TIMEOUT_MS (default 2 h); past that
+ * it returns 504 with the jobId (the job keeps running; poll GET). A job whose process died without a final
+ * status, or whose status file never appears, fails the request.
+ *
+ * GET /api/admin/cce-extract?jobId=...&after=N
+ * Job status written by the runner and the script (--job-id): status (queued / running / completed /
+ * failed / cancelled), stage, pages_done / pages_total / percent, rows, error, plus the progress
+ * events with seq > after (default 0).
+ *
+ * DELETE /api/admin/cce-extract?jobId=...
+ * Cancel a queued or running job.
  */
 
 import { NextRequest, NextResponse } from 'next/server';
 import { spawn } from 'child_process';
-import { existsSync } from 'fs';
+import { existsSync, readFileSync } from 'fs';
 import { resolve } from 'path';
 
 import { withAdminAuth } from '@/lib/require-admin-auth';
 
 export const dynamic = 'force-dynamic';
 
+// Same rule as scripts/cce_extract_events.py (JOB_ID_RE): no path separators
+const JOB_ID_RE = /^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$/;
+
+type ExtractEvent = { event: string; seq: number; [key: string]: unknown };
+
+function jobStatusDir(base: string): string {
+  return process.env.CCE_JOB_STATUS_DIR || resolve(base, 'local_data', 'cce-jobs');
+}
+
+function jobQueueDb(statusDir: string): string {
+  return process.env.CCE_JOB_DB || resolve(statusDir, 'jobs.sqlite');
+}
+
+const TERMINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+
+// Sync POST: poll interval, overall wait, and polls tolerated before the runner has written <jobId>.json
+const SYNC_POLL_MS = 2000;
+const SYNC_TIMEOUT_MS = Number(process.env.CCE_EXTRACT_SYNC_TIMEOUT_MS) || 2 * 60 * 60 * 1000;
+const SYNC_MAX_MISSING_STATUS_POLLS = 15;
+
+/** Run scripts/cce_job_runner.py; its stdout is one JSON object. */
+function runJobRunner(base: string, args: string[]): Promise<{ code: number | null; result: Record<string, unknown> }> {
+  const statusDir = jobStatusDir(base);
+  return new Promise((resolvePromise, reject) => {
+    const proc = spawn(
+      'python3',
+      [resolve(base, 'scripts', 'cce_job_runner.py'), '--db', jobQueueDb(statusDir), '--status-dir', statusDir, ...args],
+      { cwd: base, env: { ...process.env, PYTHONUNBUFFERED: '1' } }
+    );
+    const stdout: string[] = [];
+    proc.stdout?.on('data', (d) => stdout.push(d.toString()));
+    proc.on('error', reject);
+    proc.on('close', (code) => {
+      try {
+        resolvePromise({ code, result: JSON.parse(stdout.join('').trim() || '{}') });
+      } catch {
+        reject(new Error(`Unexpected job runner output: ${stdout.join('').slice(0, 500)}`));
+      }
+    });
+  });
+}
+
+function readStatus(statusDir: string, jobId: string): Record<string, unknown> | null {
+  const statusPath = resolve(statusDir, `${jobId}.json`);
+  if (!existsSync(statusPath)) return null;
+  try {
+    return JSON.parse(readFileSync(statusPath, 'utf8'));
+  } catch {
+    return null; // mid-replace on some filesystems; the next poll sees it
+  }
+}
+
+function parseEvents(text: string): ExtractEvent[] {
+  const events: ExtractEvent[] = [];
+  for (const line of text.split('\n')) {
+    if (!line.trim()) continue;
+    try {
+      events.push(JSON.parse(line) as ExtractEvent);
+    } catch {
+      // partial line while the script is still writing
+    }
+  }
+  return events;
+}
+
+// Same rule as scripts/cce_job_runner.py (pid_alive): EPERM means the process exists under another user
+function processAlive(pid: number): boolean {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (err) {
+    return (err as NodeJS.ErrnoException).code !== 'ESRCH';
+  }
+}
+
 export const POST = withAdminAuth(async (request: NextRequest) => {
   try {
     let pdfPath: string | null = null;
     let incremental = false;
+    let diff = false;
+    let runAsync = false;
 
     const contentType = request.headers.get('content-type') || '';
     if (contentType.includes('application/json')) {
       const body = await request.json().catch(() => ({}));
       pdfPath = body.pdfPath ?? body.pdf_path ?? null;
       incremental = !!body.incremental;
+      diff = !!body.diff;
+      runAsync = !!body.async;
     }
 
     const base = resolve(process.cwd());
@@ -52,58 +146,93 @@ export const POST = withAdminAuth(async (request: NextRequest) => {
     }
 
     const args = ['--pdf', finalPath];
-    if (incremental) args.push('--incremental');
+    if (incremental && !diff) args.push('--incremental');
+    // --diff: clears below only apply if there is no previous edition to diff against
+    if (diff) args.push('--diff');
     // Clear before insert so the UI shows only the new extraction (replaces Feb with Mar data)
     args.push('--clear-first');
     args.push('--clear-cce-cost-percentages');
     args.push('--clear-cce-component-costs');
 
-    return new Promise<NextResponse>((resolvePromise) => {
-      const proc = spawn('python3', [scriptPath, ...args], {
-        cwd: base,
-        env: { ...process.env, PYTHONUNBUFFERED: '1' },
-      });
-
-      const stdout: string[] = [];
-      const stderr: string[] = [];
-
-      proc.stdout?.on('data', (d) => stdout.push(d.toString()));
-      proc.stderr?.on('data', (d) => stderr.push(d.toString()));
-
-      proc.on('close', (code) => {
-        const out = stdout.join('').trim();
-        const err = stderr.join('').trim();
-        if (code === 0) {
-          resolvePromise(
-            NextResponse.json({
-              success: true,
-              message: 'Extraction completed',
-              output: out || undefined,
-            })
-          );
-        } else {
-          resolvePromise(
-            NextResponse.json(
-              {
-                success: false,
-                error: err || out || `Process exited with code ${code}`,
-                output: out,
-              },
-              { status: 500 }
-            )
-          );
-        }
-      });
+    const statusDir = jobStatusDir(base);
+    const { code, result } = await runJobRunner(base, [
+      'enqueue', '--kind', 'cce-extract', '--start-worker', '--', ...args,
+    ]);
+    const jobId = result.job_id as string | undefined;
+    if (code !== 0 || !jobId) {
+      return NextResponse.json(
+        { success: false, error: (result.error as string | undefined) || 'Failed to queue extraction' },
+        { status: 500 }
+      );
+    }
 
-      proc.on('error', (err) => {
-        resolvePromise(
-          NextResponse.json(
-            { success: false, error: String(err.message) },
-            { status: 500 }
-          )
+    const statusUrl = `/api/admin/cce-extract?jobId=${encodeURIComponent(jobId)}`;
+    if (runAsync) {
+      return NextResponse.json(
+        {
+          success: true,
+          jobId,
+          duplicate: !!result.duplicate,
+          statusUrl,
+        },
+        { status: 202 }
+      );
+    }
+
+    // Sync callers: wait for the queued job to finish
+    const deadline = Date.now() + SYNC_TIMEOUT_MS;
+    let missingPolls = 0;
+    for (;;) {
+      if (Date.now() > deadline) {
+        return NextResponse.json(
+          {
+            success: false,
+            error: `Extraction still running after ${Math.round(SYNC_TIMEOUT_MS / 1000)}s; poll statusUrl for the result`,
+            jobId,
+            statusUrl,
+          },
+          { status: 504 }
         );
-      });
-    });
+      }
+      await new Promise((done) => setTimeout(done, SYNC_POLL_MS));
+      const status = readStatus(statusDir, jobId);
+      if (!status) {
+        if (++missingPolls >= SYNC_MAX_MISSING_STATUS_POLLS) {
+          return NextResponse.json(
+            { success: false, error: 'Job status file not found; the job runner may not have started', jobId, statusUrl },
+            { status: 500 }
+          );
+        }
+        continue;
+      }
+      missingPolls = 0;
+      if (status.status === 'running' && typeof status.pid === 'number' && !processAlive(status.pid)) {
+        // Same check as GET: killed before it could record a final status
+        status.status = 'failed';
+        status.error = status.error || 'Extraction process exited without a final status';
+      }
+      if (!TERMINAL_STATUSES.includes(status.status as string)) continue;
+      const logPath = resolve(statusDir, `${jobId}.log`);
+      const log = existsSync(logPath) ? readFileSync(logPath, 'utf8').trim() : '';
+      if (status.status === 'completed') {
+        return NextResponse.json({
+          success: true,
+          message: 'Extraction completed',
+          jobId,
+          rows: status.rows,
+          output: log || undefined,
+        });
+      }
+      return NextResponse.json(
+        {
+          success: false,
+          error: (status.error as string | undefined) || `Extraction ${status.status}`,
+          jobId,
+          output: log,
+        },
+        { status: 500 }
+      );
+    }
   } catch (err) {
     console.error('[cce-extract] Error:', err);
     return NextResponse.json(
@@ -112,3 +241,49 @@ export const POST = withAdminAuth(async (request: NextRequest) => {
     );
   }
 }, { requireRole: 'admin' });
+
+export const GET = withAdminAuth(async (request: NextRequest) => {
+  const jobId = request.nextUrl.searchParams.get('jobId') || '';
+  if (!JOB_ID_RE.test(jobId)) {
+    return NextResponse.json({ error: 'Invalid jobId' }, { status: 400 });
+  }
+  const after = Number(request.nextUrl.searchParams.get('after') || 0) || 0;
+  const statusDir = jobStatusDir(resolve(process.cwd()));
+  const status = readStatus(statusDir, jobId);
+  if (!status) {
+    return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+  }
+
+  try {
+    const eventsPath = resolve(statusDir, `${jobId}.events.ndjson`);
+    const events = existsSync(eventsPath)
+      ? parseEvents(readFileSync(eventsPath, 'utf8')).filter((e) => e.seq > after)
+      : [];
+    if (status.status === 'running' && typeof status.pid === 'number' && !processAlive(status.pid)) {
+      // Killed before it could record a final status (OOM, container restart)
+      status.status = 'failed';
+      status.error = status.error || 'Extraction process exited without a final status';
+    }
+    return NextResponse.json({ ...status, events });
+  } catch (err) {
+    console.error('[cce-extract] Status read error:', err);
+    return NextResponse.json({ error: 'Failed to read job status' }, { status: 500 });
+  }
+}, { requireRole: 'admin' });
+
+export const DELETE = withAdminAuth(async (request: NextRequest) => {
+  const jobId = request.nextUrl.searchParams.get('jobId') || '';
+  if (!JOB_ID_RE.test(jobId)) {
+    return NextResponse.json({ error: 'Invalid jobId' }, { status: 400 });
+  }
+  try {
+    const { code, result } = await runJobRunner(resolve(process.cwd()), ['cancel', jobId]);
+    if (code !== 0) {
+      return NextResponse.json({ error: result.error || 'Job not found' }, { status: 404 });
+    }
+    return NextResponse.json({ success: true, jobId, status: result.status, cancelRequested: result.cancel_requested });
+  } catch (err) {
+    console.error('[cce-extract] Cancel error:', err);
+    return NextResponse.json({ error: 'Failed to cancel job' }, { status: 500 });
+  }
+}, { requireRole: 'admin' });
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Unit tests for cce_component_item_extract helpers (no PDF required)."""
 
+import random
 import sys
 import unittest
 from pathlib import Path
@@ -9,10 +10,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from cce_component_item_extract import (  # noqa: E402
     ITEM_MAX_LEN,
+    LIST_COST_LINE_RE_DOTS,
+    LIST_COST_LINE_RE_LEGACY,
+    LIST_COST_TAIL_RE,
+    cached_normalize_component_item_name,
+    join_layout_continuation_pairs,
     join_list_continuation_lines,
+    join_list_continuation_scans,
     list_section_header_is_truncated_junk,
     normalize_component_item_name,
+    normalize_component_item_names,
     parse_list_cost_line,
+    parse_numeric_token,
+    scan_list_cost_line,
     section_name_is_weak_short,
     tier_order_ok,
 )
@@ -89,6 +99,126 @@ class TestJoinListContinuationLines(unittest.TestCase):
         self.assertEqual(len(out), 3)
         self.assertEqual(out[1].strip().upper(), "WALL COSTS")
 
+    def test_scans_returned_with_lines(self):
+        raw = ["", "Kitchen wall upper", "cabinets .......... 32.75 43.00 55.50 72.00", "Sparse .......... 1.0 2.0"]
+        out = join_list_continuation_scans(raw, strategy="auto", line_is_protected=self._nop_protect)
+        self.assertEqual([line for line, _ in out], join_list_continuation_lines(raw, line_is_protected=self._nop_protect))
+        for line, scan in out:
+            self.assertEqual(scan, scan_list_cost_line(line, "auto"))
+
+    def test_text_run_emitted_once(self):
+        raw = ["First note", "second note", "third note", "Sparse line .......... 10.0 20.0"]
+        out = join_list_continuation_lines(raw, strategy="auto", line_is_protected=self._nop_protect)
+        self.assertEqual(out, raw)
+
+    def test_max_continuation_lines(self):
+        raw = ["Note one", "note two", "Built-in", "bookcases .......... 10.0 20.0 30.0 40.0"]
+        out = join_list_continuation_lines(
+            raw, strategy="auto", line_is_protected=self._nop_protect, max_continuation_lines=1
+        )
+        self.assertEqual(out, ["Note one", "note two", "Built-in bookcases .......... 10.0 20.0 30.0 40.0"])
+        for cap in (None, 0, 3):
+            out = join_list_continuation_lines(
+                raw, strategy="auto", line_is_protected=self._nop_protect, max_continuation_lines=cap
+            )
+            self.assertEqual(out, [" ".join(raw)])
+
+    def test_matches_rescanning_joiner_on_random_pages(self):
+        rng = random.Random(20260317)
+        shapes = [
+            "",
+            "WALL COSTS",
+            "Kitchen wall upper",
+            "bookcases with",
+            "cabinets .......... 32.75 43.00 55.50 72.00",
+            "Sparse line .......... 10.0 20.0",
+            "Wood deck   12.00 14.50 18.25",
+            "Add for railing 3.10 4.20 5.30 6.40",
+        ]
+
+        def prot(s):
+            return s == "WALL COSTS"
+
+        for _ in range(300):
+            raw = [rng.choice(shapes) for _ in range(rng.randint(0, 25))]
+            old = _rescan_join_list_continuation_lines(raw, "auto", prot)
+            new = join_list_continuation_scans(raw, strategy="auto", line_is_protected=prot)
+            # The old joiner re-emitted text-only lines; the list parser skips those either way.
+            self.assertEqual(
+                [line for line in old if prot(line) or scan_list_cost_line(line, "auto")],
+                [line for line, scan in new if prot(line) or scan],
+                raw,
+            )
+            # Same as the old joiner resuming after an unmerged run instead of one line later.
+            once = _rescan_join_list_continuation_lines(raw, "auto", prot, resume_after_run=True)
+            self.assertEqual([line for line, _ in new], once, raw)
+
+
+class TestJoinLayoutContinuationPairs(unittest.TestCase):
+    def test_merges_description_rows_and_keeps_headers(self):
+        pairs = [
+            ("WALL COSTS", ""),
+            ("Built-in", ""),
+            ("bookcases", "10.0 20.0 30.0 40.0"),
+            ("Orphan note", ""),
+            ("Sparse", "1.0 2.0"),
+        ]
+        out = join_layout_continuation_pairs(pairs, line_is_protected=lambda s: s == "WALL COSTS")
+        self.assertEqual(
+            out,
+            [
+                ("WALL COSTS", ""),
+                ("Built-in bookcases", "10.0 20.0 30.0 40.0"),
+                ("Orphan note", ""),
+                ("Sparse", "1.0 2.0"),
+            ],
+        )
+        capped = join_layout_continuation_pairs(
+            [("a", ""), ("b", ""), ("c", "1 2 3 4")], line_is_protected=lambda s: False, max_continuation_lines=1
+        )
+        self.assertEqual(capped, [("a", ""), ("b c", "1 2 3 4")])
+
+
+def _rescan_join_list_continuation_lines(lines, strategy, line_is_protected, resume_after_run=False):
+    """Previous joiner (quadratic): forward scan from every unmerged line, advancing by one."""
+    out = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        s = lines[i].strip()
+        if not s:
+            i += 1
+            continue
+        if line_is_protected(s) or scan_list_cost_line(s, strategy) is not None:
+            out.append(s)
+            i += 1
+            continue
+        buf = [s]
+        j = i + 1
+        merged_one = False
+        while j < n:
+            t = lines[j].strip()
+            if not t:
+                j += 1
+                continue
+            if line_is_protected(t):
+                break
+            p2 = scan_list_cost_line(t, strategy)
+            if p2 is not None:
+                if sum(1 for v in p2[2] if v is not None) >= 4:
+                    out.append(" ".join(buf + [t]))
+                    i = j + 1
+                    merged_one = True
+                break
+            buf.append(t)
+            j += 1
+        if merged_one:
+            continue
+        out.extend(buf)
+        i = j if resume_after_run else i + 1
+    return out
+
+
 
 class TestParseListCostLine(unittest.TestCase):
     def test_dot_leader(self):
@@ -115,6 +245,69 @@ class TestParseListCostLine(unittest.TestCase):
         self.assertIsNotNone(r)
 
 
+def _regex_parse_list_cost_line(line, strategy="auto"):
+    """The regex cascade scan_list_cost_line replaces (LIST_COST_LINE_RE_DOTS / _LEGACY / LIST_COST_TAIL_RE)."""
+    line = line.strip()
+    if not line:
+        return None
+
+    def dots():
+        m = LIST_COST_LINE_RE_DOTS.match(line)
+        return (m.group(1).strip(), m.group(2).strip()) if m else None
+
+    def legacy():
+        m = LIST_COST_LINE_RE_LEGACY.match(line) if ".." not in line else None
+        return (m.group(1).strip(), m.group(2).strip()) if m else None
+
+    def tail():
+        m = LIST_COST_TAIL_RE.match(line)
+        if m and sum(1 for t in m.group(2).split() if parse_numeric_token(t) is not None) >= 2:
+            return m.group(1).strip(), m.group(2).strip()
+        return None
+
+    if strategy == "dots":
+        return dots() or tail() or legacy()
+    if strategy == "spaces":
+        return legacy() or dots() or tail()
+    return dots() or legacy() or tail()
+
+
+# Item words, numbers (incl. glued / multi-dot / non-ASCII digits), leaders and odd whitespace
+_LINE_FRAGMENTS = (
+    "Wall", "door", "a", "X", "—", "$", "x1", "1x",
+    "12.50", "3.25", "1234", "12345", "7", "0", "12.", ".5", "1.2.3", "1.23.4", "5.5.55", "٣",
+    ".", "..", "...", ". .", "  ", " ", "\t", "\n", "\xa0", "\x1c",
+)
+
+
+class TestScanListCostLine(unittest.TestCase):
+    def test_matches_regex_cascade_on_random_lines(self):
+        rng = random.Random(20260316)
+        for _ in range(20000):
+            sep = rng.choice((" ", "", "  ", " . ", "\t"))
+            line = sep.join(rng.choice(_LINE_FRAGMENTS) for _ in range(rng.randint(0, 10)))
+            for strategy in ("auto", "dots", "spaces"):
+                got = scan_list_cost_line(line, strategy)
+                self.assertEqual(got and got[:2], _regex_parse_list_cost_line(line, strategy), (line, strategy))
+                if got:
+                    self.assertEqual(got[2], [parse_numeric_token(t) for t in got[1].split()])
+
+    def test_values_and_strategies(self):
+        self.assertEqual(
+            scan_list_cost_line("Wood deck .......... 32.75 43.00 55.50 72.00"),
+            ("Wood deck", "32.75 43.00 55.50 72.00", [32.75, 43.0, 55.5, 72.0]),
+        )
+        # Leader without spaces after it: the dots pattern fails, the tail pattern keeps the dots in the item
+        self.assertEqual(
+            scan_list_cost_line("Wood deck ...32.75 43.00 50.00", "dots")[:2],
+            ("Wood deck ...32.75", "43.00 50.00"),
+        )
+        self.assertEqual(scan_list_cost_line("Canopy  . .  12.5 15.0", "spaces")[:2], ("Canopy", "12.5 15.0"))
+        self.assertEqual(scan_list_cost_line("Canopy 12 ft 1.2.3 14.0 15.0")[2], [14.0, 15.0])
+        self.assertIsNone(scan_list_cost_line("Canopy 12"))
+        self.assertIsNone(scan_list_cost_line("  "))
+
+
 class TestGoldenListLineShapes(unittest.TestCase):
     """
     Line-level shapes that mirror problematic CCE PDF pages (e.g. early section list pages ~27,
@@ -157,6 +350,35 @@ class TestNormalizeItem(unittest.TestCase):
         self.assertLessEqual(len(s), ITEM_MAX_LEN)
 
 
+# Fragments that trigger each normalization rule (dots, OCR splits, cost bleed, refs, footers)
+_ITEM_FRAGMENTS = (
+    "Wall", "C eiling", "door", "Steel frame", "x", "A", "b", "X  y", "\t", "  ",
+    "....", "...", ". . .", ".", "..........",
+    "12.50", "3.25", "7.10", "99.99", "0.25", "3.5", "66", "2", "12", "1", "499", "500",
+    "see section 4.2", "refer to section IV", "p. 12", "(P 3)", "Page 7", "continued on next page",
+    "MSB  x", "*", "†", "‡‡", " — see also", "- footnote", " – refer to ", "—", "-",
+)
+
+
+class TestNormalizeBatch(unittest.TestCase):
+    def test_batch_matches_scalar_on_random_items(self):
+        rng = random.Random(20260302)
+        items = []
+        for _ in range(20000):
+            s = " ".join(rng.choice(_ITEM_FRAGMENTS) for _ in range(rng.randint(0, 9)))
+            if rng.random() < 0.3:
+                s = s.replace(" ", "", rng.randint(0, 3))  # glued fragments
+            items.append(s)
+        cached_normalize_component_item_name.cache_clear()
+        self.assertEqual(normalize_component_item_names(items), [normalize_component_item_name(s) for s in items])
+        # Second pass is served from the memo and must not change anything
+        self.assertEqual(normalize_component_item_names(items[:500]), [normalize_component_item_name(s) for s in items[:500]])
+        self.assertGreater(cached_normalize_component_item_name.cache_info().hits, 500)
+
+    def test_empty_and_none(self):
+        self.assertEqual(normalize_component_item_names(["", None, "  Wall  "]), ["", "", "Wall"])
+
+
 class TestNormalizeRealWorldSamples(unittest.TestCase):
     """Strings shaped like Cost Explorer / audit findings (column bleed, leaders, footnotes)."""
 
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests for cce_component_reclean (reclean-cce-component-items.py)."""
+
+import contextlib
+import io
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_component_item_extract import NORMALIZATION_VERSION  # noqa: E402
+from cce_component_reclean import reclean_patch, run_reclean, write_batch  # noqa: E402
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """Just enough of the PostgREST builder: filters, keyset order/limit, upsert and update."""
+
+    def __init__(self, db):
+        self.db, self.filters, self.n, self.write = db, [], None, None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, key, value):
+        self.filters.append(lambda r: r.get(key) == value)
+        return self
+
+    def lt(self, key, value):
+        self.filters.append(lambda r: r.get(key) < value)
+        return self
+
+    def gt(self, key, value):
+        self.filters.append(lambda r: r.get(key) > value)
+        return self
+
+    def order(self, key):
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def upsert(self, rows, on_conflict):
+        self.write = ("upsert", rows, on_conflict)
+        return self
+
+    def update(self, patch):
+        self.write = ("update", patch, None)
+        return self
+
+    def execute(self):
+        db = self.db
+        with db.lock:
+            if self.write is None:
+                db.selects += 1
+                rows = [dict(r) for _, r in sorted(db.rows.items()) if all(f(r) for f in self.filters)]
+                return _Response(rows[: self.n])
+            kind, payload, on_conflict = self.write
+            if kind == "upsert":
+                db.upserts.append(len(payload))
+                if db.fail_upsert and db.fail_upsert(payload):
+                    raise db.fail_upsert(payload)
+                for r in payload:
+                    db.rows[r["id"]].update(r)
+                return _Response(payload)
+            db.updates += 1
+            for r in db.rows.values():
+                if all(f(r) for f in self.filters):
+                    if db.fail_update and db.fail_update(r):
+                        raise RuntimeError("duplicate key value violates unique constraint")
+                    r.update(payload)
+            return _Response([])
+
+
+class _Client:
+    def __init__(self, rows):
+        self.rows = {r["id"]: dict(r) for r in rows}
+        self.lock = threading.Lock()
+        self.selects = self.updates = 0
+        self.upserts = []
+        self.fail_upsert = self.fail_update = None
+
+    def table(self, name):
+        return _Query(self)
+
+
+def _rows(n, version=0):
+    names = ["Concrete ........", "C eiling tile", "Brick", "Cedar  shingles"]
+    return [
+        {"id": f"{i:05d}", "item_name": names[i % 4], "normalization_version": version,
+         "extraction_date": "2026-03-01", "extraction_flags": {"layout_parsed": True}}
+        for i in range(n)
+    ]
+
+
+class TestReclean(unittest.TestCase):
+    def test_patch(self):
+        row = _rows(1)[0]
+        patch = reclean_patch(row, "Concrete")
+        self.assertEqual(patch["item_name"], "Concrete")
+        self.assertEqual(patch["normalization_version"], NORMALIZATION_VERSION)
+        self.assertTrue(patch["extraction_flags"]["layout_parsed"])
+        self.assertIsNone(reclean_patch({**row, "item_name": "Brick"}, "Brick"))
+        self.assertIsNone(reclean_patch({**row, "normalization_version": NORMALIZATION_VERSION}, "Concrete"))
+        self.assertIsNotNone(reclean_patch({**row, "item_name": "Brick"}, "Brick", force=True))
+
+    def test_batched_upserts_over_keyset_pages(self):
+        client = _Client(_rows(2500))
+        saved = []
+        progress = run_reclean(client, page_rows=300, batch_rows=100, workers=3, save=saved.append)
+        self.assertEqual((progress["scanned"], progress["changed"], progress["failed"]), (2500, 1875, 0))
+        self.assertEqual(client.updates, 0)
+        self.assertTrue(all(n <= 100 for n in client.upserts))
+        self.assertEqual(sum(client.upserts), 1875)
+        self.assertEqual(client.selects, 10)  # 9 pages + the empty one
+        self.assertEqual([s["last_id"] for s in saved], sorted(s["last_id"] for s in saved))
+        self.assertEqual(saved[-1]["last_id"], "02499")
+        names = {r["item_name"] for r in client.rows.values()}
+        self.assertEqual(names, {"Concrete", "Ceiling tile", "Brick", "Cedar shingles"})
+        # Already recleaned rows are filtered out on the server
+        again = run_reclean(client, page_rows=300)
+        self.assertEqual((again["scanned"], again["changed"]), (625, 0))
+
+    def test_dry_run_writes_nothing(self):
+        client = _Client(_rows(50))
+        progress = run_reclean(client, dry_run=True, page_rows=20)
+        self.assertEqual((progress["scanned"], progress["changed"]), (50, 38))
+        self.assertEqual((client.upserts, client.updates), ([], 0))
+
+    def test_resume_after_interruption(self):
+        client = _Client(_rows(1000))
+        saved = []
+
+        def save(progress):
+            saved.append(progress)
+            if len(saved) == 3:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_reclean(client, force=True, page_rows=100, batch_rows=40, workers=2, save=save)
+        checkpoint = saved[-1]
+        self.assertEqual((checkpoint["last_id"], checkpoint["scanned"]), ("00299", 300))
+
+        client.upserts.clear()
+        progress = run_reclean(client, force=True, page_rows=100, batch_rows=40, workers=2, resume_from=checkpoint)
+        self.assertEqual((progress["scanned"], progress["changed"]), (1000, 1000))
+        self.assertEqual(sum(client.upserts), 700)
+        self.assertTrue(all(r["normalization_version"] == NORMALIZATION_VERSION for r in client.rows.values()))
+
+    def test_write_batch_splits_and_falls_back(self):
+        client = _Client(_rows(8))
+        patches = [reclean_patch(r, "x" + r["id"]) for r in _rows(8)]
+        client.fail_upsert = lambda rows: RuntimeError("413 Payload Too Large") if len(rows) > 2 else None
+        self.assertEqual(write_batch(client, patches, log=lambda _: None), 0)
+        self.assertEqual(client.upserts, [8, 4, 2, 2, 4, 2, 2])
+
+        client = _Client(_rows(8))
+        client.fail_upsert = lambda rows: RuntimeError("duplicate key value violates unique constraint")
+        client.fail_update = lambda r: r["id"] == "00003"
+        messages = []
+        self.assertEqual(write_batch(client, patches, log=messages.append), 1)
+        self.assertEqual(client.updates, 8)
+        self.assertEqual(client.rows["00004"]["item_name"], "x00004")
+        self.assertEqual(client.rows["00003"]["item_name"], "Cedar  shingles")
+        self.assertTrue(messages[-1].startswith("Update failed for 00003"))
+
+        # Failures go to stderr by default, as the script always reported them
+        client = _Client(_rows(8))
+        client.fail_upsert = lambda rows: RuntimeError("duplicate key value violates unique constraint")
+        client.fail_update = lambda r: r["id"] == "00003"
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            self.assertEqual(write_batch(client, patches), 1)
+        self.assertEqual(out.getvalue(), "")
+        self.assertIn("Update failed for 00003", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Tests for edition-to-edition diff loads (page fingerprints, change report, delta write)."""
+
+import contextlib
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_edition_diff import (  # noqa: E402
+    apply_edition_diff,
+    build_page_records,
+    diff_editions,
+    final_rows,
+    format_change_report,
+    page_fingerprint,
+    row_digests_by_page,
+)
+from cce_extract_sink import SupabaseSink  # noqa: E402
+
+UNIQUE = {"cce_occupancies": ("occupancy_code",), "cce_cost_percentages": ("section_name", "occupancy", "category")}
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """Just enough PostgREST for the sink: filters apply to delete / update / select."""
+
+    def __init__(self, db, table):
+        self.db, self.table, self.op, self.filters = db, table, None, []
+
+    def insert(self, rows):
+        self.op, self.rows = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op, self.rows = "upsert", rows
+        return self
+
+    def update(self, row):
+        self.op, self.row = "update", row
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def select(self, cols):
+        self.op = "select"
+        return self
+
+    def eq(self, col, v):
+        self.filters.append(lambda r: r.get(col) == v)
+        return self
+
+    def neq(self, col, v):
+        self.filters.append(lambda r: r.get(col) != v)
+        return self
+
+    def gte(self, col, v):
+        self.filters.append(lambda r: r.get(col) is not None and r.get(col) >= v)
+        return self
+
+    def in_(self, col, values):
+        values = list(values)
+        self.filters.append(lambda r: r.get(col) in values)
+        return self
+
+    def _match(self, r):
+        return all(f(r) for f in self.filters)
+
+    def execute(self):
+        rows = self.db.tables.setdefault(self.table, [])
+        self.db.requests.append((self.table, self.op))
+        if self.op == "insert":
+            rows.extend(dict(r) for r in self.rows)
+        elif self.op == "upsert":
+            keys = UNIQUE[self.table]
+            for r in self.rows:
+                hit = [o for o in rows if all(o.get(k) == r.get(k) for k in keys)]
+                if hit:
+                    hit[0].update(r)
+                else:
+                    rows.append(dict(r, id=f"id-{r.get('occupancy_code')}"))
+        elif self.op == "delete":
+            rows[:] = [r for r in rows if not self._match(r)]
+        elif self.op == "update":
+            for r in rows:
+                if self._match(r):
+                    r.update(self.row)
+        elif self.op == "select":
+            return _Result([r for r in rows if self._match(r)])
+        return _Result([])
+
+
+class _FakeDb:
+    def __init__(self):
+        self.tables = {}
+        self.requests = []
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rows(self, table):
+        return sorted((sorted((k, str(v)) for k, v in r.items()) for r in self.tables.get(table, [])))
+
+
+def _comp(item, page, col_1=10.0, section="WALLS"):
+    return {"section_name": section, "item_name": item, "cost_tier": None, "col_1": col_1, "source_page": page}
+
+
+def _cost(quality, page, sq_ft):
+    return {
+        "occupancy_code": 300, "building_class": "D", "quality_type": quality, "exterior_walls": None,
+        "interior_finish": None, "lighting_plumbing": None, "heat": None, "cost_sq_m": None,
+        "cost_cu_ft": None, "cost_sq_ft": sq_ft, "source_page": page,
+    }
+
+
+def _pct(category, page, median):
+    return {"section_name": "ELECTRICAL", "occupancy": "Offices", "category": category, "median_pct": median, "source_page": page}
+
+
+def _edition(date, components, costs, pcts, modifiers, pages):
+    rows = final_rows(components, costs, pcts, modifiers, date)
+    return rows, build_page_records(pages, rows)
+
+
+def _quiet(fn, *a, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*a, **kw)
+
+
+def _full_load(db, date, rows):
+    sink = SupabaseSink(db, date)
+    _quiet(sink.clear_existing, clear_cost_rows=True, clear_cost_percentages=True,
+           clear_component_costs=True, clear_modifiers=True)
+    _quiet(sink.upsert_occupancies, [{"occupancy_code": 300, "occupancy_name": "Apartments"}])
+    _quiet(sink.add_modifier_rows, rows["cce_modifiers"])
+    _quiet(sink.finish_modifier_rows)
+    _quiet(sink.add_component_rows, rows["cce_component_costs"])
+    _quiet(sink.finish_component_rows)
+    _quiet(sink.add_cost_pct_rows, rows["cce_cost_percentages"])
+    _quiet(sink.finish_cost_pct_rows)
+    _quiet(sink.write_cost_rows, rows["cce_cost_rows"])
+
+
+class TestFingerprints(unittest.TestCase):
+    def test_whitespace_insensitive(self):
+        a = page_fingerprint("SECTION 11  PAGE 3\nWALLS ", [[["Item", " 1.50"], [None, "2"]]])
+        b = page_fingerprint("SECTION 11 PAGE 3 WALLS", [[["Item", "1.50"], ["", "2"]]])
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, page_fingerprint("SECTION 11 PAGE 3 WALLS", [[["Item", "1.55"], ["", "2"]]]))
+        self.assertNotEqual(page_fingerprint("x", None), page_fingerprint("x", [[["x"]]]))
+
+    def test_row_digests_ignore_order(self):
+        rows = [_comp("a", 1), _comp("b", 1), _comp("c", 2)]
+        self.assertEqual(row_digests_by_page(rows), row_digests_by_page(list(reversed(rows))))
+        self.assertEqual(set(row_digests_by_page(rows)), {1, 2})
+
+
+class TestDiffEditions(unittest.TestCase):
+    def test_classifies_pages(self):
+        _, prev = _edition("2026-03-01", [_comp("a", 1), _comp("b", 2), _comp("c", 3)], [], [], [],
+                           {1: "f1", 2: "f2", 3: "f3", 4: "f4"})
+        # page 2 text changed, page 3 same text but section carried from page 2 changed, 5 new, 4 gone
+        _, cur = _edition("2026-04-01", [_comp("a", 1), _comp("B", 2), _comp("c", 3, section="DOORS")], [], [], [],
+                          {1: "f1", 2: "f2x", 3: "f3", 5: "f5"})
+        report = diff_editions(prev, cur)
+        self.assertEqual(report["changed"], [2])
+        self.assertEqual(report["rows_only"], [3])
+        self.assertEqual(report["added"], [5])
+        self.assertEqual(report["removed"], [4])
+        self.assertEqual(report["dirty"], [2, 3, 5])
+        self.assertEqual(report["unchanged"], 1)
+        report["previous_extraction_date"] = "2026-03-01"
+        self.assertIn("1 unchanged, 1 changed", format_change_report(report)[0])
+
+
+class TestApplyEditionDiff(unittest.TestCase):
+    def test_delta_write_matches_full_reload(self):
+        pages_a = {1: "f1", 2: "f2", 3: "f3", 4: "f4", 5: "f5"}
+        rows_a, records_a = _edition(
+            "2026-03-01",
+            [_comp("a", 1), _comp("b", 2), _comp("c", 3), _comp("d", 4)],
+            [_cost("Good", 2, 100.0), _cost("Low", 3, 50.0), _cost("Good", 4, 110.0)],
+            [_pct("OTHER", 3, 1.0), _pct("TOTAL", 5, 2.0)],
+            [{"modifier_type": "perimeter", "sq_ft_multiplier": 1.1, "source_page": 5}],
+            pages_a,
+        )
+        pages_b = {1: "f1", 2: "f2", 3: "f3x", 4: "f4", 6: "f6"}
+        rows_b, records_b = _edition(
+            "2026-04-01",
+            [_comp("a", 1), _comp("b", 2), _comp("c", 3, col_1=12.0), _comp("d", 4), _comp("e", 6)],
+            [_cost("Good", 2, 100.0), _cost("Low", 3, 55.0), _cost("Good", 4, 110.0)],
+            [_pct("OTHER", 3, 1.5), _pct("TOTAL", 6, 2.0)],
+            [{"modifier_type": "perimeter", "sq_ft_multiplier": 1.2, "source_page": 6}],
+            pages_b,
+        )
+        expected, delta = _FakeDb(), _FakeDb()
+        _full_load(expected, "2026-03-01", rows_a)
+        _full_load(expected, "2026-04-01", rows_b)
+        _full_load(delta, "2026-03-01", rows_a)
+        delta.requests.clear()
+
+        report = diff_editions(records_a, records_b)
+        self.assertEqual(report["dirty"], [3, 6])
+        self.assertEqual(report["removed"], [5])
+        sink = SupabaseSink(delta, "2026-04-01")
+        _quiet(sink.upsert_occupancies, [{"occupancy_code": 300, "occupancy_name": "Apartments"}])
+        for _ in range(2):  # re-running after a failure leaves the same tables
+            _quiet(apply_edition_diff, sink, previous_extraction_date="2026-03-01", report=report, rows_by_table=rows_b)
+        for table in ("cce_component_costs", "cce_cost_rows", "cce_cost_percentages", "cce_modifiers"):
+            self.assertEqual(delta.rows(table), expected.rows(table), table)
+        self.assertEqual(report["tables"]["cce_component_costs"], {"rows_written": 2, "pages": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for extract-cce-pdf.py --checkpoint / --resume state files."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_checkpoint import (  # noqa: E402
+    build_checkpoint,
+    checkpoint_mismatch,
+    load_checkpoint,
+    restore_parser_state,
+    save_checkpoint,
+)
+
+
+def _checkpoint(**overrides):
+    occupancies = {
+        300: {"occupancy_code": 300, "occupancy_name": "Apartments", "section_number": 11, "page_start": 4, "page_end": 9},
+        150: {"occupancy_code": 150, "occupancy_name": "Barns", "section_number": 12, "page_start": 10, "page_end": 12},
+    }
+    kw = {
+        "pdf_path": "local_data/CCE.pdf",
+        "pdf_sha256": "abc",
+        "edition_id": "march_2026",
+        "extraction_date": "2026-03-01",
+        "page_start": 1,
+        "page_end": 900,
+        "last_committed_page": 12,
+        "run_started_at": "2026-03-02T10:00:00+00:00",
+        "current_section": 12,
+        "current_section_name": "BARNS",
+        "occupancies": occupancies,
+        "prev_occupancy": occupancies[150],
+        "pending_cost_rows": [{"occupancy_code": 300, "building_class": "D", "cost_sq_ft": 101.5}],
+        "counters": {"stream_counts": {"cost": 1}},
+    }
+    kw.update(overrides)
+    return build_checkpoint(**kw)
+
+
+class TestCheckpointFile(unittest.TestCase):
+    def test_round_trip_restores_parser_state(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "sub" / "ckpt.json")
+            save_checkpoint(path, _checkpoint())
+            data = load_checkpoint(path)
+        section, section_name, occupancies, prev = restore_parser_state(data)
+        self.assertEqual((section, section_name), (12, "BARNS"))
+        self.assertEqual(list(occupancies), [300, 150])  # discovery order kept
+        self.assertIs(prev, occupancies[150])  # later pages extend the same occupancy
+        self.assertEqual(data["last_committed_page"], 12)
+        self.assertEqual(data["pending_cost_rows"][0]["cost_sq_ft"], 101.5)
+        self.assertIn("saved_at", data)
+
+    def test_snapshot_is_a_copy(self):
+        occupancies = {300: {"occupancy_code": 300, "occupancy_name": "Apartments", "page_end": 4}}
+        data = _checkpoint(occupancies=occupancies, prev_occupancy=occupancies[300])
+        occupancies[300]["page_end"] = 99
+        self.assertEqual(data["parser"]["occupancies"][0]["page_end"], 4)
+
+    def test_no_prev_occupancy(self):
+        _, _, _, prev = restore_parser_state(_checkpoint(prev_occupancy=None))
+        self.assertIsNone(prev)
+
+    def test_missing_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(load_checkpoint(str(Path(tmp) / "none.json")))
+
+    def test_save_replaces_atomically(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ckpt.json"
+            save_checkpoint(str(path), _checkpoint(last_committed_page=5))
+            save_checkpoint(str(path), _checkpoint(last_committed_page=30))
+            self.assertEqual(load_checkpoint(str(path))["last_committed_page"], 30)
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["ckpt.json"])
+
+    def test_unknown_version_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ckpt.json"
+            path.write_text(json.dumps({"version": 99}))
+            with self.assertRaises(ValueError):
+                load_checkpoint(str(path))
+
+
+class TestCheckpointMismatch(unittest.TestCase):
+    def test_matching_run(self):
+        data = _checkpoint()
+        self.assertIsNone(checkpoint_mismatch(data, pdf_sha256="abc", edition_id="march_2026", extraction_date="2026-03-01"))
+
+    def test_mismatches(self):
+        data = _checkpoint()
+        self.assertIn("PDF", checkpoint_mismatch(data, pdf_sha256="def", edition_id="march_2026", extraction_date="2026-03-01"))
+        self.assertIn("edition_id", checkpoint_mismatch(data, pdf_sha256="abc", edition_id="june_2026", extraction_date="2026-03-01"))
+        self.assertIn("extraction_date", checkpoint_mismatch(data, pdf_sha256="abc", edition_id="march_2026", extraction_date="2026-06-01"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Tests for extract-cce-pdf.py --events ndjson / --job-id status files (cce_extract_events.py)."""
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cce_extract_events  # noqa: E402
+from cce_extract_events import (  # noqa: E402
+    NULL_EVENTS,
+    JobEvents,
+    open_job_events,
+    read_job_status,
+    run_with_job_events,
+    status_paths,
+    update_job_status,
+)
+
+
+class TestJobEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_stream_status_and_events_file(self):
+        out = io.StringIO()
+        ev = JobEvents("job-1", stream=out, status_dir=self.tmp.name)
+        rows = {"cost_rows": 0}
+        ev.emit("start")
+        ev.start_pages(250, lambda: dict(rows))
+        for n in range(1, 251):
+            rows["cost_rows"] = n
+            ev.page(n + 10, n)
+        ev.finish("completed", rows={"cost_rows": 250})
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        progress = [e for e in lines if e["event"] == "progress"]
+        self.assertEqual(len(progress), 125)  # every 250 // 100 = 2 pages
+        self.assertEqual(progress[-1]["percent"], 100.0)
+        self.assertEqual([e["seq"] for e in lines], list(range(1, len(lines) + 1)))
+        _, events_path = status_paths(self.tmp.name, "job-1")
+        self.assertEqual(events_path.read_text().splitlines(), out.getvalue().splitlines())
+
+        status = read_job_status(self.tmp.name, "job-1")
+        self.assertEqual(status["status"], "completed")
+        self.assertEqual(status["stage"], "parse")
+        self.assertEqual((status["pages_done"], status["pages_total"], status["last_page"]), (250, 250, 260))
+        self.assertEqual(status["rows"], {"cost_rows": 250})
+        ev.fail("late")  # finished jobs stay finished
+        self.assertEqual(read_job_status(self.tmp.name, "job-1")["status"], "completed")
+
+    def test_keeps_job_runner_fields(self):
+        update_job_status(
+            self.tmp.name, "job-2", kind="cce-extract", status="running", tables=["cce_costs"],
+            queued_at="2026-03-01T00:00:00+00:00", log="job-2.log",
+        )
+        ev = JobEvents("job-2", status_dir=self.tmp.name)
+        ev.stage("parse")
+        status = read_job_status(self.tmp.name, "job-2")
+        self.assertEqual(status["stage"], "parse")
+        self.assertEqual(
+            (status["kind"], status["tables"], status["queued_at"], status["log"]),
+            ("cce-extract", ["cce_costs"], "2026-03-01T00:00:00+00:00", "job-2.log"),
+        )
+
+    def test_job_id_cannot_escape_status_dir(self):
+        for bad in ("../x", "a/b", "", ".hidden"):
+            with self.assertRaises(ValueError):
+                status_paths(self.tmp.name, bad)
+        self.assertIsNone(read_job_status(self.tmp.name, "missing"))
+
+
+class TestRunWithJobEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        stdout = sys.stdout
+        self.addCleanup(setattr, sys, "stdout", stdout)
+        self.addCleanup(setattr, cce_extract_events, "_current", NULL_EVENTS)
+
+    def _main_exiting_with_error(self):
+        print("Note: starting")
+        print("Error: PDF not found: x.pdf")
+        sys.exit(1)
+
+    def test_error_line_and_exit_code_mark_job_failed(self):
+        out = io.StringIO()
+        sys.stdout = out
+        open_job_events(None, "job-2", self.tmp.name)
+        with self.assertRaises(SystemExit):
+            run_with_job_events(self._main_exiting_with_error)
+        self.assertIn("Error: PDF not found", out.getvalue())  # log still passes through
+        status = read_job_status(self.tmp.name, "job-2")
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "PDF not found: x.pdf")
+        _, events_path = status_paths(self.tmp.name, "job-2")
+        kinds = [json.loads(line)["event"] for line in events_path.read_text().splitlines()]
+        self.assertEqual(kinds, ["note", "error", "done"])
+
+    def test_ndjson_mode_keeps_stdout_for_events(self):
+        out, err = io.StringIO(), io.StringIO()
+        sys.stdout, stderr = out, sys.stderr
+        sys.stderr = err
+        try:
+            events = open_job_events("ndjson", None, self.tmp.name)
+            run_with_job_events(lambda: print("human log line"))
+        finally:
+            sys.stderr = stderr
+        self.assertEqual(err.getvalue(), "human log line\n")
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([e["event"] for e in lines], ["done"])
+        self.assertEqual(lines[0]["job_id"], events.job_id)
+        self.assertEqual(read_job_status(self.tmp.name, events.job_id)["status"], "completed")
+
+    def test_disabled(self):
+        self.assertIs(open_job_events(None, None, self.tmp.name), NULL_EVENTS)
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
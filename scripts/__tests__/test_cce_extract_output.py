@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for extract-cce-pdf.py --output-dir run files and --load-from."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_output import (  # noqa: E402
+    MANIFEST_NAME,
+    load_extract_run,
+    push_extract_run,
+    resolve_output_format,
+    write_extract_run,
+)
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+TABLES = {
+    "cce_occupancies": [
+        {"occupancy_code": 300, "occupancy_name": "Apartments", "section_number": 11, "page_start": 4, "page_end": 9},
+    ],
+    "cce_cost_rows": [
+        {"occupancy_code": 300, "building_class": "D", "quality_type": "Good", "cost_sq_ft": 101.5, "cost_sq_m": None, "source_page": 5},
+    ],
+    "cce_cost_percentages": [
+        {"section_name": "ELECTRICAL", "occupancy": "Offices", "category": "OTHER", "median_pct": 1.5, "source_page": 7},
+    ],
+    "cce_component_costs": [
+        {"section_name": "WALLS", "item_name": "Brick", "col_1": 10.0, "col_2": None, "source_page": 6,
+         "extraction_flags": {"sparse_tiers": True}, "normalization_version": 1, "occupancy_code": 300},
+        {"section_name": "WALLS", "item_name": "Block", "col_1": 8, "col_2": 9.25, "source_page": 6,
+         "extraction_flags": {}, "normalization_version": 1},
+    ],
+    "cce_modifiers": [],
+    "extract_stats": [
+        {"rejected_non_monotonic": 1, "non_mono_samples": [{"page": 6, "cols": [3.0, 2.0], "item": "Tile"}], "sparse_tier_hint_rows": 0},
+    ],
+}
+METADATA = {"pdf_filename": "CCE.pdf", "page_start": 1, "page_end": 9, "status": "completed"}
+
+
+def _write(tmp, fmt):
+    return write_extract_run(
+        tmp, TABLES, fmt=fmt, extraction_date="2026-03-01", edition_id="march_2026", pdf_sha256="abc", metadata=METADATA,
+    )
+
+
+class _RecordingSink:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.calls.append((name, a, kw))
+
+
+class TestRunFiles(unittest.TestCase):
+    def test_ndjson_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = _write(tmp, "ndjson")
+            self.assertEqual(manifest["tables"]["cce_component_costs"]["optional_columns"], ["occupancy_code"])
+            loaded_manifest, tables = load_extract_run(tmp)
+        self.assertEqual(tables, TABLES)
+        self.assertEqual(loaded_manifest["metadata"], METADATA)
+        self.assertEqual(loaded_manifest["extraction_date"], "2026-03-01")
+
+    @unittest.skipUnless(HAVE_PYARROW, "pyarrow not installed")
+    def test_parquet_round_trip_keeps_missing_keys_and_nested_values(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = _write(tmp, "parquet")
+            self.assertEqual(manifest["tables"]["cce_component_costs"]["json_columns"], ["extraction_flags"])
+            _, tables = load_extract_run(tmp)
+        self.assertEqual(tables, TABLES)
+
+    def test_auto_format(self):
+        self.assertEqual(resolve_output_format("auto"), "parquet" if HAVE_PYARROW else "ndjson")
+        if not HAVE_PYARROW:
+            with self.assertRaises(RuntimeError):
+                resolve_output_format("parquet")
+
+    def test_incomplete_run_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _write(tmp, "ndjson")
+            (Path(tmp) / MANIFEST_NAME).unlink()
+            with self.assertRaises(FileNotFoundError):
+                load_extract_run(tmp)
+            _write(tmp, "ndjson")
+            with open(Path(tmp) / "cce_cost_rows.ndjson", "a", encoding="utf-8") as f:
+                f.write(json.dumps(TABLES["cce_cost_rows"][0]) + "\n")
+            with self.assertRaises(ValueError):
+                load_extract_run(tmp)
+
+
+class TestPushRun(unittest.TestCase):
+    def test_sink_call_order(self):
+        sink = _RecordingSink()
+        push_extract_run(sink, TABLES, METADATA, clear_component_costs=True)
+        names = [c[0] for c in sink.calls]
+        self.assertEqual(names, [
+            "clear_existing", "upsert_occupancies", "add_modifier_rows", "finish_modifier_rows",
+            "add_component_rows", "finish_component_rows", "add_cost_pct_rows", "finish_cost_pct_rows",
+            "write_cost_rows", "write_metadata", "close",
+        ])
+        self.assertTrue(sink.calls[0][2]["clear_component_costs"])
+        self.assertFalse(sink.calls[0][2]["clear_cost_rows"])
+        self.assertEqual(sink.calls[-2][1], (METADATA,))
+
+
+if __name__ == "__main__":
+    unittest.main()
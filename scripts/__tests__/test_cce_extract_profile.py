@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for edition profile loading and CompiledProfile lookups (cce_extract_profile.py)."""
+
+import json
+import pickle
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_profile import (  # noqa: E402
+    CompiledProfile,
+    apply_section_alias,
+    default_profile_dict,
+    load_cce_profile,
+    profile_layout_list_enabled_for_page,
+    profile_skip_page,
+)
+from cce_extract_rules import compile_extract_rules  # noqa: E402
+
+
+def _alias_scan(aliases, name):
+    """apply_section_alias() on a plain dict profile before CompiledProfile."""
+    if not name:
+        return name
+    if name in aliases:
+        return str(aliases[name])
+    u = name.strip().upper()
+    for k, v in aliases.items():
+        if isinstance(k, str) and k.strip().upper() == u:
+            return str(v)
+    return name
+
+
+class TestCompiledProfile(unittest.TestCase):
+    def _profile(self, **overlay):
+        data = default_profile_dict()
+        data.update(overlay)
+        return CompiledProfile(data)
+
+    def test_page_rules_and_ranges(self):
+        p = self._profile(
+            page_rules={"skip_pages": [3, "10-12", " 40 "], "layout_list_pages": ["100-102"]},
+            layout={"enabled": True},
+        )
+        self.assertEqual(p.skip_pages, frozenset({3, 10, 11, 12, 40}))
+        self.assertTrue(profile_skip_page(p, 11))
+        self.assertFalse(profile_skip_page(p, 13))
+        self.assertTrue(profile_layout_list_enabled_for_page(p, 101))
+        self.assertTrue(profile_skip_page(p.to_dict(), 11))  # plain dicts accept ranges too
+        self.assertFalse(self._profile(page_rules={"layout_list_pages": [5]}).layout_list_enabled_for_page(5))
+        for bad in (["12-10"], ["a"], [True], [2.5]):
+            with self.assertRaises(ValueError):
+                self._profile(page_rules={"skip_pages": bad})
+
+    def test_section_alias_matches_linear_scan(self):
+        rng = random.Random(20260320)
+        keys = ["HOTELS", "hotels ", "Electrical Systems", "ELECTRICAL SYSTEMS", " Wall Costs", "BARNS"]
+        names = keys + ["", None, "hotels", "  electrical systems", "Offices", "barns"]
+        for _ in range(200):
+            aliases = {k: rng.choice(["A", "B", 3]) for k in rng.sample(keys, rng.randint(0, len(keys)))}
+            p = self._profile(section_aliases=aliases)
+            for name in names:
+                self.assertEqual(p.section_alias(name), _alias_scan(aliases, name), (aliases, name))
+                self.assertEqual(apply_section_alias(p, name), apply_section_alias(p.to_dict(), name))
+        self.assertEqual(self._profile(section_aliases=["not", "a", "dict"]).section_alias("X"), "X")
+
+    def test_mapping_hash_and_pickle(self):
+        p = self._profile(truncated_and_junk_headers_extra=[" and shed "], short_section_denylist_extra=["Gates"])
+        self.assertEqual(p.get("list_line_strategy"), "auto")
+        self.assertEqual(p["page_rules"]["force_segregated_crop"], True)
+        self.assertEqual(dict(p), p.to_dict())
+        q = pickle.loads(pickle.dumps(p))
+        self.assertEqual(q, p)
+        self.assertEqual(hash(q), hash(p))
+        self.assertEqual(len({p, q, self._profile()}), 2)
+        rules = compile_extract_rules(p)
+        self.assertIs(rules.extra_trunc, p.extra_trunc)
+        self.assertEqual(rules.extra_short, compile_extract_rules(p.to_dict()).extra_short)
+
+    def test_load_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "edition.json"
+            path.write_text(json.dumps({"edition_id": "x", "page_rules": {"skip_pages": ["1-3"]}, "layout": {"enabled": True}}))
+            p = load_cce_profile(str(path))
+        self.assertIsInstance(p, CompiledProfile)
+        self.assertEqual(p.edition_id, "x")
+        self.assertEqual(p.skip_pages, frozenset({1, 2, 3}))
+        self.assertEqual(p["layout"]["y_tolerance"], 3.5)  # merged with the defaults
+        self.assertIsInstance(load_cce_profile(None), CompiledProfile)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for extract-cce-pdf.py --profile-report stage timers (cce_extract_profiler.py)."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_profiler import NULL_PROFILER, StageProfiler  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def tick(self, seconds):
+        self.now += seconds
+
+
+def _helper(clock, seconds):
+    def helper(x):
+        clock.tick(seconds)
+        return x * 2
+
+    return helper
+
+
+class TestStageProfiler(unittest.TestCase):
+    def _run(self):
+        clock = _Clock()
+        prof = StageProfiler(clock=clock)
+        rows = []
+        prof.counters = lambda: {"component_rows": len(rows)}
+        ns = {"helper": _helper(clock, 0.25)}
+        prof.instrument(ns, ["helper", "missing"])
+        prof.stage("setup")
+        clock.tick(1.0)
+
+        def pages():
+            for n in (1, 2):
+                clock.tick(0.5)  # reader wait
+                yield {"page_num": n, "timings": {"text": 0.4}}
+
+        for data in prof.pages(pages()):
+            prof.begin_page(data["page_num"], data["timings"], "list")
+            clock.tick(0.1)
+            prof.stage("parse;list_lines")
+            self.assertEqual(ns["helper"](2), 4)
+            rows.extend([{}] * data["page_num"])
+            if data["page_num"] == 1:
+                continue  # the lap closes when the next page is requested
+            clock.tick(2.0)
+        return prof, clock
+
+    def test_laps_pages_and_helpers(self):
+        prof, _ = self._run()
+        report = prof.report()
+        stages = {s["stage"]: s for s in report["stages"]}
+        self.assertAlmostEqual(stages["setup"]["seconds"], 1.0)
+        self.assertAlmostEqual(stages["read"]["seconds"], 1.0)
+        self.assertAlmostEqual(stages["read;text"]["seconds"], 0.8)
+        self.assertAlmostEqual(stages["parse;page_state"]["seconds"], 0.2)
+        self.assertAlmostEqual(stages["parse;list_lines"]["seconds"], 2.5)
+        self.assertAlmostEqual(stages["parse;list_lines"]["self_seconds"], 2.0)
+        self.assertEqual(stages["parse;list_lines;helper"]["calls"], 2)
+        self.assertEqual(report["roots"], {"parse": 2.7, "setup": 1.0, "read": 1.0})
+        self.assertEqual(report["untracked_seconds"], 0.0)
+        slow = report["slowest_pages"]
+        self.assertEqual([p["page"] for p in slow], [2, 1])
+        self.assertEqual(slow[0]["rows"], {"component_rows": 2})
+        self.assertAlmostEqual(slow[0]["parse_seconds"], 2.35)
+        self.assertAlmostEqual(slow[0]["read_seconds"], 0.4)
+
+    def test_folded_stacks_are_self_time(self):
+        prof, _ = self._run()
+        with tempfile.TemporaryDirectory() as tmp:
+            _, folded = prof.write_report(str(Path(tmp) / "profile.json"))
+            lines = Path(folded).read_text().splitlines()
+            report = json.loads((Path(tmp) / "profile.json").read_text())
+        counts = dict(line.rsplit(" ", 1) for line in lines)
+        self.assertEqual(counts["extract-cce-pdf;parse;list_lines"], "2000000")
+        self.assertEqual(counts["extract-cce-pdf;parse;list_lines;helper"], "500000")
+        self.assertEqual(sum(int(v) for v in counts.values()), round(report["wall_seconds"] * 1e6))
+
+    def test_null_profiler_is_passthrough(self):
+        ns = {"helper": len}
+        NULL_PROFILER.instrument(ns, ["helper"])
+        self.assertIs(ns["helper"], len)
+        it = iter([1, 2])
+        self.assertIs(NULL_PROFILER.pages(it), it)
+        NULL_PROFILER.begin_page(1, {"text": 1.0})
+        NULL_PROFILER.stage("parse;x")
+
+
+if __name__ == "__main__":
+    unittest.main()
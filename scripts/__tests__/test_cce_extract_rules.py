@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for compiled CCE rules: fused matchers must decide exactly like the per-pattern loops."""
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_component_item_extract import list_section_header_is_truncated_junk  # noqa: E402
+from cce_extract_rules import (  # noqa: E402
+    LIST_SECTION_FALLBACK_RE,
+    LIST_SECTION_HEADER_RE,
+    LIST_SECTION_SIMPLE_RE,
+    LIST_SKIP_PATTERNS,
+    LIST_SKIP_RE,
+    OCCUPANCY_NAME_BLOCK_RE,
+    OCCUPANCY_NAME_BLOCKLIST,
+    SKIP_ITEM_PATTERNS,
+    SKIP_ITEM_RE,
+    SUBSECTION_HEADER_RE,
+    compile_extract_rules,
+    match_list_header,
+)
+
+
+def _sequential_header(line):
+    rules = (
+        ("subsection", SUBSECTION_HEADER_RE, 0, None),
+        ("fallback", LIST_SECTION_FALLBACK_RE, 15, None),
+        ("simple", LIST_SECTION_SIMPLE_RE, 10, None),
+        ("header", LIST_SECTION_HEADER_RE, 5, 50),
+    )
+    for kind, rx, min_len, max_len in rules:
+        m = rx.match(line)
+        if m and len(line) >= min_len and (max_len is None or len(line) <= max_len):
+            return kind, m.group(1)
+    return None
+
+
+def _random_lines(n, seed):
+    rng = random.Random(seed)
+    pieces = [
+        "WALL COSTS", "Balconies", "AND", "OR", "and", "CANOPIES", "MARQUEES", "LANDINGS", "(Apply to",
+        "floor area)", "2nd", "(", ")", "Add for", "Good", "|", "18.1", "32.75", "...........", "-", ",",
+        "Section", "IV", "dear", "customer", "For", "see section", "deduct", "Concrete", "ı", "ſ", "/",
+        "DOORS - RESIDENTIAL", "a", "c-d-s", "d pole", "pole", "slant", "hoop", " ", "  ",
+    ]
+    for _ in range(n):
+        yield "".join(rng.choice(pieces) + rng.choice(["", " "]) for _ in range(rng.randint(1, 9))).strip()
+
+
+class TestMatchListHeader(unittest.TestCase):
+    def test_kinds(self):
+        cases = {
+            "EXTERIOR BALCONIES/LANDINGS (Apply to balcony area)": "subsection",
+            "MARQUEES (Apply to 2nd floor area)": "subsection",
+            "BALCONIES AND CANOPIES": "fallback",
+            "EXTERIOR BALCONIES": "fallback",  # "OR" inside EXTERIOR, as in the original regex order
+            "LARGE BALCONIES": "simple",
+            "WALL COSTS": "header",
+            "Concrete .......... 32.75 43.00 55.50": None,
+            "AND": None,
+        }
+        for line, kind in cases.items():
+            got = match_list_header(line)
+            self.assertEqual(got[0] if got else None, kind, line)
+
+    def test_same_as_sequential_regexes(self):
+        for line in _random_lines(20000, seed=3):
+            got = match_list_header(line)
+            self.assertEqual((got[0], got[1].group(1)) if got else None, _sequential_header(line), line)
+
+
+class TestFusedSkipPatterns(unittest.TestCase):
+    def test_list_and_table_skips_match_loops(self):
+        for line in _random_lines(20000, seed=5):
+            low = line.lower()
+            self.assertEqual(bool(LIST_SKIP_RE.search(low)), any(re.search(p, low) for p in LIST_SKIP_PATTERNS), low)
+            self.assertEqual(bool(SKIP_ITEM_RE.search(low)), any(re.search(p, low) for p in SKIP_ITEM_PATTERNS), low)
+
+    def test_occupancy_blocklist(self):
+        for name in ("apartments", "license agreement", "msb information (x)", "msb", "dear customer", "barns"):
+            self.assertEqual(bool(OCCUPANCY_NAME_BLOCK_RE.search(name)), any(p in name for p in OCCUPANCY_NAME_BLOCKLIST))
+
+
+class TestExtractRules(unittest.TestCase):
+    def test_profile_sets(self):
+        rules = compile_extract_rules({
+            "truncated_and_junk_headers_extra": [" and shed ", 3],
+            "short_section_denylist_extra": ["Gates"],
+            "list_line_strategy": " Layout ",
+        })
+        self.assertEqual(rules.list_strategy, "layout")
+        for name in ("AND SHED", "and shed", "Apartments", "", "AND"):
+            self.assertEqual(
+                rules.header_is_truncated_junk(name),
+                list_section_header_is_truncated_junk(name, rules.extra_trunc),
+                name,
+            )
+        self.assertTrue(rules.section_name_is_weak_short("GATES"))
+        self.assertFalse(rules.section_candidate_ok("Add for heating"))
+        self.assertTrue(rules.section_candidate_ok("WALL COSTS"))
+
+    def test_defaults(self):
+        rules = compile_extract_rules({})
+        self.assertEqual(rules.list_strategy, "auto")
+        self.assertEqual(rules.extra_trunc, frozenset())
+        self.assertIsNone(rules.list_continuation_max_lines)
+
+    def test_list_continuation_max_lines(self):
+        self.assertEqual(compile_extract_rules({"list_continuation_max_lines": 6}).list_continuation_max_lines, 6)
+        self.assertIsNone(compile_extract_rules({"list_continuation_max_lines": 0}).list_continuation_max_lines)
+        for bad in (-1, "6", 2.5, True):
+            with self.assertRaises(ValueError):
+                compile_extract_rules({"list_continuation_max_lines": bad})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Tests for batched Supabase writes (adaptive, concurrent) and the --stream background writer."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_checkpoint import save_stream_checkpoint  # noqa: E402
+from cce_extract_sink import (  # noqa: E402
+    AdaptiveBatch,
+    StreamWriter,
+    SupabaseSink,
+    dedupe_component_rows,
+    dedupe_cost_pct_rows,
+    dedupe_cost_rows,
+    is_batch_too_large,
+)
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = None
+        self.rows = None
+
+    def insert(self, rows):
+        self.op, self.rows = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.op, self.rows = "upsert", rows
+        return self
+
+    def select(self, cols):
+        self.op = "select"
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, *a):
+        return self
+
+    def neq(self, *a):
+        return self
+
+    def gt(self, *a):
+        self.client.filters.append(("gt",) + a)
+        return self
+
+    def gte(self, *a):
+        self.client.filters.append(("gte",) + a)
+        return self
+
+    def in_(self, col, values):
+        self.rows = values
+        return self
+
+    def execute(self):
+        if (self.table, self.op) in self.client.fail:
+            raise RuntimeError("boom")
+        if self.client.fail_if and self.client.fail_if(self.table, self.rows):
+            raise RuntimeError("boom")
+        if self.client.max_rows and self.op in ("insert", "upsert") and len(self.rows) > self.client.max_rows:
+            raise RuntimeError("413 Payload Too Large")
+        with self.client.lock:
+            self.client.calls.append((self.table, self.op, self.rows))
+        if self.table == "cce_occupancies" and self.op == "upsert":
+            for r in self.rows:
+                self.client.occ[r["occupancy_code"]] = f"id-{r['occupancy_code']}"
+        if self.table == "cce_occupancies" and self.op == "select":
+            return _Result([{"id": v, "occupancy_code": k} for k, v in self.client.occ.items()])
+        return _Result([])
+
+
+class _FakeSupabase:
+    def __init__(self, fail=(), max_rows=None, fail_if=None):
+        self.calls = []
+        self.fail_if = fail_if
+        self.filters = []
+        self.occ = {}
+        self.fail = set(fail)
+        self.max_rows = max_rows
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def batches(self, table, op="insert"):
+        return [rows for t, o, rows in self.calls if t == table and o == op]
+
+
+def _comp(i, page=1, occ=None):
+    r = {"section_name": "WALLS", "item_name": f"item {i}", "source_page": page, "col_1": float(i)}
+    if occ:
+        r["occupancy_code"] = occ
+    return r
+
+
+def _quiet(fn, *a, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*a, **kw)
+
+
+class TestSinkBatching(unittest.TestCase):
+    def test_streamed_adds_match_single_add(self):
+        rows = [_comp(i, page=i // 7) for i in range(123)]
+        whole, streamed = _FakeSupabase(), _FakeSupabase()
+        a = SupabaseSink(whole, "2026-03-01", batch_rows=50)
+        _quiet(a.add_component_rows, rows)
+        _quiet(a.finish_component_rows)
+        b = SupabaseSink(streamed, "2026-03-01", batch_rows=50)
+        for k in range(0, len(rows), 7):
+            _quiet(b.add_component_rows, rows[k : k + 7])
+        _quiet(b.finish_component_rows)
+        self.assertEqual(whole.calls, streamed.calls)
+        self.assertEqual([len(x) for x in whole.batches("cce_component_costs")], [50, 50, 23])
+
+    def test_component_rows_link_occupancy(self):
+        db = _FakeSupabase()
+        sink = SupabaseSink(db, "2026-03-01")
+        _quiet(sink.upsert_occupancies, [{"occupancy_code": 300, "occupancy_name": "Apartments"}], refresh_all=False)
+        _quiet(sink.add_component_rows, [_comp(1, occ=300), _comp(2)])
+        _quiet(sink.finish_component_rows)
+        (batch,) = db.batches("cce_component_costs")
+        self.assertEqual(batch[0]["occupancy_id"], "id-300")
+        self.assertNotIn("occupancy_code", batch[0])
+        self.assertNotIn("occupancy_id", batch[1])
+        self.assertEqual(batch[1]["extraction_date"], "2026-03-01")
+
+    def test_modifier_failure_stops_later_batches(self):
+        db = _FakeSupabase(fail={("cce_modifiers", "insert")})
+        sink = SupabaseSink(db, "2026-03-01")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            sink.add_modifier_rows([{"modifier_type": "perimeter"}] * 45)
+            sink.add_modifier_rows([{"modifier_type": "perimeter"}] * 5)
+            sink.finish_modifier_rows()
+        self.assertEqual(out.getvalue().count("cce_modifiers insert skipped"), 1)
+        self.assertNotIn("Inserted", out.getvalue())
+
+    def test_modifier_batches(self):
+        db = _FakeSupabase()
+        sink = SupabaseSink(db, "2026-03-01", batch_rows=20)
+        _quiet(sink.add_modifier_rows, [{"modifier_type": "wall_height"}] * 45)
+        _quiet(sink.finish_modifier_rows)
+        self.assertEqual([len(x) for x in db.batches("cce_modifiers")], [20, 20, 5])
+
+    def test_default_batches_are_large(self):
+        db = _FakeSupabase()
+        sink = SupabaseSink(db, "2026-03-01")
+        _quiet(sink.add_component_rows, [_comp(i) for i in range(1200)])
+        _quiet(sink.finish_component_rows)
+        self.assertEqual([len(x) for x in db.batches("cce_component_costs")], [500, 500, 200])
+
+    def test_pct_batch_dedupes_upsert_key(self):
+        db = _FakeSupabase()
+        sink = SupabaseSink(db, "2026-03-01")
+        row = {"section_name": "ELECTRICAL", "occupancy": "Offices", "category": "OTHER"}
+        _quiet(sink.add_cost_pct_rows, [dict(row, median_pct=1.0), dict(row, category="TOTAL"), dict(row, median_pct=2.0)])
+        _quiet(sink.finish_cost_pct_rows)
+        (batch,) = db.batches("cce_cost_percentages", "upsert")
+        self.assertEqual([(r["category"], r.get("median_pct")) for r in batch], [("OTHER", 2.0), ("TOTAL", None)])
+
+
+class TestAdaptiveBatches(unittest.TestCase):
+    def test_too_large_request_is_split_and_later_batches_shrink(self):
+        db = _FakeSupabase(max_rows=120)
+        sink = SupabaseSink(db, "2026-03-01")
+        rows = [_comp(i) for i in range(1000)]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            sink.add_component_rows(rows)
+            sink.finish_component_rows()
+        inserted = [r for batch in db.batches("cce_component_costs") for r in batch]
+        self.assertEqual([r["item_name"] for r in inserted], [r["item_name"] for r in rows])
+        self.assertTrue(all(len(b) <= 120 for b in db.batches("cce_component_costs")))
+        self.assertIn("rejected", out.getvalue())
+        self.assertNotIn("insert skipped", out.getvalue())
+        self.assertLess(sink._component_batch.size, 500)
+
+    def test_other_errors_are_not_retried(self):
+        db = _FakeSupabase(fail={("cce_cost_rows", "insert")})
+        sink = SupabaseSink(db, "2026-03-01")
+        sink.occ_id_map = {300: "id-300"}
+        row = {"occupancy_code": 300, "building_class": "D", "quality_type": "Good", "exterior_walls": None,
+               "interior_finish": None, "lighting_plumbing": None, "heat": None, "cost_sq_m": 1.0,
+               "cost_cu_ft": None, "cost_sq_ft": 2.0, "source_page": 5}
+        with self.assertRaises(RuntimeError):
+            _quiet(sink.write_cost_rows, [row])
+
+    def test_client_timeout_splits_only_upserts(self):
+        class ReadTimeout(Exception):
+            pass
+
+        class _TimeoutOnLargeBatches(_FakeSupabase):
+            def table(self, name):
+                q = _Query(self, name)
+                execute = q.execute
+
+                def timed_out():
+                    if len(q.rows) > 100:
+                        raise ReadTimeout("read timed out")
+                    return execute()
+
+                q.execute = timed_out
+                return q
+
+        db = _TimeoutOnLargeBatches()
+        sink = SupabaseSink(db, "2026-03-01")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            sink.add_component_rows([_comp(i) for i in range(300)])
+            sink.finish_component_rows()
+            sink.add_cost_pct_rows(
+                [{"section_name": "S", "occupancy": "O", "category": f"C{i}", "median_pct": 1.0} for i in range(300)]
+            )
+            sink.finish_cost_pct_rows()
+        self.assertEqual(db.batches("cce_component_costs"), [])
+        self.assertIn("cce_component_costs insert skipped", out.getvalue())
+        self.assertEqual(sum(len(b) for b in db.batches("cce_cost_percentages", "upsert")), 300)
+
+    def test_grows_back_after_successes(self):
+        batch = AdaptiveBatch(400, grow_after=2)
+        self.assertEqual(batch.shrink(400), 200)
+        self.assertEqual(batch.shrink(200), 100)
+        for _ in range(4):
+            batch.success()
+        self.assertEqual(batch.size, 400)
+        batch.success()
+        batch.success()
+        self.assertEqual(batch.size, 400)
+
+    def test_is_batch_too_large(self):
+        class APIError(Exception):
+            code = "57014"
+
+        class ReadTimeout(Exception):
+            pass
+
+        self.assertTrue(is_batch_too_large(RuntimeError("413 Payload Too Large")))
+        self.assertTrue(is_batch_too_large(APIError("canceling statement")))
+        # The server may have committed the batch before a client timeout: only resend upserts
+        self.assertFalse(is_batch_too_large(ReadTimeout("read timed out")))
+        self.assertTrue(is_batch_too_large(ReadTimeout("read timed out"), idempotent=True))
+        self.assertTrue(is_batch_too_large(RuntimeError("canceling statement due to statement timeout")))
+        self.assertFalse(is_batch_too_large(RuntimeError("duplicate key value violates unique constraint")))
+
+
+class TestConcurrentInserts(unittest.TestCase):
+    def test_concurrent_sink_writes_same_rows(self):
+        rows = [_comp(i, page=i // 9, occ=300 if i % 3 else None) for i in range(2345)]
+        results = []
+        for concurrency in (1, 4):
+            db = _FakeSupabase()
+            sink = SupabaseSink(db, "2026-03-01", batch_rows=100, concurrency=concurrency)
+            _quiet(sink.upsert_occupancies, [{"occupancy_code": 300, "occupancy_name": "Apartments"}])
+            for k in range(0, len(rows), 37):
+                _quiet(sink.add_component_rows, rows[k : k + 37])
+            _quiet(sink.flush_pending)
+            self.assertEqual(sink.counters()["component_batches"], 24)
+            _quiet(sink.close)
+            inserted = [r for batch in db.batches("cce_component_costs") for r in batch]
+            results.append(sorted(inserted, key=lambda r: r["item_name"]))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(results[0]), len(rows))
+
+
+class TestCheckpointSupport(unittest.TestCase):
+    def test_flush_pending_then_counters_continue_numbering(self):
+        rows = [_comp(i) for i in range(70)]
+        whole = _FakeSupabase()
+        a = SupabaseSink(whole, "2026-03-01")
+        _quiet(a.add_component_rows, rows[:30])
+        _quiet(a.flush_pending)
+        _quiet(a.add_component_rows, rows[30:])
+        _quiet(a.finish_component_rows)
+
+        resumed = _FakeSupabase()
+        b = SupabaseSink(resumed, "2026-03-01")
+        _quiet(b.add_component_rows, rows[:30])
+        _quiet(b.flush_pending)
+        c = SupabaseSink(resumed, "2026-03-01")
+        c.restore_counters(b.counters())
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            c.add_component_rows(rows[30:])
+            c.finish_component_rows()
+        self.assertEqual(whole.calls, resumed.calls)
+        self.assertIn("Inserted component batch 2 ", out.getvalue())
+
+    def test_flush_pending_keeps_modifier_total_for_finish(self):
+        db = _FakeSupabase()
+        sink = SupabaseSink(db, "2026-03-01")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            sink.add_modifier_rows([{"modifier_type": "perimeter"}] * 5)
+            sink.flush_pending()
+            self.assertNotIn("Inserted", out.getvalue())
+            sink.add_modifier_rows([{"modifier_type": "perimeter"}] * 3)
+            sink.finish_modifier_rows()
+        self.assertIn("Inserted 8 modifier rows", out.getvalue())
+
+    def test_delete_after_page(self):
+        db = _FakeSupabase()
+        _quiet(SupabaseSink(db, "2026-03-01").delete_after_page, 40, "2026-03-02T10:00:00+00:00")
+        deleted = [t for t, op, _ in db.calls if op == "delete"]
+        self.assertEqual(deleted, ["cce_component_costs", "cce_modifiers", "cce_cost_rows"])
+        self.assertIn(("gt", "source_page", 40), db.filters)
+        self.assertIn(("gte", "created_at", "2026-03-02T10:00:00+00:00"), db.filters)
+
+
+class TestDedupe(unittest.TestCase):
+    def test_component_dedupe_keeps_last_value_first_position(self):
+        rows = [_comp(1), _comp(2), dict(_comp(1), col_1=99.0)]
+        out = dedupe_component_rows(rows, "2026-03-01")
+        self.assertEqual([r["item_name"] for r in out], ["item 1", "item 2"])
+        self.assertEqual(out[0]["col_1"], 99.0)
+
+    def test_cost_pct_dedupe_keeps_last_value(self):
+        row = {"section_name": "ELECTRICAL", "occupancy": "Offices", "category": "OTHER"}
+        out = dedupe_cost_pct_rows([dict(row, median_pct=1.0), dict(row, median_pct=3.0)])
+        self.assertEqual(out, [dict(row, median_pct=3.0)])
+
+    def test_cost_dedupe(self):
+        base = {"occupancy_code": 300, "building_class": "D", "quality_type": "Good"}
+        rows = [dict(base, cost_sq_ft=1.0), dict(base, building_class="C"), dict(base, cost_sq_ft=2.0)]
+        out = dedupe_cost_rows(rows)
+        self.assertEqual(len(out), 2)
+        self.assertEqual(out[0]["cost_sq_ft"], 2.0)
+
+
+class TestStreamWriter(unittest.TestCase):
+    def test_runs_in_order(self):
+        seen = []
+        writer = StreamWriter(None, max_pending=2)
+        for i in range(20):
+            writer.submit(seen.append, i)
+        writer.close()
+        self.assertEqual(seen, list(range(20)))
+
+    def test_error_surfaces_to_caller(self):
+        def fail():
+            raise RuntimeError("insert failed")
+
+        writer = StreamWriter(None, max_pending=1)
+        writer.submit(fail)
+        with self.assertRaises(RuntimeError):
+            for _ in range(100):
+                writer.submit(lambda: None)
+            writer.close()
+
+    def test_skipped_batch_stops_checkpoints(self):
+        # Page 3's component batch fails: the sink only prints a Note, but the checkpoint stays at page 2
+        db = _FakeSupabase(fail_if=lambda table, rows: table == "cce_component_costs" and rows[0]["source_page"] == 3)
+        sink = SupabaseSink(db, "2026-03-01", concurrency=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "checkpoint.json")
+            writer = StreamWriter(sink, max_pending=4)
+            with self.assertRaises(RuntimeError) as ctx, contextlib.redirect_stdout(io.StringIO()):
+                for page in range(1, 6):
+                    writer.submit(sink.add_component_rows, [_comp(i, page=page) for i in range(3)])
+                    writer.submit(sink.add_modifier_rows, [{"modifier_type": "perimeter", "source_page": page}])
+                    writer.submit(sink.flush_pending)
+                    writer.submit(save_stream_checkpoint, path, {"last_committed_page": page, "counters": {}}, sink)
+                writer.close()
+            self.assertIn("not checkpointing page 3", str(ctx.exception))
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["last_committed_page"], 2)
+        self.assertEqual(len(sink.write_failures), 1)
+        self.assertTrue(sink.write_failures[0].startswith("cce_component_costs: 3 rows"))
+        self.assertEqual({r["source_page"] for b in db.batches("cce_component_costs") for r in b}, {1, 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Tests for the staging / one-transaction sink (--sink postgres), run against SQLite."""
+
+import contextlib
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_sql_sink import SqlStagingSink, copy_text_line  # noqa: E402
+
+# Same tables / columns / unique keys as scripts/migrations (SQLite types)
+SCHEMA = """
+CREATE TABLE cce_occupancies (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  occupancy_code INTEGER UNIQUE NOT NULL,
+  occupancy_name TEXT NOT NULL,
+  section_number INTEGER, page_start INTEGER, page_end INTEGER,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE cce_cost_rows (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  occupancy_id TEXT NOT NULL REFERENCES cce_occupancies(id),
+  building_class TEXT, quality_type TEXT, exterior_walls TEXT, interior_finish TEXT,
+  lighting_plumbing TEXT, heat TEXT, cost_sq_m NUMERIC, cost_cu_ft NUMERIC, cost_sq_ft NUMERIC,
+  source_page INTEGER, extraction_date TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE cce_component_costs (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  section_name TEXT, item_name TEXT, cost_tier TEXT,
+  col_1 NUMERIC, col_2 NUMERIC, col_3 NUMERIC, col_4 NUMERIC, source_page INTEGER,
+  occupancy_id TEXT, extraction_date TEXT,
+  extraction_flags TEXT NOT NULL DEFAULT '{}', normalization_version INTEGER NOT NULL DEFAULT 0,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE UNIQUE INDEX cce_component_costs_dedupe_idx ON cce_component_costs (
+  COALESCE(section_name, ''), COALESCE(item_name, ''), source_page, extraction_date
+);
+CREATE TABLE cce_cost_percentages (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  section_name TEXT NOT NULL, section_number INTEGER, occupancy TEXT NOT NULL, category TEXT NOT NULL,
+  low_pct NUMERIC, median_pct NUMERIC, high_pct NUMERIC, source_page INTEGER,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE (section_name, occupancy, category)
+);
+CREATE TABLE cce_modifiers (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  modifier_type TEXT NOT NULL, section_name TEXT, height_m NUMERIC, height_ft NUMERIC,
+  sq_ft_multiplier NUMERIC, sq_m_multiplier NUMERIC, cu_ft_multiplier NUMERIC, notes TEXT,
+  source_page INTEGER, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE cce_extraction_metadata (
+  id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+  pdf_path TEXT NOT NULL, pdf_filename TEXT, page_start INTEGER NOT NULL, page_end INTEGER NOT NULL,
+  total_pages INTEGER, occupancies_count INTEGER DEFAULT 0, cost_rows_count INTEGER DEFAULT 0,
+  cost_pct_rows_count INTEGER DEFAULT 0, component_rows_count INTEGER DEFAULT 0,
+  modifier_rows_count INTEGER DEFAULT 0, incremental BOOLEAN DEFAULT FALSE,
+  last_page_extracted INTEGER, status TEXT DEFAULT 'completed', error_message TEXT,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+DATE = "2026-03-01"
+
+
+def _comp(i, page=1, occ=None):
+    r = {
+        "section_name": "WALLS", "item_name": f"item {i}", "cost_tier": None, "col_1": float(i),
+        "col_2": None, "col_3": None, "col_4": None, "source_page": page,
+        "extraction_flags": {"layout_parsed": False}, "normalization_version": 3,
+    }
+    if occ:
+        r["occupancy_code"] = occ
+    return r
+
+
+def _cost(occ, quality, sq_ft):
+    return {
+        "occupancy_code": occ, "building_class": "D", "quality_type": quality, "exterior_walls": None,
+        "interior_finish": None, "lighting_plumbing": None, "heat": None, "cost_sq_m": None,
+        "cost_cu_ft": None, "cost_sq_ft": sq_ft, "source_page": 40,
+    }
+
+
+def _pct(category, median):
+    return {
+        "section_name": "ELECTRICAL", "section_number": 61, "occupancy": "Offices", "category": category,
+        "low_pct": None, "median_pct": median, "high_pct": None, "source_page": 90,
+    }
+
+
+META = {"pdf_path": "x.pdf", "page_start": 1, "page_end": 100, "last_page_extracted": 100, "status": "completed"}
+
+
+def _quiet(fn, *a, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*a, **kw)
+
+
+class TestSqlStagingSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "cce.sqlite")
+        conn = sqlite3.connect(self.path)
+        conn.executescript(SCHEMA)
+        # Earlier run of the same edition, an older edition and an existing cost % row
+        conn.execute("INSERT INTO cce_occupancies (id, occupancy_code, occupancy_name) VALUES ('occ-old', 300, 'Old name')")
+        conn.execute(
+            "INSERT INTO cce_component_costs (section_name, item_name, source_page, extraction_date) "
+            "VALUES ('WALLS', 'stale', 2, ?), ('WALLS', 'older edition', 2, '2025-09-01')",
+            (DATE,),
+        )
+        conn.execute(
+            "INSERT INTO cce_cost_percentages (section_name, occupancy, category, median_pct) "
+            "VALUES ('ELECTRICAL', 'Offices', 'OTHER', 9.9)"
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _query(self, sql, params=()):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _load(self, sink, *, meta=META):
+        sink.clear_existing()
+        sink.upsert_occupancies([
+            {"occupancy_code": 300, "occupancy_name": "Apartments", "page_start": 10, "page_end": 12},
+            {"occupancy_code": 400, "occupancy_name": "Offices", "page_start": 13, "page_end": 20},
+        ])
+        for k in range(0, 25, 4):
+            sink.add_component_rows([_comp(i, page=i, occ=300 if i % 2 else None) for i in range(k, min(k + 4, 25))])
+        sink.add_modifier_rows([{"modifier_type": "perimeter", "source_page": 5, "sq_ft_multiplier": 1.1}])
+        sink.add_cost_pct_rows([_pct("OTHER", 1.0), _pct("TOTAL_ELECTRICAL", 5.0)])
+        sink.add_cost_pct_rows([_pct("OTHER", 2.0)])
+        sink.finish_modifier_rows()
+        sink.finish_component_rows()
+        sink.finish_cost_pct_rows()
+        sink.write_cost_rows([_cost(300, "Good", 100.0), _cost(400, "Low", 50.0), _cost(999, "Low", 1.0)])
+        if meta is not None:
+            sink.write_metadata(meta)
+
+    def test_merge_replaces_edition_and_upserts(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE, copy_rows=3)
+        _quiet(self._load, sink)
+        _quiet(sink.close)
+
+        items = self._query("SELECT item_name, extraction_date FROM cce_component_costs ORDER BY source_page, item_name")
+        self.assertIn(("older edition", "2025-09-01"), items)
+        self.assertNotIn(("stale", DATE), items)
+        self.assertEqual(len(items), 26)
+        linked = self._query("SELECT COUNT(*) FROM cce_component_costs WHERE occupancy_id = 'occ-old'")
+        self.assertEqual(linked, [(12,)])
+        flags = self._query("SELECT extraction_flags, normalization_version FROM cce_component_costs WHERE item_name = 'item 3'")
+        self.assertEqual((json.loads(flags[0][0]), flags[0][1]), ({"layout_parsed": False}, 3))
+        self.assertEqual(
+            self._query("SELECT category, median_pct FROM cce_cost_percentages ORDER BY category"),
+            [("OTHER", 2.0), ("TOTAL_ELECTRICAL", 5.0)],
+        )
+        self.assertEqual(self._query("SELECT occupancy_name FROM cce_occupancies WHERE id = 'occ-old'"), [("Apartments",)])
+        self.assertEqual(
+            self._query("SELECT quality_type, extraction_date FROM cce_cost_rows ORDER BY quality_type"),
+            [("Good", DATE), ("Low", DATE)],
+        )
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_modifiers"), [(1,)])
+        self.assertEqual(self._query("SELECT last_page_extracted FROM cce_extraction_metadata"), [(100,)])
+
+    def test_nothing_visible_before_commit(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        _quiet(self._load, sink)
+        self.assertEqual(self._query("SELECT item_name FROM cce_component_costs WHERE extraction_date = ?", (DATE,)), [("stale",)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_occupancies"), [(1,)])
+        _quiet(sink.close)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_occupancies"), [(2,)])
+
+    def test_no_metadata_rolls_back(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        _quiet(self._load, sink, meta=None)
+        _quiet(sink.close)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_occupancies"), [(1,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_component_costs"), [(2,)])
+
+    def test_failed_merge_rolls_back_everything(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        _quiet(self._load, sink, meta=dict(META, no_such_column=1))
+        with self.assertRaises(sqlite3.OperationalError):
+            _quiet(sink.close)
+        self.assertEqual(self._query("SELECT item_name FROM cce_component_costs ORDER BY item_name"), [("older edition",), ("stale",)])
+        self.assertEqual(self._query("SELECT median_pct FROM cce_cost_percentages"), [(9.9,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_occupancies"), [(1,)])
+
+    def test_clear_flags(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        _quiet(self._load, sink)
+        sink.clear_existing(clear_component_costs=True, clear_cost_percentages=True)
+        _quiet(sink.close)
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_component_costs WHERE extraction_date != ?", (DATE,)), [(0,)])
+        self.assertEqual(self._query("SELECT COUNT(*) FROM cce_cost_percentages"), [(2,)])
+
+    def test_last_extracted_page(self):
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        self.assertIsNone(sink.last_extracted_page())
+        _quiet(self._load, sink)
+        _quiet(sink.close)
+        sink = SqlStagingSink.connect(f"sqlite:///{self.path}", DATE)
+        self.assertEqual(sink.last_extracted_page(), 100)
+        _quiet(sink.close)
+
+
+class TestCopyText(unittest.TestCase):
+    def test_escapes(self):
+        self.assertEqual(copy_text_line([None, True, 1.5, "a\tb\\c\nd"]), "\\N\tt\t1.5\ta\\tb\\\\c\\nd\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
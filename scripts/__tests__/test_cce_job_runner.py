@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for the CCE extraction job queue (cce_job_runner.py)."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cce_job_runner  # noqa: E402
+from cce_extract_events import read_job_status  # noqa: E402
+from cce_job_runner import CCE_TABLES, JobQueue, job_tables, run_job  # noqa: E402
+
+PDF = ["--pdf", "local_data/CCE_March_2026.pdf"]
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.queue = JobQueue(Path(self.tmp.name) / "jobs.sqlite", self.tmp.name)
+        self.addCleanup(self.queue.close)
+
+    def test_tables_and_dedupe(self):
+        self.assertEqual(job_tables("cce-extract", PDF + ["--dry-run"]), [])
+        self.assertEqual(job_tables("cce-extract", PDF + ["--output-dir=out"]), [])
+        self.assertEqual(job_tables("cce-extract", PDF + ["--clear-first"]), list(CCE_TABLES))
+        self.assertEqual(job_tables("catalog-units", ["--start-page", "42"]), ["cce_catalog_units"])
+
+        a, dup_a = self.queue.enqueue("cce-extract", PDF + ["--clear-first"])
+        b, dup_b = self.queue.enqueue("cce-extract", PDF + ["--clear-first"])
+        self.assertEqual((dup_a, dup_b), (False, True))
+        self.assertEqual(b["id"], a["id"])
+        self.assertEqual(read_job_status(self.tmp.name, a["id"])["status"], "queued")
+        with self.assertRaises(ValueError):
+            self.queue.enqueue("cce-extract", PDF + ["--job-id", "x"])
+        with self.assertRaises(ValueError):
+            self.queue.enqueue("unknown", [])
+
+    def test_single_writer_per_table_in_queue_order(self):
+        load1, _ = self.queue.enqueue("cce-extract", PDF + ["--clear-first"])
+        load2, _ = self.queue.enqueue("cce-extract", PDF + ["--incremental"])
+        catalog, _ = self.queue.enqueue("catalog-units", ["--start-page", "42"])
+        dry, _ = self.queue.enqueue("cce-extract", PDF + ["--dry-run"])
+
+        claimed = [self.queue.claim_next(1)["id"] for _ in range(3)]
+        self.assertEqual(claimed, [load1["id"], catalog["id"], dry["id"]])  # load2 waits for load1's tables
+        self.assertIsNone(self.queue.claim_next(1))
+        self.queue.finish(load1["id"], "completed", exit_code=0)
+        self.assertEqual(self.queue.claim_next(1)["id"], load2["id"])
+
+    def test_older_queued_job_is_not_overtaken(self):
+        self.queue.enqueue("cce-extract", PDF + ["--clear-first"])
+        self.queue.claim_next(1)
+        self.queue.enqueue("cce-extract", PDF + ["--incremental"])
+        with mock.patch.dict(cce_job_runner.JOB_KINDS["catalog-units"], tables=("cce_catalog_units", "cce_cost_rows")):
+            self.queue.enqueue("catalog-units", [])
+        self.assertIsNone(self.queue.claim_next(1))
+
+    def test_cancel_queued_and_recover_stale(self):
+        queued, _ = self.queue.enqueue("cce-extract", PDF + ["--dry-run"])
+        self.assertEqual(self.queue.cancel(queued["id"])["status"], "cancelled")
+        self.assertEqual(read_job_status(self.tmp.name, queued["id"])["status"], "cancelled")
+        self.assertIsNone(self.queue.cancel("missing"))
+
+        running, _ = self.queue.enqueue("cce-extract", PDF + ["--clear-first"])
+        self.queue.claim_next(worker_pid=2**22 + 12345)  # no such process
+        self.assertEqual(self.queue.recover_stale(), [running["id"]])
+        self.assertEqual(self.queue.get(running["id"])["status"], "failed")
+        self.assertEqual(self.queue._conn.execute("SELECT COUNT(*) FROM table_locks").fetchone()[0], 0)
+
+
+class TestRunJob(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        script = Path(self.tmp.name) / "job.py"
+        script.write_text(
+            "import sys, time\n"
+            "print('started', flush=True)\n"
+            "if '--sleep' in sys.argv:\n"
+            "    time.sleep(30)\n"
+            "sys.exit(3 if '--fail' in sys.argv else 0)\n"
+        )
+        kinds = {"test": {"script": str(script), "job_events": False, "tables": ("t",), "read_only_flags": ()}}
+        patcher = mock.patch.dict(cce_job_runner.JOB_KINDS, kinds)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.queue = JobQueue(Path(self.tmp.name) / "jobs.sqlite", self.tmp.name)
+        self.addCleanup(self.queue.close)
+
+    def _run(self, args):
+        job, _ = self.queue.enqueue("test", args)
+        return job["id"], run_job(self.queue, self.queue.claim_next(os.getpid()), poll=0.05, grace=2.0)
+
+    def test_exit_codes(self):
+        job_id, status = self._run([])
+        self.assertEqual(status, "completed")
+        self.assertIn("started", (Path(self.tmp.name) / f"{job_id}.log").read_text())
+        job_id, status = self._run(["--fail"])
+        self.assertEqual(status, "failed")
+        self.assertEqual(read_job_status(self.tmp.name, job_id)["error"], "Process exited with code 3")
+
+    def test_cancel_running(self):
+        job, _ = self.queue.enqueue("test", ["--sleep"])
+        claimed = self.queue.claim_next(os.getpid())
+
+        def cancel_soon():  # e.g. `cce_job_runner.py cancel` from the admin route
+            time.sleep(0.3)
+            canceller = JobQueue(self.queue.db_path, self.tmp.name)
+            canceller.cancel(job["id"])
+            canceller.close()
+
+        t = threading.Thread(target=cancel_soon)
+        t.start()
+        started = time.monotonic()
+        self.assertEqual(run_job(self.queue, claimed, poll=0.05, grace=2.0), "cancelled")
+        t.join()
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(read_job_status(self.tmp.name, job["id"])["status"], "cancelled")
+        self.assertEqual(self.queue.get(job["id"])["status"], "cancelled")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Tests for layout list parsing on word boxes (cce_layout_list_parse.py), NumPy vs pure Python."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cce_layout_list_parse  # noqa: E402
+from cce_layout_list_parse import detect_numeric_columns, parse_layout_columns, parse_layout_list_words  # noqa: E402
+
+try:
+    import numpy  # noqa: F401
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+LAYOUT = {"y_tolerance": 3.5, "x_numeric_min_ratio": 0.52, "min_words_per_line": 2}
+
+
+def _word(text, x0, top, width=None):
+    return {"text": text, "x0": x0, "x1": x0 + (width if width is not None else 5.5 * len(text)), "top": top}
+
+
+def _random_page(rng, rows=40):
+    """Cost rows, prose, headers, slanted rows and rows entirely left or right of the numeric band."""
+    words = []
+    top = 40.0
+    for _ in range(rows):
+        top += rng.choice([0.0, 1.5, 3.5, 3.6, 7.0, 12.0, 12.25])
+        shape = rng.random()
+        x = 36.0
+        for t in rng.sample(["Wood", "deck", "Add", "for", "railing", "Concrete,", "Section", "IV", "x"], rng.randint(1, 4)):
+            words.append(_word(t, x, top + rng.choice([0.0, 0.0, 0.4, 2.0])))
+            x += 5.5 * len(t) + rng.choice([2.0, 3.0, 40.0])
+        if shape < 0.7:
+            x = rng.choice([x + rng.uniform(0, 30), 330.0]) if shape < 0.35 else x + rng.choice([2.0, 16.0, 60.0])
+            for _ in range(rng.randint(0, 4)):
+                t = rng.choice(["32.75", "43.00", "1,250", "12", "-", "n/a", "7.", "2.5.1"])
+                words.append(_word(t, x, top + rng.choice([0.0, 0.25, 1.0])))
+                x += 5.5 * len(t) + rng.choice([4.0, 10.0, 10.0])
+    rng.shuffle(words)
+    return words
+
+
+class TestParseLayoutListWords(unittest.TestCase):
+    def test_columns_and_gap_split(self):
+        words = [
+            _word("Wood", 36, 100), _word("deck", 65, 100.5), _word("32.75", 330, 101), _word("43.00", 380, 100),
+            _word("Canopy", 36, 120), _word("12.00", 120, 120), _word("14.50", 160, 120),  # all left: widest gap
+            _word("Note", 36, 140), _word("only", 65, 140),
+            _word("Add", 36, 160),
+        ]
+        expected = [("Wood deck", "32.75 43.00"), ("Canopy", "12.00 14.50")]
+        for engine in ("python",) + (("numpy", "auto") if HAVE_NUMPY else ()):
+            self.assertEqual(parse_layout_list_words(words, 612, LAYOUT, engine=engine), expected, engine)
+        self.assertEqual(parse_layout_list_words([], 612, LAYOUT), [])
+        with self.assertRaises(ValueError):
+            parse_layout_list_words(words, 612, LAYOUT, engine="simd")
+
+    def test_without_numpy(self):
+        words = [_word("Wood", 36, 100), _word("32.75", 330, 100), _word("43.00", 380, 100)]
+        with mock.patch.object(cce_layout_list_parse, "_numpy", return_value=None):
+            self.assertEqual(parse_layout_list_words(words, 612, LAYOUT), [("Wood", "32.75 43.00")])
+            with self.assertRaises(RuntimeError):
+                parse_layout_list_words(words, 612, LAYOUT, engine="numpy")
+
+    @unittest.skipUnless(HAVE_NUMPY, "NumPy not installed")
+    def test_numpy_matches_python_on_random_pages(self):
+        rng = random.Random(20260318)
+        for _ in range(300):
+            words = _random_page(rng, rows=rng.randint(1, 40))
+            cfg = dict(LAYOUT, y_tolerance=rng.choice([0.0, 1.0, 3.5]), min_words_per_line=rng.choice([1, 2, 3]))
+            self.assertEqual(
+                parse_layout_list_words(words, 612, cfg, engine="numpy"),
+                parse_layout_list_words(words, 612, cfg, engine="python"),
+            )
+
+
+def _cost_row(words, x, top, item, tiers, num_x):
+    for t in item.split():
+        words.append(_word(t, x, top))
+        x += 5.5 * len(t) + 3.0
+    for i, v in enumerate(tiers):
+        words.append(_word(v, num_x + 40 * i, top, width=24))
+
+
+class TestColumnDetection(unittest.TestCase):
+    def test_single_band(self):
+        words = [_word("WALL", 36, 60), _word("COSTS", 66, 60)]
+        for r in range(12):
+            _cost_row(words, 36, 80 + 12 * r, "Wood deck with railing", ["12.00", "14.50", "18.25", "22.00"], 330)
+        _cost_row(words, 36, 240, "Vinyl siding", ["56.85", "64.51", "84.24", "97.40"], 250)  # set left of the band
+        cols = detect_numeric_columns(words, 612, LAYOUT)
+        self.assertEqual(len(cols), 1)
+        self.assertAlmostEqual(cols[0]["x_cut"], 330, delta=2)
+        pairs = parse_layout_columns(words, 612, LAYOUT)
+        self.assertEqual(pairs[0], ("WALL COSTS", ""))
+        self.assertEqual(pairs[1], ("Wood deck with railing", "12.00 14.50 18.25 22.00"))
+        self.assertEqual(pairs[-1], ("Vinyl siding", "56.85 64.51 84.24 97.40"))
+
+    def test_two_column_segregated_page(self):
+        words = [_word(t, x, 70) for t, x in (("CHURCHES,", 36), ("THEATERS", 90), ("AND", 140), ("AUDITORIUMS", 165))]
+        for r in range(10):
+            _cost_row(words, 36, 100 + 10 * r, "Left item", ["1.00", "2.00", "3.00", "4.00"], 120)
+            _cost_row(words, 314, 100 + 10 * r + 0.5, "Right item", ["5.00", "6.00", "7.00", "8.00"], 400)
+        cols = detect_numeric_columns(words, 612, LAYOUT)
+        self.assertEqual([round(c["x_cut"]) for c in cols], [120, 400])
+        pairs = parse_layout_columns(words, 612, LAYOUT)
+        self.assertEqual(pairs[0], ("CHURCHES, THEATERS AND AUDITORIUMS", ""))  # spans the boundary, kept whole
+        self.assertEqual(pairs[1:11], [("Left item", "1.00 2.00 3.00 4.00")] * 10)
+        self.assertEqual(pairs[11:], [("Right item", "5.00 6.00 7.00 8.00")] * 10)
+
+    def test_no_band(self):
+        words = [_word("Costs", 36, 80 + 12 * r) for r in range(10)] + [_word("12.00", 200, 80)]
+        self.assertEqual(detect_numeric_columns(words, 612, LAYOUT), [])
+        self.assertEqual(parse_layout_columns(words, 612, LAYOUT), [])
+        self.assertEqual(parse_layout_columns([], 612, LAYOUT), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for the page -> active occupancy index."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_occupancy_index import OccupancyIndex  # noqa: E402
+
+
+def _brute_force(occupancies, page_num):
+    candidates = [o for o in occupancies.values() if o["page_start"] <= page_num <= o["page_end"]]
+    return max(candidates, key=lambda o: o["page_start"]) if candidates else None
+
+
+def _occ(code, start, end=None):
+    return {"occupancy_code": code, "occupancy_name": f"Occ {code}", "page_start": start, "page_end": end or start}
+
+
+class TestOccupancyIndex(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(OccupancyIndex().active(10))
+
+    def test_latest_start_wins(self):
+        index = OccupancyIndex.from_occupancies([_occ(300, 4, 20), _occ(310, 10, 12)])
+        self.assertEqual(index.active(11)["occupancy_code"], 310)
+        self.assertEqual(index.active(13)["occupancy_code"], 300)
+        self.assertIsNone(index.active(3))
+        self.assertIsNone(index.active(21))
+
+    def test_first_added_wins_ties(self):
+        index = OccupancyIndex()
+        for o in (_occ(400, 7), _occ(350, 7), _occ(360, 7)):
+            index.add(o)
+        self.assertEqual(index.active(7)["occupancy_code"], 400)
+        index.set_page_end(360, 9)
+        self.assertEqual(index.active(8)["occupancy_code"], 360)
+
+    def test_set_page_end_updates_dict(self):
+        occ = _occ(300, 4)
+        index = OccupancyIndex()
+        index.add(occ)
+        index.set_page_end(300, 6)
+        self.assertEqual(occ["page_end"], 6)
+        self.assertIs(index.active(6), occ)
+
+    def test_rows_without_range_skipped(self):
+        index = OccupancyIndex.from_occupancies([{"occupancy_code": 1, "page_start": None, "page_end": None}])
+        self.assertEqual(len(index), 0)
+        self.assertNotIn(1, index)
+
+    def test_matches_linear_scan_during_extraction(self):
+        # Mirrors extract-cce-pdf.py: occupancies start on the current page, page_end only grows
+        rng = random.Random(7)
+        for _ in range(50):
+            occupancies, index, prev = {}, OccupancyIndex(), None
+            for page in range(1, 120):
+                if rng.random() < 0.3:
+                    for _ in range(rng.randint(1, 3)):
+                        code = rng.randint(50, 90)
+                        if code not in occupancies:
+                            occupancies[code] = _occ(code, page)
+                            index.add(occupancies[code])
+                        index.set_page_end(code, page)
+                        prev = occupancies[code]
+                elif prev:
+                    index.set_page_end(prev["occupancy_code"], page)
+                self.assertIs(index.active(page), _brute_force(occupancies, page))
+
+    def test_matches_linear_scan_arbitrary_order(self):
+        rng = random.Random(11)
+        for _ in range(50):
+            occupancies, index = {}, OccupancyIndex()
+            for code in rng.sample(range(50, 500), rng.randint(1, 40)):
+                start = rng.randint(1, 60)
+                occupancies[code] = _occ(code, start, start + rng.randint(0, 15))
+                index.add(occupancies[code])
+            rebuilt = OccupancyIndex.from_occupancies(occupancies.values())
+            for code in rng.sample(list(occupancies), len(occupancies) // 2):
+                end = occupancies[code]["page_start"] + rng.randint(0, 30)
+                index.set_page_end(code, end)
+                rebuilt.set_page_end(code, end)
+            for page in range(0, 100):
+                expected = _brute_force(occupancies, page)
+                self.assertIs(index.active(page), expected)
+                self.assertIs(rebuilt.active(page), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
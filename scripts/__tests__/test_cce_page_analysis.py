@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Tests for shared per-page word clustering (text / words / crop text from one pass)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_page_analysis import PageAnalysis, lines_equivalent_for_tolerances  # noqa: E402
+
+try:
+    import pdfplumber.utils  # type: ignore  # noqa: E402
+
+    HAVE_PDFPLUMBER = True
+except ImportError:
+    HAVE_PDFPLUMBER = False
+
+
+def _chars(line_tops, text="COST 12.50", upright=True):
+    """One 6pt-wide char per letter, one line per entry in line_tops."""
+    chars = []
+    for top in line_tops:
+        for i, ch in enumerate(text):
+            chars.append({
+                "text": ch,
+                "x0": 10.0 + 6 * i,
+                "x1": 15.0 + 6 * i,
+                "top": top,
+                "bottom": top + 8,
+                "doctop": top,
+                "upright": upright,
+                "size": 8.0,
+            })
+    return chars
+
+
+class _FakePage:
+    def __init__(self, chars):
+        self.chars = chars
+        self.bbox = (0, 0, 612, 792)
+        self.width = 612
+        self.height = 792
+
+
+class TestLinesEquivalent(unittest.TestCase):
+    def test_well_separated_lines(self):
+        self.assertTrue(lines_equivalent_for_tolerances(_chars([100, 101.5, 120]), 3, 3.5))
+
+    def test_gap_between_tolerances_not_equivalent(self):
+        self.assertFalse(lines_equivalent_for_tolerances(_chars([100, 103.2]), 3, 3.5))
+
+    def test_tall_chained_line_not_equivalent(self):
+        # 100 → 102.5 → 105 chains into one line at tolerance 3 but spans 5pt
+        self.assertFalse(lines_equivalent_for_tolerances(_chars([100, 102.5, 105]), 3, 3.5))
+
+    def test_rotated_text_not_equivalent(self):
+        self.assertFalse(lines_equivalent_for_tolerances(_chars([100], upright=False), 3, 3.5))
+
+    def test_argument_order_irrelevant(self):
+        chars = _chars([100, 103.2])
+        self.assertEqual(
+            lines_equivalent_for_tolerances(chars, 3.5, 3),
+            lines_equivalent_for_tolerances(chars, 3, 3.5),
+        )
+
+    def test_empty(self):
+        self.assertTrue(lines_equivalent_for_tolerances([], 3, 3.5))
+
+
+@unittest.skipUnless(HAVE_PDFPLUMBER, "pdfplumber not installed")
+class TestPageAnalysisMatchesPdfplumber(unittest.TestCase):
+    def _check_words(self, line_tops):
+        chars = _chars(line_tops)
+        analysis = PageAnalysis(_FakePage(chars))
+        analysis.text()
+        for y_tol in (3, 3.5, 6):
+            kw = {"x_tolerance": 3, "y_tolerance": y_tol, "keep_blank_chars": False, "use_text_flow": False}
+            self.assertEqual(analysis.words(**kw), pdfplumber.utils.extract_words(chars, **kw), (line_tops, y_tol))
+
+    def test_words_equivalent_layout(self):
+        self._check_words([100, 120, 140])
+
+    def test_words_non_equivalent_layout(self):
+        self._check_words([100, 103.2, 106.4, 120])
+
+    def test_text_matches_extract_text(self):
+        chars = _chars([100, 120])
+        page = _FakePage(chars)
+        expected = pdfplumber.utils.extract_text(
+            chars, layout_bbox=page.bbox, layout_width=page.width, layout_height=page.height
+        )
+        self.assertEqual(PageAnalysis(page).text(), expected)
+
+    def test_crop_text_matches_cropped_chars(self):
+        chars = _chars([100, 120])
+        bbox = (0, 110, 612, 200)
+        expected = pdfplumber.utils.extract_text(
+            pdfplumber.utils.crop_to_bbox(chars, bbox), layout_bbox=bbox, layout_width=612, layout_height=90
+        )
+        self.assertEqual(PageAnalysis(_FakePage(chars)).crop_text(bbox), expected)
+        self.assertEqual(expected, "COST 12.50")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for the persistent per-page pdfplumber cache."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_page_cache import MISSING, PageCache, pdf_sha256, settings_key  # noqa: E402
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "cache.sqlite"
+        self.cache = PageCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        key = settings_key()
+        self.assertIs(self.cache.get("abc", 1, "text", key), MISSING)
+        self.cache.put("abc", 1, "text", key, "SECTION 11 PAGE 3")
+        self.assertEqual(self.cache.get("abc", 1, "text", key), "SECTION 11 PAGE 3")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_empty_values_are_hits(self):
+        key = settings_key()
+        self.cache.put("abc", 2, "tables", key, [])
+        self.assertEqual(self.cache.get("abc", 2, "tables", key), [])
+
+    def test_tables_round_trip_none_cells(self):
+        key = settings_key()
+        tables = [[["CLASS", None, "SQ. FT."], ["A", "Avg.", "123.45"]]]
+        self.cache.put("abc", 3, "tables", key, tables)
+        self.assertEqual(self.cache.get("abc", 3, "tables", key), tables)
+
+    def test_settings_and_pdf_are_part_of_key(self):
+        k35 = settings_key({"y_tolerance": 3.5})
+        k30 = settings_key({"y_tolerance": 3.0})
+        self.assertNotEqual(k35, k30)
+        self.cache.put("abc", 1, "words", k35, [{"text": "A"}])
+        self.assertIs(self.cache.get("abc", 1, "words", k30), MISSING)
+        self.assertIs(self.cache.get("other", 1, "words", k35), MISSING)
+
+    def test_settings_key_order_independent(self):
+        self.assertEqual(settings_key({"a": 1, "b": 2}), settings_key({"b": 2, "a": 1}))
+
+    def test_persists_across_instances(self):
+        key = settings_key()
+        self.cache.put("abc", 5, "text", key, "x")
+        self.cache.put_total_pages("abc", 1250)
+        self.cache.close()
+        self.cache = PageCache(self.path)
+        self.assertEqual(self.cache.get("abc", 5, "text", key), "x")
+        self.assertEqual(self.cache.get_total_pages("abc"), 1250)
+        self.assertIsNone(self.cache.get_total_pages("other"))
+
+    def test_pdf_sha256_content_based(self):
+        a = Path(self._tmp.name) / "a.pdf"
+        b = Path(self._tmp.name) / "b.pdf"
+        a.write_bytes(b"%PDF-1.4 same")
+        b.write_bytes(b"%PDF-1.4 same")
+        self.assertEqual(pdf_sha256(str(a)), pdf_sha256(str(b)))
+        b.write_bytes(b"%PDF-1.4 changed")
+        self.assertNotEqual(pdf_sha256(str(a)), pdf_sha256(str(b)))
+
+
+if __name__ == "__main__":
+    unittest.main()
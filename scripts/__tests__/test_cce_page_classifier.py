@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Tests for the cheap page classifier that gates extract_tables()."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_profile import default_profile_dict  # noqa: E402
+from cce_page_classifier import (  # noqa: E402
+    classify_page,
+    classify_page_text,
+    page_is_pct_table,
+    page_may_have_tables,
+    page_needs_tables,
+)
+
+
+class _FakePage:
+    def __init__(self, edges):
+        self.edges = edges
+
+
+class TestClassifyPageText(unittest.TestCase):
+    def test_life_expectancy_is_skip(self):
+        self.assertEqual(classify_page_text("LIFE EXPECTANCY GUIDELINES\nSEGREGATED COST METHOD"), "skip")
+
+    def test_front_matter_is_skip(self):
+        self.assertEqual(classify_page_text("TABLE OF CONTENTS\nSection 11 ....... 1"), "skip")
+        self.assertEqual(classify_page_text("Marshall & Swift License Agreement"), "skip")
+
+    def test_segregated_wins_over_front_matter(self):
+        self.assertEqual(classify_page_text("TABLE OF CONTENTS\nSEGREGATED COST METHOD"), "segregated")
+
+    def test_pct_table(self):
+        text = "OCCUPANCY LOW MEDIAN HIGH\nApartments 1.0 2.0 3.0"
+        self.assertTrue(page_is_pct_table(text))
+        self.assertEqual(classify_page_text(text), "pct_table")
+
+    def test_modifier(self):
+        self.assertEqual(classify_page_text("AVERAGE WALL HEIGHT multipliers", 4, 4), "modifier")
+        self.assertEqual(classify_page_text("AVERAGE PERIMETER"), "modifier")
+
+    def test_occupancy_grid_needs_ruling(self):
+        text = "CLASS TYPE EXTERIOR WALLS INTERIOR FINISH"
+        self.assertEqual(classify_page_text(text, 6, 5), "occupancy_grid")
+        self.assertEqual(classify_page_text(text, 6, 0), "list")
+
+    def test_default_list(self):
+        self.assertEqual(classify_page_text("Concrete .......... 32.75 43.00 55.50"), "list")
+
+
+class TestTableGate(unittest.TestCase):
+    def test_edge_counts(self):
+        page = _FakePage([{"orientation": "h"}, {"orientation": "h"}, {"orientation": "v"}, {"orientation": None}])
+        cls = classify_page(page, "CLASS TYPE")
+        self.assertEqual((cls["h_edges"], cls["v_edges"], cls["label"]), (2, 1, "occupancy_grid"))
+
+    def test_no_intersections_no_tables(self):
+        self.assertFalse(page_may_have_tables({"label": "list", "h_edges": 3, "v_edges": 0}))
+        self.assertFalse(page_may_have_tables({"label": "list", "h_edges": 0, "v_edges": 3}))
+        self.assertTrue(page_may_have_tables({"label": "list", "h_edges": 1, "v_edges": 1}))
+
+    def test_skip_pages_gated_by_profile(self):
+        cls = {"label": "skip", "h_edges": 4, "v_edges": 4}
+        self.assertTrue(page_needs_tables(cls, {}))
+        self.assertTrue(page_needs_tables(cls, default_profile_dict()))
+        self.assertFalse(page_needs_tables(cls, {"page_rules": {"skip_tables_on_skip_pages": True}}))
+
+    def test_table_pages_need_tables(self):
+        self.assertTrue(page_needs_tables({"label": "list", "h_edges": 4, "v_edges": 4}, {}))
+        self.assertFalse(page_needs_tables({"label": "occupancy_grid", "h_edges": 0, "v_edges": 0}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
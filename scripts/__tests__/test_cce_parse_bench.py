@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Tests for the golden-corpus parsing benchmark (cce_parse_bench.py)."""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_parse_bench import (  # noqa: E402
+    DEFAULT_CORPUS_DIR,
+    bench_cases,
+    compare_to_baseline,
+    load_corpus,
+    median_results,
+    output_digest,
+)
+
+
+class TestGoldenCorpus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.corpus = load_corpus()
+        cls.baseline = json.loads((DEFAULT_CORPUS_DIR / "baseline.json").read_text(encoding="utf-8"))
+
+    def test_corpus_is_populated(self):
+        for key in ("list_lines", "component_items", "tier_rows", "table_headers", "page_words"):
+            self.assertTrue(self.corpus[key], key)
+        self.assertTrue(all(len(row) == 4 for row in self.corpus["tier_rows"]))
+        self.assertTrue(all({"page", "width", "words"} <= set(p) for p in self.corpus["page_words"]))
+
+    def test_outputs_match_baseline_digests(self):
+        # A parser behaviour change must come with cce_parse_bench.py --update-baseline
+        for name, _, n, fn in bench_cases(self.corpus):
+            with self.subTest(case=name):
+                base = self.baseline["cases"].get(name)
+                if base is None:
+                    self.skipTest(f"{name} not in baseline (e.g. NumPy engine)")
+                self.assertEqual(base["items"], n)
+                self.assertEqual(output_digest(fn()), base["digest"])
+
+
+class TestCompareToBaseline(unittest.TestCase):
+    def _case(self, relative, digest="d1", items=10):
+        return {"unit": "lines", "items": items, "digest": digest, "per_sec": relative * 100, "relative": relative}
+
+    def test_statuses(self):
+        baseline = {"cases": {"a": self._case(2.0), "b": self._case(2.0), "c": self._case(2.0), "gone": self._case(1.0)}}
+        results = {
+            "calibration_ops": 100.0,
+            "cases": {"a": self._case(1.7), "b": self._case(1.4), "c": self._case(2.0, digest="d2"), "d": self._case(1.0)},
+        }
+        rows = {r["case"]: r for r in compare_to_baseline(results, baseline, threshold=0.25)}
+        self.assertEqual({k: r["status"] for k, r in rows.items()}, {"a": "ok", "b": "slower", "c": "changed", "d": "new"})
+        self.assertEqual(rows["a"]["ratio"], 0.85)
+        self.assertEqual([r["status"] for r in compare_to_baseline(results, None, 0.25)], ["new"] * 4)
+
+    def test_median_results(self):
+        runs = [{"calibration_ops": c, "cases": {"a": self._case(r)}} for c, r in ((10.0, 3.0), (30.0, 1.0), (20.0, 2.0))]
+        merged = median_results(runs)
+        self.assertEqual(merged["calibration_ops"], 20.0)
+        self.assertEqual(merged["cases"]["a"]["relative"], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
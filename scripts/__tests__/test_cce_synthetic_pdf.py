@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic CCE PDF generator (cce_synthetic_pdf.py)."""
+
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_pdf_pages import PdfPageSource  # noqa: E402
+from cce_synthetic_pdf import build_page_plan, write_synthetic_cce_pdf  # noqa: E402
+
+
+class TestSyntheticPdf(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_deterministic(self):
+        a, b = Path(self.tmp.name) / "a.pdf", Path(self.tmp.name) / "b.pdf"
+        info = write_synthetic_cce_pdf(str(a), 40, seed=3)
+        write_synthetic_cce_pdf(str(b), 40, seed=3)
+        self.assertEqual(a.read_bytes(), b.read_bytes())
+        self.assertEqual(info["pages"], 40)
+        self.assertEqual(sum(info["kinds"].values()), 40)
+        self.assertNotEqual(build_page_plan(40, 3), build_page_plan(40, 4))
+
+    def test_pages_classify_like_an_edition(self):
+        path = Path(self.tmp.name) / "cce.pdf"
+        write_synthetic_cce_pdf(str(path), 40, seed=5)
+        labels = Counter()
+        with PdfPageSource(str(path)) as source:
+            self.assertEqual(source.total_pages, 40)
+            for n in range(1, 41):
+                views = source.views(n)
+                labels[views.classification()["label"]] += 1
+                if n == 3:
+                    self.assertRegex(views.text(), r"SECTION \d+ PAGE 1 ")
+                views.release()
+        for label in ("occupancy_grid", "pct_table", "list", "segregated", "modifier", "skip"):
+            self.assertGreater(labels[label], 0, label)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Tests for cce_validation (streaming checks shared by the CCE validation scripts)."""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cce_extract_output import iter_extract_run_table, write_extract_run  # noqa: E402
+from cce_occupancy_index import OccupancyIndex  # noqa: E402
+from cce_validation import ComponentValidator, QuantileSketch, iter_table_rows  # noqa: E402
+
+try:
+    import psycopg
+    from psycopg.conninfo import make_conninfo
+except ImportError:
+    psycopg = None
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations"
+# A Postgres server where the test may create and drop a scratch database, e.g.
+# CCE_TEST_DATABASE_URL=postgresql://postgres@localhost/postgres
+TEST_DATABASE_URL = os.environ.get("CCE_TEST_DATABASE_URL")
+
+
+def _rows(n, seed=3):
+    rng = random.Random(seed)
+    sections = ["WALLS", "ROOFING", "Add for heat", "FLOORS,", None]
+    items = ["Brick", "Block ..... 3", "Tile 12.50 14.75 18.00", "Cedar", None]
+    rows = []
+    for i in range(n):
+        cols = [round(rng.lognormvariate(3, 1), 2) if rng.random() > 0.05 else None for _ in range(4)]
+        if rng.random() < 0.02:
+            cols[1] = "1,250.50"
+        rows.append({
+            "id": i + 1,
+            "section_name": rng.choice(sections),
+            "item_name": rng.choice(items),
+            "col_1": cols[0], "col_2": cols[1], "col_3": cols[2], "col_4": cols[3],
+            "source_page": rng.randint(1, 40),
+            "occupancy_id": rng.choice([None, "a", "b"]),
+        })
+    return rows
+
+
+class _Query:
+    def __init__(self, rows, log):
+        self.rows, self.log = rows, log
+
+    def select(self, columns):
+        return self
+
+    def gt(self, key, value):
+        self.log.append(("gt", value))
+        self.rows = [r for r in self.rows if r[key] > value]
+        return self
+
+    def eq(self, key, value):
+        self.rows = [r for r in self.rows if r[key] == value]
+        return self
+
+    def order(self, key):
+        self.rows = sorted(self.rows, key=lambda r: r[key])
+        return self
+
+    def limit(self, n):
+        self.rows = self.rows[:n]
+        return self
+
+    def execute(self):
+        return type("Response", (), {"data": self.rows})()
+
+
+class _Client:
+    def __init__(self, rows, max_rows=None):
+        self._rows, self.max_rows, self.log = rows, max_rows, []
+
+    def table(self, name):
+        q = _Query(list(self._rows), self.log)
+        if self.max_rows:
+            limit = q.limit
+            q.limit = lambda n: limit(min(n, self.max_rows))
+        return q
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(2, 1.5) * rng.choice([1, 1, 1, -1]) for _ in range(20000)] + [0.0] * 50
+        sketch = QuantileSketch(0.01)
+        for v in values:
+            sketch.add(v)
+        exact = sorted(values)
+        for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+            true = exact[min(len(exact) - 1, int(q * len(exact)))]
+            self.assertLessEqual(abs(sketch.quantile(q) - true), 0.01 * abs(true) + 1e-12, q)
+        self.assertEqual((sketch.min, sketch.max, sketch.count), (exact[0], exact[-1], len(values)))
+
+    def test_merge_matches_single_sketch(self):
+        values = [random.Random(1).uniform(0.5, 500) for _ in range(1000)]
+        whole, a, b = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, v in enumerate(values):
+            whole.add(v)
+            (a if i % 2 else b).add(v)
+        a.merge(b)
+        self.assertEqual([a.quantile(q) for q in (0.01, 0.5, 0.99)], [whole.quantile(q) for q in (0.01, 0.5, 0.99)])
+        with self.assertRaises(ValueError):
+            a.merge(QuantileSketch(0.02))
+
+
+class TestComponentValidator(unittest.TestCase):
+    def test_counts_match_direct_checks(self):
+        rows = _rows(3000)
+        v = ComponentValidator(max_examples=None).add_rows(rows)
+        num = lambda x: None if x is None else float(str(x).replace(",", ""))  # noqa: E731
+        c1 = [num(r["col_1"]) for r in rows]
+        c2 = [num(r["col_2"]) for r in rows]
+        self.assertEqual(v.total_rows, 3000)
+        self.assertEqual(v.missing["col_1"], c1.count(None))
+        self.assertEqual(
+            v.counts["low_gt_high"],
+            sum(1 for a, b in zip(c1, c2) if a is not None and b is not None and b < a * 0.5),
+        )
+        self.assertEqual(v.counts["section_add_for"], sum(1 for r in rows if r["section_name"] == "Add for heat"))
+        self.assertEqual(v.counts["section_trailing_punct"], sum(1 for r in rows if r["section_name"] == "FLOORS,"))
+        self.assertEqual(v.counts["item_toc_dot_runs"], sum(1 for r in rows if r["item_name"] == "Block ..... 3"))
+        self.assertEqual(len(v.examples["item_cost_bleed"]), v.counts["item_cost_bleed"])
+        keys = {}
+        for r in rows:
+            k = ((r["section_name"] or "").strip(), (r["item_name"] or "").strip(), r["source_page"])
+            keys[k] = keys.get(k, 0) + 1
+        self.assertEqual(
+            sorted((d["section_name"], d["item_name"], d["source_page"], d["count"]) for d in v.duplicate_groups),
+            sorted(k + (n,) for k, n in keys.items() if n > 1),
+        )
+
+        exact = sorted(x for x in c1 if x is not None)
+        n = len(exact)
+        pct = v.col_1_percentiles()
+        for name, rank in (("p1", int(n * 0.01)), ("p99", int(n * 0.99) - 1)):
+            self.assertLessEqual(abs(pct[name] - exact[rank]), v.col_1.relative_error * exact[rank])
+        below, above, low, high = v.col_1_outliers()
+        self.assertLessEqual(below, sum(1 for x in exact if x < pct["p1"]))
+        self.assertTrue(all(e["col_1"] < pct["p1"] for e in low))
+        self.assertTrue(all(e["col_1"] > pct["p99"] for e in high))
+
+    def test_hash_collisions_are_not_duplicates(self):
+        # CPython hashes -1 and -2 alike, so these keys collide under hash()
+        self.assertEqual(hash(("WALLS", "Brick", -1)), hash(("WALLS", "Brick", -2)))
+        rows = [{"id": i, "section_name": "WALLS", "item_name": "Brick", "col_1": 10, "source_page": p}
+                for i, p in enumerate((-1, -2), 1)]
+        self.assertEqual(ComponentValidator().add_rows(rows).duplicate_groups, [])
+
+    def test_examples_capped_and_occupancy_links(self):
+        rows = [
+            {"id": 1, "section_name": "Add for x", "item_name": "A", "col_1": 10, "source_page": 5, "occupancy_id": "a"},
+            {"id": 2, "section_name": "Add for y", "item_name": "B", "col_1": 10, "source_page": 5, "occupancy_id": "b"},
+            {"id": 3, "section_name": "Add for z", "item_name": "C", "col_1": 10, "source_page": 5, "occupancy_id": None},
+            {"id": 4, "section_name": "WALLS", "item_name": "D", "col_1": 10, "source_page": 50, "occupancy_id": None},
+        ]
+        index = OccupancyIndex.from_occupancies([{"id": "a", "occupancy_code": 300, "page_start": 1, "page_end": 9}])
+        v = ComponentValidator(max_examples=2, occupancy_index=index).add_rows(rows)
+        self.assertEqual(v.counts["section_add_for"], 3)
+        self.assertEqual([e["id"] for e in v.examples["section_add_for"]], [1, 2])
+        cv = v.component_validation()
+        self.assertEqual((cv["with_occupancy_id"], cv["without_occupancy_id"]), (2, 2))
+        self.assertEqual((cv["occupancy_page_mismatch"], cv["unlinked_in_occupancy_range"]), (1, 1))
+        self.assertEqual(cv["col_1_percentiles"]["p1"], 10)
+
+
+class TestRowSources(unittest.TestCase):
+    def test_keyset_pages_read_every_row_once(self):
+        rows = [{"id": i, "kind": i % 3} for i in range(1, 2502)]
+        random.Random(2).shuffle(rows)
+        client = _Client(rows, max_rows=400)  # server cap below page_rows
+        got = list(iter_table_rows(client, "t", "id,kind", page_rows=1000))
+        self.assertEqual([r["id"] for r in got], list(range(1, 2502)))
+        self.assertEqual(len(client.log), 7)  # 7 capped pages + the empty one; no gt() on the first
+        filtered = list(iter_table_rows(_Client(rows), "t", "id,kind", where=lambda q: q.eq("kind", 0), page_rows=100))
+        self.assertEqual(len(filtered), 833)
+
+    def test_iter_extract_run_table(self):
+        components = [{"section_name": "WALLS", "item_name": f"Item {i}", "col_1": i, "source_page": 3} for i in range(25)]
+        with tempfile.TemporaryDirectory() as tmp:
+            write_extract_run(tmp, {"cce_component_costs": components, "cce_occupancies": []}, fmt="ndjson",
+                              extraction_date="2026-03-01", edition_id=None, pdf_sha256=None, metadata={})
+            manifest, rows = iter_extract_run_table(tmp, "cce_component_costs")
+            self.assertEqual(manifest["tables"]["cce_component_costs"]["rows"], 25)
+            self.assertEqual(list(rows), components)
+            with self.assertRaises(KeyError):
+                iter_extract_run_table(tmp, "cce_component_items")
+            with open(Path(tmp) / manifest["tables"]["cce_component_costs"]["file"], "a", encoding="utf-8") as f:
+                f.write('{"section_name": "EXTRA"}\n')
+            _, rows = iter_extract_run_table(tmp, "cce_component_costs")
+            with self.assertRaises(ValueError):
+                list(rows)
+
+
+@unittest.skipUnless(psycopg and TEST_DATABASE_URL, "needs psycopg and CCE_TEST_DATABASE_URL")
+class TestServerValidation(unittest.TestCase):
+    """create-cce-component-validation-rpc.sql against the client pass, in a scratch database."""
+
+    def setUp(self):
+        self.dbname = f"cce_validation_test_{os.getpid()}"
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS {self.dbname}")
+            admin.execute(f"CREATE DATABASE {self.dbname}")
+        self.conn = psycopg.connect(make_conninfo(TEST_DATABASE_URL, dbname=self.dbname), autocommit=True)
+        for name in ("create-cce-costs-tables.sql", "add-cce-component-occupancy-id.sql",
+                     "create-cce-component-validation-rpc.sql"):
+            self.conn.execute((MIGRATIONS / name).read_text(encoding="utf-8"))
+
+    def tearDown(self):
+        self.conn.close()
+        with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS {self.dbname}")
+
+    def _load(self, rows):
+        occ_ids = {}
+        for code, (start, end) in {"a": (1, 20), "b": (15, 30)}.items():
+            occ_ids[code] = self.conn.execute(
+                "INSERT INTO cce_occupancies (occupancy_code, occupancy_name, page_start, page_end)"
+                " VALUES (%s, %s, %s, %s) RETURNING id",
+                (300 + len(occ_ids), code, start, end),
+            ).fetchone()[0]
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO cce_component_costs (section_name, item_name, col_1, col_2, col_3, col_4, source_page,"
+                " occupancy_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+                [
+                    (r["section_name"], r["item_name"], r["col_1"], str(r["col_2"]).replace(",", "")
+                     if r["col_2"] is not None else None, r["col_3"], r["col_4"], r["source_page"],
+                     occ_ids.get(r["occupancy_id"]))
+                    for r in rows
+                ],
+            )
+        occupancies = self.conn.execute("SELECT id, occupancy_code, page_start, page_end FROM cce_occupancies ORDER BY id")
+        cols = ("id", "occupancy_code", "page_start", "page_end")
+        index = OccupancyIndex.from_occupancies([dict(zip(cols, r)) for r in occupancies.fetchall()])
+        components = self.conn.execute(
+            "SELECT id, section_name, item_name, col_1, col_2, col_3, col_4, source_page, occupancy_id"
+            " FROM cce_component_costs ORDER BY id"
+        )
+        names = [d.name for d in components.description]
+        return index, [dict(zip(names, r)) for r in components.fetchall()]
+
+    def _server(self):
+        return self.conn.execute("SELECT cce_component_validation(0.005, 0.02)").fetchone()[0]
+
+    def test_matches_client_pass(self):
+        rows = _rows(2000, seed=5)
+        rows += [dict(rows[0]), dict(rows[1]), dict(rows[1])]  # duplicate groups with samples
+        index, stored = self._load(rows)
+        client = ComponentValidator(occupancy_index=index).add_rows(stored).component_validation()
+        server = self._server()
+        approximate = {"col_1_percentiles", "outliers_below_p1", "outliers_above_p99",
+                       "sample_outliers_low", "sample_outliers_high"}
+        for key in set(client) | set(server):
+            if key not in approximate:
+                self.assertEqual(server.get(key), client.get(key), key)
+
+        c1 = sorted(float(r["col_1"]) for r in stored if r["col_1"] is not None)
+        n = len(c1)
+        p1, p99 = c1[int(n * 0.01)], c1[int(n * 0.99) - 1]
+        self.assertEqual(server["col_1_percentiles"]["p1"], round(p1, 2))
+        self.assertEqual(server["col_1_percentiles"]["p99"], round(p99, 2))
+        self.assertEqual(server["outliers_below_p1"], sum(1 for v in c1 if v < p1))
+        self.assertEqual(server["outliers_above_p99"], sum(1 for v in c1 if v > p99))
+        for name in ("p1", "p99"):
+            self.assertAlmostEqual(
+                client["col_1_percentiles"][name], server["col_1_percentiles"][name],
+                delta=0.005 * server["col_1_percentiles"][name] + 0.01,
+            )
+
+    def test_empty_table_and_small_samples(self):
+        self.assertEqual(self._server()["total_rows"], 0)
+        self.assertNotIn("occupancy_page_mismatch", self._server())
+        rows = [
+            {"section_name": "Add for heat ", "item_name": " Tile 12.50 14.75 18.00", "col_1": 10, "col_2": 4,
+             "col_3": 3, "col_4": None, "source_page": 3, "occupancy_id": "b"},
+            {"section_name": None, "item_name": "Block .....", "col_1": None, "col_2": None,
+             "col_3": None, "col_4": None, "source_page": 40, "occupancy_id": None},
+        ]
+        index, stored = self._load(rows)
+        client = ComponentValidator(occupancy_index=index).add_rows(stored).component_validation()
+        server = self._server()
+        client["col_1_percentiles"]["relative_error"] = 0
+        self.assertEqual(server, client)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ Deep audit of CCE PDF extraction - identify ALL table types and ensure nothing i
 Usage:
   python scripts/audit-cce-pdf-extraction.py
   python scripts/audit-cce-pdf-extraction.py --start-page 1 --end-page 100
+  python scripts/audit-cce-pdf-extraction.py --page-cache   # share cached pages with extract-cce-pdf.py
 
 Output: Report of table types found, extraction coverage, and gaps.
 """
@@ -21,7 +22,9 @@ try:
 except ImportError:
     pass
 
-import pdfplumber
+from cce_page_cache import DEFAULT_PAGE_CACHE_PATH
+from cce_page_classifier import PAGE_LABELS, page_is_pct_table, page_may_have_tables
+from cce_pdf_pages import PdfPageSource
 
 
 def main():
@@ -29,6 +32,13 @@ def main():
     parser.add_argument("--pdf", default=None, help="Path to PDF")
     parser.add_argument("--start-page", type=int, default=1)
     parser.add_argument("--end-page", type=int, default=None)
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(DEFAULT_PAGE_CACHE_PATH),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Reuse per-page pdfplumber output cached by PDF hash (see extract-cce-pdf.py --page-cache)",
+    )
     args = parser.parse_args()
 
     base = Path(__file__).resolve().parent.parent
@@ -57,10 +67,12 @@ def main():
     unknown_tables: list[tuple[int, str]] = []
     # All unique header patterns
     all_headers: set[str] = set()
+    # cce_page_classifier labels (shared with extract-cce-pdf.py via --page-cache)
+    page_classes: dict[str, list[int]] = defaultdict(list)
 
     print(f"Opening PDF: {pdf_path}")
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
+    with PdfPageSource(pdf_path, cache_path=args.page_cache) as source:
+        total_pages = source.total_pages
         start_idx = max(0, args.start_page - 1)
         end_idx = min(total_pages, args.end_page) if args.end_page else total_pages
         end_idx = max(start_idx, end_idx)
@@ -68,8 +80,10 @@ def main():
 
         for i in range(start_idx, end_idx):
             page_num = i + 1
-            page = pdf.pages[i]
-            text = page.extract_text() or ""
+            page = source.views(page_num)
+            text = page.text()
+            page_class = page.classification()
+            page_classes[page_class["label"]].append(page_num)
 
             # Section detection
             sec_match = SECTION_PAGE.search(text)
@@ -80,15 +94,11 @@ def main():
                 sections_by_page[page_num] = (current_section, current_section_name)
 
             # Percentage table detection (text-based)
-            is_pct = (
-                "OCCUPANCY" in text and "LOW" in text and "MEDIAN" in text
-                and ("HIGH" in text or "TOTAL" in text or "ELECTRICAL" in text or "PLUMBING" in text or "HVAC" in text)
-            )
-            if is_pct:
+            if page_is_pct_table(text):
                 pct_table_pages.add(page_num)
 
-            # Extract tables
-            tables = page.extract_tables()
+            # Extract tables (pages without h+v ruling edges cannot have any)
+            tables = page.tables() if page_may_have_tables(page_class) else []
             if not tables:
                 # List-style pages: no grid tables, but may have cost data (e.g. BALCONIES)
                 list_cost_line = re.compile(r"^(.+?)\s+[\.\s]{2,}\s+([\d\.\s]+)$")
@@ -159,6 +169,11 @@ def main():
         print(f"  Percentage table pages (OCCUPANCY+LOW+MEDIAN): {len(pct_table_pages)} pages")
         print(f"  Unknown/unmatched tables: {len(unknown_tables)}")
 
+        print("\n  Page classes:")
+        for label in PAGE_LABELS:
+            pages = page_classes.get(label, [])
+            print(f"    {label}: {len(pages)} pages" + (f" (e.g. {pages[:8]})" if pages else ""))
+
         print("\n## 3. SECTIONS IN PDF")
         print("-" * 50)
         section_pages: dict[tuple[int, str], list[int]] = defaultdict(list)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput of extract-cce-pdf.py on a synthetic edition: pages/sec and peak RSS.
+
+Generates a CCE-shaped PDF with cce_synthetic_pdf.py (or takes --pdf), then runs the extractor as a
+child process in --dry-run mode or with the local file sink (--output-dir), --runs times. Peak RSS
+is the largest single process in the extractor's tree (os.wait4; with --workers it is the biggest
+process, not the sum). Needs a POSIX system.
+
+Usage:
+  python3 scripts/bench-cce-extract-e2e.py --pages 2000                       # generate, time --dry-run
+  python3 scripts/bench-cce-extract-e2e.py --pages 2000 --mode local --workers 4
+  python3 scripts/bench-cce-extract-e2e.py --pages 5000 --out local_data/CCE_Synthetic_5000.pdf --runs 3
+  python3 scripts/bench-cce-extract-e2e.py --pages 500 --min-pages-per-sec 5 --max-rss-mb 600   # CI gate
+  python3 scripts/bench-cce-extract-e2e.py --pages 500 -- --page-cache /tmp/cce-cache.sqlite    # extra args
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from cce_synthetic_pdf import write_synthetic_cce_pdf  # noqa: E402
+
+EXTRACTOR = _scripts_dir / "extract-cce-pdf.py"
+_PAGE_RANGE_RE = re.compile(r"extracting pages (\d+)-(\d+)")
+
+
+def run_extractor(cmd: list[str], log_path: Path) -> tuple[int, float, int]:
+    """Run one extraction; return (exit code, wall seconds, peak RSS bytes)."""
+    t0 = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=str(_scripts_dir.parent))
+        _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - t0
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024  # Linux reports KiB
+    return proc.returncode, wall, rss
+
+
+def pdf_page_count(pdf_path: Path) -> int:
+    from cce_pdf_pages import PdfPageSource
+
+    with PdfPageSource(str(pdf_path)) as source:
+        return source.total_pages
+
+
+def read_log(log_path: Path, pages: int) -> tuple[int, str]:
+    """(pages extracted, "Found ... rows" line) from the extractor log; pages defaults to the whole PDF."""
+    found = ""
+    for line in log_path.read_text(encoding="utf-8", errors="replace").splitlines():
+        m = _PAGE_RANGE_RE.search(line)
+        if m:
+            pages = int(m.group(2)) - int(m.group(1)) + 1
+        elif line.startswith("Found "):
+            found = line
+    return pages, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract-cce-pdf.py end to end on a synthetic CCE PDF")
+    parser.add_argument("--pdf", default=None, help="Benchmark this PDF instead of generating one")
+    parser.add_argument("--pages", type=int, default=600, help="Synthetic page count (default 600)")
+    parser.add_argument("--seed", type=int, default=2026, help="Synthetic PDF seed (default 2026)")
+    parser.add_argument("--out", default=None, help="Keep the generated PDF here (reused when it already exists)")
+    parser.add_argument("--mode", choices=("dry-run", "local"), default="dry-run", help="--dry-run or --output-dir sink")
+    parser.add_argument("--workers", type=int, default=None, help="Passed to extract-cce-pdf.py --workers")
+    parser.add_argument("--runs", type=int, default=1, help="Extraction runs (default 1)")
+    parser.add_argument("--min-pages-per-sec", type=float, default=None, help="Fail when median pages/sec is lower")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help="Fail when peak RSS exceeds this many MiB")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("extra", nargs="*", help="Extra extract-cce-pdf.py arguments (after --)")
+    args = parser.parse_args()
+
+    log = sys.stderr if args.json else sys.stdout
+    tmp = Path(tempfile.mkdtemp(prefix="cce-e2e-"))
+    try:
+        if args.pdf:
+            pdf_path = Path(args.pdf)
+            if not pdf_path.is_file():
+                print(f"Error: PDF not found: {pdf_path}")
+                sys.exit(1)
+            pages = pdf_page_count(pdf_path)
+        elif args.out and Path(args.out).is_file():
+            pdf_path = Path(args.out)
+            pages = pdf_page_count(pdf_path)
+            print(f"Note: reusing {pdf_path} ({pages} pages)", file=log)
+        else:
+            pdf_path = Path(args.out) if args.out else tmp / "cce_synthetic.pdf"
+            t0 = time.perf_counter()
+            info = write_synthetic_cce_pdf(str(pdf_path), args.pages, args.seed)
+            pages = info["pages"]
+            print(
+                f"Generated {pdf_path}: {pages} pages, {pdf_path.stat().st_size / 1e6:.1f} MB "
+                f"in {time.perf_counter() - t0:.1f}s",
+                file=log,
+            )
+
+        runs = []
+        for i in range(max(1, args.runs)):
+            cmd = [sys.executable, str(EXTRACTOR), "--pdf", str(pdf_path)]
+            if args.mode == "dry-run":
+                cmd.append("--dry-run")
+            else:
+                cmd += ["--output-dir", str(tmp / f"out-{i}")]
+            if args.workers:
+                cmd += ["--workers", str(args.workers)]
+            cmd += args.extra
+            log_path = tmp / f"run-{i}.log"
+            code, wall, rss = run_extractor(cmd, log_path)
+            if code != 0:
+                tail = log_path.read_text(encoding="utf-8", errors="replace").splitlines()[-15:]
+                print("\n".join(tail), file=log)
+                print(f"Error: extract-cce-pdf.py exited with code {code}")
+                sys.exit(1)
+            extracted, found = read_log(log_path, pages)
+            runs.append({
+                "seconds": round(wall, 3),
+                "pages": extracted,
+                "pages_per_sec": round(extracted / wall, 2),
+                "peak_rss_mb": round(rss / 2**20, 1),
+            })
+            print(
+                f"  run {i + 1}: {extracted} pages in {wall:.1f}s  {extracted / wall:,.1f} pages/sec"
+                f"  peak RSS {rss / 2**20:,.0f} MiB",
+                file=log,
+            )
+            if i == 0 and found:
+                print(f"  {found}", file=log)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "pdf": str(pdf_path) if args.pdf or args.out else "synthetic",
+        "pages": runs[0]["pages"],
+        "mode": args.mode,
+        "workers": args.workers,
+        "runs": runs,
+        "pages_per_sec": round(statistics.median(r["pages_per_sec"] for r in runs), 2),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['pages']} pages, {args.mode}: median {report['pages_per_sec']:,.1f} pages/sec, "
+            f"peak RSS {report['peak_rss_mb']:,.0f} MiB"
+        )
+
+    failed = []
+    if args.min_pages_per_sec is not None and report["pages_per_sec"] < args.min_pages_per_sec:
+        failed.append(f"{report['pages_per_sec']:.1f} pages/sec < {args.min_pages_per_sec:g}")
+    if args.max_rss_mb is not None and report["peak_rss_mb"] > args.max_rss_mb:
+        failed.append(f"peak RSS {report['peak_rss_mb']:.0f} MiB > {args.max_rss_mb:g}")
+    if failed:
+        print(f"Error: {'; '.join(failed)}", file=log)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list-line rule stage of extract-cce-pdf.py: lines/sec before and after
+cce_extract_rules.py (per-line header regexes tried in sequence + per-item loops over
+uncompiled skip patterns, vs. match_list_header() + fused skip regexes).
+
+Both versions run on the same lines and must agree; the script exits 1 if they do not.
+
+Usage:
+  python scripts/bench-cce-extract-rules.py                       # built-in synthetic lines
+  python scripts/bench-cce-extract-rules.py --pdf path/to.pdf --page-cache
+  python scripts/bench-cce-extract-rules.py --repeat 5
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from cce_extract_rules import (  # noqa: E402
+    LIST_SECTION_FALLBACK_RE,
+    LIST_SECTION_HEADER_RE,
+    LIST_SECTION_SIMPLE_RE,
+    LIST_SKIP_PATTERNS,
+    LIST_SKIP_RE,
+    SUBSECTION_HEADER_RE,
+    match_list_header,
+)
+
+# Before: header regexes in order with length gates (run by the joiner's guard and again by the parser)
+_LEGACY_HEADER_RULES = (
+    ("subsection", SUBSECTION_HEADER_RE, 0, None),
+    ("fallback", LIST_SECTION_FALLBACK_RE, 15, None),
+    ("simple", LIST_SECTION_SIMPLE_RE, 10, None),
+    ("header", LIST_SECTION_HEADER_RE, 5, 50),
+)
+
+
+def legacy_list_header(line: str):
+    for kind, rx, min_len, max_len in _LEGACY_HEADER_RULES:
+        m = rx.match(line)
+        if m and len(line) >= min_len and (max_len is None or len(line) <= max_len):
+            return kind, m
+    return None
+
+
+def legacy_stage(lines: list[str]) -> list:
+    out = []
+    for line in lines:
+        legacy_list_header(line)  # continuation-merge guard
+        header = legacy_list_header(line)
+        if header:
+            out.append((header[0], header[1].group(1)))
+        else:
+            out.append(any(re.search(p, line.lower()) for p in LIST_SKIP_PATTERNS))
+    return out
+
+
+def compiled_stage(lines: list[str]) -> list:
+    out = []
+    for line in lines:
+        match_list_header(line)  # continuation-merge guard
+        header = match_list_header(line)
+        if header:
+            out.append((header[0], header[1].group(1)))
+        else:
+            out.append(bool(LIST_SKIP_RE.search(line.lower())))
+    return out
+
+
+def synthetic_lines(n: int, seed: int = 7) -> list[str]:
+    """Mix of CCE list-page lines: cost lines with leaders, headers, subsections, prose, skips."""
+    rng = random.Random(seed)
+    items = ["Concrete", "Wood deck with railing", "Cedar shingles", "Aluminum awning", "Steel frame, bolted",
+             "Add for insulation", "Good", "Section IV", "For each additional floor", "Deduct for slab"]
+    headers = ["WALL COSTS", "BALCONIES AND CANOPIES", "EXTERIOR BALCONIES", "GARAGE DOORS", "Miscellaneous",
+               "EXTERIOR BALCONIES/LANDINGS (Apply to balcony area)", "MARQUEES (Apply to 2nd floor area)"]
+    words = ["costs", "include", "labor", "materials", "overhead", "profit", "permits", "typical", "and", "for"]
+    lines = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.55:
+            item = rng.choice(items)
+            nums = " ".join(f"{rng.uniform(5, 150):.2f}" for _ in range(rng.randint(2, 4)))
+            lines.append(f"{item} {'.' * rng.randint(3, 30)} {nums}")
+        elif r < 0.65:
+            lines.append(rng.choice(headers))
+        elif r < 0.9:
+            lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(4, 16))).capitalize())
+        else:
+            lines.append(rng.choice(items))
+    return lines
+
+
+def pdf_lines(pdf_path: str, cache_path) -> list[str]:
+    from cce_pdf_pages import PdfPageSource
+
+    lines = []
+    with PdfPageSource(pdf_path, cache_path=cache_path) as source:
+        for n in range(1, source.total_pages + 1):
+            views = source.views(n)
+            lines.extend(x.strip() for x in views.text().split("\n") if x.strip())
+            views.release()
+    return lines
+
+
+def best_time(fn, lines: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(lines)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CCE list-line rules (before/after compiled rules)")
+    parser.add_argument("--pdf", default=None, help="Take lines from this PDF's page text (default: synthetic lines)")
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(_scripts_dir.parent / "local_data" / ".cce-page-cache.sqlite"),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Page cache for --pdf text (see extract-cce-pdf.py --page-cache)",
+    )
+    parser.add_argument("--lines", type=int, default=50000, help="Synthetic line count (default 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; best is reported (default 3)")
+    args = parser.parse_args()
+
+    lines = pdf_lines(args.pdf, args.page_cache) if args.pdf else synthetic_lines(args.lines)
+    if legacy_stage(lines) != compiled_stage(lines):
+        print("Error: compiled rules disagree with the sequential regexes")
+        sys.exit(1)
+    before = best_time(legacy_stage, lines, args.repeat)
+    after = best_time(compiled_stage, lines, args.repeat)
+    print(f"Lines: {len(lines)} ({'PDF ' + args.pdf if args.pdf else 'synthetic'})")
+    print(f"  before (sequential regexes): {len(lines) / before:,.0f} lines/sec")
+    print(f"  after  (compiled rules):     {len(lines) / after:,.0f} lines/sec")
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
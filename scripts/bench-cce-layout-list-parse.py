@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark layout list parsing (cce_layout_list_parse.py): pages/sec and words/sec for the
+pure-Python loops vs. the NumPy path (array line grouping, column split and gap search).
+
+Both engines run on the same word boxes and must return the same (item, numbers) pairs; the
+script exits 1 if they do not. Needs NumPy for the comparison.
+
+Usage:
+  python scripts/bench-cce-layout-list-parse.py                       # built-in synthetic pages
+  python scripts/bench-cce-layout-list-parse.py --pdf path/to.pdf --page-cache
+  python scripts/bench-cce-layout-list-parse.py --pages 500 --rows 60
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from cce_extract_profile import load_cce_profile  # noqa: E402
+from cce_layout_list_parse import _numpy, layout_word_kwargs, parse_layout_list_words  # noqa: E402
+
+
+def synthetic_pages(n: int, rows: int, seed: int = 17) -> list[tuple[list[dict], float]]:
+    """Unit-in-place list pages: item words on the left, four tier costs in the right band."""
+    rng = random.Random(seed)
+    items = ["Wood deck with railing", "Cedar shingles", "Add for insulation", "Canopy, 12 ft", "Concrete slab"]
+    pages = []
+    for _ in range(n):
+        words = []
+        top = 60.0
+        for _ in range(rows):
+            top += rng.uniform(9.0, 13.0)
+            x = 36.0
+            for t in rng.choice(items).split():
+                words.append({"text": t, "x0": x, "x1": x + 5.2 * len(t), "top": top + rng.uniform(0, 1.2)})
+                x += 5.2 * len(t) + 3.0
+            if rng.random() < 0.8:
+                x = 330.0
+                for _ in range(4):
+                    t = f"{rng.uniform(5, 150):.2f}"
+                    words.append({"text": t, "x0": x, "x1": x + 24.0, "top": top + rng.uniform(0, 1.2)})
+                    x += 60.0
+        rng.shuffle(words)
+        pages.append((words, 612.0))
+    return pages
+
+
+def pdf_pages(pdf_path: str, cache_path, layout_cfg: dict) -> list[tuple[list[dict], float]]:
+    from cce_pdf_pages import PdfPageSource
+
+    pages = []
+    with PdfPageSource(pdf_path, cache_path=cache_path) as source:
+        for n in range(1, source.total_pages + 1):
+            views = source.views(n)
+            pages.append((views.words(**layout_word_kwargs(layout_cfg)), views.size()[0]))
+            views.release()
+    return pages
+
+
+def run(pages, layout_cfg: dict, engine: str) -> list:
+    return [parse_layout_list_words(words, width, layout_cfg, engine=engine) for words, width in pages]
+
+
+def best_time(pages, layout_cfg: dict, engine: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run(pages, layout_cfg, engine)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CCE layout list parsing (pure Python vs. NumPy)")
+    parser.add_argument("--pdf", default=None, help="Take word boxes from every page of this PDF (default: synthetic)")
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(_scripts_dir.parent / "local_data" / ".cce-page-cache.sqlite"),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Page cache for --pdf words (see extract-cce-pdf.py --page-cache)",
+    )
+    parser.add_argument("--profile", default=None, help="Edition profile for layout thresholds (default profile)")
+    parser.add_argument("--pages", type=int, default=300, help="Synthetic page count (default 300)")
+    parser.add_argument("--rows", type=int, default=45, help="Synthetic rows per page (default 45)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; best is reported (default 3)")
+    args = parser.parse_args()
+
+    if _numpy() is None:
+        print("Error: NumPy is not installed (pip install numpy); nothing to compare")
+        sys.exit(1)
+    layout_cfg = load_cce_profile(args.profile).get("layout") or {}
+    pages = pdf_pages(args.pdf, args.page_cache, layout_cfg) if args.pdf else synthetic_pages(args.pages, args.rows)
+    n_words = sum(len(words) for words, _ in pages)
+    print(f"Pages: {len(pages)}, words: {n_words} ({'PDF ' + args.pdf if args.pdf else 'synthetic'})")
+
+    if run(pages, layout_cfg, "python") != run(pages, layout_cfg, "numpy"):
+        print("Error: NumPy layout parse disagrees with the pure-Python one")
+        sys.exit(1)
+    for engine in ("python", "numpy"):
+        t = best_time(pages, layout_cfg, engine, args.repeat)
+        print(f"  {engine:<6} {len(pages) / t:>10,.0f} pages/sec {n_words / t:>12,.0f} words/sec")
+
+
+if __name__ == "__main__":
+    main()
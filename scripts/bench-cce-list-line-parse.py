@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Benchmark list cost-line parsing: lines/sec for the regex cascade parse_list_cost_line used before
+(LIST_COST_LINE_RE_DOTS, then LIST_COST_LINE_RE_LEGACY, then LIST_COST_TAIL_RE + float() per tail
+token) vs. scan_list_cost_line (one right-to-left scan, values parsed once).
+
+Each strategy (auto / dots / spaces) is timed separately. Both versions run on the same lines and
+must agree (item, numbers and parsed values); the script exits 1 if they do not.
+
+The continuation joiner is timed the same way: the previous join_list_continuation_lines (rescans
+from every unmerged line, quadratic on prose blocks) vs. join_list_continuation_scans (one pass).
+They must yield the same cost and header lines; the old one also repeated text-only lines.
+
+Usage:
+  python scripts/bench-cce-list-line-parse.py                       # built-in synthetic lines
+  python scripts/bench-cce-list-line-parse.py --pdf path/to.pdf --page-cache
+  python scripts/bench-cce-list-line-parse.py --long 400            # also pad items to 400 chars
+  python scripts/bench-cce-list-line-parse.py --prose-blocks 20     # add 20 runs of 500 text-only lines
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+_scripts_dir = Path(__file__).resolve().parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from cce_component_item_extract import (  # noqa: E402
+    LIST_COST_LINE_RE_DOTS,
+    LIST_COST_LINE_RE_LEGACY,
+    LIST_COST_TAIL_RE,
+    join_list_continuation_scans,
+    parse_numeric_token,
+    scan_list_cost_line,
+)
+from cce_extract_rules import list_line_is_protected_for_merge  # noqa: E402
+
+STRATEGIES = ("auto", "dots", "spaces")
+
+
+def regex_parse_list_cost_line(line: str, strategy: str = "auto"):
+    """The previous implementation: three anchored regexes with lazy item prefixes."""
+    line = line.strip()
+    if not line:
+        return None
+    strat = (strategy or "auto").strip().lower()
+    if strat not in STRATEGIES:
+        strat = "auto"
+
+    def try_dots():
+        m = LIST_COST_LINE_RE_DOTS.match(line)
+        return (m.group(1).strip(), m.group(2).strip()) if m else None
+
+    def try_legacy():
+        if ".." not in line:
+            m = LIST_COST_LINE_RE_LEGACY.match(line)
+            if m:
+                return m.group(1).strip(), m.group(2).strip()
+        return None
+
+    def try_tail():
+        m = LIST_COST_TAIL_RE.match(line)
+        if m:
+            tail = m.group(2).strip()
+            if sum(1 for t in tail.split() if parse_numeric_token(t) is not None) >= 2:
+                return m.group(1).strip(), tail
+        return None
+
+    if strat == "dots":
+        return try_dots() or try_tail() or try_legacy()
+    if strat == "spaces":
+        return try_legacy() or try_dots() or try_tail()
+    return try_dots() or try_legacy() or try_tail()
+
+
+def regex_stage(lines: list[str], strategy: str) -> list:
+    out = []
+    for line in lines:
+        r = regex_parse_list_cost_line(line, strategy)
+        out.append(r and (r[0], r[1], [parse_numeric_token(t) for t in r[1].split()]))
+    return out
+
+
+def scan_stage(lines: list[str], strategy: str) -> list:
+    return [scan_list_cost_line(line, strategy) for line in lines]
+
+
+def rescan_join_list_continuation_lines(lines: list[str], strategy: str, line_is_protected) -> list[str]:
+    """The previous joiner: forward scan from every unmerged line, advancing by one line."""
+    out: list[str] = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        s = lines[i].strip()
+        if not s:
+            i += 1
+            continue
+        if line_is_protected(s) or scan_list_cost_line(s, strategy) is not None:
+            out.append(s)
+            i += 1
+            continue
+        buf = [s]
+        j = i + 1
+        merged_one = False
+        while j < n:
+            t = lines[j].strip()
+            if not t:
+                j += 1
+                continue
+            if line_is_protected(t):
+                break
+            p2 = scan_list_cost_line(t, strategy)
+            if p2 is not None:
+                if sum(1 for v in p2[2] if v is not None) >= 4:
+                    out.append(" ".join(buf + [t]))
+                    i = j + 1
+                    merged_one = True
+                break
+            buf.append(t)
+            j += 1
+        if merged_one:
+            continue
+        out.extend(buf)
+        i += 1
+    return out
+
+
+def rescan_join_stage(lines: list[str], strategy: str) -> list:
+    out = rescan_join_list_continuation_lines(lines, strategy, list_line_is_protected_for_merge)
+    return [(line, scan_list_cost_line(line, strategy)) for line in out]
+
+
+def join_stage(lines: list[str], strategy: str) -> list:
+    return join_list_continuation_scans(lines, strategy=strategy, line_is_protected=list_line_is_protected_for_merge)
+
+
+def cost_and_header_lines(pairs: list) -> list:
+    """Lines the list parser acts on; text-only lines are skipped there anyway."""
+    return [(line, scan) for line, scan in pairs if scan is not None or list_line_is_protected_for_merge(line)]
+
+
+def synthetic_lines(n: int, seed: int = 11, long_items: int = 0) -> list[str]:
+    """List-page mix: dot leaders, space-separated columns, bare tails, prose, headers, broken rows."""
+    rng = random.Random(seed)
+    items = ["Concrete", "Wood deck with railing", "Cedar shingles", "Aluminum awning", "Steel frame, bolted",
+             "Add for insulation", "Masonry veneer, 4\" brick", "Section IV", "Deduct for slab", "Canopy, 12 ft"]
+    words = ["costs", "include", "labor", "materials", "overhead", "profit", "permits", "typical", "and", "for"]
+    lines = []
+    for _ in range(n):
+        item = rng.choice(items)
+        if long_items:
+            item = (item + " ") * max(1, long_items // (len(item) + 1))
+        nums = " ".join(f"{rng.uniform(5, 150):.2f}" for _ in range(rng.randint(1, 4)))
+        r = rng.random()
+        if r < 0.35:
+            lines.append(f"{item} {'.' * rng.randint(2, 30)} {nums}")
+        elif r < 0.5:
+            lines.append(f"{item} {' . ' * rng.randint(1, 6)} {nums}")
+        elif r < 0.65:
+            lines.append(f"{item}   {nums}")
+        elif r < 0.85:
+            lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(4, 16))).capitalize())
+        else:
+            lines.append(f"{item} {rng.randint(1, 99)}")
+    return lines
+
+
+def add_prose_blocks(lines: list[str], blocks: int, block_len: int = 500, seed: int = 13) -> list[str]:
+    """Insert runs of text-only lines, each closed by a two-number line (nothing to merge)."""
+    rng = random.Random(seed)
+    words = ["costs", "include", "labor", "materials", "overhead", "profit", "permits", "typical", "and", "for"]
+    out = list(lines)
+    for _ in range(blocks):
+        block = [" ".join(rng.choice(words) for _ in range(12)) + "," for _ in range(block_len)]
+        pos = rng.randint(0, len(out))
+        out[pos:pos] = block + ["Sparse row .......... 10.00 20.00"]
+    return out
+
+
+def pdf_lines(pdf_path: str, cache_path) -> list[str]:
+    from cce_pdf_pages import PdfPageSource
+
+    lines = []
+    with PdfPageSource(pdf_path, cache_path=cache_path) as source:
+        for n in range(1, source.total_pages + 1):
+            views = source.views(n)
+            lines.extend(x.strip() for x in views.text().split("\n") if x.strip())
+            views.release()
+    return lines
+
+
+def best_time(fn, lines: list[str], strategy: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(lines, strategy)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CCE list cost-line parsing (regex cascade vs. single scan)")
+    parser.add_argument("--pdf", default=None, help="Take lines from this PDF's page text (default: synthetic lines)")
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(_scripts_dir.parent / "local_data" / ".cce-page-cache.sqlite"),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Page cache for --pdf text (see extract-cce-pdf.py --page-cache)",
+    )
+    parser.add_argument("--lines", type=int, default=50000, help="Synthetic line count (default 50000)")
+    parser.add_argument("--long", type=int, default=0, help="Synthetic item length in characters (backtracking-heavy lines)")
+    parser.add_argument("--prose-blocks", type=int, default=0, help="Insert this many 500-line text-only runs")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats; best is reported (default 3)")
+    args = parser.parse_args()
+
+    lines = pdf_lines(args.pdf, args.page_cache) if args.pdf else synthetic_lines(args.lines, long_items=args.long)
+    if args.prose_blocks:
+        lines = add_prose_blocks(lines, args.prose_blocks)
+    print(f"Lines: {len(lines)} ({'PDF ' + args.pdf if args.pdf else 'synthetic'})")
+    for strategy in STRATEGIES:
+        if regex_stage(lines, strategy) != scan_stage(lines, strategy):
+            print(f"Error: scan_list_cost_line disagrees with the regex cascade (strategy {strategy})")
+            sys.exit(1)
+        before = best_time(regex_stage, lines, strategy, args.repeat)
+        after = best_time(scan_stage, lines, strategy, args.repeat)
+        print(
+            f"  {strategy:<6} regex {len(lines) / before:>12,.0f} lines/sec   scan {len(lines) / after:>12,.0f} lines/sec"
+            f"   speedup {before / after:.1f}x"
+        )
+
+    before_out, after_out = rescan_join_stage(lines, "auto"), join_stage(lines, "auto")
+    if cost_and_header_lines(before_out) != cost_and_header_lines(after_out):
+        print("Error: join_list_continuation_scans disagrees with the rescanning joiner")
+        sys.exit(1)
+    before = best_time(rescan_join_stage, lines, "auto", args.repeat)
+    after = best_time(join_stage, lines, "auto", args.repeat)
+    print(
+        f"  join   rescan {len(lines) / before:>11,.0f} lines/sec   one pass {len(lines) / after:>9,.0f} lines/sec"
+        f"   speedup {before / after:.1f}x   (output lines {len(before_out)} -> {len(after_out)})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,18 @@ Used by extract-cce-pdf.py and unit tests (scripts/__tests__/test_cce_component_
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import Callable, Optional
+from collections import deque
+from typing import Callable, Iterable, Optional
 
 ITEM_MAX_LEN = 200
 TIER_RTOL = 0.005
 TIER_ATOL = 0.02
 # Bump when normalize_component_item_name rules change (re-clean script updates stale rows)
 NORMALIZATION_VERSION = 1
+# Distinct raw item strings memoized by normalize_component_item_names (items repeat across pages)
+NORMALIZE_CACHE_SIZE = 1 << 16
 
 # Section titles from "SECTION n PAGE m NAME" that are too short / ambiguous alone
 SHORT_SECTION_NAME_DENYLIST = frozenset({
@@ -89,6 +93,21 @@ _TRAILING_REF_PATTERNS = (
     re.compile(r"\s+MSB\s+.*$", re.I),
 )
 _FOOTNOTE_MARKERS_END = re.compile(r"\s*[\*†‡]{1,4}\s*$")
+# Any of the above at the end: one search decides whether the strip loop can change anything
+_TRAILING_JUNK_ANY = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in (*_TRAILING_REF_PATTERNS, _FOOTNOTE_MARKERS_END)),
+    re.I,
+)
+
+_OCR_SPLIT_CAP_RE = re.compile(r"\b([A-Z])\s+([a-z])")
+_DOT_RUN_RE = re.compile(r"\.{5,}")
+_TRAILING_TOC_DOTS_RE = re.compile(r"\s*\.{3,}\s*$")
+_SPACED_DOTS_RE = re.compile(r"(?:\s*\.\s*){3,}")
+_BLEED_TRIPLET_RE = re.compile(r"\s+\d{1,2}\.\d{2}(\s+\d{1,2}\.\d{2}){2,}\s*$")
+_BLEED_PAIR_RE = re.compile(r"\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s*$")
+_BLEED_SINGLE_RE = re.compile(r"\s+\d{1,2}\.\d{2}\s*$")
+_INT_PAIR_RE = re.compile(r"\s+(\d{1,3})\s+(\d{1,3})\s*$")
+_INT_TRIPLET_RE = re.compile(r"\s+(\d{1,3})\s+(\d{1,3})\s+(\d{1,3})\s*$")
 
 
 def parse_numeric_token(s: Optional[str]) -> Optional[float]:
@@ -122,7 +141,7 @@ def clean_list_item_ocr(s: str) -> str:
     """Fix common OCR artifacts: 'C eiling' -> 'Ceiling'."""
     if not s or len(s) < 3:
         return s
-    return re.sub(r"\b([A-Z])\s+([a-z])", r"\1\2", s)
+    return _OCR_SPLIT_CAP_RE.sub(r"\1\2", s)
 
 
 def _strip_footer_phrases(s: str) -> str:
@@ -162,46 +181,55 @@ def list_section_header_is_truncated_junk(name: str, extra: Optional[frozenset[s
     return False
 
 
-def normalize_component_item_name(raw: str) -> str:
-    """
-    Strip TOC leaders, collapse dot runs, OCR-fix, strip column bleed and footer junk.
-    Caller applies length cap (ITEM_MAX_LEN) after this.
-    """
-    if not raw:
-        return ""
-    s = raw.strip()
-    # Long mid-string dot runs (leaders / OCR)
-    s = re.sub(r"\.{5,}", " ", s)
-    # Trailing TOC dots
-    s = re.sub(r"\s*\.{3,}\s*$", "", s)
-    # Repeated ". . ." style
-    s = re.sub(r"(?:\s*\.\s*){3,}", " ", s)
-    s = " ".join(s.split())
-    s = clean_list_item_ocr(s)
+def _strip_trailing_cost_bleed(s: str) -> str:
+    """Cost-column fragments glued to the item (every pattern ends in a digit)."""
     # Trailing cost decimals (triplet+)
-    bleed = re.search(r"\s+\d{1,2}\.\d{2}(\s+\d{1,2}\.\d{2}){2,}\s*$", s)
+    bleed = _BLEED_TRIPLET_RE.search(s)
     if bleed:
         s = s[: bleed.start()].strip()
     # Pair of dd.dd at end (bleed)
-    bleed2 = re.search(r"\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s*$", s)
+    bleed2 = _BLEED_PAIR_RE.search(s)
     if bleed2:
         s = s[: bleed2.start()].strip()
     # Single trailing dd.dd (small cost fragment)
-    bleed3 = re.search(r"\s+\d{1,2}\.\d{2}\s*$", s)
+    bleed3 = _BLEED_SINGLE_RE.search(s)
     if bleed3 and len(s) - bleed3.start() < 12:
         s = s[: bleed3.start()].strip()
     # Trailing two small integers (e.g. "66 2" from truncated cost) — conservative
-    int_pair = re.search(r"\s+(\d{1,3})\s+(\d{1,3})\s*$", s)
+    int_pair = _INT_PAIR_RE.search(s)
     if int_pair:
         a, b = int(int_pair.group(1)), int(int_pair.group(2))
         if a < 500 and b < 500 and len(s[: int_pair.start()]) > 5:
             s = s[: int_pair.start()].strip()
     # Trailing three small integers (rare bleed from split cost + index)
-    int_trip = re.search(r"\s+(\d{1,3})\s+(\d{1,3})\s+(\d{1,3})\s*$", s)
+    int_trip = _INT_TRIPLET_RE.search(s)
     if int_trip:
         a, b, c = int(int_trip.group(1)), int(int_trip.group(2)), int(int_trip.group(3))
         if max(a, b, c) < 500 and len(s[: int_trip.start()]) > 8:
             s = s[: int_trip.start()].strip()
+    return s
+
+
+def normalize_component_item_name(raw: str) -> str:
+    """
+    Strip TOC leaders, collapse dot runs, OCR-fix, strip column bleed and footer junk.
+    Caller applies length cap (ITEM_MAX_LEN) after this.
+
+    Reference implementation: every rule runs on every item. Hot paths use
+    cached_normalize_component_item_name / normalize_component_item_names (same results).
+    """
+    if not raw:
+        return ""
+    s = raw.strip()
+    # Long mid-string dot runs (leaders / OCR)
+    s = _DOT_RUN_RE.sub(" ", s)
+    # Trailing TOC dots
+    s = _TRAILING_TOC_DOTS_RE.sub("", s)
+    # Repeated ". . ." style
+    s = _SPACED_DOTS_RE.sub(" ", s)
+    s = " ".join(s.split())
+    s = clean_list_item_ocr(s)
+    s = _strip_trailing_cost_bleed(s)
     s = _strip_trailing_reference_junk(s)
     s = _strip_footer_phrases(s)
     s = _strip_trailing_reference_junk(s)
@@ -209,18 +237,191 @@ def normalize_component_item_name(raw: str) -> str:
     return s
 
 
-def _parse_tail_cluster(line: str) -> Optional[tuple[str, str]]:
-    rm = LIST_COST_TAIL_RE.match(line)
-    if rm:
-        tail = rm.group(2).strip()
-        tokens = tail.split()
-        parsed = [parse_numeric_token(t) for t in tokens]
-        n_ok = sum(1 for x in parsed if x is not None)
-        if n_ok >= 2:
-            return rm.group(1).strip(), tail
+def _strip_trailing_reference_junk_fast(s: str) -> str:
+    if _TRAILING_JUNK_ANY.search(s) is None:
+        return s.strip()
+    return _strip_trailing_reference_junk(s)
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def cached_normalize_component_item_name(raw: str) -> str:
+    """
+    normalize_component_item_name with passes that cannot match skipped, memoized per raw string.
+
+    Dot rules only run when the item has a '.', cost-bleed rules only when it ends in a digit, and
+    the trailing-reference loop only when one search over all its patterns finds something.
+    """
+    if not raw:
+        return ""
+    s = raw.strip()
+    if "." in s:
+        s = _DOT_RUN_RE.sub(" ", s)
+        s = _TRAILING_TOC_DOTS_RE.sub("", s)
+        s = _SPACED_DOTS_RE.sub(" ", s)
+    s = " ".join(s.split())
+    s = clean_list_item_ocr(s)
+    if s[-1:].isdigit():
+        s = _strip_trailing_cost_bleed(s)
+    s = _strip_trailing_reference_junk_fast(s)
+    s = _strip_footer_phrases(s)
+    s = _strip_trailing_reference_junk_fast(s)
+    return " ".join(s.split())
+
+
+def normalize_component_item_names(items: Iterable[str]) -> list[str]:
+    """Batch normalize_component_item_name (same results, in order); repeated raw strings are normalized once."""
+    return [cached_normalize_component_item_name(raw or "") for raw in items]
+
+
+# ASCII characters of the cost-tail alphabet (digits, '.', whitespace); anything else ends the tail
+_TAIL_ASCII_CHARS = "0123456789. \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_ASCII_WS_TO_SPACE = str.maketrans("\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f", " " * 9)
+
+
+def _tail_start(line: str) -> int:
+    """Start of the longest suffix made only of digits, '.' and whitespace (the cost-tail alphabet)."""
+    i = len(line.rstrip(_TAIL_ASCII_CHARS))
+    while i > 0:
+        c = line[i - 1]
+        if c.isascii() or not (c.isdecimal() or c.isspace()):
+            break
+        i = len(line[:i - 1].rstrip(_TAIL_ASCII_CHARS))  # non-ASCII digit / space (rare)
+    return i
+
+
+def _dots_split(line: str, start: int) -> Optional[tuple[int, int]]:
+    """LIST_COST_LINE_RE_DOTS: first 2+ dot run in the tail with whitespace on both sides."""
+    n = len(line)
+    d = line.find("..", start)
+    while d != -1:
+        k = n - len(line[d:].lstrip("."))
+        if d > start and line[d - 1].isspace() and k < n and line[k].isspace():
+            p = d - 1
+            while p > start and line[p - 1].isspace():
+                p -= 1
+            return p, k
+        d = line.find("..", k)
     return None
 
 
+def _legacy_split(line: str, start: int) -> Optional[tuple[int, int]]:
+    """
+    LIST_COST_LINE_RE_LEGACY (no '..' in the line): in the first run of dots / whitespace that can hold
+    ws + 2 + ws, the item ends at the run's first whitespace and the numbers start after its last
+    usable whitespace.
+    """
+    n = len(line)
+    spaced = line[start:].translate(_ASCII_WS_TO_SPACE)
+    if spaced.isascii() and "  " not in spaced and " . " not in spaced:
+        return None  # 4 dot / space characters without '..' always contain one of these
+    i = start
+    while i < n:
+        if not (line[i] == "." or line[i].isspace()):
+            i += 1
+            continue
+        r = i
+        while r < n and (line[r] == "." or line[r].isspace()):
+            r += 1
+        p = i
+        while p < r and not line[p].isspace():
+            p += 1
+        q = min(r - 1, n - 2)
+        while q >= p + 3 and not line[q].isspace():
+            q -= 1
+        if p < r and q >= p + 3:
+            return p, q + 1
+        i = r
+    return None
+
+
+def _number_chunk_ok(chunk: str) -> bool:
+    """Chunk (no whitespace) can be split into LIST_COST_TAIL_RE numbers: d{1,4}(.d{1,4})? glued together."""
+    if "." not in chunk:
+        return True
+    parts = chunk.split(".")
+    if not parts[0] or not parts[-1]:
+        return False
+    return all(len(mid) >= 2 for mid in parts[1:-1])
+
+
+def _tail_split(line: str, start: int) -> Optional[int]:
+    """LIST_COST_TAIL_RE: whitespace run before the longest run of trailing number chunks."""
+    tail = line[start:]
+    chunks = tail.split()
+    first = 0 if tail[:1].isspace() else 1  # a chunk glued to the item text cannot start the tail
+    m = 0
+    for idx in range(len(chunks) - 1, first - 1, -1):
+        if not _number_chunk_ok(chunks[idx]):
+            break
+        m += 1
+    if not m:
+        return None
+    if m == len(chunks):
+        return start
+    return start + len(tail.rsplit(None, m)[0])
+
+
+def scan_list_cost_line(line: str, strategy: str = "auto") -> Optional[tuple[str, str, list[Optional[float]]]]:
+    """
+    (item_raw, nums_str, values) for a list-style cost line, or None; values are the parsed
+    nums_str tokens (None where a token is not a number).
+
+    Same results as trying LIST_COST_LINE_RE_DOTS / LIST_COST_LINE_RE_LEGACY / LIST_COST_TAIL_RE in
+    strategy order, but from one right-to-left scan for the cost tail (digits, dots, whitespace):
+    the lazy item prefixes of those patterns can only end inside that tail, so nothing left of it
+    is examined twice.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    strat = (strategy or "auto").strip().lower()
+    if strat not in ("auto", "dots", "spaces"):
+        strat = "auto"
+    start = _tail_start(line)
+    newline = line.find("\n")  # the patterns' (.+?) item does not cross a newline
+
+    def item_ok(p: int) -> bool:
+        return newline < 0 or newline >= p
+
+    def dots() -> Optional[tuple[str, str, list[Optional[float]]]]:
+        hit = _dots_split(line, start)
+        if hit and item_ok(hit[0]):
+            return _split_result(line, hit[0], hit[1])
+        return None
+
+    def legacy() -> Optional[tuple[str, str, list[Optional[float]]]]:
+        if ".." in line:
+            return None
+        hit = _legacy_split(line, start)
+        if hit and item_ok(hit[0]):
+            return _split_result(line, hit[0], hit[1])
+        return None
+
+    def tail() -> Optional[tuple[str, str, list[Optional[float]]]]:
+        p = _tail_split(line, start)
+        if p is None or not item_ok(p):
+            return None
+        r = _split_result(line, p, p)
+        return r if sum(1 for v in r[2] if v is not None) >= 2 else None
+
+    if strat == "dots":
+        return dots() or tail() or legacy()
+    if strat == "spaces":
+        return legacy() or dots() or tail()
+    return dots() or legacy() or tail()
+
+
+def _split_result(line: str, item_end: int, nums_start: int) -> tuple[str, str, list[Optional[float]]]:
+    nums = line[nums_start:].strip()
+    values: list[Optional[float]] = []
+    for tok in nums.split():
+        try:
+            values.append(float(tok))
+        except ValueError:
+            values.append(None)
+    return line[:item_end].strip(), nums, values
+
+
 def list_line_tail_numeric_token_count(nums_str: str) -> int:
     """Count parseable numeric tokens in the cost tail from parse_list_cost_line()."""
     if not nums_str or not nums_str.strip():
@@ -228,110 +429,126 @@ def list_line_tail_numeric_token_count(nums_str: str) -> int:
     return sum(1 for t in nums_str.split() if parse_numeric_token(t) is not None)
 
 
-def join_list_continuation_lines(
+def join_list_continuation_scans(
     lines: list[str],
     *,
     strategy: str = "auto",
     line_is_protected: Callable[[str], bool],
-) -> list[str]:
+    max_continuation_lines: Optional[int] = None,
+) -> list[tuple[str, Optional[tuple[str, str, list[Optional[float]]]]]]:
     """
-    Pre-pass for BUILT-INS-style list pages: merge a line with no parseable cost tail into
-    following continuation lines until a line with four tail numbers is found, then parse as one.
+    Pre-pass for BUILT-INS-style list pages: merge lines with no parseable cost tail into the
+    following line when it has four tail numbers, then parse as one.
 
     Reduces bad ITEM splits (description broken across lines) and stray quality-only fragments
     incorrectly emitted as items when the numeric row stands alone on the next line.
+
+    Single pass: each input line is scanned at most once (merged lines once more), and the
+    scan_list_cost_line() result is returned with the line so callers do not parse it again.
+    Returns (line, scan) pairs; scan is None for protected and description-only lines.
+
+    max_continuation_lines (profile list_continuation_max_lines): glue at most this many
+    description lines onto a four-number line; older lines of a longer run are emitted as-is.
+    None or 0 means no limit.
     """
-    out: list[str] = []
-    i = 0
-    n = len(lines)
+    out: list[tuple[str, Optional[tuple[str, str, list[Optional[float]]]]]] = []
     strat = (strategy or "auto").strip().lower()
+    cap = max_continuation_lines if max_continuation_lines and max_continuation_lines > 0 else None
+    pending: deque[str] = deque()  # description-only lines since the last cost / protected line
 
-    while i < n:
-        s = lines[i].strip()
+    for raw in lines:
+        s = raw.strip()
         if not s:
-            i += 1
             continue
         if line_is_protected(s):
-            out.append(s)
-            i += 1
+            out.extend((p, None) for p in pending)
+            pending.clear()
+            out.append((s, None))
             continue
-        if parse_list_cost_line(s, strat) is not None:
-            out.append(s)
-            i += 1
+        scan = scan_list_cost_line(s, strat)
+        if scan is None:
+            if cap is not None and len(pending) == cap:
+                out.append((pending.popleft(), None))
+            pending.append(s)
             continue
-
-        buf = [s]
-        j = i + 1
-        merged_one = False
-        while j < n:
-            t = lines[j].strip()
-            if not t:
-                j += 1
-                continue
-            if line_is_protected(t):
-                break
-            p2 = parse_list_cost_line(t, strat)
-            if p2 is not None:
-                if list_line_tail_numeric_token_count(p2[1]) >= 4:
-                    out.append(" ".join(buf + [t]))
-                    i = j + 1
-                    merged_one = True
-                break
-            buf.append(t)
-            j += 1
-
-        if merged_one:
+        if pending and sum(1 for v in scan[2] if v is not None) >= 4:
+            pending.append(s)
+            merged = " ".join(pending)
+            pending.clear()
+            out.append((merged, scan_list_cost_line(merged, strat)))
             continue
+        out.extend((p, None) for p in pending)
+        pending.clear()
+        out.append((s, scan))
+
+    out.extend((p, None) for p in pending)
+    return out
 
-        for b in buf:
-            out.append(b)
-        i += 1
 
+def join_list_continuation_lines(
+    lines: list[str],
+    *,
+    strategy: str = "auto",
+    line_is_protected: Callable[[str], bool],
+    max_continuation_lines: Optional[int] = None,
+) -> list[str]:
+    """Lines only from join_list_continuation_scans()."""
+    return [
+        line
+        for line, _ in join_list_continuation_scans(
+            lines,
+            strategy=strategy,
+            line_is_protected=line_is_protected,
+            max_continuation_lines=max_continuation_lines,
+        )
+    ]
+
+
+def join_layout_continuation_pairs(
+    pairs: list[tuple[str, str]],
+    *,
+    line_is_protected: Callable[[str], bool],
+    max_continuation_lines: Optional[int] = None,
+) -> list[tuple[str, str]]:
+    """
+    join_list_continuation_scans() for bbox-parsed rows: (item_raw, nums_str) pairs where text-only
+    lines have nums_str "". Description lines before a row with four tail numbers are prepended to
+    its item; protected (header) lines stop the merge. Text-only pairs are kept for header handling.
+    """
+    out: list[tuple[str, str]] = []
+    cap = max_continuation_lines if max_continuation_lines and max_continuation_lines > 0 else None
+    pending: deque[str] = deque()
+
+    for item_raw, nums_str in pairs:
+        if not nums_str:
+            if line_is_protected(item_raw):
+                out.extend((p, "") for p in pending)
+                pending.clear()
+                out.append((item_raw, ""))
+                continue
+            if cap is not None and len(pending) == cap:
+                out.append((pending.popleft(), ""))
+            pending.append(item_raw)
+            continue
+        if pending and sum(1 for t in nums_str.split() if parse_numeric_token(t) is not None) >= 4:
+            pending.append(item_raw)
+            item_raw = " ".join(pending)
+        else:
+            out.extend((p, "") for p in pending)
+        pending.clear()
+        out.append((item_raw, nums_str))
+
+    out.extend((p, "") for p in pending)
     return out
 
 
 def parse_list_cost_line(line: str, strategy: str = "auto") -> Optional[tuple[str, str]]:
     """
     Return (item_raw, nums_str) for a list-style cost line, or None.
-    strategy: auto | dots | spaces (profile list_line_strategy).
+    strategy: auto | dots | spaces (profile list_line_strategy). See scan_list_cost_line.
     """
-    line = line.strip()
-    if not line:
-        return None
-    strat = (strategy or "auto").strip().lower()
-    if strat not in ("auto", "dots", "spaces"):
-        strat = "auto"
-
-    def try_dots() -> Optional[tuple[str, str]]:
-        m = LIST_COST_LINE_RE_DOTS.match(line)
-        if m:
-            return m.group(1).strip(), m.group(2).strip()
-        return None
-
-    def try_legacy() -> Optional[tuple[str, str]]:
-        if ".." not in line:
-            m = LIST_COST_LINE_RE_LEGACY.match(line)
-            if m:
-                return m.group(1).strip(), m.group(2).strip()
-        return None
-
-    if strat == "dots":
-        r = try_dots() or _parse_tail_cluster(line) or try_legacy()
-        return r
-
-    if strat == "spaces":
-        r = try_legacy() or try_dots() or _parse_tail_cluster(line)
-        return r
-
-    # auto
-    r = try_dots()
-    if r:
-        return r
-    if ".." not in line:
-        r = try_legacy()
-        if r:
-            return r
-    return _parse_tail_cluster(line)
+    r = scan_list_cost_line(line, strategy)
+    return (r[0], r[1]) if r else None
 
 
 def build_component_extraction_flags(
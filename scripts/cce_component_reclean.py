@@ -0,0 +1,191 @@
+"""
+Bulk re-normalization of cce_component_costs.item_name for reclean-cce-component-items.py.
+
+Rows are read in keyset pages (id > last id, cce_validation.iter_table_rows), filtered on the
+server to normalization_version < NORMALIZATION_VERSION unless --force. Changed rows are
+written as upsert(on_conflict="id") batches of id / item_name / normalization_version /
+extraction_flags on a small thread pool with at most 2x workers requests in flight. A batch
+the server rejects as too large is split in half; any other batch error (e.g. two rows
+normalizing onto the same dedupe key) falls back to one update per row, so only the offending
+rows fail, as before.
+
+The checkpoint file records the last id whose page is fully written (pages finish out of
+order on the pool; the checkpoint only moves past a page once every earlier page is done),
+together with the filters and target version it belongs to. A rerun with the same settings
+continues after that id; the file is removed when the reclean completes.
+
+An upsert inserts when the id no longer exists, so do not reclean an extraction_date while
+extract-cce-pdf.py is replacing it.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from cce_component_item_extract import (
+    ITEM_MAX_LEN,
+    NORMALIZATION_VERSION,
+    build_component_extraction_flags,
+    normalize_component_item_names,
+)
+from cce_extract_checkpoint import CHECKPOINT_VERSION, utc_now_iso
+from cce_extract_sink import is_batch_too_large
+from cce_validation import iter_table_rows
+
+RECLEAN_COLUMNS = "id,item_name,normalization_version,extraction_date,extraction_flags"
+RECLEAN_PAGE_ROWS = 1000
+RECLEAN_BATCH_ROWS = 500
+RECLEAN_WORKERS = 4
+
+
+def log_stderr(message: str) -> None:
+    """Default log for batch / row failures: stderr, leaving stdout for the summary line."""
+    print(message, file=sys.stderr)
+
+
+def reclean_patch(row: dict, new: str, *, force: bool = False, target_version: int = NORMALIZATION_VERSION) -> Optional[dict]:
+    """Upsert payload for one row given its normalized name, or None when nothing changes."""
+    old = row.get("item_name") or ""
+    ver = row.get("normalization_version")
+    if not force and ver is not None and int(ver) >= target_version:
+        return None
+    new = new[:ITEM_MAX_LEN]
+    if new == old and not force:
+        return None
+    prev = row.get("extraction_flags")
+    merged = dict(prev) if isinstance(prev, dict) else {}
+    merged.update(build_component_extraction_flags(item_raw=old, item_final=new))
+    return {"id": row.get("id"), "item_name": new, "normalization_version": target_version, "extraction_flags": merged}
+
+
+def reclean_settings(extraction_date: Optional[str], force: bool, target_version: int = NORMALIZATION_VERSION) -> dict:
+    """What a checkpoint must match to be resumed."""
+    return {"extraction_date": extraction_date, "force": force, "target_version": target_version}
+
+
+def checkpoint_mismatch(data: dict[str, Any], settings: dict) -> Optional[str]:
+    """Reason the checkpoint belongs to another reclean, or None."""
+    if data.get("kind") != "reclean":
+        return "not a reclean checkpoint"
+    for k, v in settings.items():
+        if data.get(k) != v:
+            return f"{k} {v!r} != checkpoint {data.get(k)!r}"
+    return None
+
+
+def write_batch(client: Any, rows: list[dict], log: Callable[[str], None] = log_stderr) -> int:
+    """Upsert rows by id; returns how many rows could not be written."""
+    try:
+        client.table("cce_component_costs").upsert(rows, on_conflict="id").execute()
+        return 0
+    except Exception as e:
+        if len(rows) > 1 and is_batch_too_large(e):
+            mid = len(rows) // 2
+            return write_batch(client, rows[:mid], log) + write_batch(client, rows[mid:], log)
+        if len(rows) > 1:
+            log(f"Note: batch of {len(rows)} rows failed ({e}); updating them one by one")
+    failed = 0
+    for r in rows:
+        try:
+            client.table("cce_component_costs").update(
+                {k: v for k, v in r.items() if k != "id"}
+            ).eq("id", r["id"]).execute()
+        except Exception as e:
+            log(f"Update failed for {r['id']}: {e}")
+            failed += 1
+    return failed
+
+
+def run_reclean(
+    client: Any,
+    *,
+    extraction_date: Optional[str] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    page_rows: int = RECLEAN_PAGE_ROWS,
+    batch_rows: int = RECLEAN_BATCH_ROWS,
+    workers: int = RECLEAN_WORKERS,
+    resume_from: Optional[dict] = None,
+    save: Optional[Callable[[dict], None]] = None,
+    log: Callable[[str], None] = log_stderr,
+) -> dict[str, Any]:
+    """
+    Reclean every matching row; returns the final progress dict (scanned, changed, failed,
+    last_id, ...). resume_from is a loaded checkpoint (already matched); save(progress) is
+    called whenever the fully-written prefix advances (not with dry_run).
+    """
+    target = NORMALIZATION_VERSION
+    progress: dict[str, Any] = {
+        "version": CHECKPOINT_VERSION,
+        "kind": "reclean",
+        **reclean_settings(extraction_date, force, target),
+        "run_started_at": utc_now_iso(),
+        "last_id": None,
+        "scanned": 0,
+        "changed": 0,
+        "failed": 0,
+    }
+    if resume_from:
+        for k in ("run_started_at", "last_id", "scanned", "changed", "failed"):
+            progress[k] = resume_from.get(k, progress[k])
+
+    def where(q):
+        if extraction_date:
+            q = q.eq("extraction_date", extraction_date)
+        if not force:
+            q = q.lt("normalization_version", target)
+        return q
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cce-reclean") if not dry_run else None
+    # (last id, rows scanned, rows changed, batch futures) per page, oldest first
+    pending: deque[tuple[Any, int, int, list[Future]]] = deque()
+    inflight: deque[Future] = deque()
+
+    def advance(block: bool) -> None:
+        while pending and (block or all(f.done() for f in pending[0][3])):
+            last_id, scanned, changed, futures = pending.popleft()
+            progress["failed"] += sum(f.result() for f in futures)
+            progress["last_id"], progress["scanned"] = last_id, progress["scanned"] + scanned
+            progress["changed"] += changed
+            if save is not None:
+                save(dict(progress))
+
+    page: list[dict] = []
+
+    def finish_page() -> None:
+        normalized = normalize_component_item_names(row.get("item_name") or "" for row in page)
+        patches = [p for p in (reclean_patch(r, n, force=force, target_version=target) for r, n in zip(page, normalized)) if p]
+        if dry_run:
+            progress["scanned"] += len(page)
+            progress["changed"] += len(patches)
+            progress["last_id"] = page[-1]["id"]
+            return
+        futures = []
+        for i in range(0, len(patches), batch_rows):
+            while len(inflight) >= 2 * max(1, workers):
+                inflight.popleft().result()
+            f = pool.submit(write_batch, client, patches[i : i + batch_rows], log)
+            inflight.append(f)
+            futures.append(f)
+        pending.append((page[-1]["id"], len(page), len(patches), futures))
+        advance(block=False)
+
+    try:
+        # One normalize batch per page: repeated item names (same item across occupancies) normalize once
+        for row in iter_table_rows(
+            client, "cce_component_costs", RECLEAN_COLUMNS, where=where, page_rows=page_rows, after=progress["last_id"]
+        ):
+            page.append(row)
+            if len(page) >= page_rows:
+                finish_page()
+                page = []
+        if page:
+            finish_page()
+        advance(block=True)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return progress
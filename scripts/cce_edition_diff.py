@@ -0,0 +1,167 @@
+"""
+Edition-to-edition differential loads for extract-cce-pdf.py (--diff).
+
+Each full run records one row per parsed page in cce_page_fingerprints:
+
+  fingerprint   hash of the page's normalized text and table cells (what the PDF says)
+  row_digests   per table, hash of the rows that page contributed to the final load
+                (after dedupe; what the parser made of it)
+
+A --diff run parses the whole book as usual (section / occupancy state carries across pages,
+so an unchanged page can still yield different rows after an earlier page changed) and
+compares with the latest recorded edition. Only "dirty" pages are written:
+
+  changed    fingerprint differs
+  rows_only  same fingerprint, different rows (parser / profile change, carried state)
+  added      page not in the previous edition
+  removed    page no longer parsed (book got shorter, new skip_pages) - rows deleted
+
+apply_edition_diff() deletes the previous rows of dirty + removed pages, moves the remaining
+component / cost rows to the new extraction_date in one update per table, and inserts the
+dirty pages' rows, which leaves the tables as a full --clear-* reload would.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Iterable, Optional
+
+from cce_extract_sink import (
+    dedupe_component_rows,
+    dedupe_cost_pct_rows,
+    dedupe_cost_rows,
+)
+
+FINGERPRINT_TABLES = ("cce_component_costs", "cce_cost_rows", "cce_cost_percentages", "cce_modifiers")
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _norm(s: Any) -> str:
+    return _WS_RE.sub(" ", str(s or "")).strip()
+
+
+def _digest(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def page_fingerprint(text: str, tables: Optional[list]) -> str:
+    """Hash of whitespace-normalized page text and table cells (tables=None when not read)."""
+    cells = [[[_norm(c) for c in row or []] for row in table or []] for table in tables or []]
+    return _digest(_norm(text) + "\x1f" + json.dumps(cells, ensure_ascii=False, separators=(",", ":")))
+
+
+def row_digests_by_page(rows: Iterable[dict]) -> dict[int, str]:
+    """source_page -> hash of that page's rows (order-independent)."""
+    by_page: dict[int, list[str]] = {}
+    for r in rows:
+        by_page.setdefault(r.get("source_page"), []).append(json.dumps(r, sort_keys=True, default=str))
+    return {page: _digest("\n".join(sorted(items))) for page, items in by_page.items()}
+
+
+def final_rows(
+    component_rows: list[dict],
+    cost_rows: list[dict],
+    cost_pct_rows: list[dict],
+    modifier_rows: list[dict],
+    extraction_date_str: str,
+) -> dict[str, list[dict]]:
+    """Rows a full load ends up with, per table (same dedupe as the sink / upsert keys)."""
+    return {
+        "cce_component_costs": dedupe_component_rows(component_rows, extraction_date_str),
+        "cce_cost_rows": dedupe_cost_rows(cost_rows),
+        "cce_cost_percentages": dedupe_cost_pct_rows(cost_pct_rows),
+        "cce_modifiers": list(modifier_rows),
+    }
+
+
+def build_page_records(page_fingerprints: dict[int, str], rows_by_table: dict[str, list[dict]]) -> dict[int, dict]:
+    """page -> {"fingerprint", "row_digests": {table: hash}} for every parsed page."""
+    records = {page: {"fingerprint": fp, "row_digests": {}} for page, fp in page_fingerprints.items()}
+    for table, rows in rows_by_table.items():
+        for page, digest in row_digests_by_page(rows).items():
+            if page in records:
+                records[page]["row_digests"][table] = digest
+    return records
+
+
+def diff_editions(previous: dict[int, dict], current: dict[int, dict]) -> dict[str, Any]:
+    """Classify pages of `current` against `previous` (both from build_page_records)."""
+    changed, rows_only, added = [], [], []
+    for page in sorted(current):
+        prev = previous.get(page)
+        if prev is None:
+            added.append(page)
+        elif prev["fingerprint"] != current[page]["fingerprint"]:
+            changed.append(page)
+        elif (prev.get("row_digests") or {}) != current[page]["row_digests"]:
+            rows_only.append(page)
+    removed = sorted(p for p in previous if p not in current)
+    dirty = sorted(set(changed) | set(rows_only) | set(added))
+    return {
+        "pages": len(current),
+        "unchanged": len(current) - len(dirty),
+        "changed": changed,
+        "rows_only": rows_only,
+        "added": added,
+        "removed": removed,
+        "dirty": dirty,
+    }
+
+
+def _page_list(pages: list[int], limit: int = 20) -> str:
+    shown = ", ".join(str(p) for p in pages[:limit])
+    return shown + (f", ... (+{len(pages) - limit})" if len(pages) > limit else "")
+
+
+def format_change_report(report: dict[str, Any]) -> list[str]:
+    lines = [
+        f"Diff vs extraction_date={report['previous_extraction_date']}: {report['pages']} pages, "
+        f"{report['unchanged']} unchanged, {len(report['changed'])} changed, "
+        f"{len(report['rows_only'])} with changed rows only, {len(report['added'])} added, "
+        f"{len(report['removed'])} removed"
+    ]
+    for key, label in (("changed", "Changed"), ("rows_only", "Rows only"), ("added", "Added"), ("removed", "Removed")):
+        if report[key]:
+            lines.append(f"  {label}: {_page_list(report[key])}")
+    for table, counts in (report.get("tables") or {}).items():
+        lines.append(f"  {table}: {counts['rows_written']} rows written for {counts['pages']} pages")
+    return lines
+
+
+def apply_edition_diff(
+    sink: Any,
+    *,
+    previous_extraction_date: str,
+    report: dict[str, Any],
+    rows_by_table: dict[str, list[dict]],
+) -> None:
+    """
+    Delta write through a SupabaseSink (occupancies must already be upserted). Safe to re-run
+    after a failure: rows of the new date on rewritten pages are deleted along with the old ones.
+    """
+    dirty = set(report["dirty"])
+    rewrite = sorted(dirty | set(report["removed"]))
+    dates = sorted({previous_extraction_date, sink.extraction_date})
+    sink.delete_pages("cce_component_costs", rewrite, extraction_dates=dates)
+    sink.delete_pages("cce_cost_rows", rewrite, extraction_dates=dates)
+    sink.delete_pages("cce_cost_percentages", rewrite)
+    sink.delete_pages("cce_modifiers", rewrite)
+    if previous_extraction_date != sink.extraction_date:
+        sink.move_extraction_date("cce_component_costs", previous_extraction_date)
+        sink.move_extraction_date("cce_cost_rows", previous_extraction_date)
+
+    written = {t: [r for r in rows_by_table[t] if r.get("source_page") in dirty] for t in FINGERPRINT_TABLES}
+    sink.add_modifier_rows(written["cce_modifiers"])
+    sink.finish_modifier_rows()
+    sink.add_component_rows(written["cce_component_costs"])
+    sink.finish_component_rows()
+    sink.add_cost_pct_rows(written["cce_cost_percentages"])
+    sink.finish_cost_pct_rows()
+    sink.write_cost_rows(written["cce_cost_rows"])
+    report["tables"] = {
+        t: {"rows_written": len(rows), "pages": len({r.get("source_page") for r in rows})}
+        for t, rows in written.items()
+    }
@@ -0,0 +1,127 @@
+"""
+Checkpoint files for extract-cce-pdf.py --checkpoint / --resume.
+
+A checkpoint is written (atomically) by the --stream writer thread after every row up to
+`last_committed_page` has been inserted. It carries the cross-page parser state
+(current_section, current_section_name, occupancies in discovery order, prev_occupancy),
+the cost rows still waiting for the end-of-run dedupe, counters, and the PDF hash /
+edition / extraction_date it belongs to, so a resume continues exactly where the run left
+off instead of re-parsing the book.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def build_checkpoint(
+    *,
+    pdf_path: str,
+    pdf_sha256: str,
+    edition_id: Optional[str],
+    extraction_date: str,
+    page_start: int,
+    page_end: int,
+    last_committed_page: int,
+    run_started_at: str,
+    current_section: Optional[int],
+    current_section_name: Optional[str],
+    occupancies: dict[int, dict],
+    prev_occupancy: Optional[dict],
+    pending_cost_rows: list[dict],
+    counters: dict[str, Any],
+) -> dict[str, Any]:
+    """JSON-ready snapshot (copies everything, so the caller may keep mutating its state)."""
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "pdf_path": pdf_path,
+        "pdf_sha256": pdf_sha256,
+        "edition_id": edition_id,
+        "extraction_date": extraction_date,
+        "page_start": page_start,
+        "page_end": page_end,
+        "last_committed_page": last_committed_page,
+        "run_started_at": run_started_at,
+        "parser": {
+            "current_section": current_section,
+            "current_section_name": current_section_name,
+            "occupancies": list(occupancies.values()),
+            "prev_occupancy_code": prev_occupancy["occupancy_code"] if prev_occupancy else None,
+        },
+        "pending_cost_rows": pending_cost_rows,
+        "counters": counters,
+    }
+    return json.loads(json.dumps(data))
+
+
+def save_checkpoint(path: str, data: dict[str, Any]) -> None:
+    """Write via temp file + rename so a crash never leaves a half-written checkpoint."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**data, "saved_at": utc_now_iso()}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+
+
+def save_stream_checkpoint(path: str, snapshot: dict[str, Any], sink: Any) -> None:
+    """
+    Record the snapshot with the sink's counters. Called on the writer thread after
+    sink.flush_pending(); raises instead when the sink skipped a batch (sink.write_failures),
+    so the checkpoint never moves past rows that are not in the database.
+    """
+    failures = getattr(sink, "write_failures", None)
+    if failures:
+        raise RuntimeError(
+            f"not checkpointing page {snapshot['last_committed_page']}: {len(failures)} batch(es) were not "
+            f"written ({failures[0]}); --resume continues from the last checkpoint"
+        )
+    snapshot["counters"]["sink"] = sink.counters()
+    save_checkpoint(path, snapshot)
+
+
+def load_checkpoint(path: str) -> Optional[dict[str, Any]]:
+    p = Path(path)
+    if not p.is_file():
+        return None
+    with open(p, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version {data.get('version')!r} in {path}")
+    return data
+
+
+def checkpoint_mismatch(
+    data: dict[str, Any], *, pdf_sha256: str, edition_id: Optional[str], extraction_date: str
+) -> Optional[str]:
+    """Reason the checkpoint cannot be resumed for this run, or None."""
+    if data.get("pdf_sha256") != pdf_sha256:
+        return "PDF content differs from the checkpointed run"
+    if data.get("edition_id") != edition_id:
+        return f"profile edition_id {edition_id!r} != checkpoint {data.get('edition_id')!r}"
+    if data.get("extraction_date") != extraction_date:
+        return f"extraction_date {extraction_date} != checkpoint {data.get('extraction_date')}"
+    return None
+
+
+def restore_parser_state(data: dict[str, Any]) -> tuple[Optional[int], Optional[str], dict[int, dict], Optional[dict]]:
+    """(current_section, current_section_name, occupancies, prev_occupancy) with discovery order kept."""
+    parser = data.get("parser") or {}
+    occupancies: dict[int, dict] = {}
+    for o in parser.get("occupancies") or []:
+        occupancies[int(o["occupancy_code"])] = dict(o)
+    prev_code = parser.get("prev_occupancy_code")
+    prev = occupancies.get(int(prev_code)) if prev_code is not None else None
+    return parser.get("current_section"), parser.get("current_section_name"), occupancies, prev
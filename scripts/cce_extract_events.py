@@ -0,0 +1,291 @@
+"""
+Machine-readable progress for extract-cce-pdf.py (--events ndjson, --job-id, --status-dir).
+
+Every event is one JSON object per line:
+
+  {"event": "start" | "stage" | "progress" | "rows" | "note" | "error" | "done",
+   "job_id": ..., "seq": n, "ts": "2026-03-02T10:00:00+00:00", ...fields}
+
+With --events ndjson, stdout carries only these lines; the human-readable log moves to stderr.
+With a job id (--job-id, generated when --events is given without one) the same lines are appended
+to <status-dir>/<job_id>.events.ndjson, and <status-dir>/<job_id>.json is replaced atomically
+after every event with the latest state (status, stage, pages_done / pages_total / percent,
+rows, error, on top of the fields the job runner wrote there), so a caller can poll one small
+file or tail the events file instead of holding a request open for the whole run.
+
+"Error: ..." / "Note: ..." lines printed by the extractor become error / note events, and
+run_with_job_events() turns an exit code or uncaught exception into a failed status.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import traceback
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+JOB_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+PROGRESS_STEPS = 100  # progress events per run (at most)
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def new_job_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:8]
+
+
+def status_paths(status_dir: str, job_id: str) -> tuple[Path, Path]:
+    """(<job_id>.json, <job_id>.events.ndjson) under status_dir."""
+    if not JOB_ID_RE.match(job_id):
+        raise ValueError(f"invalid job id {job_id!r} (letters, digits, '_', '.', '-'; max 64)")
+    root = Path(status_dir)
+    return root / f"{job_id}.json", root / f"{job_id}.events.ndjson"
+
+
+def read_job_status(status_dir: str, job_id: str) -> Optional[dict[str, Any]]:
+    path, _ = status_paths(status_dir, job_id)
+    if not path.is_file():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_json_atomic(path: Path, obj: dict[str, Any]) -> None:
+    """Readers polling the file never see a partial write."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, default=str) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def update_job_status(status_dir: str, job_id: str, **fields: Any) -> dict[str, Any]:
+    """Merge fields into <job_id>.json (created when missing); used by cce_job_runner.py for queued / cancelled jobs."""
+    path, _ = status_paths(status_dir, job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    status = read_job_status(status_dir, job_id) or {"job_id": job_id}
+    status.update(fields, updated_at=utc_now_iso())
+    write_json_atomic(path, status)
+    return status
+
+
+class JobEvents:
+    enabled = True
+
+    def __init__(
+        self,
+        job_id: str,
+        *,
+        stream: Optional[TextIO] = None,
+        status_dir: Optional[str] = None,
+    ):
+        self.job_id = job_id
+        self.stream = stream
+        self.status_path: Optional[Path] = None
+        self.events_path: Optional[Path] = None
+        if status_dir:
+            self.status_path, self.events_path = status_paths(status_dir, job_id)
+            self.status_path.parent.mkdir(parents=True, exist_ok=True)
+            self.events_path.write_text("", encoding="utf-8")  # one run per job id
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._rows: Optional[Callable[[], dict[str, int]]] = None
+        self._progress_every = 1
+        # Keep what cce_job_runner.py already recorded for this job (kind, tables, queued_at, log)
+        previous = read_job_status(status_dir, job_id) if status_dir else None
+        self.status: dict[str, Any] = {
+            **(previous or {}),
+            "job_id": job_id,
+            "pid": os.getpid(),
+            "status": "running",
+            "stage": None,
+            "pages_done": 0,
+            "pages_total": None,
+            "percent": None,
+            "last_page": None,
+            "rows": {},
+            "error": None,
+            "started_at": utc_now_iso(),
+            "updated_at": None,
+            "finished_at": None,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return self.status["status"] in TERMINAL_STATUSES
+
+    def emit(self, event: str, **fields: Any) -> None:
+        with self._lock:
+            self._seq += 1
+            now = utc_now_iso()
+            line = json.dumps(
+                {"event": event, "job_id": self.job_id, "seq": self._seq, "ts": now, **fields},
+                ensure_ascii=False,
+                default=str,
+            )
+            if self.stream is not None:
+                self.stream.write(line + "\n")
+                self.stream.flush()
+            if self.events_path is not None:
+                with open(self.events_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            if self.status_path is not None:
+                self.status.update(updated_at=now, seq=self._seq, last_event=event)
+                write_json_atomic(self.status_path, self.status)
+
+    def stage(self, name: str, **fields: Any) -> None:
+        self.status["stage"] = name
+        self.emit("stage", stage=name, **fields)
+
+    def start_pages(self, pages_total: int, rows: Optional[Callable[[], dict[str, int]]] = None) -> None:
+        """Begin page progress; `rows` returns running row totals for progress events."""
+        self._rows = rows
+        self._progress_every = max(1, pages_total // PROGRESS_STEPS)
+        self.status.update(pages_total=pages_total, pages_done=0, percent=0.0 if pages_total else 100.0)
+        self.stage("parse", pages_total=pages_total)
+
+    def page(self, page_num: int, pages_done: int) -> None:
+        """Called once per parsed page; emits a progress event every ~1% of the run."""
+        total = self.status["pages_total"] or 0
+        if pages_done % self._progress_every and pages_done != total:
+            return
+        percent = round(100.0 * pages_done / total, 1) if total else None
+        self.status.update(pages_done=pages_done, last_page=page_num, percent=percent)
+        if self._rows is not None:
+            self.status["rows"] = self._rows()
+        self.emit("progress", page=page_num, pages_done=pages_done, pages_total=total, percent=percent, rows=self.status["rows"])
+
+    def rows(self, counts: dict[str, int], **fields: Any) -> None:
+        self.status["rows"] = dict(counts)
+        self.emit("rows", rows=counts, **fields)
+
+    def log_line(self, line: str) -> None:
+        """Human log line (from LogTap): Error: / Note: lines become events."""
+        if line.startswith("Error:"):
+            self.last_error = line[len("Error:"):].strip()
+            self.emit("error", message=self.last_error)
+        elif line.startswith("Note:"):
+            self.emit("note", message=line[len("Note:"):].strip())
+
+    def finish(self, status: str = "completed", **fields: Any) -> None:
+        if self.finished:
+            return
+        self.status.update(status=status, finished_at=utc_now_iso())
+        if status == "completed" and self.status["pages_total"]:
+            self.status["percent"] = 100.0
+        if "rows" in fields:
+            self.status["rows"] = fields["rows"]
+        if "error" in fields:
+            self.status["error"] = fields["error"]
+        self.emit("done", status=status, **fields)
+
+    def fail(self, message: str, **fields: Any) -> None:
+        self.finish("failed", error=message, **fields)
+
+
+class NullEvents:
+    """No --events / --job-id: every hook is a no-op."""
+
+    enabled = False
+    finished = False
+    last_error = None
+
+    def emit(self, event: str, **fields: Any) -> None:
+        pass
+
+    def stage(self, name: str, **fields: Any) -> None:
+        pass
+
+    def start_pages(self, pages_total: int, rows: Optional[Callable[[], dict[str, int]]] = None) -> None:
+        pass
+
+    def page(self, page_num: int, pages_done: int) -> None:
+        pass
+
+    def rows(self, counts: dict[str, int], **fields: Any) -> None:
+        pass
+
+    def finish(self, status: str = "completed", **fields: Any) -> None:
+        pass
+
+    def fail(self, message: str, **fields: Any) -> None:
+        pass
+
+
+NULL_EVENTS = NullEvents()
+_current: Any = NULL_EVENTS
+
+
+class LogTap:
+    """File-like wrapper for sys.stdout: passes text through to `out` and hands whole lines to events.log_line."""
+
+    def __init__(self, out: TextIO, events: JobEvents):
+        self.out = out
+        self.events = events
+        self._buf = ""
+        self._lock = threading.Lock()  # the --stream writer thread prints too
+
+    def write(self, s: str) -> int:
+        self.out.write(s)
+        with self._lock:
+            self._buf += s
+            lines = self._buf.split("\n")
+            self._buf = lines.pop()
+        for line in lines:
+            self.events.log_line(line)
+        return len(s)
+
+    def flush(self) -> None:
+        self.out.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.out, name)
+
+
+def open_job_events(mode: Optional[str], job_id: Optional[str], status_dir: Optional[str]) -> Any:
+    """
+    JobEvents for --events ndjson and / or --job-id (NULL_EVENTS when neither is given).
+
+    ndjson: events go to the real stdout and sys.stdout is pointed at stderr for the log.
+    """
+    global _current
+    if mode != "ndjson" and not job_id:
+        return NULL_EVENTS
+    job_id = job_id or new_job_id()
+    if mode == "ndjson":
+        events = JobEvents(job_id, stream=sys.stdout, status_dir=status_dir)
+        sys.stdout = LogTap(sys.stderr, events)
+    else:
+        events = JobEvents(job_id, status_dir=status_dir)
+        sys.stdout = LogTap(sys.stdout, events)
+    _current = events
+    return events
+
+
+def current_job_events() -> Any:
+    return _current
+
+
+def run_with_job_events(fn: Callable[[], Any]) -> Any:
+    """Run the extractor's main(); record a completed / failed done event unless main already did."""
+    try:
+        result = fn()
+    except SystemExit as e:
+        events = current_job_events()
+        if e.code in (0, None):
+            events.finish("completed")
+        else:
+            events.fail(events.last_error or f"exited with code {e.code}", exit_code=e.code)
+        raise
+    except BaseException as e:
+        current_job_events().fail(f"{type(e).__name__}: {e}", traceback=traceback.format_exc(limit=8))
+        raise
+    current_job_events().finish("completed")
+    return result
@@ -0,0 +1,235 @@
+"""
+Local run files for extract-cce-pdf.py --output-dir / --load-from.
+
+A run directory holds one columnar file per table, holding the rows a full load would write
+(after the same dedupe as the sinks), plus manifest.json:
+
+  cce_occupancies.*       occupancies with final page ranges
+  cce_cost_rows.*         keyed by occupancy_code (ids are resolved at load time)
+  cce_cost_percentages.*
+  cce_component_costs.*   occupancy_code, not occupancy_id
+  cce_modifiers.*
+  extract_stats.*         one row of parser counters
+  manifest.json           format, extraction_date, edition, cce_extraction_metadata row, per-table files
+
+Files are Parquet when pyarrow is installed (--output-format auto), NDJSON otherwise. In Parquet,
+nested values (extraction_flags, stats samples) are stored as JSON text and keys missing from
+some rows are dropped again on read, so --load-from inserts exactly what a direct run would.
+manifest.json is written last; a directory without one is an incomplete run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from cce_extract_checkpoint import utc_now_iso
+
+RUN_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RUN_TABLES = (
+    "cce_occupancies",
+    "cce_cost_rows",
+    "cce_cost_percentages",
+    "cce_component_costs",
+    "cce_modifiers",
+    "extract_stats",
+)
+OUTPUT_FORMATS = ("auto", "parquet", "ndjson")
+FILE_SUFFIX = {"parquet": ".parquet", "ndjson": ".ndjson"}
+
+
+def _parquet():
+    """pyarrow (+ parquet) modules, or None when pyarrow is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def resolve_output_format(fmt: str) -> str:
+    if fmt == "auto":
+        return "parquet" if _parquet() else "ndjson"
+    if fmt == "parquet" and not _parquet():
+        raise RuntimeError("--output-format parquet needs pyarrow (pip install pyarrow); use ndjson or auto")
+    if fmt not in FILE_SUFFIX:
+        raise ValueError(f"unknown output format {fmt!r}")
+    return fmt
+
+
+def _columns(rows: list[dict]) -> tuple[list[str], list[str], list[str]]:
+    """(all columns in first-seen order, columns missing from some rows, columns holding dict / list values)."""
+    seen: dict[str, int] = {}
+    nested: set[str] = set()
+    for r in rows:
+        for k, v in r.items():
+            seen[k] = seen.get(k, 0) + 1
+            if isinstance(v, (dict, list)):
+                nested.add(k)
+    columns = list(seen)
+    optional = [c for c in columns if seen[c] < len(rows)]
+    return columns, optional, [c for c in columns if c in nested]
+
+
+def _write_parquet(path: Path, rows: list[dict], columns: list[str], json_columns: list[str]) -> None:
+    pa = _parquet()
+    encoded = [
+        {c: (json.dumps(r[c], ensure_ascii=False) if c in json_columns and r.get(c) is not None else r.get(c)) for c in columns}
+        for r in rows
+    ]
+    table = pa.Table.from_pylist(encoded) if encoded else pa.table({c: pa.array([], pa.null()) for c in columns})
+    pa.parquet.write_table(table, str(path))
+
+
+def _write_ndjson(path: Path, rows: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r, ensure_ascii=False, default=str) + "\n")
+
+
+def write_extract_run(
+    out_dir: str,
+    tables: dict[str, list[dict]],
+    *,
+    fmt: str,
+    extraction_date: str,
+    edition_id: Optional[str],
+    pdf_sha256: Optional[str],
+    metadata: dict[str, Any],
+) -> dict[str, Any]:
+    """Write one file per RUN_TABLES entry, then manifest.json (atomically). Returns the manifest."""
+    fmt = resolve_output_format(fmt)
+    target = Path(out_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    entries: dict[str, dict] = {}
+    for name in RUN_TABLES:
+        rows = tables.get(name) or []
+        columns, optional, json_columns = _columns(rows)
+        path = target / f"{name}{FILE_SUFFIX[fmt]}"
+        if fmt == "parquet":
+            _write_parquet(path, rows, columns, json_columns)
+        else:
+            _write_ndjson(path, rows)
+        entries[name] = {
+            "file": path.name,
+            "rows": len(rows),
+            "columns": columns,
+            "optional_columns": optional,
+            "json_columns": json_columns if fmt == "parquet" else [],
+        }
+    manifest = {
+        "version": RUN_FORMAT_VERSION,
+        "format": fmt,
+        "extraction_date": extraction_date,
+        "edition_id": edition_id,
+        "pdf_sha256": pdf_sha256,
+        "metadata": metadata,
+        "tables": entries,
+        "written_at": utc_now_iso(),
+    }
+    tmp = target / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, default=str) + "\n", encoding="utf-8")
+    os.replace(tmp, target / MANIFEST_NAME)
+    return manifest
+
+
+def _iter_table(run_dir: Path, fmt: str, entry: dict, batch_rows: int = 10_000) -> Iterator[dict]:
+    path = run_dir / entry["file"]
+    if fmt == "ndjson":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    pa = _parquet()
+    if pa is None:
+        raise RuntimeError(f"{path} is Parquet; reading it needs pyarrow (pip install pyarrow)")
+    optional, json_columns = set(entry.get("optional_columns") or []), set(entry.get("json_columns") or [])
+    for batch in pa.parquet.ParquetFile(str(path)).iter_batches(batch_size=batch_rows):
+        for r in batch.to_pylist():
+            row = {}
+            for k, v in r.items():
+                if v is None and k in optional:
+                    continue
+                row[k] = json.loads(v) if k in json_columns and v is not None else v
+            yield row
+
+
+def _read_manifest(root: Path, run_dir: str) -> dict[str, Any]:
+    manifest_path = root / MANIFEST_NAME
+    if not manifest_path.is_file():
+        raise FileNotFoundError(f"no {MANIFEST_NAME} in {run_dir} (not a completed --output-dir run)")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("version") != RUN_FORMAT_VERSION:
+        raise ValueError(f"unsupported run format version {manifest.get('version')!r}")
+    return manifest
+
+
+def load_extract_run(run_dir: str) -> tuple[dict[str, Any], dict[str, list[dict]]]:
+    """(manifest, table -> rows) for a directory written by write_extract_run."""
+    root = Path(run_dir)
+    manifest = _read_manifest(root, run_dir)
+    tables = {name: list(_iter_table(root, manifest["format"], entry)) for name, entry in manifest["tables"].items()}
+    for name, entry in manifest["tables"].items():
+        if len(tables[name]) != entry["rows"]:
+            raise ValueError(f"{entry['file']}: {len(tables[name])} rows, manifest says {entry['rows']}")
+    return manifest, tables
+
+
+def iter_extract_run_table(run_dir: str, name: str) -> tuple[dict[str, Any], Iterator[dict]]:
+    """
+    (manifest, rows of one table) without loading the others; rows are read lazily (NDJSON line by
+    line, Parquet in record batches). The row count is checked against the manifest at the end.
+    """
+    root = Path(run_dir)
+    manifest = _read_manifest(root, run_dir)
+    entry = manifest["tables"].get(name)
+    if entry is None:
+        raise KeyError(f"{run_dir}: no {name} table in {MANIFEST_NAME}")
+
+    def rows() -> Iterator[dict]:
+        n = 0
+        for row in _iter_table(root, manifest["format"], entry):
+            n += 1
+            yield row
+        if n != entry["rows"]:
+            raise ValueError(f"{entry['file']}: {n} rows, manifest says {entry['rows']}")
+
+    return manifest, rows()
+
+
+def push_extract_run(
+    sink: Any,
+    tables: dict[str, list[dict]],
+    metadata: dict[str, Any],
+    *,
+    clear_cost_rows: bool = False,
+    clear_cost_percentages: bool = False,
+    clear_component_costs: bool = False,
+    clear_modifiers: bool = False,
+) -> None:
+    """Load a saved run through a sink in the same order as a direct (non-stream) run."""
+    sink.clear_existing(
+        clear_cost_rows=clear_cost_rows,
+        clear_cost_percentages=clear_cost_percentages,
+        clear_component_costs=clear_component_costs,
+        clear_modifiers=clear_modifiers,
+    )
+    occ_list = tables["cce_occupancies"]
+    sink.upsert_occupancies(occ_list)
+    sink.add_modifier_rows(tables["cce_modifiers"])
+    sink.finish_modifier_rows()
+    sink.add_component_rows(tables["cce_component_costs"])
+    sink.finish_component_rows()
+    sink.add_cost_pct_rows(tables["cce_cost_percentages"])
+    sink.finish_cost_pct_rows()
+    if not occ_list:
+        print("No occupancies in run; skipping cce_cost_rows.")
+    else:
+        sink.write_cost_rows(tables["cce_cost_rows"])
+    sink.write_metadata(metadata)
+    sink.close()
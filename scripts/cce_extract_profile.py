@@ -2,15 +2,18 @@
 Load CCE edition profiles (JSON) for extract-cce-pdf.py.
 
 Profiles live under config/cce-profiles/*.json (repo root relative to this package).
+load_cce_profile() returns a CompiledProfile: the merged JSON as a read-only mapping plus page
+sets, alias lookups and header denylists built once per run.
 """
 
 from __future__ import annotations
 
 import json
 import re
+from collections.abc import Mapping
 from datetime import date
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 DEFAULT_PROFILE_REL = Path("config/cce-profiles/default.json")
 
@@ -24,16 +27,19 @@ def default_profile_dict() -> dict[str, Any]:
         "edition_id": "default",
         "extraction_date_override": None,
         "list_line_strategy": "auto",
+        "list_continuation_max_lines": None,
         "page_rules": {
             "skip_pages": [],
             "layout_list_pages": [],
             "force_segregated_crop": True,
+            "skip_tables_on_skip_pages": False,
         },
         "layout": {
             "enabled": False,
             "x_numeric_min_ratio": 0.52,
             "y_tolerance": 3.5,
             "min_words_per_line": 2,
+            "auto_columns": False,
         },
         "section_aliases": {},
         "truncated_and_junk_headers_extra": [],
@@ -46,18 +52,125 @@ def default_profile_dict() -> dict[str, Any]:
     }
 
 
-def load_cce_profile(path_or_name: Optional[str]) -> dict[str, Any]:
+def _page_set(values: Any, key: str) -> frozenset[int]:
+    """Page numbers from a profile list: ints, "27" or inclusive ranges such as "100-250"."""
+    pages: set[int] = set()
+    for v in values or []:
+        if isinstance(v, int) and not isinstance(v, bool):
+            pages.add(v)
+            continue
+        m = re.fullmatch(r"\s*(\d+)\s*(?:-\s*(\d+)\s*)?", v) if isinstance(v, str) else None
+        if not m or (m.group(2) and int(m.group(2)) < int(m.group(1))):
+            raise ValueError(f"page_rules.{key}: expected page numbers or ranges like \"100-250\", got {v!r}")
+        first = int(m.group(1))
+        pages.update(range(first, int(m.group(2) or first) + 1))
+    return frozenset(pages)
+
+
+def _upper_name_set(values: Any) -> frozenset[str]:
+    return frozenset(x.strip().upper() for x in (values or []) if isinstance(x, str) and x.strip())
+
+
+class CompiledProfile(Mapping):
+    """
+    Merged edition profile (read-only mapping over the JSON, so profile.get(...) works as before)
+    with the per-page and per-row lookups precomputed: page_rules page lists as frozensets
+    (ranges expanded), section aliases keyed exactly and upper-cased, and the extra header
+    denylists upper-cased. Hashable by content; pickles as its JSON and recompiles, so it is
+    cheap to hand to page-reader worker processes.
+    """
+
+    __slots__ = (
+        "_data",
+        "_key",
+        "edition_id",
+        "skip_pages",
+        "layout_list_pages",
+        "layout_enabled",
+        "layout_auto_columns",
+        "extra_trunc",
+        "extra_short",
+        "_alias_exact",
+        "_alias_upper",
+    )
+
+    def __init__(self, data: dict[str, Any]):
+        self._data = data
+        self._key = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        page_rules = data.get("page_rules") or {}
+        layout = data.get("layout") or {}
+        self.edition_id = data.get("edition_id")
+        self.skip_pages = _page_set(page_rules.get("skip_pages"), "skip_pages")
+        self.layout_list_pages = _page_set(page_rules.get("layout_list_pages"), "layout_list_pages")
+        self.layout_enabled = bool(layout.get("enabled"))
+        self.layout_auto_columns = self.layout_enabled and bool(layout.get("auto_columns"))
+        self.extra_trunc = _upper_name_set(data.get("truncated_and_junk_headers_extra"))
+        self.extra_short = _upper_name_set(data.get("short_section_denylist_extra"))
+        aliases = data.get("section_aliases") or {}
+        if not isinstance(aliases, dict):
+            aliases = {}
+        self._alias_exact = {k: str(v) for k, v in aliases.items()}
+        self._alias_upper: dict[str, str] = {}
+        for k, v in aliases.items():
+            if isinstance(k, str):
+                self._alias_upper.setdefault(k.strip().upper(), str(v))  # first key wins, as the scan did
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompiledProfile):
+            return self._key == other._key
+        return super().__eq__(other)
+
+    def __reduce__(self) -> tuple[Any, tuple[dict[str, Any]]]:
+        return (CompiledProfile, (self._data,))
+
+    def __repr__(self) -> str:
+        return f"CompiledProfile(edition_id={self.edition_id!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Deep copy of the merged JSON."""
+        return json.loads(json.dumps(self._data))
+
+    def skip_page(self, page_num: int) -> bool:
+        return page_num in self.skip_pages
+
+    def layout_list_enabled_for_page(self, page_num: int) -> bool:
+        return self.layout_enabled and page_num in self.layout_list_pages
+
+    def section_alias(self, name: Optional[str]) -> Optional[str]:
+        """section_aliases lookup: exact key first, then trimmed case-insensitive."""
+        if not name:
+            return name
+        hit = self._alias_exact.get(name)
+        if hit is not None:
+            return hit
+        return self._alias_upper.get(name.strip().upper(), name)
+
+
+def load_cce_profile(path_or_name: Optional[str]) -> CompiledProfile:
     """
     Merge default profile with JSON file.
     path_or_name: None -> default.json only; "march_2026" -> config/cce-profiles/march_2026.json;
     absolute or relative path -> that file.
+    Raises ValueError for malformed page_rules page lists.
     """
     base = default_profile_dict()
     if not path_or_name or str(path_or_name).strip().lower() in ("", "default"):
         path = _repo_root() / DEFAULT_PROFILE_REL
         if path.is_file():
-            return _merge_profile(base, _read_json(path))
-        return base
+            return CompiledProfile(_merge_profile(base, _read_json(path)))
+        return CompiledProfile(base)
 
     p = str(path_or_name).strip()
     root = _repo_root()
@@ -71,7 +184,7 @@ def load_cce_profile(path_or_name: Optional[str]) -> dict[str, Any]:
     if not candidate.is_file():
         raise FileNotFoundError(f"CCE profile not found: {candidate}")
 
-    return _merge_profile(base, _read_json(candidate))
+    return CompiledProfile(_merge_profile(base, _read_json(candidate)))
 
 
 def _read_json(path: Path) -> dict[str, Any]:
@@ -82,8 +195,8 @@ def _read_json(path: Path) -> dict[str, Any]:
     return data
 
 
-def _merge_profile(base: dict[str, Any], overlay: dict[str, Any]) -> dict[str, Any]:
-    out = json.loads(json.dumps(base))
+def _merge_profile(base: Mapping[str, Any], overlay: Mapping[str, Any]) -> dict[str, Any]:
+    out = json.loads(json.dumps(dict(base)))
     for k, v in overlay.items():
         if k in ("page_rules", "layout", "component_table") and isinstance(v, dict) and isinstance(out.get(k), dict):
             out[k] = {**out[k], **v}
@@ -92,7 +205,7 @@ def _merge_profile(base: dict[str, Any], overlay: dict[str, Any]) -> dict[str, A
     return out
 
 
-def profile_extraction_date(profile: dict[str, Any], pdf_path: str) -> date:
+def profile_extraction_date(profile: Mapping[str, Any], pdf_path: str) -> date:
     """Use profile override ISO date (YYYY-MM-DD) if set; else parse from PDF filename."""
     override = profile.get("extraction_date_override")
     if override and isinstance(override, str):
@@ -140,7 +253,9 @@ def _parse_date_from_pdf(pdf_path: str) -> date:
     return date.today()
 
 
-def apply_section_alias(profile: dict[str, Any], name: Optional[str]) -> Optional[str]:
+def apply_section_alias(profile: Mapping[str, Any], name: Optional[str]) -> Optional[str]:
+    if isinstance(profile, CompiledProfile):
+        return profile.section_alias(name)
     if not name:
         return name
     aliases = profile.get("section_aliases") or {}
@@ -156,16 +271,25 @@ def apply_section_alias(profile: dict[str, Any], name: Optional[str]) -> Optiona
     return name
 
 
-def profile_skip_page(profile: dict[str, Any], page_num: int) -> bool:
-    pages = (profile.get("page_rules") or {}).get("skip_pages") or []
-    return page_num in pages
+def profile_skip_page(profile: Mapping[str, Any], page_num: int) -> bool:
+    if isinstance(profile, CompiledProfile):
+        return profile.skip_page(page_num)
+    return page_num in _page_set((profile.get("page_rules") or {}).get("skip_pages"), "skip_pages")
 
 
-def profile_layout_list_enabled_for_page(profile: dict[str, Any], page_num: int) -> bool:
+def profile_layout_list_enabled_for_page(profile: Mapping[str, Any], page_num: int) -> bool:
+    if isinstance(profile, CompiledProfile):
+        return profile.layout_list_enabled_for_page(page_num)
     layout = profile.get("layout") or {}
     if not layout.get("enabled"):
         return False
-    pages = (profile.get("page_rules") or {}).get("layout_list_pages") or []
-    if not pages:
-        return False
-    return page_num in pages
+    pages = (profile.get("page_rules") or {}).get("layout_list_pages")
+    return page_num in _page_set(pages, "layout_list_pages")
+
+
+def profile_layout_auto_columns(profile: Mapping[str, Any]) -> bool:
+    """layout.enabled + layout.auto_columns: bbox parsing with detected column bands on every list page."""
+    if isinstance(profile, CompiledProfile):
+        return profile.layout_auto_columns
+    layout = profile.get("layout") or {}
+    return bool(layout.get("enabled")) and bool(layout.get("auto_columns"))
@@ -0,0 +1,222 @@
+"""
+Stage timers and per-page counters for extract-cce-pdf.py --profile-report.
+
+Stages are ';'-separated paths (flame-graph style). The parse loop is timed as laps: stage(name)
+closes the running segment and opens the next, so the many `continue`s in the page body need no
+try/finally. Roots:
+
+  setup        profile / sink / cache setup before the first page
+  finish       end-of-run occupancy list, dedupe, fingerprints
+  read         main thread waiting for the next page; children are per-view reader times
+               (read;text, read;tables, ...) returned with each page by cce_pdf_pages.read_page,
+               measured in the worker processes when --workers > 1 (so they can exceed `read`)
+  parse;*      page state, % tables, list lines, grid tables; instrument() adds helper functions
+               (parse;list_lines;cached_normalize_component_item_name, ...)
+  write;*      sink calls (stream queue waits, end-of-run inserts, --output-dir files)
+
+write_report() emits a JSON summary (stage totals and self time, slowest pages with per-page row
+counts) and a .folded file (`path microseconds` per line) for flamegraph.pl / speedscope.
+
+When profiling is off the extractor uses NULL_PROFILER, whose methods do nothing and whose
+pages() returns the iterator unchanged; helpers are only wrapped when profiling is on.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+PROFILE_REPORT_VERSION = 1
+SLOWEST_PAGES = 20
+
+
+class StageProfiler:
+    enabled = True
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.counters: Optional[Callable[[], dict[str, int]]] = None
+        self.totals: dict[str, list] = {}  # path -> [seconds, calls]
+        self.pages_seen: dict[int, dict[str, Any]] = {}
+        self._stack: list[str] = []  # open instrumented calls under the running stage
+        self._stage: Optional[str] = None
+        self._stage_start = 0.0
+        self._page: Optional[dict[str, Any]] = None
+        self._page_counts: dict[str, int] = {}
+
+    def add(self, path: str, seconds: float, calls: int = 1) -> None:
+        entry = self.totals.get(path)
+        if entry is None:
+            self.totals[path] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+        if self._page is not None:
+            stages = self._page["stages"]
+            stages[path] = stages.get(path, 0.0) + seconds
+
+    def stage(self, path: Optional[str]) -> None:
+        """Close the running segment and start `path` (None: just close)."""
+        now = self.clock()
+        if self._stage is not None:
+            self.add(self._stage, now - self._stage_start)
+        self._stage = path
+        self._stage_start = now
+
+    def begin_page(self, page_num: int, timings: Optional[dict[str, float]] = None, page_class: Optional[str] = None) -> None:
+        """Attribute reader timings and the following parse segments to page_num."""
+        self.stage(None)
+        self._page = self.pages_seen.setdefault(page_num, {"page": page_num, "page_class": page_class, "stages": {}, "rows": {}})
+        for view, seconds in (timings or {}).items():
+            self.add(f"read;{view}", seconds)
+        self._page_counts = self.counters() if self.counters else {}
+        self.stage("parse;page_state")
+
+    def _end_page(self) -> None:
+        self.stage(None)
+        if self._page is not None and self.counters:
+            now = self.counters()
+            rows = {k: v - self._page_counts.get(k, 0) for k, v in now.items()}
+            self._page["rows"] = {k: v for k, v in rows.items() if v}
+        self._page = None
+
+    def pages(self, it: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Wrap the page iterator: closes each page's last segment and times the wait for the next."""
+        it = iter(it)
+        while True:
+            self._end_page()
+            t0 = self.clock()
+            try:
+                data = next(it)
+            except StopIteration:
+                return
+            self.add("read", self.clock() - t0)
+            yield data
+
+    def instrument(self, namespace: dict[str, Any], names: Iterable[str]) -> None:
+        """Replace namespace[name] with a wrapper timed as a child of whatever stage is running."""
+        for name in names:
+            fn = namespace.get(name)
+            if fn is not None and not getattr(fn, "_cce_profiled", False):
+                namespace[name] = self._wrap(name, fn)
+
+    def _wrap(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed_call(*args: Any, **kwargs: Any) -> Any:
+            parent = self._stack[-1] if self._stack else (self._stage or "parse")
+            path = f"{parent};{name}"
+            self._stack.append(path)
+            t0 = self.clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(path, self.clock() - t0)
+                self._stack.pop()
+
+        timed_call._cce_profiled = True  # type: ignore[attr-defined]
+        return timed_call
+
+    def self_seconds(self) -> dict[str, float]:
+        """Total minus direct children (clamped at 0: parallel reader time can exceed the wait)."""
+        own = {path: entry[0] for path, entry in self.totals.items()}
+        for path, entry in self.totals.items():
+            parent = path.rpartition(";")[0]
+            if parent in own:
+                own[parent] -= entry[0]
+        return {path: max(0.0, s) for path, s in own.items()}
+
+    def report(self, *, slowest: int = SLOWEST_PAGES, extra: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        self._end_page()
+        wall = self.clock() - self.started
+        own = self.self_seconds()
+        # Outermost recorded paths (no recorded ancestor), summed per root: setup / read / parse / write
+        roots: dict[str, float] = {}
+        for path, entry in self.totals.items():
+            parts = path.split(";")
+            if not any(";".join(parts[:i]) in self.totals for i in range(1, len(parts))):
+                roots[parts[0]] = roots.get(parts[0], 0.0) + entry[0]
+        tracked = sum(roots.values())
+        stages = [
+            {
+                "stage": path,
+                "seconds": round(entry[0], 6),
+                "self_seconds": round(own[path], 6),
+                "calls": entry[1],
+                "pct_of_wall": round(100.0 * entry[0] / wall, 2) if wall else 0.0,
+            }
+            for path, entry in sorted(self.totals.items(), key=lambda kv: -kv[1][0])
+        ]
+        pages = []
+        for rec in self.pages_seen.values():
+            read = sum(s for p, s in rec["stages"].items() if p.startswith("read;"))
+            parse = sum(s for p, s in rec["stages"].items() if p.startswith("parse;") and p.count(";") == 1)
+            pages.append({**rec, "seconds": round(read + parse, 6), "read_seconds": round(read, 6), "parse_seconds": round(parse, 6)})
+        pages.sort(key=lambda r: -r["seconds"])
+        for rec in pages[:slowest]:
+            rec["stages"] = {p: round(s, 6) for p, s in sorted(rec["stages"].items(), key=lambda kv: -kv[1])}
+        return {
+            "version": PROFILE_REPORT_VERSION,
+            "wall_seconds": round(wall, 6),
+            "pages": len(self.pages_seen),
+            "roots": {k: round(v, 6) for k, v in sorted(roots.items(), key=lambda kv: -kv[1])},
+            "untracked_seconds": round(max(0.0, wall - tracked), 6),
+            "stages": stages,
+            "slowest_pages": pages[:slowest],
+            **(extra or {}),
+        }
+
+    def folded_lines(self, root: str = "extract-cce-pdf", untracked: float = 0.0) -> list[str]:
+        """flamegraph.pl / speedscope "folded" stacks: self time in microseconds per path."""
+        own = self.self_seconds()
+        if untracked:
+            own["untracked"] = untracked
+        return [f"{root};{path} {round(s * 1e6)}" for path, s in sorted(own.items()) if round(s * 1e6) > 0]
+
+    def write_report(self, path: str, *, extra: Optional[dict[str, Any]] = None) -> tuple[dict[str, Any], str]:
+        """Write JSON to `path` and folded stacks next to it (.folded). Returns (report, folded path)."""
+        report = self.report(extra=extra)
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        folded = target.with_suffix(".folded")
+        folded.write_text("\n".join(self.folded_lines(untracked=report["untracked_seconds"])) + "\n", encoding="utf-8")
+        return report, str(folded)
+
+
+class NullProfiler:
+    """Profiling off: every hook is a no-op."""
+
+    enabled = False
+    counters = None
+
+    def stage(self, path: Optional[str]) -> None:
+        pass
+
+    def begin_page(self, page_num: int, timings: Optional[dict[str, float]] = None, page_class: Optional[str] = None) -> None:
+        pass
+
+    def pages(self, it: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+        return it
+
+    def instrument(self, namespace: dict[str, Any], names: Iterable[str]) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def format_stage_summary(report: dict[str, Any], limit: int = 12) -> list[str]:
+    lines = [
+        f"Profile: {report['wall_seconds']:.2f}s wall, {report['pages']} pages ("
+        + ", ".join(f"{k} {v:.2f}s" for k, v in report["roots"].items())
+        + f", untracked {report['untracked_seconds']:.2f}s)"
+    ]
+    for s in report["stages"][:limit]:
+        lines.append(f"  {s['stage']:<60} {s['seconds']:9.3f}s {s['pct_of_wall']:6.1f}%  self {s['self_seconds']:.3f}s  calls {s['calls']}")
+    for rec in report["slowest_pages"][:5]:
+        lines.append(f"  slow page {rec['page']}: {rec['seconds']:.3f}s (read {rec['read_seconds']:.3f}s, parse {rec['parse_seconds']:.3f}s)")
+    return lines
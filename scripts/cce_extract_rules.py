@@ -0,0 +1,229 @@
+"""
+Skip / block / section-header rules for extract-cce-pdf.py, compiled once per run.
+
+The extractor used to rebuild these blocklists inside the page loop and test items with
+`any(re.search(p, item) for p in PATTERNS)`. Pattern lists are now fused into one
+alternation each, and list-line header detection (four anchored regexes, tried for every
+line twice: once by the continuation joiner and once by the list parser) goes through
+match_list_header(), which rules a line out with substring / length / digit checks before
+running at most the regexes that can still match. Results are identical to trying the
+regexes in order; see bench-cce-extract-rules.py for lines/sec before and after.
+
+Profile-dependent pieces (extra truncated-junk headers, extra short-section denylist, list
+line strategy) live on ExtractRules (compile_extract_rules(profile)).
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from cce_component_item_extract import LIST_TRUNCATED_AND_JUNK_HEADERS, section_name_is_weak_short
+from cce_extract_profile import CompiledProfile
+
+
+def fuse_patterns(patterns: tuple[str, ...], flags: int = 0) -> re.Pattern:
+    """One regex whose .search() matches iff any pattern's re.search() does."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+def fuse_substrings(phrases: tuple[str, ...]) -> re.Pattern:
+    """One regex whose .search() matches iff any phrase is a substring."""
+    return re.compile("|".join(re.escape(p) for p in phrases))
+
+
+MONTH_NAMES = (
+    "JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE",
+    "JULY", "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER",
+)
+
+# --- Page section names ("SECTION 11 PAGE 3 APARTMENTS") ---
+
+SECTION_NAME_RE = re.compile(r"SECTION\s+\d+\s+PAGE\s+\d+\s+([A-Z][A-Za-z\s]+?)(?:\s|$|\n)")
+# Blocklist: dates, brand names, common false positives from PDF layout
+BLOCKED_SECTION_NAMES = frozenset({
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+    "Marshall", "MARSHALL", "Calculator", "CALCULATOR", "Method", "Notes", "Outline",
+    "Table", "TTAABBLLEE",
+    "CLASS", "Type", "Exterior", "INDEX", "ALTERNATE", "OUTLINE",
+})
+REPEATED_CHAR_RE = re.compile(r"(.)\1{3,}")
+
+# --- Shared small matchers ---
+
+HAS_DIGIT_RE = re.compile(r"\d")
+NUMERIC_ONLY_RE = re.compile(r"^[\d\.\s]+$")
+NUMERIC_WITH_COMMAS_RE = re.compile(r"^[\d\.\s,]+$")
+
+# --- Occupancy names ("APARTMENTS (300)") ---
+
+OCCUPANCY_NAME_BLOCKLIST = (
+    "proprietary", "license", "agreement", "msb ", " msb", "information (",
+    "welcome", "dear ", "customer", "subscription", "renewal",
+)
+OCCUPANCY_NAME_BLOCK_RE = fuse_substrings(OCCUPANCY_NAME_BLOCKLIST)
+
+# --- List-style component lines ---
+
+LIST_SKIP_PATTERNS = (
+    r"^dear\b", r"^dear\s+customer", r"^it is a pleasure", r"^customer\b",
+    r"^(excellent|very good|good|average|fair|low|cheap)$",
+    r"^(excellent|very good|good|average|fair|low|cheap)\s*[|\|]\s*[\d\.]+",  # "Good | 18.1"
+    r"^(i|ii|iii|iv|v|vi)$", r"^section\s+[ivxlcdm]+\s*$", r"^for\s+",
+    r"^see\s+section\s+", r"^deduct\s+",
+)
+LIST_SKIP_RE = fuse_patterns(LIST_SKIP_PATTERNS)
+LIST_SKIP_SECTIONS = frozenset({
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+    "LIFE EXPECTANCY", "LIFE EXPECTANCY GUIDELINES",
+    "MARSHALL", "Marshall", "MARSHALL VALUATION SERVICE", "VALUATION SERVICE",
+})
+# Block "Add for X" - these are sub-headers/add-ons, not main sections
+ADD_FOR_PATTERN = re.compile(r"^[Aa]dd\s+for\s+", re.I)
+
+# Subsection headers on list-style pages (e.g. "EXTERIOR BALCONIES/LANDINGS (Apply to balcony area)")
+SUBSECTION_HEADER_RE = re.compile(
+    r"^([A-Z][A-Za-z\s/]+?)\s*\(Apply to\s+[^)]+\)\s*$",
+    re.IGNORECASE,
+)
+# Fallback: standalone section headings (e.g. "BALCONIES AND CANOPIES", "EXTERIOR BALCONIES")
+LIST_SECTION_FALLBACK_RE = re.compile(
+    r"^([A-Z][A-Za-z\s/]+(?:AND|OR)\s+[A-Za-z\s/]+)\s*$",
+)
+LIST_SECTION_SIMPLE_RE = re.compile(
+    r"^([A-Z][A-Za-z\s/]+(?:BALCONIES|CANOPIES|LANDINGS|MARQUEES)[A-Za-z\s/]*)\s*$",
+)
+_SIMPLE_SECTION_WORDS_RE = re.compile(r"BALCONIES|CANOPIES|LANDINGS|MARQUEES")
+# Wall Costs, Doors, and similar list-style section headers
+LIST_SECTION_HEADER_RE = re.compile(
+    r"^(WALL\s+COSTS|DOORS\s*-\s*RESIDENTIAL|GARAGE\s+DOORS|ORNAMENTAL\s+DOORWAYS|MISCELLANEOUS"
+    r"|[A-Z][A-Za-z\s,]+(?:\s*-\s*[A-Z][A-Za-z\s]+)?)\s*$",
+    re.IGNORECASE,
+)
+# Segregated cost method category (e.g. "SHEDS AND FARM BUILDINGS", "CHURCHES, THEATERS AND AUDITORIUMS")
+SEGREGATED_CATEGORY_RE = re.compile(
+    r"^([A-Z][A-Za-z\s,]+(?:AND|OR)\s+[A-Za-z\s,]+)\s*$",
+)
+
+# --- Component tables ---
+
+# Skip false positives: letters, quality words, building classes, TOC
+SKIP_ITEM_PATTERNS = (
+    r"^dear\b",
+    r"^dear\s+customer",
+    r"^it is a pleasure",
+    r"^customer\b",
+    r"^(excellent|very good|good|average|fair|low|cheap)$",
+    r"^(excellent|very good|good|average|fair|low|cheap)\s*[|\|]\s*[\d\.]+",
+    r"^(i|ii|iii|iv|v|vi)$",
+    r"^section\s+[ivxlcdm]+\s*$",
+    r"^[a-ds]\s*$",  # Single letter (building class)
+    r"^(a-b|c-d-s|d\s*pole|s\s*slant|d\s*hoop|cds)$",
+    r"^[a-ds]\s+pole$",
+    r"^[a-ds]\s+slant",
+    r"^[a-ds]\s+hoop",
+)
+SKIP_ITEM_RE = fuse_patterns(SKIP_ITEM_PATTERNS)
+# Cost-column header cells: sizes (¼", 25,000), sizes with units (10 FT), descriptive (SPHEROID)
+SIZE_HEADER_RE = re.compile(r"^[\d¼½¾⅛⅜⅝⅞\/\"\'\s\.]+$")
+SIZE_HEADER_FALLBACK_RE = re.compile(r"^[\d¼½¾\/\"\'\s\.]+$")
+SIZE_UNITS_HEADER_RE = re.compile(r"^[\d\s\.\'\"ftm]+$", re.I)
+DESCRIPTIVE_HEADER_RE = re.compile(r"^[A-Z][A-Za-z\s\-]+$")
+
+# Occupancy grids without a header row (e.g. 26.50 | 265.00 | C | EXCELLENT | FINE INTERIOR...)
+QUALITY_WORDS = ("EXCELLENT", "GOOD", "AVERAGE", "FAIR", "LOW", "CHEAP")
+BUILDING_CLASS_PATTERN = re.compile(r"^[A-DS](-[A-DS]+)?$", re.I)
+BUILDING_CLASS_CODES = frozenset({"A", "B", "C", "D", "S", "A-B", "C-D-S"})
+
+
+def match_list_header(line: str) -> Optional[tuple[str, re.Match]]:
+    """
+    ("subsection" | "fallback" | "simple" | "header", match) for a stripped list line, or None.
+
+    Same result as trying SUBSECTION_HEADER_RE, LIST_SECTION_FALLBACK_RE (len >= 15),
+    LIST_SECTION_SIMPLE_RE (len >= 10) and LIST_SECTION_HEADER_RE (5 <= len <= 50) in order.
+    Each regex needs a leading letter; only the subsection one allows digits (inside its
+    "(Apply to ...)"), so cost lines are rejected without running any of them.
+    """
+    if not line or not line[0].isalpha():
+        return None
+    if "(" in line:
+        m = SUBSECTION_HEADER_RE.match(line)
+        if m:
+            return "subsection", m
+    if HAS_DIGIT_RE.search(line):
+        return None
+    n = len(line)
+    if n >= 15 and ("AND" in line or "OR" in line):
+        m = LIST_SECTION_FALLBACK_RE.match(line)
+        if m:
+            return "fallback", m
+    if n >= 10 and _SIMPLE_SECTION_WORDS_RE.search(line):
+        m = LIST_SECTION_SIMPLE_RE.match(line)
+        if m:
+            return "simple", m
+    if 5 <= n <= 50:
+        m = LIST_SECTION_HEADER_RE.match(line)
+        if m:
+            return "header", m
+    return None
+
+
+def list_line_is_protected_for_merge(line: str) -> bool:
+    """Same structural lines as the list parser: do not glue across section/subsection headers."""
+    return match_list_header(line) is not None
+
+
+class ExtractRules:
+    """Profile-dependent matchers (build once per run with compile_extract_rules)."""
+
+    def __init__(
+        self,
+        extra_trunc: frozenset[str],
+        extra_short: frozenset[str],
+        list_strategy: str,
+        list_continuation_max_lines: Optional[int] = None,
+    ):
+        self.extra_trunc = extra_trunc
+        self.extra_short = extra_short
+        self.list_strategy = list_strategy
+        self.list_continuation_max_lines = list_continuation_max_lines
+        self.truncated_junk_headers = LIST_TRUNCATED_AND_JUNK_HEADERS | extra_trunc
+
+    def header_is_truncated_junk(self, name: str) -> bool:
+        """list_section_header_is_truncated_junk(name, extra_trunc) with the sets pre-merged."""
+        return (name or "").strip().upper() in self.truncated_junk_headers
+
+    def section_candidate_ok(self, cand: str) -> bool:
+        """List/subsection header usable as a section: not "Add for ..." and not a truncated fragment."""
+        return not ADD_FOR_PATTERN.match(cand) and not self.header_is_truncated_junk(cand)
+
+    def section_name_is_weak_short(self, raw_name: str) -> bool:
+        return section_name_is_weak_short(raw_name, extra=self.extra_short)
+
+
+def _upper_set(values: Any) -> frozenset[str]:
+    return frozenset(x.strip().upper() for x in (values or []) if isinstance(x, str) and x.strip())
+
+
+def _max_lines(value: Any) -> Optional[int]:
+    """Profile line cap: null / 0 -> no limit; otherwise a positive integer."""
+    if value is None or value == 0:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"list_continuation_max_lines must be a non-negative integer or null, got {value!r}")
+    return value
+
+
+def compile_extract_rules(profile: Mapping[str, Any]) -> ExtractRules:
+    """Rules for a profile dict, or a CompiledProfile (its denylist sets are reused)."""
+    compiled = isinstance(profile, CompiledProfile)
+    return ExtractRules(
+        extra_trunc=profile.extra_trunc if compiled else _upper_set(profile.get("truncated_and_junk_headers_extra")),
+        extra_short=profile.extra_short if compiled else _upper_set(profile.get("short_section_denylist_extra")),
+        list_strategy=str(profile.get("list_line_strategy") or "auto").strip().lower(),
+        list_continuation_max_lines=_max_lines(profile.get("list_continuation_max_lines")),
+    )
@@ -0,0 +1,625 @@
+"""
+Supabase writes for extract-cce-pdf.py.
+
+SupabaseSink holds the batched insert / upsert logic (same tables, batch sizes and messages
+whether rows arrive all at the end or page by page). Batches are large and adaptive: a
+request rejected as too large or cancelled by the statement timeout is split in half and
+retried, later batches use the smaller size, and the size grows back after successes. A
+client read timeout is not split (the server may already have committed the insert, and a
+resend would duplicate rows) except for the cost % upsert, where resending is harmless.
+Component and cost-row inserts run on a small thread pool (--rest-concurrency); modifier
+inserts and cost % upserts stay sequential (a failed modifier insert stops later ones, and
+upserts of the same key must keep their order).
+Component, cost % and modifier batches that fail are reported ("Note: ... skipped") and the
+run goes on, but they are recorded in write_failures: extract-cce-pdf.py --checkpoint refuses
+to checkpoint past them and fails the run.
+
+StreamWriter runs a sink on a background thread behind a bounded queue (--stream): parsing
+continues while batches are inserted, and the queue bound keeps memory flat when the
+database is slower than parsing.
+
+The direct-Postgres sink (COPY into staging tables, one transaction) is in
+cce_extract_sql_sink.py; both expose the same methods.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Rows per REST request (upper bound; AdaptiveBatch shrinks it when the server pushes back)
+BATCH_MODIFIERS = 200
+BATCH_COMPONENTS = 500
+BATCH_PCT = 500
+BATCH_COST_ROWS = 1000
+MIN_BATCH_ROWS = 10
+REST_CONCURRENCY = 4
+PAGES_PER_FILTER = 200  # source_page=in.(...) values per delete (URL length)
+FINGERPRINT_PAGE_ROWS = 1000  # PostgREST max rows per select
+
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def occupancy_row(o: dict) -> dict:
+    return {
+        "occupancy_code": o["occupancy_code"],
+        "occupancy_name": o["occupancy_name"],
+        "section_number": o.get("section_number"),
+        "page_start": o.get("page_start"),
+        "page_end": o.get("page_end"),
+    }
+
+
+def component_row_key(r: dict, extraction_date_str: str) -> tuple:
+    return (r.get("section_name"), r.get("item_name"), r.get("source_page"), extraction_date_str)
+
+
+def dedupe_component_rows(rows: list[dict], extraction_date_str: str) -> list[dict]:
+    """Dedupe by (section_name, item_name, source_page, extraction_date): first position, last value."""
+    seen: dict[tuple, dict] = {}
+    for r in rows:
+        seen[component_row_key(r, extraction_date_str)] = r
+    return list(seen.values())
+
+
+def component_db_row(row: dict, occ_id_map: dict, extraction_date_str: str) -> dict:
+    """cce_component_costs row: occupancy_code → occupancy_id (when known), plus extraction_date."""
+    r = dict(row)
+    occ_code = r.pop("occupancy_code", None)
+    occ_id = occ_id_map.get(occ_code) if occ_code else None
+    if occ_id:
+        r["occupancy_id"] = occ_id
+    r["extraction_date"] = extraction_date_str
+    return r
+
+
+def cost_pct_row_key(r: dict) -> tuple:
+    return (r.get("section_name"), r.get("occupancy"), r.get("category"))
+
+
+def dedupe_cost_pct_rows(rows: list[dict]) -> list[dict]:
+    """
+    Dedupe cost % rows by the upsert key (section_name, occupancy, category), keeping the last
+    value: one upsert may not touch the same row twice, and later rows win either way.
+    """
+    seen: dict[tuple, dict] = {}
+    for r in rows:
+        seen[cost_pct_row_key(r)] = r
+    return list(seen.values())
+
+
+def cost_row_key(r: dict) -> tuple:
+    return (
+        r["occupancy_code"],
+        r.get("building_class") or "",
+        r.get("quality_type") or "",
+        r.get("exterior_walls") or "",
+        r.get("interior_finish") or "",
+        r.get("lighting_plumbing") or "",
+        r.get("heat") or "",
+    )
+
+
+def dedupe_cost_rows(rows: list[dict]) -> list[dict]:
+    """Dedupe cost rows by logical key (keep last occurrence, at the first occurrence's position)."""
+    seen: dict[tuple, dict] = {}
+    for r in rows:
+        seen[cost_row_key(r)] = r
+    return list(seen.values())
+
+
+def cost_db_row(r: dict, occ_id: str, extraction_date_str: str) -> dict:
+    """cce_cost_rows row for an extracted cost row whose occupancy has id occ_id."""
+    return {
+        "occupancy_id": occ_id,
+        "building_class": r["building_class"],
+        "quality_type": r["quality_type"],
+        "exterior_walls": r["exterior_walls"],
+        "interior_finish": r["interior_finish"],
+        "lighting_plumbing": r["lighting_plumbing"],
+        "heat": r["heat"],
+        "cost_sq_m": r["cost_sq_m"],
+        "cost_cu_ft": r["cost_cu_ft"],
+        "cost_sq_ft": r["cost_sq_ft"],
+        "source_page": r["source_page"],
+        "extraction_date": extraction_date_str,
+    }
+
+
+def is_batch_too_large(exc: BaseException, *, idempotent: bool = False) -> bool:
+    """
+    True for rejections a smaller batch can fix and where nothing was written: HTTP 413 and
+    statement timeout (57014). A client-side timeout may arrive after the server committed
+    the batch, so it only counts for idempotent writes (upserts), where resending is safe.
+    """
+    if idempotent and "timeout" in type(exc).__name__.lower():
+        return True
+    code = getattr(exc, "code", None)
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if str(code) in ("413", "57014") or status == 413:
+        return True
+    text = str(exc).lower()
+    return any(
+        marker in text
+        for marker in ("payload too large", "request entity too large", "statement timeout", "57014")
+    )
+
+
+class AdaptiveBatch:
+    """
+    Rows per request for one table: starts at max_size, halves (down to min_size) when a
+    request is rejected as too large, doubles back after grow_after successes in a row.
+    """
+
+    def __init__(self, max_size: int, min_size: int = MIN_BATCH_ROWS, grow_after: int = 4):
+        self.max_size = max(1, int(max_size))
+        self.min_size = max(1, min(min_size, self.max_size))
+        self.size = self.max_size
+        self.grow_after = grow_after
+        self._ok = 0
+        self._lock = threading.Lock()
+
+    def shrink(self, failed_len: int) -> int:
+        with self._lock:
+            self.size = max(self.min_size, min(self.size, failed_len // 2))
+            self._ok = 0
+            return self.size
+
+    def success(self) -> None:
+        with self._lock:
+            self._ok += 1
+            if self._ok >= self.grow_after and self.size < self.max_size:
+                self.size = min(self.max_size, self.size * 2)
+                self._ok = 0
+
+
+class SupabaseSink:
+    """Batched writes of extracted rows; add_* buffer and flush full batches, finish_* flush the rest."""
+
+    def __init__(
+        self,
+        supabase: Any,
+        extraction_date_str: str,
+        *,
+        batch_rows: Optional[int] = None,
+        concurrency: int = 1,
+    ):
+        """batch_rows caps rows per request for every table (default: BATCH_* per table)."""
+        self.supabase = supabase
+        self.extraction_date = extraction_date_str
+        self.occ_id_map: dict[int, str] = {}
+        self._modifier_batch = AdaptiveBatch(batch_rows or BATCH_MODIFIERS)
+        self._component_batch = AdaptiveBatch(batch_rows or BATCH_COMPONENTS)
+        self._pct_batch = AdaptiveBatch(batch_rows or BATCH_PCT)
+        self._cost_batch = AdaptiveBatch(batch_rows or BATCH_COST_ROWS)
+        self._modifier_buf: list[dict] = []
+        self._modifiers_inserted = 0
+        self._modifiers_failed = False
+        self._component_buf: list[dict] = []
+        self._component_batches = 0
+        self._pct_buf: list[dict] = []
+        self._pct_batches = 0
+        self._concurrency = max(1, concurrency)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if self._concurrency > 1:
+            self._pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="cce-rest")
+        self._inflight: list[Future] = []
+        # Batches dropped after a "Note: ... skipped" (the run goes on); a checkpoint must not pass them
+        self.write_failures: list[str] = []
+        self._failures_lock = threading.Lock()
+
+    # --- Requests: split on "too large", optional thread pool ---
+
+    def _send(
+        self,
+        table: str,
+        rows: list[dict],
+        write: Callable[[list[dict]], Any],
+        batch: AdaptiveBatch,
+        *,
+        idempotent: bool = False,
+    ) -> None:
+        """write(rows), splitting into smaller requests while the server rejects the size."""
+        try:
+            write(rows)
+        except Exception as e:
+            if len(rows) <= batch.min_size or not is_batch_too_large(e, idempotent=idempotent):
+                raise
+            size = batch.shrink(len(rows))
+            print(f"Note: {table} request of {len(rows)} rows rejected ({e}); retrying in batches of {size}")
+            for i in range(0, len(rows), size):
+                self._send(table, rows[i : i + size], write, batch, idempotent=idempotent)
+            return
+        batch.success()
+
+    def _insert_fn(self, table: str) -> Callable[[list[dict]], Any]:
+        return lambda rows: self.supabase.table(table).insert(rows).execute()
+
+    def _run(self, fn: Callable[..., None], *args: Any) -> None:
+        """Run now (concurrency 1) or on the pool, keeping at most 2x concurrency requests in flight."""
+        if self._pool is None:
+            fn(*args)
+            return
+        while len(self._inflight) >= 2 * self._concurrency:
+            self._inflight.pop(0).result()
+        self._inflight.append(self._pool.submit(fn, *args))
+
+    def drain(self) -> None:
+        """Wait for in-flight requests; re-raise the first error."""
+        futures, self._inflight = self._inflight, []
+        first_error: Optional[BaseException] = None
+        for f in futures:
+            try:
+                f.result()
+            except BaseException as e:  # noqa: BLE001 - raised below after the rest finish
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+
+    def close(self) -> None:
+        """Finish in-flight requests and stop the pool."""
+        try:
+            self.drain()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def clear_existing(
+        self,
+        *,
+        clear_cost_rows: bool = False,
+        clear_cost_percentages: bool = False,
+        clear_component_costs: bool = False,
+        clear_modifiers: bool = False,
+    ) -> None:
+        """Clear tables (--clear-*) or replace rows for this extraction_date before inserting."""
+        supabase = self.supabase
+        if clear_cost_rows:
+            supabase.table("cce_cost_rows").delete().gte("source_page", 0).execute()
+            print("Cleared cce_cost_rows")
+        else:
+            # Replace same-month data (delete rows with same extraction_date before insert)
+            try:
+                supabase.table("cce_cost_rows").delete().eq("extraction_date", self.extraction_date).execute()
+                print(f"Replaced existing rows for extraction_date={self.extraction_date}")
+            except Exception as e:
+                if "extraction_date" in str(e).lower() or "column" in str(e).lower():
+                    pass  # Column may not exist yet
+                else:
+                    print(f"Note: delete by extraction_date skipped ({e})")
+
+        if clear_cost_percentages:
+            supabase.table("cce_cost_percentages").delete().neq("id", NIL_UUID).execute()
+            print("Cleared cce_cost_percentages")
+
+        if clear_component_costs:
+            supabase.table("cce_component_costs").delete().neq("id", NIL_UUID).execute()
+            print("Cleared cce_component_costs")
+        else:
+            try:
+                supabase.table("cce_component_costs").delete().eq("extraction_date", self.extraction_date).execute()
+                print(f"Replaced existing component rows for extraction_date={self.extraction_date}")
+            except Exception as e:
+                if "extraction_date" in str(e).lower() or "column" in str(e).lower():
+                    pass
+                else:
+                    print(f"Note: delete cce_component_costs by extraction_date skipped ({e})")
+
+        if clear_modifiers:
+            try:
+                supabase.table("cce_modifiers").delete().neq("id", NIL_UUID).execute()
+                print("Cleared cce_modifiers")
+            except Exception as e:
+                print(f"Note: cce_modifiers clear skipped ({e})")
+
+    def delete_after_page(self, last_committed_page: int, run_started_at: str) -> None:
+        """
+        --resume: drop rows the interrupted run wrote for pages after its last checkpoint
+        (they are parsed again). Cost percentages are upserts and cost rows are only written
+        at the end, so those are idempotent / replaced by extraction_date.
+        """
+        supabase = self.supabase
+        try:
+            supabase.table("cce_component_costs").delete().eq("extraction_date", self.extraction_date).gt(
+                "source_page", last_committed_page
+            ).execute()
+        except Exception as e:
+            print(f"Note: delete cce_component_costs after page {last_committed_page} skipped ({e})")
+        try:
+            # cce_modifiers has no extraction_date; created_at bounds the delete to the interrupted run
+            supabase.table("cce_modifiers").delete().gt("source_page", last_committed_page).gte(
+                "created_at", run_started_at
+            ).execute()
+        except Exception as e:
+            print(f"Note: delete cce_modifiers after page {last_committed_page} skipped ({e})")
+        try:
+            supabase.table("cce_cost_rows").delete().eq("extraction_date", self.extraction_date).execute()
+        except Exception as e:
+            if "extraction_date" not in str(e).lower() and "column" not in str(e).lower():
+                print(f"Note: delete by extraction_date skipped ({e})")
+        print(f"Removed rows written after checkpointed page {last_committed_page}")
+
+    def flush_pending(self) -> None:
+        """Write partial batches now (before a checkpoint) without the finish_* summary lines."""
+        if self._modifier_buf and not self._modifiers_failed:
+            self._insert_modifiers(len(self._modifier_buf))
+        self.finish_component_rows()
+        self.finish_cost_pct_rows()
+        self.drain()
+
+    def _record_failure(self, table: str, rows: int, exc: BaseException) -> None:
+        with self._failures_lock:
+            self.write_failures.append(f"{table}: {rows} rows ({exc})")
+
+    # --- Edition diff (cce_edition_diff.py) ---
+
+    def delete_pages(self, table: str, pages: list[int], *, extraction_dates: Optional[list[str]] = None) -> None:
+        """Delete rows on these source pages (optionally only for these extraction dates)."""
+        for i in range(0, len(pages), PAGES_PER_FILTER):
+            q = self.supabase.table(table).delete().in_("source_page", pages[i : i + PAGES_PER_FILTER])
+            if extraction_dates:
+                q = q.in_("extraction_date", extraction_dates)
+            q.execute()
+
+    def move_extraction_date(self, table: str, from_date: str) -> None:
+        """Re-date rows kept from the previous edition (unchanged pages) to this extraction_date."""
+        self.supabase.table(table).update({"extraction_date": self.extraction_date}).eq(
+            "extraction_date", from_date
+        ).execute()
+
+    def load_page_fingerprints(self) -> Optional[tuple[str, dict[int, dict]]]:
+        """(extraction_date, page -> {"fingerprint", "row_digests"}) of the latest recorded edition, or None."""
+        r = (
+            self.supabase.table("cce_page_fingerprints")
+            .select("extraction_date")
+            .order("extraction_date", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if not r.data:
+            return None
+        date = r.data[0]["extraction_date"]
+        records: dict[int, dict] = {}
+        start = 0
+        while True:
+            r = (
+                self.supabase.table("cce_page_fingerprints")
+                .select("page_number, fingerprint, row_digests")
+                .eq("extraction_date", date)
+                .order("page_number")
+                .range(start, start + FINGERPRINT_PAGE_ROWS - 1)
+                .execute()
+            )
+            for row in r.data or []:
+                records[row["page_number"]] = {
+                    "fingerprint": row["fingerprint"],
+                    "row_digests": row.get("row_digests") or {},
+                }
+            if len(r.data or []) < FINGERPRINT_PAGE_ROWS:
+                return date, records
+            start += FINGERPRINT_PAGE_ROWS
+
+    def save_page_fingerprints(self, records: dict[int, dict], pdf_sha256: Optional[str]) -> None:
+        """Replace this extraction_date's page fingerprints (base for the next --diff)."""
+        rows = [
+            {
+                "extraction_date": self.extraction_date,
+                "page_number": page,
+                "fingerprint": rec["fingerprint"],
+                "row_digests": rec["row_digests"],
+                "pdf_sha256": pdf_sha256,
+            }
+            for page, rec in sorted(records.items())
+        ]
+        try:
+            self.supabase.table("cce_page_fingerprints").delete().eq("extraction_date", self.extraction_date).execute()
+            for i in range(0, len(rows), FINGERPRINT_PAGE_ROWS):
+                self.supabase.table("cce_page_fingerprints").insert(rows[i : i + FINGERPRINT_PAGE_ROWS]).execute()
+            print(f"Recorded page fingerprints ({len(rows)} pages)")
+        except Exception as e:
+            print(f"Note: cce_page_fingerprints not recorded ({e}). Run create-cce-page-fingerprints.sql")
+
+    def last_extracted_page(self) -> Optional[int]:
+        """--incremental: last page of the latest cce_extraction_metadata row (None if no runs)."""
+        r = (
+            self.supabase.table("cce_extraction_metadata")
+            .select("last_page_extracted, page_end")
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if not r.data:
+            return None
+        last = r.data[0]
+        return last.get("last_page_extracted") or last.get("page_end") or 0
+
+    def counters(self) -> dict[str, Any]:
+        """Batch numbering / totals carried across a checkpoint (buffers must be flushed)."""
+        return {
+            "modifiers_inserted": self._modifiers_inserted,
+            "modifiers_failed": self._modifiers_failed,
+            "component_batches": self._component_batches,
+            "pct_batches": self._pct_batches,
+        }
+
+    def restore_counters(self, counters: dict[str, Any]) -> None:
+        self._modifiers_inserted = int(counters.get("modifiers_inserted") or 0)
+        self._modifiers_failed = bool(counters.get("modifiers_failed"))
+        self._component_batches = int(counters.get("component_batches") or 0)
+        self._pct_batches = int(counters.get("pct_batches") or 0)
+
+    # --- Occupancies (needed for occupancy_id on component and cost rows) ---
+
+    def upsert_occupancies(self, occ_list: list[dict], *, refresh_all: bool = True) -> None:
+        """Upsert occupancies and refresh occ_id_map (all rows, or just these codes when refresh_all=False)."""
+        if not occ_list:
+            return
+        self.supabase.table("cce_occupancies").upsert(
+            [occupancy_row(o) for o in occ_list], on_conflict="occupancy_code"
+        ).execute()
+        q = self.supabase.table("cce_occupancies").select("id, occupancy_code")
+        if refresh_all:
+            r = q.execute()
+            self.occ_id_map = {row["occupancy_code"]: row["id"] for row in (r.data or [])}
+        else:
+            r = q.in_("occupancy_code", [o["occupancy_code"] for o in occ_list]).execute()
+            self.occ_id_map.update({row["occupancy_code"]: row["id"] for row in (r.data or [])})
+
+    # --- Modifiers ---
+
+    def add_modifier_rows(self, rows: list[dict]) -> None:
+        if self._modifiers_failed:
+            return
+        self._modifier_buf.extend(rows)
+        while len(self._modifier_buf) >= self._modifier_batch.size and not self._modifiers_failed:
+            self._insert_modifiers(self._modifier_batch.size)
+
+    def finish_modifier_rows(self) -> None:
+        if self._modifier_buf and not self._modifiers_failed:
+            self._insert_modifiers(len(self._modifier_buf))
+        if self._modifiers_inserted and not self._modifiers_failed:
+            print(f"Inserted {self._modifiers_inserted} modifier rows")
+
+    def _insert_modifiers(self, n: int) -> None:
+        batch, self._modifier_buf = self._modifier_buf[:n], self._modifier_buf[n:]
+        try:
+            self._send("cce_modifiers", batch, self._insert_fn("cce_modifiers"), self._modifier_batch)
+            self._modifiers_inserted += len(batch)
+        except Exception as e:
+            print(f"Note: cce_modifiers insert skipped ({e}). Run create-cce-modifier-tables.sql")
+            self._record_failure("cce_modifiers", len(batch), e)
+            self._modifiers_failed = True
+            self._modifier_buf = []
+
+    # --- Component costs (rows already deduped; occupancy_code → occupancy_id) ---
+
+    def add_component_rows(self, rows: list[dict]) -> None:
+        self._component_buf.extend(rows)
+        while len(self._component_buf) >= self._component_batch.size:
+            self._insert_components(self._component_batch.size)
+
+    def finish_component_rows(self) -> None:
+        if self._component_buf:
+            self._insert_components(len(self._component_buf))
+        self.drain()
+
+    def _insert_components(self, n: int) -> None:
+        rows, self._component_buf = self._component_buf[:n], self._component_buf[n:]
+        self._component_batches += 1
+        # occupancy ids are resolved now: the map can change before a pooled request runs
+        batch = [component_db_row(row, self.occ_id_map, self.extraction_date) for row in rows]
+        self._run(self._send_components, self._component_batches, batch)
+
+    def _send_components(self, batch_no: int, batch: list[dict]) -> None:
+        try:
+            self._send("cce_component_costs", batch, self._insert_fn("cce_component_costs"), self._component_batch)
+            print(f"Inserted component batch {batch_no} ({len(batch)} rows)")
+        except Exception as e:
+            print(f"Note: cce_component_costs insert skipped ({e})")
+            self._record_failure("cce_component_costs", len(batch), e)
+
+    # --- Cost percentages (upsert to avoid duplicates with unique constraint) ---
+
+    def add_cost_pct_rows(self, rows: list[dict]) -> None:
+        self._pct_buf.extend(rows)
+        while len(self._pct_buf) >= self._pct_batch.size:
+            self._upsert_pct(self._pct_batch.size)
+
+    def finish_cost_pct_rows(self) -> None:
+        if self._pct_buf:
+            self._upsert_pct(len(self._pct_buf))
+
+    def _upsert_pct(self, n: int) -> None:
+        batch, self._pct_buf = dedupe_cost_pct_rows(self._pct_buf[:n]), self._pct_buf[n:]
+        self._pct_batches += 1
+        try:
+            self._send(
+                "cce_cost_percentages",
+                batch,
+                lambda rows: self.supabase.table("cce_cost_percentages")
+                .upsert(rows, on_conflict="section_name,occupancy,category")
+                .execute(),
+                self._pct_batch,
+                idempotent=True,  # an upsert resent after a client timeout writes the same rows
+            )
+            print(f"Upserted cost % batch {self._pct_batches} ({len(batch)} rows)")
+        except Exception as e:
+            print(f"Note: cce_cost_percentages upsert skipped ({e}). Run cce-audit-fixes migration.")
+            self._record_failure("cce_cost_percentages", len(batch), e)
+
+    # --- Cost rows (deduped across the whole run, so written once at the end) ---
+
+    def write_cost_rows(self, cost_rows_deduped: list[dict]) -> None:
+        """Insert cost rows (rows whose occupancy has no id are skipped); raises if a batch fails."""
+        rows = [
+            cost_db_row(r, self.occ_id_map[r["occupancy_code"]], self.extraction_date)
+            for r in cost_rows_deduped
+            if self.occ_id_map.get(r["occupancy_code"])
+        ]
+        i = batch_no = 0
+        while i < len(rows):
+            size = self._cost_batch.size
+            batch_no += 1
+            self._run(self._send_cost_rows, batch_no, rows[i : i + size])
+            i += size
+        self.drain()
+
+    def _send_cost_rows(self, batch_no: int, batch: list[dict]) -> None:
+        self._send("cce_cost_rows", batch, self._insert_fn("cce_cost_rows"), self._cost_batch)
+        print(f"Inserted batch {batch_no} ({len(batch)} rows)")
+
+    def write_metadata(self, meta: dict) -> None:
+        """Insert extraction metadata (audit trail) once every row request has finished."""
+        self.drain()
+        try:
+            self.supabase.table("cce_extraction_metadata").insert(meta).execute()
+            print("Recorded extraction metadata")
+        except Exception as e:
+            print(f"Note: cce_extraction_metadata insert skipped ({e}). Run create-cce-extraction-metadata.sql")
+
+
+class StreamWriter:
+    """
+    Run sink calls on one background thread, fed by a bounded queue.
+
+    submit() blocks when max_pending calls are queued (backpressure) and re-raises the first
+    error from the writer thread, so parsing stops soon after a failed insert instead of at
+    the end. close() drains the queue and joins the thread.
+    """
+
+    def __init__(self, sink: Any, max_pending: int = 16):
+        self.sink = sink
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="cce-stream-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # drain without writing after a failure
+            fn, args, kwargs = item
+            try:
+                fn(*args, **kwargs)
+            except BaseException as e:  # noqa: BLE001 - surfaced to the caller in submit()/close()
+                self._error = e
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        self._raise_if_failed()
+        self._queue.put((fn, args, kwargs))
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_if_failed()
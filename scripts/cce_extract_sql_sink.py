@@ -0,0 +1,351 @@
+"""
+Direct-database sink for extract-cce-pdf.py (--sink postgres).
+
+Instead of thousands of PostgREST requests, rows are bulk-loaded into temporary staging
+tables (COPY on Postgres) while parsing runs, and close() merges them into the CCE tables in
+the same transaction that applies the clears / replace-by-extraction_date deletes and
+records cce_extraction_metadata. Readers see the old edition until the commit and the new
+one after it; any error rolls the whole run back.
+
+Only occupancy upserts go straight to the target table (component and cost rows need their
+ids), and those are inside the transaction too.
+
+The database is reached through a small dialect object so the sink runs against Postgres
+(psycopg 3, or psycopg2) and against SQLite as a local stand-in with the same table and
+column names (sqlite:///path URLs; used by the tests).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import sqlite3
+from typing import Any, Iterable, Optional
+
+from cce_extract_sink import (
+    component_db_row,
+    cost_db_row,
+    cost_pct_row_key,
+    occupancy_row,
+)
+
+BATCH_COPY_ROWS = 5000
+
+OCCUPANCY_COLUMNS = ("occupancy_code", "occupancy_name", "section_number", "page_start", "page_end")
+MODIFIER_COLUMNS = (
+    "modifier_type", "section_name", "height_m", "height_ft", "sq_ft_multiplier",
+    "sq_m_multiplier", "cu_ft_multiplier", "notes", "source_page",
+)
+COMPONENT_COLUMNS = (
+    "section_name", "item_name", "cost_tier", "col_1", "col_2", "col_3", "col_4", "source_page",
+    "occupancy_id", "extraction_date", "extraction_flags", "normalization_version",
+)
+COST_PCT_COLUMNS = (
+    "section_name", "section_number", "occupancy", "category",
+    "low_pct", "median_pct", "high_pct", "source_page",
+)
+COST_PCT_KEY = ("section_name", "occupancy", "category")
+COST_ROW_COLUMNS = (
+    "occupancy_id", "building_class", "quality_type", "exterior_walls", "interior_finish",
+    "lighting_plumbing", "heat", "cost_sq_m", "cost_cu_ft", "cost_sq_ft", "source_page",
+    "extraction_date",
+)
+
+# Merge order: the table each staged batch goes into
+STAGED_TABLES = {
+    "cce_modifiers": MODIFIER_COLUMNS,
+    "cce_component_costs": COMPONENT_COLUMNS,
+    "cce_cost_percentages": COST_PCT_COLUMNS,
+    "cce_cost_rows": COST_ROW_COLUMNS,
+}
+
+
+def copy_text_line(values: Iterable[Any]) -> str:
+    """One row in COPY text format (tab-separated, \\N for NULL)."""
+    out = []
+    for v in values:
+        if v is None:
+            out.append("\\N")
+        elif isinstance(v, bool):
+            out.append("t" if v else "f")
+        else:
+            out.append(
+                str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+            )
+    return "\t".join(out) + "\n"
+
+
+class SqliteDialect:
+    """SQLite stand-in: executemany into the staging table."""
+
+    name = "sqlite"
+    param = "?"
+
+    def begin(self, conn: Any) -> None:
+        conn.execute("BEGIN")
+
+    def copy_rows(self, cur: Any, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+        marks = ", ".join(self.param for _ in columns)
+        cur.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})", rows)
+
+
+class PostgresDialect:
+    """COPY ... FROM STDIN via psycopg 3 (cursor.copy) or psycopg2 (copy_expert)."""
+
+    name = "postgres"
+    param = "%s"
+
+    def begin(self, conn: Any) -> None:
+        pass  # psycopg opens a transaction on the first statement
+
+    def copy_rows(self, cur: Any, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        if hasattr(cur, "copy"):
+            with cur.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            cur.copy_expert(sql, io.StringIO("".join(copy_text_line(row) for row in rows)))
+
+
+def connect_database(url: str) -> tuple[Any, Any]:
+    """(connection, dialect) for a postgres://… / postgresql://… or sqlite:///path URL."""
+    if url.startswith("sqlite:///"):
+        conn = sqlite3.connect(url[len("sqlite:///"):], check_same_thread=False)
+        conn.isolation_level = None  # transaction is opened explicitly by the sink
+        return conn, SqliteDialect()
+    try:
+        import psycopg
+
+        return psycopg.connect(url), PostgresDialect()
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+
+        return psycopg2.connect(url), PostgresDialect()
+    except ImportError:
+        raise RuntimeError(
+            "--sink postgres needs a Postgres driver: pip install 'psycopg[binary]' (or psycopg2-binary)"
+        ) from None
+
+
+class SqlStagingSink:
+    """
+    Same methods as SupabaseSink; rows are staged (COPY) as they arrive and merged by close().
+
+    clear_existing() only records what to clear: the deletes run in close(), right before the
+    merge, so the old rows stay visible until the new ones are committed.
+    """
+
+    def __init__(self, conn: Any, dialect: Any, extraction_date_str: str, *, copy_rows: int = BATCH_COPY_ROWS):
+        self.conn = conn
+        self.dialect = dialect
+        self.extraction_date = extraction_date_str
+        self.copy_rows = max(1, copy_rows)
+        self.occ_id_map: dict[int, str] = {}
+        self._clear: dict[str, bool] = {}
+        self._buffers: dict[str, list[tuple]] = {t: [] for t in STAGED_TABLES}
+        self._staged: dict[str, int] = {t: 0 for t in STAGED_TABLES}
+        self._pct_rows: dict[tuple, dict] = {}
+        self._meta: Optional[dict] = None
+        self._closed = False
+        self.dialect.begin(conn)
+
+    @classmethod
+    def connect(cls, url: str, extraction_date_str: str, **kwargs: Any) -> "SqlStagingSink":
+        conn, dialect = connect_database(url)
+        return cls(conn, dialect, extraction_date_str, **kwargs)
+
+    def _sql(self, sql: str) -> str:
+        return sql.replace("?", self.dialect.param)
+
+    # --- Staging ---
+
+    def _stage_table(self, table: str) -> str:
+        return f"{table}_stage"
+
+    def _stage(self, table: str, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        cur = self.conn.cursor()
+        stage = self._stage_table(table)
+        cols = ", ".join(STAGED_TABLES[table])
+        if not self._staged[table]:
+            # Same column types as the target; dropped with the connection
+            cur.execute(f"CREATE TEMP TABLE {stage} AS SELECT {cols} FROM {table} LIMIT 0")
+        self.dialect.copy_rows(cur, stage, STAGED_TABLES[table], rows)
+        self._staged[table] += len(rows)
+
+    def _add(self, table: str, rows: list[dict]) -> None:
+        cols = STAGED_TABLES[table]
+        buf = self._buffers[table]
+        buf.extend(tuple(r.get(c) for c in cols) for r in rows)
+        if len(buf) >= self.copy_rows:
+            self._stage(table, buf)
+            self._buffers[table] = []
+
+    def _finish(self, table: str) -> None:
+        self._stage(table, self._buffers[table])
+        self._buffers[table] = []
+
+    def flush_pending(self) -> None:
+        for table in STAGED_TABLES:
+            self._finish(table)
+
+    # --- Same interface as SupabaseSink ---
+
+    def clear_existing(
+        self,
+        *,
+        clear_cost_rows: bool = False,
+        clear_cost_percentages: bool = False,
+        clear_component_costs: bool = False,
+        clear_modifiers: bool = False,
+    ) -> None:
+        self._clear = {
+            "cost_rows": clear_cost_rows,
+            "cost_percentages": clear_cost_percentages,
+            "component_costs": clear_component_costs,
+            "modifiers": clear_modifiers,
+        }
+
+    def last_extracted_page(self) -> Optional[int]:
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT last_page_extracted, page_end FROM cce_extraction_metadata ORDER BY created_at DESC LIMIT 1"
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return row[0] or row[1] or 0
+
+    def upsert_occupancies(self, occ_list: list[dict], *, refresh_all: bool = True) -> None:
+        if not occ_list:
+            return
+        cols = ", ".join(OCCUPANCY_COLUMNS)
+        marks = ", ".join("?" for _ in OCCUPANCY_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in OCCUPANCY_COLUMNS[1:])
+        cur = self.conn.cursor()
+        rows = [occupancy_row(o) for o in occ_list]
+        cur.executemany(
+            self._sql(
+                f"INSERT INTO cce_occupancies ({cols}) VALUES ({marks}) "
+                f"ON CONFLICT (occupancy_code) DO UPDATE SET {updates}"
+            ),
+            [tuple(r[c] for c in OCCUPANCY_COLUMNS) for r in rows],
+        )
+        if refresh_all:
+            cur.execute("SELECT id, occupancy_code FROM cce_occupancies")
+            self.occ_id_map = {code: str(occ_id) for occ_id, code in cur.fetchall()}
+        else:
+            codes = [r["occupancy_code"] for r in rows]
+            marks = ", ".join("?" for _ in codes)
+            cur.execute(self._sql(f"SELECT id, occupancy_code FROM cce_occupancies WHERE occupancy_code IN ({marks})"), codes)
+            self.occ_id_map.update({code: str(occ_id) for occ_id, code in cur.fetchall()})
+
+    def add_modifier_rows(self, rows: list[dict]) -> None:
+        self._add("cce_modifiers", rows)
+
+    def finish_modifier_rows(self) -> None:
+        self._finish("cce_modifiers")
+
+    def add_component_rows(self, rows: list[dict]) -> None:
+        db_rows = []
+        for row in rows:
+            r = component_db_row(row, self.occ_id_map, self.extraction_date)
+            r["extraction_flags"] = json.dumps(r.get("extraction_flags") or {}, sort_keys=True)
+            db_rows.append(r)
+        self._add("cce_component_costs", db_rows)
+
+    def finish_component_rows(self) -> None:
+        self._finish("cce_component_costs")
+
+    def add_cost_pct_rows(self, rows: list[dict]) -> None:
+        # Upserted by key at merge time; ON CONFLICT may not touch a row twice, so keep the last value
+        for r in rows:
+            self._pct_rows[cost_pct_row_key(r)] = r
+
+    def finish_cost_pct_rows(self) -> None:
+        pass  # staged in close(): a later page may still replace a value
+
+    def write_cost_rows(self, cost_rows_deduped: list[dict]) -> None:
+        rows = [
+            cost_db_row(r, self.occ_id_map[r["occupancy_code"]], self.extraction_date)
+            for r in cost_rows_deduped
+            if self.occ_id_map.get(r["occupancy_code"])
+        ]
+        for i in range(0, len(rows), self.copy_rows):
+            self._add("cce_cost_rows", rows[i : i + self.copy_rows])
+        self._finish("cce_cost_rows")
+
+    def write_metadata(self, meta: dict) -> None:
+        """Recorded by close(), in the same transaction as the rows."""
+        self._meta = dict(meta)
+
+    # --- Merge + commit ---
+
+    def _apply_clears(self, cur: Any) -> None:
+        clear = self._clear
+        if clear.get("cost_rows"):
+            cur.execute("DELETE FROM cce_cost_rows")
+            print("Cleared cce_cost_rows")
+        else:
+            cur.execute(self._sql("DELETE FROM cce_cost_rows WHERE extraction_date = ?"), (self.extraction_date,))
+            print(f"Replaced existing rows for extraction_date={self.extraction_date}")
+        if clear.get("cost_percentages"):
+            cur.execute("DELETE FROM cce_cost_percentages")
+            print("Cleared cce_cost_percentages")
+        if clear.get("component_costs"):
+            cur.execute("DELETE FROM cce_component_costs")
+            print("Cleared cce_component_costs")
+        else:
+            cur.execute(self._sql("DELETE FROM cce_component_costs WHERE extraction_date = ?"), (self.extraction_date,))
+            print(f"Replaced existing component rows for extraction_date={self.extraction_date}")
+        if clear.get("modifiers"):
+            cur.execute("DELETE FROM cce_modifiers")
+            print("Cleared cce_modifiers")
+
+    def _merge(self, cur: Any, table: str) -> None:
+        if not self._staged[table]:
+            return
+        cols = ", ".join(STAGED_TABLES[table])
+        sql = f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {self._stage_table(table)}"
+        if table == "cce_cost_percentages":
+            updates = ", ".join(f"{c} = excluded.{c}" for c in COST_PCT_COLUMNS if c not in COST_PCT_KEY)
+            # "WHERE true" keeps SQLite from reading ON CONFLICT as part of the SELECT
+            sql += f" WHERE true ON CONFLICT ({', '.join(COST_PCT_KEY)}) DO UPDATE SET {updates}"
+        cur.execute(sql)
+        print(f"Merged {self._staged[table]} rows into {table}")
+
+    def close(self) -> None:
+        """Merge staged rows and commit (only when write_metadata was called; otherwise roll back)."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._meta is None:
+                self.conn.rollback()
+                print("No extraction metadata recorded; staged rows discarded")
+                return
+            self._add("cce_cost_percentages", list(self._pct_rows.values()))
+            self.flush_pending()
+            cur = self.conn.cursor()
+            self._apply_clears(cur)
+            for table in STAGED_TABLES:
+                self._merge(cur, table)
+            meta_cols = list(self._meta)
+            cur.execute(
+                self._sql(
+                    f"INSERT INTO cce_extraction_metadata ({', '.join(meta_cols)}) "
+                    f"VALUES ({', '.join('?' for _ in meta_cols)})"
+                ),
+                tuple(self._meta[c] for c in meta_cols),
+            )
+            self.conn.commit()
+            print("Committed extraction (staged rows merged, metadata recorded)")
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.close()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Background job runner for CCE extraction (extract-cce-pdf.py, extract-catalog-units.py).
+
+Jobs live in a SQLite queue (default local_data/cce-jobs/jobs.sqlite, or CCE_JOB_DB) and are run by
+one worker process per queue with --workers threads (default 1, or CCE_JOB_WORKERS), so heavy
+extractions run outside the web process and at most N at a time.
+
+  enqueue   add a job; an identical queued / running job (same kind + args) is returned instead
+  worker    claim and run jobs (--exit-when-idle for a worker started on demand by enqueue --start-worker)
+  cancel    drop a queued job, or SIGTERM (then SIGKILL) a running one
+  status    one job as JSON; list: recent jobs
+
+Single writer per table: every job declares the tables it writes (none for --dry-run / --debug /
+--output-dir), and a job is only claimed when none of them is locked by a running job or wanted by
+an older queued one, so two full loads that both --clear-first the same tables run one after the other.
+
+Status for the admin API stays in <status-dir>/<job_id>.json (see cce_extract_events.py): the runner
+writes queued / running / cancelled (and the exit result for scripts without --job-id support);
+extract-cce-pdf.py keeps it current with progress while it runs. Logs go to <job_id>.log.
+
+Usage:
+  python3 scripts/cce_job_runner.py enqueue --kind cce-extract --start-worker -- --pdf local_data/CCE_March_2026.pdf --clear-first
+  python3 scripts/cce_job_runner.py worker --workers 2
+  python3 scripts/cce_job_runner.py cancel cce-extract-20260302T100000Z-1a2b3c4d
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import json
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from cce_extract_events import JOB_ID_RE, new_job_id, read_job_status, update_job_status, utc_now_iso
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_STATUS_DIR = BASE_DIR / "local_data" / "cce-jobs"
+DEFAULT_JOB_DB = DEFAULT_STATUS_DIR / "jobs.sqlite"
+CANCEL_GRACE_SECONDS = 10.0
+
+CCE_TABLES = (
+    "cce_occupancies",
+    "cce_cost_rows",
+    "cce_cost_percentages",
+    "cce_component_costs",
+    "cce_modifiers",
+    "cce_extraction_metadata",
+    "cce_page_fingerprints",
+)
+
+# kind -> script, whether it takes --job-id / --status-dir, tables it writes, flags that make it read-only
+JOB_KINDS: dict[str, dict[str, Any]] = {
+    "cce-extract": {
+        "script": "extract-cce-pdf.py",
+        "job_events": True,
+        "tables": CCE_TABLES,
+        "read_only_flags": ("--dry-run", "--output-dir"),
+    },
+    "catalog-units": {
+        "script": "extract-catalog-units.py",
+        "job_events": False,
+        "tables": ("cce_catalog_units",),
+        "read_only_flags": ("--dry-run", "--debug"),
+    },
+}
+RUNNER_FLAGS = ("--job-id", "--status-dir", "--events")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  id TEXT NOT NULL UNIQUE,
+  kind TEXT NOT NULL,
+  args TEXT NOT NULL,
+  dedupe_key TEXT NOT NULL,
+  tables TEXT NOT NULL,
+  status TEXT NOT NULL,
+  cancel_requested INTEGER NOT NULL DEFAULT 0,
+  created_at TEXT NOT NULL,
+  started_at TEXT,
+  finished_at TEXT,
+  worker_pid INTEGER,
+  pid INTEGER,
+  exit_code INTEGER,
+  error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq);
+CREATE TABLE IF NOT EXISTS table_locks (
+  table_name TEXT PRIMARY KEY,
+  job_id TEXT NOT NULL
+);
+"""
+
+
+def job_tables(kind: str, args: list[str]) -> list[str]:
+    """Tables the job writes; [] when a read-only flag is present."""
+    spec = JOB_KINDS[kind]
+    for a in args:
+        if a in spec["read_only_flags"] or a.split("=", 1)[0] in spec["read_only_flags"]:
+            return []
+    return list(spec["tables"])
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _row_to_job(row: sqlite3.Row) -> dict[str, Any]:
+    job = dict(row)
+    job["args"] = json.loads(job["args"])
+    job["tables"] = json.loads(job["tables"])
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    return job
+
+
+class JobQueue:
+    """SQLite queue; one instance per thread (claims and lock changes run in BEGIN IMMEDIATE transactions)."""
+
+    def __init__(self, db_path: str | Path = DEFAULT_JOB_DB, status_dir: str | Path = DEFAULT_STATUS_DIR):
+        self.db_path = str(db_path)
+        self.status_dir = str(status_dir)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _begin(self) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def get(self, job_id: str) -> Optional[dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, limit: int = 20) -> list[dict[str, Any]]:
+        rows = self._conn.execute("SELECT * FROM jobs ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+        return [_row_to_job(r) for r in rows]
+
+    def enqueue(self, kind: str, args: list[str], job_id: Optional[str] = None) -> tuple[dict[str, Any], bool]:
+        """Returns (job, duplicate). duplicate=True: an identical job was already queued or running."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"unknown job kind {kind!r} (expected one of {', '.join(JOB_KINDS)})")
+        for a in args:
+            if a.split("=", 1)[0] in RUNNER_FLAGS:
+                raise ValueError(f"{a.split('=', 1)[0]} is set by the job runner")
+        job_id = job_id or f"{kind}-{new_job_id()}"
+        if not JOB_ID_RE.match(job_id):
+            raise ValueError(f"invalid job id {job_id!r}")
+        dedupe_key = json.dumps([kind, args])
+        tables = job_tables(kind, args)
+        self._begin()
+        try:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running') ORDER BY seq LIMIT 1",
+                (dedupe_key,),
+            ).fetchone()
+            if row is not None:
+                self._conn.execute("COMMIT")
+                return _row_to_job(row), True
+            now = utc_now_iso()
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, args, dedupe_key, tables, status, created_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, json.dumps(args), dedupe_key, json.dumps(tables), now),
+            )
+            # before COMMIT: a worker claiming the job right away must not have "running" overwritten
+            update_job_status(
+                self.status_dir, job_id, kind=kind, status="queued", stage=None,
+                percent=None, rows={}, error=None, queued_at=now, tables=tables,
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id), False  # type: ignore[return-value]
+
+    def claim_next(self, worker_pid: int) -> Optional[dict[str, Any]]:
+        """Oldest queued job whose tables are free (not locked, not wanted by an older queued job); locks them."""
+        self._begin()
+        try:
+            held = {r[0] for r in self._conn.execute("SELECT table_name FROM table_locks")}
+            reserved: set[str] = set()
+            for row in self._conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY seq").fetchall():
+                tables = set(json.loads(row["tables"]))
+                if tables & (held | reserved):
+                    reserved |= tables
+                    continue
+                self._conn.executemany(
+                    "INSERT INTO table_locks (table_name, job_id) VALUES (?, ?)",
+                    [(t, row["id"]) for t in sorted(tables)],
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, worker_pid = ? WHERE id = ?",
+                    (utc_now_iso(), worker_pid, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+                return self.get(row["id"])
+            self._conn.execute("COMMIT")
+            return None
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def set_pid(self, job_id: str, pid: int) -> None:
+        self._conn.execute("UPDATE jobs SET pid = ? WHERE id = ?", (pid, job_id))
+
+    def cancel_requested(self, job_id: str) -> bool:
+        row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def finish(self, job_id: str, status: str, exit_code: Optional[int] = None, error: Optional[str] = None) -> None:
+        """Record the result and release the job's table locks."""
+        self._begin()
+        try:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, exit_code = ?, error = ? WHERE id = ?",
+                (status, utc_now_iso(), exit_code, error, job_id),
+            )
+            self._conn.execute("DELETE FROM table_locks WHERE job_id = ?", (job_id,))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def cancel(self, job_id: str) -> Optional[dict[str, Any]]:
+        """Queued: cancelled now. Running: flagged; the worker stops the process and records cancelled."""
+        self._begin()
+        try:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            if row[0] == "queued":
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? WHERE id = ?",
+                    (utc_now_iso(), job_id),
+                )
+            elif row[0] == "running":
+                self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        if row[0] == "queued":
+            update_job_status(self.status_dir, job_id, status="cancelled", finished_at=utc_now_iso(), error="Cancelled before it started")
+        return self.get(job_id)
+
+    def recover_stale(self) -> list[str]:
+        """Running jobs whose worker process is gone: stop any surviving child, mark failed, free locks."""
+        stale = []
+        for row in self._conn.execute("SELECT * FROM jobs WHERE status = 'running'").fetchall():
+            if pid_alive(row["worker_pid"]):
+                continue
+            if pid_alive(row["pid"]):
+                try:
+                    os.killpg(row["pid"], signal.SIGTERM)
+                except OSError:
+                    pass
+            message = "Job runner exited while the job was running"
+            self.finish(row["id"], "failed", error=message)
+            status = read_job_status(self.status_dir, row["id"]) or {}
+            if status.get("status") not in ("completed", "failed"):
+                update_job_status(self.status_dir, row["id"], status="failed", finished_at=utc_now_iso(), error=message)
+            stale.append(row["id"])
+        return stale
+
+
+def job_command(job: dict[str, Any], status_dir: str) -> list[str]:
+    spec = JOB_KINDS[job["kind"]]
+    cmd = [sys.executable, str(Path(__file__).resolve().parent / spec["script"]), *job["args"]]
+    if spec["job_events"]:
+        cmd += ["--job-id", job["id"], "--status-dir", status_dir]
+    return cmd
+
+
+def run_job(queue: JobQueue, job: dict[str, Any], *, poll: float = 1.0, grace: float = CANCEL_GRACE_SECONDS) -> str:
+    """Run one claimed job to completion (or cancellation); returns the final status."""
+    status_dir = queue.status_dir
+    spec = JOB_KINDS[job["kind"]]
+    log_path = Path(status_dir) / f"{job['id']}.log"
+    update_job_status(status_dir, job["id"], status="running", started_at=job["started_at"], log=str(log_path))
+    cancelled = False
+    with open(log_path, "ab") as log:
+        try:
+            proc = subprocess.Popen(
+                job_command(job, status_dir),
+                cwd=str(BASE_DIR),
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env={**os.environ, "PYTHONUNBUFFERED": "1"},
+                start_new_session=True,  # cancel signals the whole process group (--workers children too)
+            )
+        except OSError as e:
+            queue.finish(job["id"], "failed", error=str(e))
+            update_job_status(status_dir, job["id"], status="failed", finished_at=utc_now_iso(), error=str(e))
+            return "failed"
+        queue.set_pid(job["id"], proc.pid)
+        if not spec["job_events"]:
+            update_job_status(status_dir, job["id"], pid=proc.pid)
+        deadline: Optional[float] = None
+        while True:
+            try:
+                proc.wait(timeout=poll)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if deadline is None and queue.cancel_requested(job["id"]):
+                cancelled = True
+                _signal_group(proc.pid, signal.SIGTERM)
+                deadline = time.monotonic() + grace
+            elif deadline is not None and time.monotonic() > deadline:
+                _signal_group(proc.pid, signal.SIGKILL)
+    code = proc.returncode
+    current = read_job_status(status_dir, job["id"]) or {}
+    if cancelled:
+        status, error = "cancelled", "Cancelled"
+    elif code == 0:
+        status, error = "completed", None
+    else:
+        status, error = "failed", current.get("error") or f"Process exited with code {code}"
+    queue.finish(job["id"], status, exit_code=code, error=error)
+    fields: dict[str, Any] = {"status": status, "exit_code": code, "finished_at": current.get("finished_at") or utc_now_iso()}
+    if error:
+        fields["error"] = error
+    if status != "completed" or current.get("status") != "completed":
+        update_job_status(status_dir, job["id"], **fields)
+    return status
+
+
+def _signal_group(pid: int, sig: int) -> None:
+    try:
+        os.killpg(pid, sig)
+    except OSError:
+        pass
+
+
+class WorkerLock:
+    """One worker process per queue DB (flock on <db>.worker.lock); pool size is its thread count."""
+
+    def __init__(self, db_path: str | Path):
+        self.path = str(db_path) + ".worker.lock"
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def worker_running(db_path: str | Path) -> bool:
+    lock = WorkerLock(db_path)
+    if lock.acquire():
+        lock.release()
+        return False
+    return True
+
+
+def start_worker(db_path: str | Path, status_dir: str | Path) -> bool:
+    """Spawn a detached `worker --exit-when-idle` unless one already holds the worker lock."""
+    if worker_running(db_path):
+        return False
+    Path(status_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(status_dir) / "worker.log", "ab") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--db", str(db_path), "--status-dir", str(status_dir), "worker", "--exit-when-idle"],
+            cwd=str(BASE_DIR),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    return True
+
+
+def run_worker(
+    db_path: str | Path,
+    status_dir: str | Path,
+    *,
+    workers: int = 1,
+    poll: float = 1.0,
+    exit_when_idle: bool = False,
+    idle_seconds: float = 5.0,
+) -> int:
+    while True:
+        lock = WorkerLock(db_path)
+        if not lock.acquire():
+            print(f"Another worker already serves {db_path}")
+            return 0
+        try:
+            _serve(db_path, status_dir, workers=workers, poll=poll, exit_when_idle=exit_when_idle, idle_seconds=idle_seconds)
+        finally:
+            lock.release()
+        # enqueue inserts, then checks the lock: a job queued while this worker was going idle
+        # either shows up here or its enqueue saw the lock free and started a new worker
+        queue = JobQueue(db_path, status_dir)
+        try:
+            pending = queue._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        finally:
+            queue.close()
+        if not pending:
+            return 0
+
+
+def _serve(db_path: str | Path, status_dir: str | Path, *, workers: int, poll: float, exit_when_idle: bool, idle_seconds: float) -> None:
+    queue = JobQueue(db_path, status_dir)
+    for job_id in queue.recover_stale():
+        print(f"Marked stale job {job_id} failed")
+    queue.close()
+    busy = [0]
+    busy_lock = threading.Lock()
+    last_active = [time.monotonic()]
+
+    def loop() -> None:
+        q = JobQueue(db_path, status_dir)
+        try:
+            while True:
+                job = q.claim_next(os.getpid())
+                if job is None:
+                    with busy_lock:
+                        idle = busy[0] == 0 and time.monotonic() - last_active[0] > idle_seconds
+                    if exit_when_idle and idle:
+                        return
+                    time.sleep(poll)
+                    continue
+                with busy_lock:
+                    busy[0] += 1
+                print(f"Running {job['id']} ({job['kind']} {' '.join(job['args'])}; tables: {', '.join(job['tables']) or 'none'})")
+                try:
+                    status = run_job(q, job, poll=poll)
+                finally:
+                    with busy_lock:
+                        busy[0] -= 1
+                        last_active[0] = time.monotonic()
+                print(f"{job['id']}: {status}")
+        finally:
+            q.close()
+
+    threads = [threading.Thread(target=loop, name=f"cce-job-{i}", daemon=True) for i in range(max(1, workers))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        while t.is_alive():
+            t.join(timeout=1.0)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Queue and run CCE extraction jobs")
+    parser.add_argument("--db", default=os.environ.get("CCE_JOB_DB") or str(DEFAULT_JOB_DB), help="Queue database (SQLite)")
+    parser.add_argument(
+        "--status-dir",
+        default=os.environ.get("CCE_JOB_STATUS_DIR") or str(DEFAULT_STATUS_DIR),
+        help="Directory for <job_id>.json status files and <job_id>.log",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("enqueue", help="Queue a job; prints {job_id, status, duplicate, tables} as JSON")
+    p.add_argument("--kind", required=True, choices=sorted(JOB_KINDS))
+    p.add_argument("--job-id", default=None)
+    p.add_argument("--start-worker", action="store_true", help="Start a worker (exits when idle) if none is running")
+    p.add_argument("job_args", nargs=argparse.REMAINDER, help="Script arguments after --")
+    p = sub.add_parser("worker", help="Claim and run queued jobs")
+    p.add_argument("--workers", type=int, default=int(os.environ.get("CCE_JOB_WORKERS") or 1), help="Jobs run at once (default 1)")
+    p.add_argument("--poll", type=float, default=1.0, help="Seconds between queue / cancel checks")
+    p.add_argument("--exit-when-idle", action="store_true", help="Exit once the queue has been empty for a few seconds")
+    p = sub.add_parser("cancel", help="Cancel a queued or running job")
+    p.add_argument("job_id")
+    p = sub.add_parser("status", help="Print one job as JSON")
+    p.add_argument("job_id")
+    p = sub.add_parser("list", help="Print recent jobs as JSON lines")
+    p.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        return run_worker(args.db, args.status_dir, workers=args.workers, poll=args.poll, exit_when_idle=args.exit_when_idle)
+
+    queue = JobQueue(args.db, args.status_dir)
+    try:
+        if args.command == "enqueue":
+            job_args = args.job_args[1:] if args.job_args[:1] == ["--"] else args.job_args
+            try:
+                job, duplicate = queue.enqueue(args.kind, job_args, args.job_id)
+            except ValueError as e:
+                print(json.dumps({"error": str(e)}))
+                return 2
+            started = start_worker(args.db, args.status_dir) if args.start_worker else False
+            print(json.dumps({"job_id": job["id"], "status": job["status"], "duplicate": duplicate, "tables": job["tables"], "worker_started": started}))
+            return 0
+        if args.command == "cancel":
+            job = queue.cancel(args.job_id)
+        elif args.command == "status":
+            job = queue.get(args.job_id)
+        else:
+            for job in queue.list(args.limit):
+                print(json.dumps(job))
+            return 0
+        if job is None:
+            print(json.dumps({"error": f"job not found: {args.job_id}"}))
+            return 1
+        print(json.dumps(job))
+        return 0
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,112 @@
 """
 Layout-aware list-line parsing using pdfplumber word bounding boxes.
 
-Used when a CCE profile enables layout for specific pages (see config/cce-profiles/*.json).
-Falls back to empty list when no geometry; caller should use text regex parsing instead.
+Used when a CCE profile enables layout for specific pages (see config/cce-profiles/*.json), or for
+every list page with layout.auto_columns (numeric column bands detected per page, see
+detect_numeric_columns()). Falls back to empty list when no geometry; caller should use text
+regex parsing instead.
+
+Word geometry is processed with NumPy arrays when NumPy is installed (line grouping, column split
+and gap search over the whole page at once); otherwise the pure-Python loops below run. Both
+return the same pairs.
 """
 
 from __future__ import annotations
 
-from typing import Any
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate, chain
+from operator import itemgetter
+from typing import Any, Optional
 
 import pdfplumber  # type: ignore
 
+LAYOUT_ENGINES = ("auto", "numpy", "python")
+_WORD_COORDS = itemgetter("top", "x0", "x1")
+# Cost tiers per list row (col_1..col_4)
+MAX_TIER_VALUES = 4
+
+
+def _numpy():
+    """numpy module, or None when NumPy is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def layout_word_kwargs(layout_cfg: dict[str, Any]) -> dict[str, Any]:
+    """extract_words() settings used for layout parsing (also the page-cache key)."""
+    return {
+        "x_tolerance": 3,
+        "y_tolerance": float(layout_cfg.get("y_tolerance", 3.5)),
+        "keep_blank_chars": False,
+        "use_text_flow": False,
+    }
+
 
 def parse_layout_list_lines(page: pdfplumber.page.Page, layout_cfg: dict[str, Any]) -> list[tuple[str, str]]:
     """
     Return (item_raw, nums_str) pairs for lines that look like unit-in-place cost rows.
     nums_str is space-joined tokens from the numeric (right) band.
     """
+    words = page.extract_words(**layout_word_kwargs(layout_cfg))
+    return parse_layout_list_words(words, float(page.width), layout_cfg)
+
+
+def parse_layout_list_words(
+    words: list[dict],
+    page_width: float,
+    layout_cfg: dict[str, Any],
+    engine: str = "auto",
+    x_cut: Optional[float] = None,
+) -> list[tuple[str, str]]:
+    """
+    Same as parse_layout_list_lines() on pre-extracted words (e.g. from the page cache).
+    engine: auto (NumPy when installed) | numpy | python.
+    x_cut: numeric band start in points (default: page_width * x_numeric_min_ratio).
+    """
+    if engine not in LAYOUT_ENGINES:
+        raise ValueError(f"Unknown layout engine {engine!r} (expected one of {', '.join(LAYOUT_ENGINES)})")
+    if not words:
+        return []
+    np = _numpy() if engine != "python" else None
+    if np is None:
+        if engine == "numpy":
+            raise RuntimeError("layout engine 'numpy' needs NumPy: pip install numpy")
+        return _parse_layout_words_python(words, page_width, layout_cfg, x_cut)
+    return _parse_layout_words_numpy(np, words, page_width, layout_cfg, x_cut)
+
+
+def _layout_params(
+    page_width: float, layout_cfg: dict[str, Any], x_cut: Optional[float] = None
+) -> tuple[float, int, float, float, float]:
+    """(y_tol, min_words, page_w, x_cut, min_gap) from the profile layout block."""
     y_tol = float(layout_cfg.get("y_tolerance", 3.5))
     ratio = float(layout_cfg.get("x_numeric_min_ratio", 0.52))
     min_words = int(layout_cfg.get("min_words_per_line", 2))
     min_gap_frac = float(layout_cfg.get("min_gap_fraction", 0.025))
+    page_w = float(page_width)
+    return y_tol, min_words, page_w, page_w * ratio if x_cut is None else float(x_cut), page_w * min_gap_frac
 
-    words = page.extract_words(
-        x_tolerance=3,
-        y_tolerance=y_tol,
-        keep_blank_chars=False,
-        use_text_flow=False,
-    )
-    if not words:
-        return []
 
-    page_w = float(page.width)
-    x_cut = page_w * ratio
+def _token_is_numeric(p: str) -> bool:
+    if p.replace(".", "", 1).isdigit():
+        return True
+    try:
+        float(p)
+        return True
+    except ValueError:
+        return False
+
 
-    # Group words into visual lines by vertical proximity
+def _numeric_token_count(nums_str: str) -> int:
+    return sum(1 for p in nums_str.replace(",", " ").split() if _token_is_numeric(p))
+
+
+def _group_lines(words: list[dict], y_tol: float) -> list[list[dict]]:
+    """Visual lines (each sorted by x0): words within y_tol of the line's first word, top to bottom."""
     sorted_w = sorted(words, key=lambda w: (w["top"], w["x0"]))
     lines: list[list[dict]] = []
     for w in sorted_w:
@@ -46,10 +118,17 @@ def parse_layout_list_lines(page: pdfplumber.page.Page, layout_cfg: dict[str, An
             lines[-1].append(w)
         else:
             lines.append([w])
+    return [sorted(row, key=lambda w: w["x0"]) for row in lines]
+
+
+def _parse_layout_words_python(
+    words: list[dict], page_width: float, layout_cfg: dict[str, Any], x_cut: Optional[float] = None
+) -> list[tuple[str, str]]:
+    """Reference implementation: Python loops over words and rows."""
+    y_tol, min_words, page_w, x_cut, min_gap = _layout_params(page_width, layout_cfg, x_cut)
 
     out: list[tuple[str, str]] = []
-    for row in lines:
-        row = sorted(row, key=lambda w: w["x0"])
+    for row in _group_lines(words, y_tol):
         if len(row) < min_words:
             continue
 
@@ -64,7 +143,7 @@ def parse_layout_list_lines(page: pdfplumber.page.Page, layout_cfg: dict[str, An
                 if gap > max_gap:
                     max_gap = gap
                     gap_after = i
-            if gap_after >= 0 and max_gap >= page_w * min_gap_frac:
+            if gap_after >= 0 and max_gap >= min_gap:
                 left = row[: gap_after + 1]
                 right = row[gap_after + 1 :]
             else:
@@ -75,25 +154,255 @@ def parse_layout_list_lines(page: pdfplumber.page.Page, layout_cfg: dict[str, An
         if len(item_raw) < 2:
             continue
         # Require at least two numeric tokens on the right
-        parts = nums_str.replace(",", " ").split()
-        numish = 0
-        for p in parts:
-            try:
-                float(p)
-                numish += 1
-            except ValueError:
-                if p.replace(".", "", 1).isdigit():
-                    numish += 1
-        if numish < 2:
+        if _numeric_token_count(nums_str) < 2:
             continue
         out.append((item_raw, nums_str))
 
     return out
 
 
+def _line_starts(np: Any, top: Any, y_tol: float) -> list[int]:
+    """
+    Start index of each visual line in ascending `top`: a line takes every following word within
+    y_tol of its first word (not of the previous word, so slanted rows do not chain together).
+    """
+    n = len(top)
+    idx = np.arange(n)
+    # Where the next line would start if word i opened a line
+    nxt = np.searchsorted(top, top + y_tol, side="right")
+    # Same float comparison as the Python path (top - anchor <= y_tol), not anchor + y_tol
+    while True:
+        grow = nxt < n
+        grow[grow] = top[nxt[grow]] - top[grow] <= y_tol
+        if not grow.any():
+            break
+        nxt[grow] += 1
+    while True:
+        shrink = nxt > idx + 1
+        shrink[shrink] = top[nxt[shrink] - 1] - top[shrink] > y_tol
+        if not shrink.any():
+            break
+        nxt[shrink] -= 1
+    nxt = nxt.tolist()
+    starts = []
+    s = 0
+    while s < n:
+        starts.append(s)
+        s = nxt[s]
+    return starts
+
+
+def _parse_layout_words_numpy(
+    np: Any, words: list[dict], page_width: float, layout_cfg: dict[str, Any], x_cut: Optional[float] = None
+) -> list[tuple[str, str]]:
+    """Array version of _parse_layout_words_python(): one sort per page, per-row splits by segment ops."""
+    y_tol, min_words, page_w, x_cut, min_gap = _layout_params(page_width, layout_cfg, x_cut)
+    n = len(words)
+    coords = np.fromiter(chain.from_iterable(map(_WORD_COORDS, words)), dtype=np.float64, count=3 * n)
+    top, x0, x1 = coords[0::3], coords[1::3], coords[2::3]
+
+    # Lines: stable sort by (top, x0), then by x0 within each line (stable, as sorted() is)
+    order = np.lexsort((x0, top))
+    starts = _line_starts(np, top[order], y_tol)
+    line_id = np.zeros(n, dtype=np.int64)
+    line_id[starts[1:]] = 1
+    line_id = np.cumsum(line_id)
+    order = order[np.lexsort((x0[order], line_id))]
+    x0, x1 = x0[order], x1[order]
+
+    start = np.asarray(starts, dtype=np.int64)
+    count = np.diff(np.append(start, n))
+    # Rows are x0-sorted, so the left band (x0 < x_cut) is a prefix of each row
+    n_left = np.add.reduceat((x0 < x_cut).astype(np.int64), start)
+    split = start + n_left
+
+    # Rows with an empty band split after their widest gap instead (first one on ties)
+    gap = np.full(n, -np.inf)
+    gap[:-1] = x0[1:] - x1[:-1]
+    gap[start[1:] - 1] = -np.inf  # no gap across rows
+    max_gap = np.maximum.reduceat(gap, start)
+    is_max = gap == max_gap[line_id]
+    first_idx = np.flatnonzero(is_max)
+    first_max = np.full(len(start), -1, dtype=np.int64)
+    max_rows = line_id[first_idx]
+    first_of_row = np.ones(len(first_idx), dtype=bool)
+    first_of_row[1:] = max_rows[1:] != max_rows[:-1]
+    first_max[max_rows[first_of_row]] = first_idx[first_of_row]
+    use_gap = (n_left == 0) | (n_left == count)
+    gap_ok = (max_gap > 0.0) & (max_gap >= min_gap)
+    split = np.where(use_gap, first_max + 1, split)
+    keep = (count >= min_words) & (~use_gap | gap_ok)
+
+    texts = [str(words[i]["text"]) for i in order.tolist()]
+    pairs: list[tuple[str, str]] = []
+    for a, b, e in zip(start[keep].tolist(), split[keep].tolist(), (start + count)[keep].tolist()):
+        item_raw = " ".join(texts[a:b]).strip()
+        if len(item_raw) >= 2:
+            pairs.append((item_raw, " ".join(texts[b:e]).strip()))
+
+    # Numeric-token check once per distinct token on the page
+    numeric: dict[str, bool] = {}
+    out: list[tuple[str, str]] = []
+    for item_raw, nums_str in pairs:
+        numish = 0
+        for p in nums_str.replace(",", " ").split():
+            ok = numeric.get(p)
+            if ok is None:
+                ok = numeric[p] = _token_is_numeric(p)
+            numish += ok
+        if numish >= 2:
+            out.append((item_raw, nums_str))
+    return out
+
+
+@lru_cache(maxsize=1 << 14)
+def _word_kind(text: str) -> int:
+    """1 numeric (commas allowed), 0 dash / blank placeholder, -1 text."""
+    t = text.replace(",", "")
+    if not t.strip("-\u2013\u2014"):
+        return 0
+    return 1 if _token_is_numeric(t) else -1
+
+
+def detect_numeric_columns(words: list[dict], page_width: float, layout_cfg: dict[str, Any]) -> list[dict[str, float]]:
+    """
+    Find the numeric cost bands of a list page from an x-coverage histogram of its word boxes.
+
+    Each bin of column_bin_width points counts the numeric and text words covering it. A band
+    starts at a bin where numeric words dominate and reach column_min_rows and column_min_fraction
+    of the busiest numeric bin, continues across blank space between tier columns, and ends at
+    the next text-dominated bin. Two-column (segregated) pages give two bands. A band with no
+    text to its left is dropped.
+
+    Returns [{"x0", "x_cut", "x1"}, ...] left to right: words with x0 in [x0, x1) form one column
+    group whose numeric band starts at x_cut. [] when the page has no usable band.
+    """
+    page_w = float(page_width)
+    if not words or page_w <= 0 or float(layout_cfg.get("column_bin_width", 2.0)) <= 0:
+        return []
+    return _detect_columns(words, [_word_kind(str(w["text"])) for w in words], page_w, layout_cfg)
+
+
+def _detect_columns(
+    words: list[dict], kinds: list[int], page_w: float, layout_cfg: dict[str, Any]
+) -> list[dict[str, float]]:
+    bin_w = float(layout_cfg.get("column_bin_width", 2.0))
+    min_rows = int(layout_cfg.get("column_min_rows", 3))
+    min_frac = float(layout_cfg.get("column_min_fraction", 0.35))
+    nb = int(page_w // bin_w) + 1
+    num_d = [0] * (nb + 1)  # difference arrays: +1 at the first covered bin, -1 after the last
+    txt_d = [0] * (nb + 1)
+    for w, kind in zip(words, kinds):
+        if kind == 0:
+            continue
+        b0 = min(max(int(float(w["x0"]) // bin_w), 0), nb - 1)
+        b1 = min(max(int(float(w["x1"]) // bin_w), b0), nb - 1)
+        d = num_d if kind > 0 else txt_d
+        d[b0] += 1
+        d[b1 + 1] -= 1
+    num = list(accumulate(num_d[:nb]))
+    txt = list(accumulate(txt_d[:nb]))
+    floor = max(min_rows, min_frac * max(num))
+
+    bands: list[list[int]] = []  # [first numeric bin, last numeric bin]
+    band: Optional[list[int]] = None
+    seen_text = False  # text-dominated bins since the previous band (the item column)
+    for b in range(nb):
+        if num[b] >= floor and num[b] > txt[b]:
+            if band is None:
+                band = [b, b]
+                if seen_text:
+                    bands.append(band)
+                seen_text = False
+            band[1] = b
+        elif txt[b] >= min_rows and txt[b] >= num[b]:
+            band = None
+            seen_text = True
+    if not bands:
+        return []
+
+    cols = []
+    for i, (b0, b1) in enumerate(bands):
+        lo = 0.0 if i == 0 else (bands[i - 1][1] + 1) * bin_w
+        cols.append({"x0": lo, "x_cut": b0 * bin_w, "x1": (b1 + 1) * bin_w})
+    cols[-1]["x1"] = page_w + 1.0
+    for left, right in zip(cols, cols[1:]):
+        right["x0"] = left["x1"]
+    return cols
+
+
+def parse_layout_columns(words: list[dict], page_width: float, layout_cfg: dict[str, Any]) -> list[tuple[str, str]]:
+    """
+    (item_raw, nums_str) pairs per detected column group (detect_numeric_columns()), left group
+    first, so a two-column segregated page reads like its left then right half-page crops. Text
+    running across a group boundary (a full-width header) stays whole in the group it starts in.
+
+    Each visual line splits before its trailing run of numeric / dash words. Words left of the
+    band (by more than column_slack points) join the run only until it holds four values, so
+    tiers set left of the column stay numbers while a number ending the item text does not.
+    Needs two numeric tokens and an item; other lines come back as (text, "") so callers can
+    apply list headers and continuation lines (join_layout_continuation_pairs()).
+    [] when no numeric band is found (callers fall back to text parsing).
+    """
+    y_tol, _, page_w, _, min_gap = _layout_params(page_width, layout_cfg)
+    slack = float(layout_cfg.get("column_slack", 36.0))
+    if not words or page_w <= 0 or float(layout_cfg.get("column_bin_width", 2.0)) <= 0:
+        return []
+    kinds = [_word_kind(str(w["text"])) for w in words]
+    cols = _detect_columns(words, kinds, page_w, layout_cfg)
+    if not cols:
+        return []
+
+    # Column group per word by x0; a text run that continues across a group boundary (full-width
+    # title, category header) stays with the group it starts in
+    kind_of = {id(w): kind for w, kind in zip(words, kinds)}
+    bounds = [col["x1"] for col in cols[:-1]]
+    groups: list[list[dict]] = [[] for _ in cols]
+    for row in _group_lines(words, y_tol):
+        prev, prev_g = None, 0
+        for w in row:
+            g = bisect_right(bounds, float(w["x0"]))
+            if (
+                prev is not None
+                and g > prev_g
+                and kind_of[id(w)] < 0
+                and kind_of[id(prev)] < 0
+                and float(w["x0"]) - float(prev["x1"]) < min_gap
+            ):
+                g = prev_g
+            groups[g].append(w)
+            prev, prev_g = w, g
+
+    out: list[tuple[str, str]] = []
+    for col, group in zip(cols, groups):
+        band_lo = col["x_cut"] - slack
+        for row in _group_lines(group, y_tol):
+            k = len(row)
+            numish = 0
+            while k > 0:
+                kind = kind_of[id(row[k - 1])]
+                if kind < 0 or (float(row[k - 1]["x1"]) <= band_lo and numish >= MAX_TIER_VALUES):
+                    break
+                numish += kind
+                k -= 1
+            item_raw = " ".join(str(w["text"]) for w in row[:k]).strip()
+            if numish < 2 or len(item_raw) < 2:
+                text = " ".join(str(w["text"]) for w in row).strip()
+                if text:
+                    out.append((text, ""))  # header / description line
+                continue
+            out.append((item_raw, " ".join(str(w["text"]) for w in row[k:]).strip()))
+    return out
+
+
 def dump_page_words_json(page: pdfplumber.page.Page, y_tolerance: float = 3.5) -> list[dict]:
     """Debug helper: words with positions for threshold tuning (spike / CLI)."""
-    words = page.extract_words(x_tolerance=3, y_tolerance=y_tolerance, keep_blank_chars=False)
+    words = page.extract_words(**layout_word_kwargs({"y_tolerance": y_tolerance}))
+    return dump_words_json(words)
+
+
+def dump_words_json(words: list[dict]) -> list[dict]:
+    """Rounded text/x0/x1/top/bottom records, as printed by dump_cce_page_words.py."""
     return [
         {
             "text": w.get("text"),
@@ -0,0 +1,131 @@
+"""
+Page → active occupancy lookup for the CCE scripts.
+
+An occupancy covers pages page_start..page_end; the active occupancy for a page is the
+covering one with the greatest page_start (first-added wins ties), i.e. what
+`max((o for o in occupancies.values() if o["page_start"] <= n <= o["page_end"]), key=page_start)`
+returns. OccupancyIndex keeps occupancies sorted by page_start with a max-page_end segment
+tree over them, so lookups are O(log n) and page_end can be extended in place while
+extract-cce-pdf.py discovers occupancies page by page (appends are amortized O(1) because
+new occupancies start on the current page). validate-cce-extraction.py builds one from
+cce_occupancies rows to check occupancy-linked components.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Optional
+
+_NONE = float("-inf")
+
+
+class OccupancyIndex:
+    """Occupancy dicts (occupancy_code, page_start, page_end) indexed for active-at-page lookups."""
+
+    def __init__(self) -> None:
+        self._starts: list[int] = []
+        self._occs: list[dict] = []
+        self._pos: dict[Any, int] = {}  # occupancy_code -> position in _occs
+        self._size = 1
+        self._tree: list[float] = [_NONE, _NONE]
+
+    @classmethod
+    def from_occupancies(cls, occupancies: Iterable[dict]) -> "OccupancyIndex":
+        """Index in iteration order (ties keep it); rows without a page range are left out."""
+        index = cls()
+        rows = [o for o in occupancies if o.get("page_start") is not None and o.get("page_end") is not None]
+        rows.sort(key=lambda o: o["page_start"])  # stable
+        index._occs = rows
+        index._starts = [o["page_start"] for o in rows]
+        index._pos = {o["occupancy_code"]: i for i, o in enumerate(rows)}
+        index._rebuild()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._occs)
+
+    def __contains__(self, code: Any) -> bool:
+        return code in self._pos
+
+    def add(self, occ: dict) -> None:
+        """Index a newly discovered occupancy (the dict is kept by reference)."""
+        start = occ["page_start"]
+        if not self._starts or start >= self._starts[-1]:
+            i = len(self._occs)
+            self._occs.append(occ)
+            self._starts.append(start)
+            self._pos[occ["occupancy_code"]] = i
+            if i >= self._size:
+                self._rebuild()
+            else:
+                self._set_leaf(i, occ["page_end"])
+            return
+        i = bisect_right(self._starts, start)
+        self._occs.insert(i, occ)
+        self._starts.insert(i, start)
+        self._pos = {o["occupancy_code"]: j for j, o in enumerate(self._occs)}
+        self._rebuild()
+
+    def set_page_end(self, code: Any, page_end: int) -> None:
+        """Set occupancies[code]["page_end"] and update the index."""
+        i = self._pos[code]
+        self._occs[i]["page_end"] = page_end
+        self._set_leaf(i, page_end)
+
+    def active(self, page_num: int) -> Optional[dict]:
+        """Covering occupancy with the greatest page_start (first added on ties), or None."""
+        k = bisect_right(self._starts, page_num)
+        j = self._rightmost_at_least(1, 0, self._size, k, page_num)
+        if j < 0:
+            return None
+        first = bisect_left(self._starts, self._starts[j])
+        if first < j:
+            j = self._leftmost_at_least(1, 0, self._size, first, page_num)
+        return self._occs[j]
+
+    # --- segment tree over page_end ---
+
+    def _rebuild(self) -> None:
+        n = len(self._occs)
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+        tree = [_NONE] * (2 * size)
+        for i, o in enumerate(self._occs):
+            tree[size + i] = o["page_end"]
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+
+    def _set_leaf(self, i: int, value: float) -> None:
+        node = self._size + i
+        self._tree[node] = value
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def _rightmost_at_least(self, node: int, lo: int, hi: int, k: int, x: float) -> int:
+        """Greatest index < k whose page_end >= x, or -1."""
+        if lo >= k or self._tree[node] < x:
+            return -1
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        j = self._rightmost_at_least(2 * node + 1, mid, hi, k, x)
+        if j >= 0:
+            return j
+        return self._rightmost_at_least(2 * node, lo, mid, k, x)
+
+    def _leftmost_at_least(self, node: int, lo: int, hi: int, start: int, x: float) -> int:
+        """Smallest index >= start whose page_end >= x, or -1."""
+        if hi <= start or self._tree[node] < x:
+            return -1
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        j = self._leftmost_at_least(2 * node, lo, mid, start, x)
+        if j >= 0:
+            return j
+        return self._leftmost_at_least(2 * node + 1, mid, hi, start, x)
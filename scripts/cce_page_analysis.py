@@ -0,0 +1,125 @@
+"""
+Single-pass text analysis of one pdfplumber page for the CCE scripts.
+
+page.extract_text(), page.extract_words() and page.crop(...).extract_text() each rebuild
+pdfplumber's word clustering from the page chars. PageAnalysis builds that clustering
+once per (x_tolerance, y_tolerance) and derives the page text, word boxes and crop text
+from it, reusing pdfplumber's own WordExtractor / WordMap so the output is identical to
+the page methods. Table finding still goes through page.extract_tables() (it needs the
+ruling lines, not just chars).
+
+Falls back to the plain page methods if the pdfplumber text internals are unavailable.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+try:
+    from pdfplumber.utils import crop_to_bbox  # type: ignore
+    from pdfplumber.utils.text import WordExtractor, chars_to_textmap  # type: ignore
+except ImportError:  # pragma: no cover - older / future pdfplumber layouts
+    WordExtractor = None  # type: ignore
+
+# pdfplumber's extract_text() defaults; words with these settings come from the text wordmap
+TEXT_WORD_SETTINGS: dict[str, Any] = {
+    "x_tolerance": 3,
+    "y_tolerance": 3,
+    "keep_blank_chars": False,
+    "use_text_flow": False,
+}
+
+
+def lines_equivalent_for_tolerances(chars: list[dict], tol_a: float, tol_b: float) -> bool:
+    """
+    True when WordExtractor yields the same words with y_tolerance tol_a and tol_b.
+
+    Sufficient condition (all chars upright): clustering the distinct char tops at the smaller
+    tolerance gives lines that are each at most that tall, separated by gaps larger than the
+    bigger tolerance. Then both tolerances produce the same line clusters, and the per-char
+    interline test (|Δtop| > y_tolerance) never fires inside a line at either tolerance.
+    """
+    lo, hi = min(tol_a, tol_b), max(tol_a, tol_b)
+    if not chars:
+        return True
+    if not all(c["upright"] for c in chars):
+        return False
+    tops = sorted({c["top"] for c in chars})
+    start = last = tops[0]
+    for top in tops[1:]:
+        if top <= last + lo:
+            if top - start > lo:
+                return False
+        elif top <= last + hi:
+            return False
+        else:
+            start = top
+        last = top
+    return True
+
+
+class PageAnalysis:
+    """Lazily computed, shared word clustering for one page."""
+
+    def __init__(self, page: Any):
+        self.page = page
+        self._wordmaps: dict[tuple, Any] = {}
+        self._text: Optional[str] = None
+
+    @property
+    def chars(self) -> list[dict]:
+        return self.page.chars
+
+    def wordmap(self, **settings: Any) -> Any:
+        """pdfplumber WordMap (word → chars tuples) for the given WordExtractor settings."""
+        merged = {**TEXT_WORD_SETTINGS, **settings}
+        key = tuple(sorted(merged.items()))
+        if key not in self._wordmaps:
+            self._wordmaps[key] = WordExtractor(**merged).extract_wordmap(self.chars)
+        return self._wordmaps[key]
+
+    def text(self) -> str:
+        """Same as page.extract_text()."""
+        if self._text is None:
+            if WordExtractor is None:
+                self._text = self.page.extract_text() or ""
+            else:
+                page = self.page
+                textmap = self.wordmap().to_textmap(
+                    layout_bbox=page.bbox,
+                    layout_width=page.width,
+                    layout_height=page.height,
+                    presorted=True,
+                )
+                self._text = textmap.as_string or ""
+        return self._text
+
+    def words(self, **settings: Any) -> list[dict]:
+        """Same as page.extract_words(**settings); shares clustering with text() when provably equal."""
+        if WordExtractor is None:
+            return self.page.extract_words(**settings)
+        merged = {**TEXT_WORD_SETTINGS, **settings}
+        y_tol = merged.pop("y_tolerance")
+        if merged == {k: v for k, v in TEXT_WORD_SETTINGS.items() if k != "y_tolerance"} and (
+            y_tol == TEXT_WORD_SETTINGS["y_tolerance"]
+            or lines_equivalent_for_tolerances(self.chars, TEXT_WORD_SETTINGS["y_tolerance"], y_tol)
+        ):
+            return [word for word, _ in self.wordmap().tuples]
+        return [word for word, _ in self.wordmap(**settings).tuples]
+
+    def crop_text(self, bbox: tuple[float, float, float, float]) -> str:
+        """Same as page.crop(bbox).extract_text(), clipping only the chars (not every page object)."""
+        if WordExtractor is None:
+            return self.page.crop(bbox).extract_text() or ""
+        x0, top, x1, bottom = bbox
+        p0, ptop, p1, pbottom = self.page.bbox
+        if x0 < p0 or top < ptop or x1 > p1 or bottom > pbottom or x0 >= x1 or top >= bottom:
+            # Let pdfplumber raise its usual out-of-bounds error
+            return self.page.crop(bbox).extract_text() or ""
+        textmap = chars_to_textmap(
+            crop_to_bbox(self.chars, bbox),
+            layout_bbox=bbox,
+            layout_width=x1 - x0,
+            layout_height=bottom - top,
+        )
+        return textmap.as_string or ""
@@ -0,0 +1,106 @@
+"""
+Persistent per-page cache of pdfplumber output (text, tables, words, ...) for CCE scripts.
+
+Keyed by PDF content SHA-256, page number, view name and extraction settings (including the
+pdfplumber version), so re-running extract-cce-pdf.py / audit / word dumps against an
+unchanged PDF skips layout analysis and only pays for the regex and heuristic stages.
+Values are zlib-compressed JSON in a single SQLite file (safe for --workers processes).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_PAGE_CACHE_PATH = Path(__file__).resolve().parent.parent / "local_data" / ".cce-page-cache.sqlite"
+
+# Returned by PageCache.get() when nothing is stored (cached values may legitimately be empty)
+MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_views (
+  pdf_sha256 TEXT NOT NULL,
+  page_num INTEGER NOT NULL,
+  view TEXT NOT NULL,
+  settings TEXT NOT NULL,
+  value BLOB NOT NULL,
+  PRIMARY KEY (pdf_sha256, page_num, view, settings)
+);
+CREATE TABLE IF NOT EXISTS pdf_meta (
+  pdf_sha256 TEXT PRIMARY KEY,
+  total_pages INTEGER NOT NULL
+);
+"""
+
+
+def pdf_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _pdfplumber_version() -> str:
+    try:
+        import pdfplumber  # type: ignore
+
+        return str(getattr(pdfplumber, "__version__", "unknown"))
+    except ImportError:
+        return "unknown"
+
+
+def settings_key(settings: Optional[dict[str, Any]] = None) -> str:
+    """Canonical string for extraction kwargs; pdfplumber upgrades invalidate old entries."""
+    return json.dumps({"pdfplumber": _pdfplumber_version(), **(settings or {})}, sort_keys=True)
+
+
+class PageCache:
+    """SQLite-backed store; one instance per process (connections are not shared across forks)."""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pdf_hash: str, page_num: int, view: str, settings: str) -> Any:
+        row = self._conn.execute(
+            "SELECT value FROM page_views WHERE pdf_sha256 = ? AND page_num = ? AND view = ? AND settings = ?",
+            (pdf_hash, page_num, view, settings),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, pdf_hash: str, page_num: int, view: str, settings: str, value: Any) -> None:
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 1)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO page_views (pdf_sha256, page_num, view, settings, value) VALUES (?, ?, ?, ?, ?)",
+            (pdf_hash, page_num, view, settings, blob),
+        )
+        self._conn.commit()
+
+    def get_total_pages(self, pdf_hash: str) -> Optional[int]:
+        row = self._conn.execute("SELECT total_pages FROM pdf_meta WHERE pdf_sha256 = ?", (pdf_hash,)).fetchone()
+        return int(row[0]) if row else None
+
+    def put_total_pages(self, pdf_hash: str, total_pages: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pdf_meta (pdf_sha256, total_pages) VALUES (?, ?)",
+            (pdf_hash, total_pages),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
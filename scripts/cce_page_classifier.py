@@ -0,0 +1,91 @@
+"""
+Cheap per-page classification for the CCE scripts (text + ruling-line counts, no table finding).
+
+Labels: occupancy_grid, pct_table, list, segregated, modifier, skip (life expectancy and
+front matter). extract-cce-pdf.py uses page_needs_tables() to run page.extract_tables()
+only where ruling lines make a table possible; labels are stored with the page (and in the
+page cache) so audit-cce-pdf-extraction.py can reuse them.
+
+pdfplumber's default table settings find cells only at intersections of horizontal and
+vertical ruling edges, so a page without both orientations provably has no tables.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Bump when labels or rules change (part of the page-cache key)
+CLASSIFIER_VERSION = 1
+
+PAGE_LABELS = ("occupancy_grid", "pct_table", "list", "segregated", "modifier", "skip")
+
+FRONT_MATTER_MARKERS = ("LICENSE AGREEMENT", "TABLE OF CONTENTS")
+
+
+def page_is_pct_table(text: str) -> bool:
+    """Percentage-of-total tables (ELECTRICAL, PLUMBING, HVAC, ...): OCCUPANCY + LOW + MEDIAN."""
+    return (
+        "OCCUPANCY" in text
+        and "LOW" in text
+        and "MEDIAN" in text
+        and ("HIGH" in text or "TOTAL" in text or "ELECTRICAL" in text or "PLUMBING" in text or "HVAC" in text)
+    )
+
+
+def ruling_edge_counts(page: Any) -> dict[str, int]:
+    """Horizontal / vertical edges from lines, rects and curves (what the "lines" table strategy uses)."""
+    counts = {"h": 0, "v": 0}
+    for edge in page.edges:
+        orientation = edge.get("orientation")
+        if orientation in counts:
+            counts[orientation] += 1
+    return counts
+
+
+def classify_page_text(text: str, h_edges: int = 0, v_edges: int = 0) -> str:
+    text_upper = text.upper()
+    if "LIFE EXPECTANCY" in text_upper:
+        return "skip"
+    # Before front matter: the extractor's segregated check needs to know whether tables exist
+    if "SEGREGATED COST METHOD" in text_upper:
+        return "segregated"
+    if any(m in text_upper for m in FRONT_MATTER_MARKERS):
+        return "skip"
+    if page_is_pct_table(text):
+        return "pct_table"
+    if "WALL HEIGHT" in text_upper or ("PERIMETER" in text_upper and "AVERAGE" in text_upper):
+        return "modifier"
+    if h_edges and v_edges and "CLASS" in text_upper and "TYPE" in text_upper:
+        return "occupancy_grid"
+    return "list"
+
+
+def classify_page(page: Any, text: str) -> dict[str, Any]:
+    """{"label", "h_edges", "v_edges"} for one pdfplumber page whose extract_text() is `text`."""
+    counts = ruling_edge_counts(page)
+    return {
+        "label": classify_page_text(text, counts["h"], counts["v"]),
+        "h_edges": counts["h"],
+        "v_edges": counts["v"],
+    }
+
+
+def page_may_have_tables(page_class: dict[str, Any]) -> bool:
+    """False only when extract_tables() is certain to return [] (no h/v ruling intersections possible)."""
+    return bool(page_class.get("h_edges")) and bool(page_class.get("v_edges"))
+
+
+def page_needs_tables(page_class: dict[str, Any], profile: dict[str, Any]) -> bool:
+    """
+    Whether the extractor should run extract_tables() on this page.
+
+    Skips pages that cannot have tables. Pages labelled "skip" keep their tables by default:
+    the front matter markers are plain substrings, and grids on those pages still feed modifier
+    and occupancy cost rows. An edition whose skip pages are known to hold no cost data can opt
+    in with page_rules.skip_tables_on_skip_pages = true.
+    """
+    if not page_may_have_tables(page_class):
+        return False
+    if page_class.get("label") == "skip":
+        return not (profile.get("page_rules") or {}).get("skip_tables_on_skip_pages", False)
+    return True
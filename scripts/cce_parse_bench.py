@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Golden-corpus benchmark for the CCE parsing helpers: throughput per helper on checked-in inputs,
+compared against a baseline so parser slowdowns (and output changes) show up release over release.
+
+Corpus (scripts/data/cce-parse-corpus/): list_lines.txt (page text lines of list / segregated pages,
+in page order), component_items.txt (raw item names), tier_rows.json (col_1..col_4 values),
+table_headers.json (first rows of extract_tables()) and page_words/*.json (dump_cce_page_words.py
+--json records). The licensed PDF cannot be committed, so the checked-in corpus was captured from
+`cce_synthetic_pdf.py --pages 120 --seed 5`; --capture rebuilds it from any PDF.
+
+baseline.json stores, per case, a digest of the helper's output and its throughput relative to a
+fixed pure-Python calibration loop timed in the same run, so a baseline taken on one machine can be
+checked on another. A case fails when its digest changes or its relative throughput drops more than
+--threshold below the baseline. Cases missing from the baseline are reported as new.
+
+Usage:
+  python3 scripts/cce_parse_bench.py                          # run and compare against baseline.json
+  python3 scripts/cce_parse_bench.py --case layout --json     # cases whose name contains "layout"
+  python3 scripts/cce_parse_bench.py --update-baseline        # after an intended speed or output change
+  python3 scripts/cce_parse_bench.py --capture path/to.pdf --page-cache   # rebuild the corpus
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_scripts_dir = Path(__file__).resolve().parent
+if str(_scripts_dir) not in sys.path:
+    sys.path.insert(0, str(_scripts_dir))
+
+from cce_component_item_extract import (  # noqa: E402
+    cached_normalize_component_item_name,
+    join_list_continuation_lines,
+    normalize_component_item_name,
+    normalize_component_item_names,
+    parse_list_cost_line,
+    parse_numeric_token,
+    scan_list_cost_line,
+    tier_order_ok,
+)
+from cce_component_table_gate import component_table_header_allowed  # noqa: E402
+from cce_extract_profile import default_profile_dict  # noqa: E402
+from cce_extract_rules import list_line_is_protected_for_merge  # noqa: E402
+from cce_layout_list_parse import (  # noqa: E402
+    _numpy,
+    dump_words_json,
+    layout_word_kwargs,
+    parse_layout_columns,
+    parse_layout_list_words,
+)
+
+DEFAULT_CORPUS_DIR = _scripts_dir / "data" / "cce-parse-corpus"
+DEFAULT_THRESHOLD = 0.25
+
+
+def load_corpus(corpus_dir: Path = DEFAULT_CORPUS_DIR) -> dict[str, Any]:
+    """Read the corpus files; page_words is a list of {"page", "width", "height", "words"} records."""
+    corpus_dir = Path(corpus_dir)
+    return {
+        "list_lines": (corpus_dir / "list_lines.txt").read_text(encoding="utf-8").splitlines(),
+        "component_items": (corpus_dir / "component_items.txt").read_text(encoding="utf-8").splitlines(),
+        "tier_rows": json.loads((corpus_dir / "tier_rows.json").read_text(encoding="utf-8")),
+        "table_headers": json.loads((corpus_dir / "table_headers.json").read_text(encoding="utf-8")),
+        "page_words": [
+            json.loads(p.read_text(encoding="utf-8")) for p in sorted((corpus_dir / "page_words").glob("*.json"))
+        ],
+    }
+
+
+def capture_corpus(pdf_path: str, out_dir: Path, cache_path: Optional[str] = None, word_pages: int = 12) -> dict[str, int]:
+    """
+    Write a corpus from a PDF: text lines of list / segregated pages, items and tier values from
+    their cost lines and from table rows, table header rows, and word dumps of up to word_pages
+    list / segregated pages spread over the book. Table rows feed items and tiers only when the
+    header passes component_table_header_allowed(). Returns item counts per file.
+    """
+    from cce_page_classifier import page_may_have_tables
+    from cce_pdf_pages import PdfPageSource
+
+    layout_cfg = default_profile_dict()["layout"]
+    lines: list[str] = []
+    items: list[str] = []
+    tiers: list[list[Optional[float]]] = []
+    headers: list[list[Optional[str]]] = []
+    list_pages: list[int] = []
+    words: dict[int, dict[str, Any]] = {}
+
+    with PdfPageSource(pdf_path, cache_path=cache_path) as source:
+        for n in range(1, source.total_pages + 1):
+            views = source.views(n)
+            label = views.classification().get("label")
+            if label in ("list", "segregated"):
+                list_pages.append(n)
+                for line in views.text().split("\n"):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lines.append(line)
+                    scan = scan_list_cost_line(line)
+                    if scan is not None:
+                        items.append(scan[0])
+                        tiers.append((scan[2] + [None] * 4)[:4])
+            elif label != "skip" and page_may_have_tables(views.classification()):
+                for table in views.tables():
+                    if not table:
+                        continue
+                    headers.append(table[0])
+                    if not component_table_header_allowed(table[0]):
+                        continue  # items / tiers only from component cost grids
+                    for row in table[1:]:
+                        if row and isinstance(row[0], str) and row[0].strip():
+                            items.append(row[0].strip())
+                        vals = [parse_numeric_token(c) for c in row[1:5]]
+                        if sum(v is not None for v in vals) >= 2:
+                            tiers.append(vals + [None] * (4 - len(vals)))
+            views.release()
+
+        step = max(1, len(list_pages) // max(1, word_pages))
+        for n in list_pages[::step][:word_pages]:
+            views = source.views(n)
+            width, height = views.size()
+            words[n] = {
+                "page": n,
+                "width": width,
+                "height": height,
+                "words": dump_words_json(views.words(**layout_word_kwargs(layout_cfg))),
+            }
+            views.release()
+
+    out_dir = Path(out_dir)
+    (out_dir / "page_words").mkdir(parents=True, exist_ok=True)
+    for old in (out_dir / "page_words").glob("*.json"):
+        old.unlink()
+    (out_dir / "list_lines.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    (out_dir / "component_items.txt").write_text("\n".join(items) + "\n", encoding="utf-8")
+    (out_dir / "tier_rows.json").write_text(json.dumps(tiers, separators=(",", ":")) + "\n", encoding="utf-8")
+    (out_dir / "table_headers.json").write_text(json.dumps(headers, indent=1) + "\n", encoding="utf-8")
+    for n, record in words.items():
+        (out_dir / "page_words" / f"page-{n:04d}.json").write_text(
+            json.dumps(record, separators=(",", ":")) + "\n", encoding="utf-8"
+        )
+    return {
+        "list_lines": len(lines),
+        "component_items": len(items),
+        "tier_rows": len(tiers),
+        "table_headers": len(headers),
+        "page_words": len(words),
+    }
+
+
+def _normalize_batch(items: list[str]) -> list[str]:
+    cached_normalize_component_item_name.cache_clear()  # time the work, not cache hits from the last repeat
+    return normalize_component_item_names(items)
+
+
+def bench_cases(corpus: dict[str, Any], have_numpy: Optional[bool] = None) -> list[tuple[str, str, int, Callable[[], Any]]]:
+    """(name, unit, items per call, fn) for every case; fn returns the JSON-serializable output."""
+    if have_numpy is None:
+        have_numpy = _numpy() is not None
+    lines = corpus["list_lines"]
+    items = corpus["component_items"]
+    tiers = corpus["tier_rows"]
+    headers = corpus["table_headers"]
+    pages = corpus["page_words"]
+    layout_cfg = default_profile_dict()["layout"]
+
+    cases: list[tuple[str, str, int, Callable[[], Any]]] = []
+    for strategy in ("auto", "dots", "spaces"):
+        cases.append((
+            f"parse_list_cost_line[{strategy}]", "lines", len(lines),
+            lambda s=strategy: [parse_list_cost_line(line, s) for line in lines],
+        ))
+    cases += [
+        (
+            "join_list_continuation_lines", "lines", len(lines),
+            lambda: join_list_continuation_lines(lines, line_is_protected=list_line_is_protected_for_merge),
+        ),
+        (
+            "normalize_component_item_name", "items", len(items),
+            lambda: [normalize_component_item_name(raw) for raw in items],
+        ),
+        ("normalize_component_item_names", "items", len(items), lambda: _normalize_batch(items)),
+        ("tier_order_ok", "rows", len(tiers), lambda: [tier_order_ok(row) for row in tiers]),
+        (
+            "component_table_header_allowed", "headers", len(headers),
+            lambda: [component_table_header_allowed(h) for h in headers],
+        ),
+    ]
+    for engine in ("python", "numpy") if have_numpy else ("python",):
+        cases.append((
+            f"parse_layout_list_words[{engine}]", "pages", len(pages),
+            lambda e=engine: [parse_layout_list_words(p["words"], p["width"], layout_cfg, engine=e) for p in pages],
+        ))
+    cases.append((
+        "parse_layout_columns", "pages", len(pages),
+        lambda: [parse_layout_columns(p["words"], p["width"], layout_cfg) for p in pages],
+    ))
+    return cases
+
+
+def output_digest(out: Any) -> str:
+    return hashlib.sha256(json.dumps(out, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+
+
+def _calls_per_timing(fn: Callable[[], Any], min_time: float) -> int:
+    """Calls of fn that take about min_time (fn runs once to find out)."""
+    t0 = time.perf_counter()
+    fn()
+    once = time.perf_counter() - t0
+    return max(1, math.ceil(min_time / once)) if once > 0 else 1
+
+
+def _time_calls(fn: Callable[[], Any], number: int) -> float:
+    """Seconds per call over `number` back-to-back calls."""
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - t0) / number
+
+
+def _calibration_work() -> int:
+    """Fixed string / float / sort workload, close to what the parsers spend their time on."""
+    rows = [f"Item {i % 97} .... {i * 0.25:.2f} {i % 13}" for i in range(20000)]
+    rows.sort(key=str.lower)
+    return sum(len(r.split()) for r in rows if float(r.split()[-2]) >= 0)
+
+
+def run_suite(
+    corpus: dict[str, Any],
+    *,
+    repeat: int = 3,
+    min_time: float = 0.2,
+    only: Optional[str] = None,
+    have_numpy: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    Time every case (names containing `only`); returns {"calibration_ops", "cases": {name: result}}.
+
+    Each repeat times the calibration loop right before the case, so load changes during the run
+    shift both; the best time of each over all repeats is kept.
+    """
+    cal_number = _calls_per_timing(_calibration_work, min_time / 2)
+    cal_best = float("inf")
+    cases: dict[str, dict[str, Any]] = {}
+    for name, unit, n, fn in bench_cases(corpus, have_numpy):
+        if only and only not in name:
+            continue
+        digest = output_digest(fn())
+        number = _calls_per_timing(fn, min_time)
+        case_cal = best = float("inf")
+        for _ in range(max(1, repeat)):
+            case_cal = min(case_cal, _time_calls(_calibration_work, cal_number))
+            best = min(best, _time_calls(fn, number))
+        cal_best = min(cal_best, case_cal)
+        per_sec = n / best if best > 0 else float("inf")
+        cases[name] = {
+            "unit": unit,
+            "items": n,
+            "digest": digest,
+            "per_sec": round(per_sec, 1),
+            "relative": round(per_sec * case_cal, 3),
+        }
+    return {"calibration_ops": round(1.0 / cal_best, 2) if cases else None, "cases": cases}
+
+
+def median_results(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine run_suite() results: median calibration and, per case, the run with the median relative throughput."""
+    cals = [r["calibration_ops"] for r in runs if r["calibration_ops"]]
+    cases = {}
+    for name in runs[0]["cases"]:
+        ordered = sorted((r["cases"][name] for r in runs), key=lambda c: c["relative"])
+        cases[name] = ordered[len(ordered) // 2]
+    return {"calibration_ops": statistics.median(cals) if cals else None, "cases": cases}
+
+
+def compare_to_baseline(results: dict[str, Any], baseline: Optional[dict[str, Any]], threshold: float) -> list[dict[str, Any]]:
+    """
+    One row per case: status ok | slower | changed | new, with ratio = relative throughput / baseline.
+    slower and changed are failures.
+    """
+    base_cases = (baseline or {}).get("cases") or {}
+    rows = []
+    for name, r in results["cases"].items():
+        row = {"case": name, **r, "ratio": None}
+        b = base_cases.get(name)
+        if b is None:
+            row["status"] = "new"
+        elif b.get("items") != r["items"] or b.get("digest") != r["digest"]:
+            row["status"] = "changed"
+        else:
+            row["ratio"] = round(r["relative"] / b["relative"], 3) if b.get("relative") else None
+            row["status"] = "slower" if row["ratio"] is not None and row["ratio"] < 1.0 - threshold else "ok"
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CCE parsing helpers on the golden corpus")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help="Corpus directory (default: %(default)s)")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON (default: <corpus>/baseline.json)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when relative throughput drops more than this fraction (default %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats; best is kept (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Seconds per timing repeat (default 0.1)")
+    parser.add_argument("--runs", type=int, default=3, help="Suite runs; the median per case is kept (default 3)")
+    parser.add_argument("--case", default=None, help="Only cases whose name contains this text")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run's results as the baseline")
+    parser.add_argument("--capture", metavar="PDF", default=None, help="Rebuild the corpus from this PDF and exit")
+    parser.add_argument("--word-pages", type=int, default=12, help="Word dumps to capture (default 12)")
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(_scripts_dir.parent / "local_data" / ".cce-page-cache.sqlite"),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Page cache for --capture (see extract-cce-pdf.py --page-cache)",
+    )
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus)
+    baseline_path = Path(args.baseline) if args.baseline else corpus_dir / "baseline.json"
+
+    if args.capture:
+        if not Path(args.capture).is_file():
+            print(f"Error: PDF not found: {args.capture}")
+            sys.exit(1)
+        counts = capture_corpus(args.capture, corpus_dir, args.page_cache, args.word_pages)
+        print(f"Captured corpus in {corpus_dir}: " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+        print("Run with --update-baseline to record digests and throughput for it.")
+        return
+
+    if not (corpus_dir / "list_lines.txt").is_file():
+        print(f"Error: no corpus in {corpus_dir} (capture one with --capture path/to.pdf)")
+        sys.exit(1)
+    corpus = load_corpus(corpus_dir)
+    results = median_results(
+        [run_suite(corpus, repeat=args.repeat, min_time=args.min_time, only=args.case) for _ in range(max(1, args.runs))]
+    )
+
+    if args.update_baseline:
+        results["python"] = platform.python_version()
+        baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {baseline_path} ({len(results['cases'])} cases)")
+        return
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.is_file() else None
+    rows = compare_to_baseline(results, baseline, args.threshold)
+    failed = [r for r in rows if r["status"] in ("slower", "changed")]
+    if args.json:
+        print(json.dumps({"calibration_ops": results["calibration_ops"], "threshold": args.threshold, "cases": rows}, indent=2))
+    else:
+        if baseline is None:
+            print(f"Note: no baseline at {baseline_path}; every case is new")
+        if results["calibration_ops"]:
+            print(f"Calibration: {results['calibration_ops']:,.1f} loops/sec (Python {platform.python_version()})")
+        for r in rows:
+            vs = f"x{r['ratio']:.2f} vs baseline" if r["ratio"] is not None else ""
+            print(f"  {r['case']:<34} {r['per_sec']:>14,.0f} {r['unit']}/sec   {vs:<17} {r['status']}")
+        skipped = sorted(set((baseline or {}).get("cases") or {}) - set(results["cases"]))
+        if skipped and not args.case:
+            print(f"  not run here: {', '.join(skipped)}")
+    if failed:
+        print(
+            f"Error: {len(failed)} case(s) regressed (threshold {args.threshold:.0%}) or changed output: "
+            + ", ".join(r["case"] for r in failed),
+            file=sys.stderr if args.json else sys.stdout,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
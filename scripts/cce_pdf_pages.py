@@ -0,0 +1,292 @@
+"""
+Page reading stage for extract-cce-pdf.py: pdfplumber page → plain dict.
+
+read_page() does all of the pdfplumber work for one page (text, page class, grid tables,
+segregated half-page crops, layout word pairs) and returns a picklable dict, so the stateful parse
+stage in extract-cce-pdf.py never touches the PDF. iter_page_data() yields those dicts in
+page order, either serially or sharded across a process pool (--workers N); each worker
+opens the PDF itself and the caller replays pages in order, so cross-page state
+(section, occupancy ranges) is rebuilt exactly as in a serial run.
+
+PdfPageSource / PageViews put the optional persistent page cache (cce_page_cache.py) in
+front of pdfplumber: with a warm cache the PDF is never opened and every view is a lookup.
+On a miss, text / words / crop text come from one shared PageAnalysis (cce_page_analysis.py)
+so the page chars are clustered once instead of once per view.
+
+With timings=True (--profile-report) each page dict also carries "timings": seconds per view
+(cache lookup included), measured wherever the page was read.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+import pdfplumber  # type: ignore
+
+from cce_extract_profile import profile_layout_auto_columns, profile_layout_list_enabled_for_page
+from cce_page_analysis import PageAnalysis
+from cce_page_classifier import CLASSIFIER_VERSION, classify_page, page_needs_tables
+from cce_page_cache import MISSING, PageCache, pdf_sha256, settings_key
+
+# Pages per pool task: small enough to balance uneven pages, large enough to amortize IPC
+DEFAULT_CHUNK_SIZE = 8
+
+_worker_source: Any = None
+_worker_profile: Optional[Mapping[str, Any]] = None
+_worker_timings = False
+
+
+class PdfPageSource:
+    """
+    Lazily opened PDF plus optional page cache. Use as a context manager.
+
+    The PDF is only opened when a view misses the cache (or when `pdf` is accessed), so a
+    fully cached run does no pdfplumber parsing at all.
+    """
+
+    def __init__(self, pdf_path: str, cache_path: Optional[str] = None, pdf_hash: Optional[str] = None):
+        self.pdf_path = pdf_path
+        self.cache_path = cache_path
+        self.cache: Optional[PageCache] = PageCache(cache_path) if cache_path else None
+        self.pdf_hash = pdf_hash or (pdf_sha256(pdf_path) if self.cache else None)
+        self._pdf: Any = None
+
+    @property
+    def pdf(self) -> Any:
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf
+
+    @property
+    def total_pages(self) -> int:
+        if self.cache is not None:
+            n = self.cache.get_total_pages(self.pdf_hash)
+            if n is not None:
+                return n
+            n = len(self.pdf.pages)
+            self.cache.put_total_pages(self.pdf_hash, n)
+            return n
+        return len(self.pdf.pages)
+
+    def views(self, page_num: int) -> "PageViews":
+        return PageViews(self, page_num)
+
+    def cache_stats(self) -> Optional[tuple[int, int]]:
+        """(hits, misses) for this process, or None when caching is off."""
+        return (self.cache.hits, self.cache.misses) if self.cache else None
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def __enter__(self) -> "PdfPageSource":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class PageViews:
+    """Cached pdfplumber views of one page (1-indexed page_num)."""
+
+    def __init__(self, source: PdfPageSource, page_num: int):
+        self.source = source
+        self.page_num = page_num
+        self._page: Any = None
+        self._analysis: Optional[PageAnalysis] = None
+        self.timings: Optional[dict[str, float]] = None  # view name -> seconds, when profiling
+
+    @property
+    def page(self) -> Any:
+        if self._page is None:
+            self._page = self.source.pdf.pages[self.page_num - 1]
+        return self._page
+
+    @property
+    def analysis(self) -> PageAnalysis:
+        if self._analysis is None:
+            self._analysis = PageAnalysis(self.page)
+        return self._analysis
+
+    def release(self) -> None:
+        """Drop pdfplumber's parsed objects / layout for this page (memory stays flat over long runs)."""
+        if self._page is not None:
+            close = getattr(self._page, "close", None)
+            if close is not None:
+                close()
+            else:
+                self._page.flush_cache()
+        self._page = None
+        self._analysis = None
+
+    def view(self, name: str, settings: Optional[dict[str, Any]], compute: Callable[[Any], Any]) -> Any:
+        """Return compute(page), served from / stored in the page cache when enabled (JSON-able values only)."""
+        if self.timings is not None:
+            t0 = time.perf_counter()
+            try:
+                return self._view(name, settings, compute)
+            finally:
+                self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
+        return self._view(name, settings, compute)
+
+    def _view(self, name: str, settings: Optional[dict[str, Any]], compute: Callable[[Any], Any]) -> Any:
+        cache = self.source.cache
+        if cache is None:
+            return compute(self.page)
+        key = settings_key(settings)
+        value = cache.get(self.source.pdf_hash, self.page_num, name, key)
+        if value is MISSING:
+            value = compute(self.page)
+            cache.put(self.source.pdf_hash, self.page_num, name, key, value)
+        return value
+
+    def text(self) -> str:
+        return self.view("text", None, lambda p: self.analysis.text())
+
+    def tables(self) -> list:
+        return self.view("tables", None, lambda p: p.extract_tables())
+
+    def classification(self) -> dict[str, Any]:
+        """cce_page_classifier.classify_page() result (label + ruling edge counts)."""
+        text = self.text()
+        return self.view("page_class", {"classifier": CLASSIFIER_VERSION}, lambda p: classify_page(p, text))
+
+    def size(self) -> tuple[float, float]:
+        w, h = self.view("size", None, lambda p: [float(p.width), float(p.height)])
+        return w, h
+
+    def crop_text(self, bbox: tuple[float, float, float, float]) -> str:
+        return self.view("crop_text", {"bbox": list(bbox)}, lambda p: self.analysis.crop_text(bbox))
+
+    def words(self, **kwargs: Any) -> list[dict]:
+        return self.view("words", kwargs, lambda p: self.analysis.words(**kwargs))
+
+
+def read_page(views: PageViews, page_num: int, profile: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Extract everything the parse stage needs from one page.
+
+    Keys: page_num, text, page_class (cce_page_classifier), tables ([] without calling
+    extract_tables() when the class says no table path can use them), tables_read,
+    text_blocks (segregated crop halves or None; not cropped when layout_pairs were found),
+    layout_pairs ((item_raw, nums_str) from bbox parsing; empty unless enabled for the page).
+    """
+    text = views.text()
+    page_class = views.classification()
+    tables_read = page_needs_tables(page_class, profile)
+    tables = views.tables() if tables_read else []
+    text_upper = text.upper()
+    data: dict[str, Any] = {
+        "page_num": page_num,
+        "text": text,
+        "page_class": page_class,
+        "tables": tables,
+        "tables_read": tables_read,
+        "text_blocks": None,
+        "layout_pairs": [],
+    }
+    if views.timings is not None:
+        data["timings"] = views.timings
+    if "LIFE EXPECTANCY" in text_upper:
+        return data
+
+    # Bbox list parsing: fixed column cut on layout_list_pages, detected column bands with auto_columns
+    layout_parse = None
+    if profile_layout_list_enabled_for_page(profile, page_num):
+        from cce_layout_list_parse import parse_layout_list_words as layout_parse
+    elif profile_layout_auto_columns(profile) and page_class.get("label") in ("list", "segregated"):
+        from cce_layout_list_parse import parse_layout_columns as layout_parse
+    if layout_parse is not None:
+        from cce_layout_list_parse import layout_word_kwargs
+
+        layout_cfg = profile.get("layout") or {}
+        words = views.words(**layout_word_kwargs(layout_cfg))
+        width = views.size()[0]
+        t0 = time.perf_counter()
+        data["layout_pairs"] = layout_parse(words, width, layout_cfg)
+        if views.timings is not None:
+            views.timings["layout_pairs"] = time.perf_counter() - t0
+    if data["layout_pairs"]:
+        return data  # the list parser uses these instead of text / crops
+
+    is_segregated_page = "SEGREGATED COST METHOD" in text_upper and not tables
+    force_crop = (profile.get("page_rules") or {}).get("force_segregated_crop", True)
+    if is_segregated_page and force_crop:
+        try:
+            w, h = views.size()
+            left = views.crop_text((0, 0.1 * h, 0.5 * w, 0.95 * h))
+            right = views.crop_text((0.5 * w, 0.1 * h, w, 0.95 * h))
+            data["text_blocks"] = [left, right]
+        except Exception:
+            data["text_blocks"] = [text]
+    return data
+
+
+def _init_worker(
+    pdf_path: str, cache_path: Optional[str], pdf_hash: Optional[str], profile: Mapping[str, Any], timings: bool = False
+) -> None:
+    global _worker_source, _worker_profile, _worker_timings
+    _worker_source = PdfPageSource(pdf_path, cache_path=cache_path, pdf_hash=pdf_hash)
+    _worker_profile = profile
+    _worker_timings = timings
+
+
+def _read_and_release(source: PdfPageSource, page_num: int, profile: Mapping[str, Any], timings: bool = False) -> dict[str, Any]:
+    views = source.views(page_num)
+    if timings:
+        views.timings = {}
+    try:
+        return read_page(views, page_num, profile)
+    finally:
+        views.release()
+
+
+def _read_page_chunk(page_nums: list[int]) -> list[dict[str, Any]]:
+    return [_read_and_release(_worker_source, n, _worker_profile or {}, _worker_timings) for n in page_nums]
+
+
+def iter_page_data(
+    source: PdfPageSource,
+    page_nums: list[int],
+    profile: Mapping[str, Any],
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timings: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield read_page() dicts for page_nums (1-indexed) in the given order.
+
+    Each page's pdfplumber objects are released once it has been read.
+    workers <= 1 reads serially from `source`. workers > 1 shards contiguous chunks across
+    a process pool (each worker opens its own PdfPageSource on the same PDF and cache); at
+    most 2 * workers chunks are in flight so results never pile up faster than the caller
+    consumes them.
+    """
+    if workers <= 1 or len(page_nums) <= chunk_size:
+        for n in page_nums:
+            yield _read_and_release(source, n, profile, timings)
+        return
+
+    chunks = [page_nums[k : k + chunk_size] for k in range(0, len(page_nums), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(source.pdf_path, source.cache_path, source.pdf_hash, profile, timings),
+    ) as pool:
+        pending: deque = deque()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < 2 * workers:
+                pending.append(pool.submit(_read_page_chunk, chunks[next_chunk]))
+                next_chunk += 1
+            for data in pending.popleft().result():
+                yield data
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic Marshall & Swift CCE-shaped PDF for offline end-to-end runs.
+
+The licensed PDF cannot be committed, so this writes a structurally similar book with no
+third-party dependency (raw PDF objects, standard Helvetica): SECTION n PAGE m headers,
+occupancy grids (CLASS / TYPE / Sq.Ft.), percentage tables, dot-leader list pages,
+segregated two-column pages, modifier grids, component grids and life-expectancy pages.
+
+Usage:
+  python3 scripts/cce_synthetic_pdf.py --out local_data/CCE_Synthetic_2026.pdf --pages 1200
+  python3 scripts/cce_synthetic_pdf.py --out /tmp/cce.pdf --pages 60 --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Optional
+
+PAGE_W = 612
+PAGE_H = 792
+MARGIN = 36
+
+OCCUPANCY_NAMES = (
+    "Apartments", "Hotels", "Motels", "Office Buildings", "Warehouses", "Retail Stores",
+    "Restaurants", "Garages", "Hospitals", "Nursing Homes", "Churches", "Theaters",
+    "Libraries", "Schools", "Fire Stations", "Banks", "Clubhouses", "Bowling Centers",
+    "Cold Storage", "Hangars", "Lodges", "Dormitories", "Markets", "Showrooms",
+)
+SECTION_NAMES = (
+    "APARTMENTS", "HOTELS", "OFFICES", "WAREHOUSES", "STORES", "RESTAURANTS",
+    "GARAGES", "HOSPITALS", "CHURCHES", "SCHOOLS",
+)
+LIST_ITEMS = (
+    "Wood deck with railing", "Concrete slab on grade", "Steel stairs with landing",
+    "Aluminum awning", "Canvas canopy", "Metal roof panels", "Ornamental iron railing",
+    "Precast concrete steps", "Glass block panels", "Brick veneer wall",
+    "Kitchen wall cabinets", "Built-in bookcases", "Fireplace, masonry",
+    "Exterior insulation finish", "Vinyl siding", "Cedar shingles", "Stucco on frame",
+    "Garage door, overhead", "Entrance doors, pair", "Skylight curb",
+)
+LIST_HEADERS = (
+    "BALCONIES AND CANOPIES", "WALL COSTS", "DOORS - RESIDENTIAL", "GARAGE DOORS",
+    "MISCELLANEOUS", "STAIRS AND LANDINGS",
+)
+SEGREGATED_CATEGORIES = (
+    "SHEDS AND FARM BUILDINGS", "CHURCHES, THEATERS AND AUDITORIUMS",
+    "SCHOOLS AND PUBLIC BUILDINGS", "STORES AND COMMERCIAL BUILDINGS",
+)
+GRID_CLASSES = ("A", "B", "C", "D", "S")
+GRID_QUALITIES = ("Excellent", "Good", "Average", "Low cost")
+PAGE_KINDS = (
+    "occupancy", "occupancy_cont", "pct", "list", "segregated", "modifier", "component",
+    "life", "prose",
+)
+
+
+def _pdf_str(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class _Canvas:
+    """Minimal content-stream builder (text + stroked lines)."""
+
+    def __init__(self) -> None:
+        self.ops: list[str] = []
+
+    def text(self, x: float, y: float, s: str, size: float = 8, bold: bool = False) -> None:
+        font = "F2" if bold else "F1"
+        self.ops.append(f"BT /{font} {size:g} Tf {x:.2f} {y:.2f} Td ({_pdf_str(s)}) Tj ET")
+
+    def line(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        self.ops.append(f"{x0:.2f} {y0:.2f} m {x1:.2f} {y1:.2f} l S")
+
+    def grid(self, x: float, top: float, widths: list[float], rows: list[list[str]], row_h: float = 12, size: float = 6) -> float:
+        """Draw a ruled table with its top edge at y=top; return y of the bottom edge."""
+        self.ops.append("0.5 w")
+        total_w = sum(widths)
+        n = len(rows)
+        for r in range(n + 1):
+            y = top - r * row_h
+            self.line(x, y, x + total_w, y)
+        cx = x
+        for w in widths + [0]:
+            self.line(cx, top, cx, top - n * row_h)
+            cx += w
+        for r, row in enumerate(rows):
+            cx = x
+            for w, cell in zip(widths, row):
+                if cell:
+                    self.text(cx + 2, top - (r + 1) * row_h + 3.5, cell, size=size, bold=(r == 0))
+                cx += w
+        return top - n * row_h
+
+    def stream(self) -> bytes:
+        return ("\n".join(self.ops) + "\n").encode("latin-1", errors="replace")
+
+
+def _money(rng: random.Random, lo: float, hi: float) -> float:
+    return round(rng.uniform(lo, hi), 2)
+
+
+def _tiers(rng: random.Random, base_lo: float = 5, base_hi: float = 120) -> list[float]:
+    a = _money(rng, base_lo, base_hi)
+    out = [a]
+    for _ in range(3):
+        out.append(round(out[-1] * rng.uniform(1.08, 1.45), 2))
+    return out
+
+
+def _leader(item: str, width: int = 44) -> str:
+    return item + " " + "." * max(3, width - len(item)) + " "
+
+
+def _header(c: _Canvas, section: int, page_in_section: int, section_name: str) -> None:
+    c.text(MARGIN, PAGE_H - 40, f"SECTION {section} PAGE {page_in_section} {section_name}", size=9, bold=True)
+    c.text(PAGE_W - 170, PAGE_H - 40, "MARSHALL VALUATION SERVICE", size=7)
+
+
+def _page_license(c: _Canvas) -> None:
+    lines = (
+        "Dear Customer,",
+        "It is a pleasure to provide this proprietary information (12) under license.",
+        "This subscription agreement (14) covers renewal terms for the current year.",
+        "Welcome to the Commercial Cost Explorer.",
+    )
+    y = PAGE_H - 80
+    for s in lines:
+        c.text(MARGIN, y, s, size=10)
+        y -= 16
+
+
+def _page_toc(c: _Canvas, rng: random.Random) -> None:
+    c.text(MARGIN, PAGE_H - 60, "TABLE OF CONTENTS", size=12, bold=True)
+    y = PAGE_H - 90
+    for i, name in enumerate(SECTION_NAMES):
+        c.text(MARGIN, y, _leader(name.title(), 60) + f"Section {11 + i}", size=9)
+        y -= 14
+
+
+def _page_occupancy(c: _Canvas, rng: random.Random, occ_name: str, occ_code: int, with_title: bool) -> None:
+    y = PAGE_H - 70
+    if with_title:
+        c.text(MARGIN, y, "CALCULATOR METHOD", size=9, bold=True)
+        y -= 16
+        c.text(MARGIN, y, f"{occ_name.upper()} ({occ_code})", size=10, bold=True)
+        y -= 20
+    header = ["CLASS", "TYPE", "EXTERIOR WALLS", "INTERIOR FINISH", "LIGHTING PLUMBING", "HEAT", "Sq. M.", "Cu. Ft.", "Sq. Ft."]
+    rows = [header]
+    for cls in rng.sample(GRID_CLASSES, 2):
+        for q in GRID_QUALITIES:
+            sq_ft = _money(rng, 60, 320)
+            rows.append([
+                cls, q, rng.choice(("Brick, stone", "Frame, siding", "Block, stucco")),
+                rng.choice(("Plaster, paint", "Drywall", "Paneling")),
+                rng.choice(("Good", "Average", "Minimum")),
+                rng.choice(("Hot water", "Forced air", "Heat pump")),
+                f"{sq_ft * 10.764:,.2f}", f"{sq_ft / 9.5:.2f}", f"{sq_ft:.2f}",
+            ])
+    c.grid(MARGIN, y, [30, 52, 78, 70, 72, 56, 60, 48, 48], rows)
+
+
+def _page_pct(c: _Canvas, rng: random.Random) -> None:
+    y = PAGE_H - 70
+    c.text(MARGIN, y, "OCCUPANCY      LOW  MEDIAN  HIGH      TOTAL ELECTRICAL", size=8, bold=True)
+    y -= 16
+    for name in rng.sample(OCCUPANCY_NAMES, 14):
+        nums = []
+        for _ in range(3):
+            lo = round(rng.uniform(1, 6), 1)
+            nums += [lo, round(lo * 1.4, 1), round(lo * 1.9, 1)]
+        nums += [round(rng.uniform(0.2, 2), 1) for _ in range(3)]
+        c.text(MARGIN, y, _leader(name, 28) + " ".join(f"{n:.1f}" for n in nums), size=7)
+        y -= 12
+        if rng.random() < 0.2:
+            c.text(MARGIN, y, "and nursing homes", size=7)
+            y -= 12
+
+
+def _list_lines(rng: random.Random, n: int) -> list[str]:
+    out: list[str] = []
+    for _ in range(n):
+        item = rng.choice(LIST_ITEMS)
+        tiers = _tiers(rng)
+        r = rng.random()
+        if r < 0.12:
+            words = item.split()
+            cut = max(1, len(words) // 2)
+            out.append(" ".join(words[:cut]))
+            out.append(_leader(" ".join(words[cut:]), 38) + " ".join(f"{t:.2f}" for t in tiers))
+        elif r < 0.2:
+            out.append(item + "  " + " ".join(f"{t:.2f}" for t in tiers))
+        elif r < 0.25:
+            out.append(f"Add for {item.lower()}")
+        else:
+            out.append(_leader(item, 44) + " ".join(f"{t:.2f}" for t in tiers))
+    return out
+
+
+def _page_list(c: _Canvas, rng: random.Random) -> None:
+    y = PAGE_H - 70
+    c.text(MARGIN, y, rng.choice(LIST_HEADERS), size=9, bold=True)
+    y -= 16
+    c.text(MARGIN, y, "EXTERIOR BALCONIES/LANDINGS (Apply to balcony area)", size=8)
+    y -= 14
+    for s in _list_lines(rng, 34):
+        c.text(MARGIN, y, s, size=7.5)
+        y -= 11
+        if y < 60:
+            break
+    c.text(MARGIN, 44, "For additional information see Section 3. Costs include contractor overhead and profit.", size=6.5)
+
+
+def _page_segregated(c: _Canvas, rng: random.Random) -> None:
+    c.text(MARGIN, PAGE_H - 60, "SEGREGATED COST METHOD", size=9, bold=True)
+    c.text(MARGIN, PAGE_H - 74, rng.choice(SEGREGATED_CATEGORIES), size=9, bold=True)
+    for col_x in (MARGIN, PAGE_W / 2 + 8):
+        y = PAGE_H - 110
+        for _ in range(26):
+            item = rng.choice(LIST_ITEMS)[:22]
+            c.text(col_x, y, _leader(item, 24) + " ".join(f"{t:.2f}" for t in _tiers(rng, 2, 60)), size=6)
+            y -= 10
+
+
+def _page_modifier(c: _Canvas, rng: random.Random) -> None:
+    y = PAGE_H - 70
+    c.text(MARGIN, y, "WALL HEIGHT MULTIPLIERS", size=9, bold=True)
+    rows = [["AVERAGE WALL HEIGHT (M)", "(FT)", "SQ. FT.", "SQ. M.", "CU. FT."]]
+    h = rng.choice((2.4, 2.7, 3.0))
+    for k in range(12):
+        meters = round(h + 0.3 * k, 1)
+        mult = round(0.88 + 0.025 * k, 3)
+        rows.append([f"{meters:.1f}", f"{meters * 3.2808:.0f}", f"{mult:.3f}", f"{mult:.3f}", f"{mult * 0.98:.3f}"])
+    c.grid(MARGIN, y - 16, [120, 60, 70, 70, 70], rows)
+
+
+def _page_component(c: _Canvas, rng: random.Random) -> None:
+    y = PAGE_H - 70
+    c.text(MARGIN, y, "UNIT-IN-PLACE COSTS", size=9, bold=True)
+    rows = [["ITEM", "LOW", "AVG.", "GOOD", "EXCL."]]
+    for item in rng.sample(LIST_ITEMS, 10):
+        rows.append([item] + [f"{t:.2f}" for t in _tiers(rng)])
+    y = c.grid(MARGIN, y - 16, [200, 70, 70, 70, 70], rows)
+    rows2 = [["TOTAL AREA (Square Feet)", "Basement", "4", "6", "8"]]
+    for k in range(4):
+        rows2.append([f"{(k + 1) * 1000:,}", f"{0.9 + k / 20:.2f}", f"{0.95 + k / 20:.2f}", f"{1.0 + k / 20:.2f}", f"{1.05 + k / 20:.2f}"])
+    c.grid(MARGIN, y - 30, [200, 70, 70, 70, 70], rows2)
+
+
+def _page_life(c: _Canvas, rng: random.Random) -> None:
+    c.text(MARGIN, PAGE_H - 70, "LIFE EXPECTANCY GUIDELINES", size=9, bold=True)
+    y = PAGE_H - 90
+    for s in _list_lines(rng, 20):
+        c.text(MARGIN, y, s, size=7)
+        y -= 11
+
+
+def _page_prose(c: _Canvas, rng: random.Random) -> None:
+    y = PAGE_H - 70
+    words = "costs include labor materials overhead profit and permits for typical construction quality".split()
+    for _ in range(44):
+        c.text(MARGIN, y, " ".join(rng.choice(words) for _ in range(14)).capitalize(), size=8)
+        y -= 14
+
+
+def build_page_plan(n_pages: int, seed: int) -> list[dict]:
+    """Deterministic page plan: list of {kind, section, page_in_section, ...}."""
+    rng = random.Random(seed)
+    plan: list[dict] = [{"kind": "license"}, {"kind": "toc"}]
+    section = 11
+    occ_code = 300
+    while len(plan) < n_pages:
+        sec_name = SECTION_NAMES[(section - 11) % len(SECTION_NAMES)]
+        pages_in_section = rng.randint(8, 20)
+        for p in range(1, pages_in_section + 1):
+            if len(plan) >= n_pages:
+                break
+            kind = rng.choices(PAGE_KINDS, weights=(16, 10, 5, 26, 8, 5, 10, 4, 6))[0]
+            entry = {"kind": kind, "section": section, "page_in_section": p, "section_name": sec_name}
+            if kind == "occupancy":
+                occ_code += rng.randint(1, 9)
+                entry["occ_code"] = occ_code
+                entry["occ_name"] = rng.choice(OCCUPANCY_NAMES)
+            plan.append(entry)
+        section += 1
+    return plan[:n_pages]
+
+
+def render_page(entry: dict, seed: int, index: int) -> bytes:
+    rng = random.Random(f"{seed}:{index}")
+    c = _Canvas()
+    kind = entry["kind"]
+    if kind == "license":
+        _page_license(c)
+    elif kind == "toc":
+        _page_toc(c, rng)
+    else:
+        _header(c, entry["section"], entry["page_in_section"], entry["section_name"])
+        if kind == "occupancy":
+            _page_occupancy(c, rng, entry["occ_name"], entry["occ_code"], with_title=True)
+        elif kind == "occupancy_cont":
+            _page_occupancy(c, rng, "", 0, with_title=False)
+        elif kind == "pct":
+            _page_pct(c, rng)
+        elif kind == "list":
+            _page_list(c, rng)
+        elif kind == "segregated":
+            _page_segregated(c, rng)
+        elif kind == "modifier":
+            _page_modifier(c, rng)
+        elif kind == "component":
+            _page_component(c, rng)
+        elif kind == "life":
+            _page_life(c, rng)
+        else:
+            _page_prose(c, rng)
+    return c.stream()
+
+
+def write_synthetic_cce_pdf(out_path: str, n_pages: int = 120, seed: int = 2026) -> dict:
+    """Write the PDF; return {"pages": n, "kinds": {kind: count}}."""
+    plan = build_page_plan(max(2, n_pages), seed)
+    n = len(plan)
+    # Object numbers: 1 catalog, 2 pages, 3 F1, 4 F2, then (page, content) pairs
+    offsets: list[int] = []
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_obj(num: int, body: bytes) -> None:
+        offsets.append(len(out))
+        out.extend(f"{num} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    kids = " ".join(f"{5 + 2 * i} 0 R" for i in range(n))
+    add_obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    add_obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode())
+    add_obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    add_obj(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    kinds: dict[str, int] = {}
+    for i, entry in enumerate(plan):
+        kinds[entry["kind"]] = kinds.get(entry["kind"], 0) + 1
+        page_num, content_num = 5 + 2 * i, 6 + 2 * i
+        add_obj(
+            page_num,
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_num} 0 R >>"
+            ).encode(),
+        )
+        stream = render_page(entry, seed, i)
+        add_obj(content_num, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"endstream")
+    xref_at = len(out)
+    out.extend(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.extend(f"{off:010d} 00000 n \n".encode())
+    out.extend(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(out)
+    return {"pages": n, "kinds": kinds}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(description="Generate a synthetic CCE-shaped PDF")
+    p.add_argument("--out", required=True, help="Output PDF path")
+    p.add_argument("--pages", type=int, default=120)
+    p.add_argument("--seed", type=int, default=2026)
+    args = p.parse_args(argv)
+    info = write_synthetic_cce_pdf(args.out, args.pages, args.seed)
+    print(f"Wrote {args.out}: {info['pages']} pages {info['kinds']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Streaming checks over cce_component_costs rows for validate-cce-extraction.py and
+test-component-data-quality.py.
+
+Rows come from Supabase in keyset pages (iter_table_rows: ORDER BY id with id > last id, so every
+row is read once and large tables are no longer cut off at 10k rows) or from a local
+extract-cce-pdf.py --output-dir run (cce_extract_output.iter_extract_run_table). ComponentValidator
+updates every check as each row arrives, in one pass. Memory grows with the number of sections, one
+count per distinct (section, item, page) key and the kept examples, never with whole rows.
+
+col_1 percentiles come from QuantileSketch, a log-bucketed histogram. p1 / p99 are within
+QUANTILE_RELATIVE_ERROR of a true sample value. Outlier counts are rows in buckets entirely
+below p1 or above p99, so values sharing p1's bucket are not counted.
+
+server_component_validation calls the cce_component_validation RPC
+(scripts/migrations/create-cce-component-validation-rpc.sql), which builds the same
+component_validation block in Postgres in one round trip, with exact percentiles;
+validate-cce-extraction.py uses it first and falls back to the client pass.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from cce_component_item_extract import TIER_ATOL, TIER_RTOL, tier_order_ok
+
+QUANTILE_RELATIVE_ERROR = 0.005
+KEYSET_PAGE_ROWS = 1000
+COMPONENT_VALIDATION_COLUMNS = "id,section_name,item_name,col_1,col_2,col_3,col_4,source_page"
+COMPONENT_VALIDATION_RPC = "cce_component_validation"
+
+ADD_FOR_SECTION_RE = re.compile(r"^[Aa]dd\s+for\s+")
+TRAILING_PUNCT_SECTION_RE = re.compile(r"[,\;]$")
+# Cost-like number run in an item name, e.g. "34.34 57.80 97.31" (column bleed)
+COST_NUMBERS_RE = re.compile(r"\b\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\b")
+TOC_DOTS_RE = re.compile(r"\.{3,}")
+
+# Row-level checks, in report order
+ROW_CHECKS = (
+    "low_gt_high",  # col_2 < col_1 * 0.5
+    "column_shift",  # col_4 < col_3 * 0.5 with col_3 > 1 (Excellent < Good)
+    "section_add_for",
+    "section_trailing_punct",
+    "item_cost_bleed",
+    "item_toc_dot_runs",
+    "tier_order_violations",
+)
+
+
+def parse_numeric(v: Any) -> Optional[float]:
+    if v is None:
+        return None
+    try:
+        return float(str(v).strip().replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_table_rows(
+    client: Any,
+    table: str,
+    columns: str,
+    *,
+    where: Optional[Callable[[Any], Any]] = None,
+    page_rows: int = KEYSET_PAGE_ROWS,
+    key: str = "id",
+    after: Any = None,
+) -> Iterator[dict]:
+    """
+    All rows of a Supabase table, page by page on `key` (must be in `columns`), starting after
+    `after` when given. where(query) adds filters. Stops on an empty page, so a server max-rows
+    cap below page_rows only means smaller pages.
+    """
+    last = after
+    while True:
+        q = client.table(table).select(columns)
+        if where is not None:
+            q = where(q)
+        if last is not None:
+            q = q.gt(key, last)
+        rows = q.order(key).limit(page_rows).execute().data or []
+        if not rows:
+            return
+        yield from rows
+        last = rows[-1][key]
+
+
+def server_component_validation(client: Any) -> dict[str, Any]:
+    """
+    component_validation computed by the cce_component_validation RPC. Raises when the
+    function is missing (migration not run) or returns something else than an object.
+    """
+    data = client.rpc(COMPONENT_VALIDATION_RPC, {"tier_rtol": TIER_RTOL, "tier_atol": TIER_ATOL}).execute().data
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    if not isinstance(data, dict) or "total_rows" not in data:
+        raise ValueError(f"{COMPONENT_VALIDATION_RPC} returned {type(data).__name__}, expected an object")
+    # jsonb sorts object keys; sections are reported most common first
+    data["sections"] = dict(sorted((data.get("sections") or {}).items(), key=lambda kv: (-kv[1], kv[0])))
+    return data
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram (DDSketch-style): value v > 0 goes to bucket ceil(log_gamma(v)) with
+    gamma = (1 + e) / (1 - e), so any bucket's representative is within e (relative) of its values.
+    Negative values mirror the positive buckets; zero has its own bucket.
+    """
+
+    def __init__(self, relative_error: float = QUANTILE_RELATIVE_ERROR):
+        self.relative_error = relative_error
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._pos: dict[int, int] = {}
+        self._neg: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, v: float) -> None:
+        if v > 0:
+            k = math.ceil(math.log(v) / self._log_gamma)
+            self._pos[k] = self._pos.get(k, 0) + 1
+        elif v < 0:
+            k = math.ceil(math.log(-v) / self._log_gamma)
+            self._neg[k] = self._neg.get(k, 0) + 1
+        else:
+            self._zero += 1
+        self.count += 1
+        if self.min is None or v < self.min:
+            self.min = v
+        if self.max is None or v > self.max:
+            self.max = v
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different relative errors")
+        for mine, theirs in ((self._pos, other._pos), (self._neg, other._neg)):
+            for k, c in theirs.items():
+                mine[k] = mine.get(k, 0) + c
+        self._zero += other._zero
+        self.count += other.count
+        for v in (other.min, other.max):
+            if v is not None:
+                self.min = v if self.min is None else min(self.min, v)
+                self.max = v if self.max is None else max(self.max, v)
+
+    def _order(self, v: float) -> tuple[int, int]:
+        """Sort key of v's bucket: negatives (largest magnitude first), zero, positives."""
+        if v > 0:
+            return (1, math.ceil(math.log(v) / self._log_gamma))
+        if v < 0:
+            return (-1, -math.ceil(math.log(-v) / self._log_gamma))
+        return (0, 0)
+
+    def _buckets(self) -> Iterator[tuple[tuple[int, int], float, int]]:
+        """(order key, representative value, count) in ascending value order."""
+        rep = 2.0 / (self._gamma + 1)
+        for k in sorted(self._neg, reverse=True):
+            yield (-1, -k), -rep * self._gamma ** k, self._neg[k]
+        if self._zero:
+            yield (0, 0), 0.0, self._zero
+        for k in sorted(self._pos):
+            yield (1, k), rep * self._gamma ** k, self._pos[k]
+
+    def value_at_rank(self, rank: int) -> Optional[float]:
+        """Approximate value of the rank-th smallest sample (0-based), clamped to [min, max]."""
+        if not self.count:
+            return None
+        rank = min(max(rank, 0), self.count - 1)
+        if rank == 0:
+            return self.min
+        if rank == self.count - 1:
+            return self.max
+        seen = 0
+        for _, value, c in self._buckets():
+            seen += c
+            if seen > rank:
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.value_at_rank(int(q * (self.count - 1))) if self.count else None
+
+    def count_below(self, x: float) -> int:
+        """Samples in buckets entirely below x's bucket."""
+        key = self._order(x)
+        return sum(c for order, _, c in self._buckets() if order < key)
+
+    def count_above(self, x: float) -> int:
+        key = self._order(x)
+        return sum(c for order, _, c in self._buckets() if order > key)
+
+
+def _example(row: dict, c: list[Optional[float]]) -> dict:
+    return {
+        "id": row.get("id"),
+        "section_name": (row.get("section_name") or "").strip(),
+        "item_name": (row.get("item_name") or "").strip(),
+        "col_1": c[0],
+        "col_2": c[1],
+        "col_3": c[2],
+        "col_4": c[3],
+        "source_page": row.get("source_page"),
+    }
+
+
+class ComponentValidator:
+    """
+    One-pass accumulator over cce_component_costs rows: add() each row, then read counts /
+    examples or build component_validation(). max_examples caps the examples kept per check
+    (None keeps all). Occupancy links are checked when an OccupancyIndex is given: link_field
+    on the row must equal active_field of the occupancy covering source_page (occupancy_id / id
+    for Supabase rows, occupancy_code / occupancy_code for local runs).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_examples: Optional[int] = 5,
+        occupancy_index: Any = None,
+        link_field: str = "occupancy_id",
+        active_field: str = "id",
+        relative_error: float = QUANTILE_RELATIVE_ERROR,
+    ):
+        self.max_examples = max_examples
+        self.occupancy_index = occupancy_index if occupancy_index is not None and len(occupancy_index) else None
+        self.link_field = link_field
+        self.active_field = active_field
+        self.total_rows = 0
+        self.sections: Counter = Counter()
+        self.with_occupancy = 0
+        self.occupancy_page_mismatch = 0
+        self.unlinked_in_occupancy_range = 0
+        self.missing = {"section_name": 0, "item_name": 0, "col_1": 0}
+        self.counts = {name: 0 for name in ROW_CHECKS}
+        self.examples: dict[str, list[dict]] = {name: [] for name in ROW_CHECKS}
+        self.col_1 = QuantileSketch(relative_error)
+        self._extreme_n = (max_examples or 5) + 1
+        self._lowest: list[tuple[float, int, dict]] = []  # max-heap via negated values
+        self._highest: list[tuple[float, int, dict]] = []
+        self._key_counts: dict[tuple[str, str, Any], int] = {}
+        self._dup_groups: dict[tuple[str, str, Any], dict] = {}
+
+    def _hit(self, name: str, row: dict, c: list[Optional[float]]) -> None:
+        self.counts[name] += 1
+        if self.max_examples is None or len(self.examples[name]) < self.max_examples:
+            self.examples[name].append(_example(row, c))
+
+    def add(self, row: dict) -> None:
+        n = self.total_rows
+        self.total_rows += 1
+        section = (row.get("section_name") or "").strip()
+        item = (row.get("item_name") or "").strip()
+        page = row.get("source_page")
+        c = [parse_numeric(row.get(f"col_{i}")) for i in range(1, 5)]
+        self.sections[section or "(null)"] += 1
+
+        link = row.get(self.link_field)
+        if link:
+            self.with_occupancy += 1
+        if self.occupancy_index is not None and page is not None:
+            active = self.occupancy_index.active(page)
+            if active:
+                if not link:
+                    self.unlinked_in_occupancy_range += 1
+                elif link != active.get(self.active_field):
+                    self.occupancy_page_mismatch += 1
+
+        if not section:
+            self.missing["section_name"] += 1
+        if not item:
+            self.missing["item_name"] += 1
+        c1 = c[0]
+        if c1 is None:
+            self.missing["col_1"] += 1
+        else:
+            self.col_1.add(c1)
+            # The few lowest / highest col_1 rows: outlier samples without a second pass
+            if len(self._highest) < self._extreme_n:
+                heapq.heappush(self._highest, (c1, n, _example(row, c)))
+            elif c1 > self._highest[0][0]:
+                heapq.heapreplace(self._highest, (c1, n, _example(row, c)))
+            if len(self._lowest) < self._extreme_n:
+                heapq.heappush(self._lowest, (-c1, n, _example(row, c)))
+            elif -c1 > self._lowest[0][0]:
+                heapq.heapreplace(self._lowest, (-c1, n, _example(row, c)))
+
+        # The key itself, not hash(key): two keys sharing a hash would be reported as a duplicate group
+        key = (section, item, page)
+        seen = self._key_counts.get(key, 0) + 1
+        self._key_counts[key] = seen
+        if seen == 2:
+            self._dup_groups[key] = {"section_name": section, "item_name": item, "source_page": page, "count": 2}
+        elif seen > 2:
+            self._dup_groups[key]["count"] = seen
+
+        c2, c3, c4 = c[1], c[2], c[3]
+        if c1 is not None and c2 is not None and c2 < c1 * 0.5:
+            self._hit("low_gt_high", row, c)
+        if c3 is not None and c4 is not None and c3 > 1 and c4 < c3 * 0.5:
+            self._hit("column_shift", row, c)
+        if section and ADD_FOR_SECTION_RE.match(section):
+            self._hit("section_add_for", row, c)
+        if section and TRAILING_PUNCT_SECTION_RE.search(section):
+            self._hit("section_trailing_punct", row, c)
+        if item and COST_NUMBERS_RE.search(item):
+            self._hit("item_cost_bleed", row, c)
+        if item and TOC_DOTS_RE.search(item):
+            self._hit("item_toc_dot_runs", row, c)
+        if not tier_order_ok(c):
+            self._hit("tier_order_violations", row, c)
+
+    def add_rows(self, rows: Iterable[dict]) -> "ComponentValidator":
+        for row in rows:
+            self.add(row)
+        return self
+
+    @property
+    def duplicate_groups(self) -> list[dict]:
+        """(section, item, page) keys seen more than once, in first-duplicate order."""
+        return list(self._dup_groups.values())
+
+    def col_1_percentiles(self) -> Optional[dict[str, float]]:
+        """p1 / p99 at the ranks the old sorted-list report used (min / max up to 100 values)."""
+        sk = self.col_1
+        if not sk.count:
+            return None
+        n = sk.count
+        p1 = sk.value_at_rank(int(n * 0.01)) if n > 100 else sk.min
+        p99 = sk.value_at_rank(int(n * 0.99) - 1) if n > 100 else sk.max
+        return {"p1": p1, "p99": p99, "min": sk.min, "max": sk.max}
+
+    def col_1_outliers(self) -> tuple[int, int, list[dict], list[dict]]:
+        """(count below p1, count above p99, lowest examples below p1, highest examples above p99)."""
+        pct = self.col_1_percentiles()
+        if pct is None:
+            return 0, 0, [], []
+        below, above = self.col_1.count_below(pct["p1"]), self.col_1.count_above(pct["p99"])
+        low = sorted((t for t in self._lowest if -t[0] < pct["p1"]), key=lambda t: (-t[0], t[1]))[:below]
+        high = sorted((t for t in self._highest if t[0] > pct["p99"]), key=lambda t: (-t[0], t[1]))[:above]
+        return below, above, [t[2] for t in sorted(low, key=lambda t: t[1])], [t[2] for t in sorted(high, key=lambda t: t[1])]
+
+    def component_validation(self) -> dict[str, Any]:
+        """The component_validation block of validate-cce-extraction.py's report."""
+
+        def sample(name: str, fields: Callable[[dict], dict]) -> Optional[list[dict]]:
+            count = self.counts[name]
+            return [fields(e) for e in self.examples[name][:5]] if 0 < count <= 5 else None
+
+        cv: dict[str, Any] = {
+            "sections": dict(self.sections.most_common(20)),
+            "total_rows": self.total_rows,
+            "with_occupancy_id": self.with_occupancy,
+            "without_occupancy_id": self.total_rows - self.with_occupancy,
+        }
+        if self.occupancy_index is not None:
+            cv["occupancy_page_mismatch"] = self.occupancy_page_mismatch
+            cv["unlinked_in_occupancy_range"] = self.unlinked_in_occupancy_range
+
+        pct = self.col_1_percentiles()
+        if pct is not None:
+            cv["col_1_percentiles"] = {k: round(v, 2) for k, v in pct.items()}
+            cv["col_1_percentiles"]["relative_error"] = self.col_1.relative_error
+            below, above, low, high = self.col_1_outliers()
+            cv["outliers_below_p1"] = below
+            cv["outliers_above_p99"] = above
+            short = lambda e: {"section": e["section_name"], "item": e["item_name"][:40], "col_1": e["col_1"]}  # noqa: E731
+            if 0 < below <= 5:
+                cv["sample_outliers_low"] = [short(e) for e in low]
+            if 0 < above <= 5:
+                cv["sample_outliers_high"] = [short(e) for e in high]
+
+        cv["low_gt_high_anomalies"] = self.counts["low_gt_high"]
+        s = sample(
+            "low_gt_high",
+            lambda e: {"section": e["section_name"], "item": e["item_name"][:40], "col_1": e["col_1"], "col_2": e["col_2"]},
+        )
+        if s:
+            cv["sample_anomalies"] = s
+        cv["missing"] = dict(self.missing)
+        cv["section_add_for_count"] = self.counts["section_add_for"]
+        s = sample("section_add_for", lambda e: {"section": e["section_name"], "item": e["item_name"][:40]})
+        if s:
+            cv["sample_add_for_sections"] = s
+        dups = self.duplicate_groups
+        cv["duplicate_groups"] = len(dups)
+        if 0 < len(dups) <= 3:
+            cv["sample_duplicates"] = [
+                {"section": d["section_name"], "item": d["item_name"][:40], "page": d["source_page"], "count": d["count"]}
+                for d in dups
+            ]
+        cv["item_cost_bleed_count"] = self.counts["item_cost_bleed"]
+        cv["item_toc_dot_runs_count"] = self.counts["item_toc_dot_runs"]
+        cv["tier_order_violations"] = self.counts["tier_order_violations"]
+        s = sample(
+            "tier_order_violations",
+            lambda e: {
+                "section": e["section_name"],
+                "item": e["item_name"][:45],
+                "cols": [e["col_1"], e["col_2"], e["col_3"], e["col_4"]],
+                "page": e["source_page"],
+            },
+        )
+        if s:
+            cv["sample_tier_violations"] = s
+        return cv
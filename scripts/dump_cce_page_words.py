@@ -5,10 +5,12 @@ Dump pdfplumber extract_words() for a single page (layout spike / threshold tuni
 Usage:
   python3 scripts/dump_cce_page_words.py --pdf local_data/CCE_March_2026.pdf --page 27
   python3 scripts/dump_cce_page_words.py --pdf path/to.pdf --page 540 --json
+  python3 scripts/dump_cce_page_words.py --pdf path/to.pdf --page 540 --page-cache
 """
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -19,7 +21,9 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from cce_layout_list_parse import dump_page_words_json  # noqa: E402
+from cce_layout_list_parse import dump_words_json, layout_word_kwargs  # noqa: E402
+from cce_page_cache import DEFAULT_PAGE_CACHE_PATH  # noqa: E402
+from cce_pdf_pages import PdfPageSource  # noqa: E402
 
 
 def main() -> None:
@@ -28,6 +32,13 @@ def main() -> None:
     p.add_argument("--page", type=int, required=True, help="1-indexed page number")
     p.add_argument("--json", action="store_true")
     p.add_argument("--y-tolerance", type=float, default=3.5)
+    p.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(DEFAULT_PAGE_CACHE_PATH),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Reuse words cached by extract-cce-pdf.py --page-cache (same y-tolerance only)",
+    )
     args = p.parse_args()
 
     path = Path(args.pdf)
@@ -36,13 +47,13 @@ def main() -> None:
         sys.exit(1)
 
     idx = max(0, args.page - 1)
-    with pdfplumber.open(str(path)) as pdf:
-        if idx >= len(pdf.pages):
-            print(f"Page {args.page} out of range (1-{len(pdf.pages)})", file=sys.stderr)
+    with PdfPageSource(str(path), cache_path=args.page_cache) as source:
+        if idx >= source.total_pages:
+            print(f"Page {args.page} out of range (1-{source.total_pages})", file=sys.stderr)
             sys.exit(1)
-        page = pdf.pages[idx]
-        pw, ph = float(page.width), float(page.height)
-        words = dump_page_words_json(page, y_tolerance=args.y_tolerance)
+        views = source.views(idx + 1)
+        pw, ph = views.size()
+        words = dump_words_json(views.words(**layout_word_kwargs({"y_tolerance": args.y_tolerance})))
 
     if args.json:
         print(json.dumps({"page": args.page, "width": pw, "height": ph, "words": words}, indent=2))
@@ -6,6 +6,7 @@ Usage:
   python scripts/extract-catalog-units.py --start-page 42
   python scripts/extract-catalog-units.py --start-page 42 --end-page 60
   python scripts/extract-catalog-units.py --pdf path/to/catalog.pdf --dry-run
+  python scripts/extract-catalog-units.py --dry-run --debug --page-cache   # fast re-runs while tuning
 
 Requires: pip install -r requirements.txt
 Env: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY)
@@ -25,9 +26,11 @@ try:
 except ImportError:
     pass
 
-import pdfplumber
 from supabase import create_client, Client
 
+from cce_page_cache import DEFAULT_PAGE_CACHE_PATH
+from cce_pdf_pages import PdfPageSource
+
 
 def parse_numeric(s: Optional[str]) -> Optional[float]:
     if s is None or not isinstance(s, str):
@@ -240,6 +243,13 @@ def main():
     parser.add_argument("--end-page", type=int, default=None, help="End page inclusive (default: start+90)")
     parser.add_argument("--clear-first", action="store_true", help="Clear cce_catalog_units before insert")
     parser.add_argument("--debug", action="store_true", help="Print tables and headers found on each page (no insert)")
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(DEFAULT_PAGE_CACHE_PATH),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="Reuse per-page pdfplumber output cached by PDF hash (see extract-cce-pdf.py --page-cache)",
+    )
     args = parser.parse_args()
 
     base = Path(__file__).resolve().parent.parent
@@ -269,8 +279,8 @@ def main():
     end_page = args.end_page or (args.start_page + 90)
 
     print(f"Opening PDF: {pdf_path}")
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
+    with PdfPageSource(pdf_path, cache_path=args.page_cache) as source:
+        total_pages = source.total_pages
         start_idx = max(0, args.start_page - 1)
         end_idx = min(total_pages, end_page)
         end_idx = max(start_idx, end_idx)
@@ -278,8 +288,8 @@ def main():
 
         for i in range(start_idx, end_idx):
             page_num = i + 1
-            page = pdf.pages[i]
-            text = page.extract_text() or ""
+            page = source.views(page_num)
+            text = page.text()
 
             # Detect catalog section title from page text (e.g. "Converted Container Manufacturers", "Domes")
             section_patterns = [
@@ -318,9 +328,9 @@ def main():
                 current_price_category = price_cat_match.group(1).strip()
 
             # Extract hyperlinks for this page (product model -> URI)
-            link_map = extract_hyperlink_text_to_uri(page)
+            link_map = page.view("hyperlink_map", None, extract_hyperlink_text_to_uri)
 
-            tables = page.extract_tables()
+            tables = page.tables()
             if args.debug:
                 print(f"\n--- Page {page_num} ---")
                 print(f"Tables found: {len(tables) if tables else 0}")
@@ -6,9 +6,19 @@ Usage:
   python scripts/extract-cce-pdf.py
   python scripts/extract-cce-pdf.py --dry-run
   python scripts/extract-cce-pdf.py --pdf path/to/CCE_March_2026.pdf
-
-Requires: pip install -r requirements.txt
-Env: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY)
+  python scripts/extract-cce-pdf.py --dry-run --workers 8   # shard pdfplumber work across processes
+  python scripts/extract-cce-pdf.py --dry-run --page-cache  # reuse pdfplumber output from earlier runs
+  python scripts/extract-cce-pdf.py --stream                # insert batches while parsing (bounded memory)
+  python scripts/extract-cce-pdf.py --checkpoint local_data/cce-extract.checkpoint.json --resume
+  python scripts/extract-cce-pdf.py --sink postgres --database-url postgresql://...  # COPY + one-transaction merge
+  python scripts/extract-cce-pdf.py --pdf local_data/CCE_April_2026.pdf --diff  # rewrite only pages changed since last edition
+  python scripts/extract-cce-pdf.py --output-dir local_data/cce-runs/2026-03  # Parquet / NDJSON files instead of Supabase
+  python scripts/extract-cce-pdf.py --load-from local_data/cce-runs/2026-03 --clear-cce-component-costs  # load a saved run
+  python scripts/extract-cce-pdf.py --dry-run --profile-report local_data/cce-profile.json  # stage timers + .folded stacks
+  python scripts/extract-cce-pdf.py --events ndjson --job-id mar-2026  # JSON progress lines; status in local_data/cce-jobs/
+
+Requires: pip install -r requirements.txt (--sink postgres: psycopg or psycopg2; Parquet output: pyarrow)
+Env: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY); --sink postgres: CCE_DATABASE_URL
 """
 
 import argparse
@@ -27,19 +37,16 @@ try:
 except ImportError:
     pass
 
-import pdfplumber
 from supabase import create_client, Client
 
 from cce_component_item_extract import (
     ITEM_MAX_LEN,
     NORMALIZATION_VERSION,
     build_component_extraction_flags,
+    cached_normalize_component_item_name,
     header_implies_multi_tier_costs,
-    join_list_continuation_lines,
-    list_section_header_is_truncated_junk,
-    normalize_component_item_name,
-    parse_list_cost_line,
-    section_name_is_weak_short,
+    join_layout_continuation_pairs,
+    join_list_continuation_scans,
     tier_order_ok,
 )
 from cce_component_table_gate import (
@@ -47,13 +54,71 @@ from cce_component_table_gate import (
     component_table_header_allowed,
     component_table_header_blocked,
 )
-from cce_extract_profile import (
-    apply_section_alias,
-    load_cce_profile,
-    profile_extraction_date,
-    profile_layout_list_enabled_for_page,
-    profile_skip_page,
+from cce_extract_sink import (
+    REST_CONCURRENCY,
+    StreamWriter,
+    SupabaseSink,
+    cost_row_key,
+    dedupe_component_rows,
+    dedupe_cost_rows,
+)
+from cce_extract_sql_sink import SqlStagingSink
+from cce_extract_profiler import NULL_PROFILER, StageProfiler, format_stage_summary
+from cce_extract_events import open_job_events, run_with_job_events
+from cce_extract_output import (
+    OUTPUT_FORMATS,
+    load_extract_run,
+    push_extract_run,
+    resolve_output_format,
+    write_extract_run,
+)
+from cce_edition_diff import (
+    apply_edition_diff,
+    build_page_records,
+    diff_editions,
+    final_rows,
+    format_change_report,
+    page_fingerprint,
+)
+from cce_extract_checkpoint import (
+    build_checkpoint,
+    checkpoint_mismatch,
+    load_checkpoint,
+    restore_parser_state,
+    save_stream_checkpoint,
+    utc_now_iso,
 )
+from cce_extract_rules import (
+    ADD_FOR_PATTERN,
+    BLOCKED_SECTION_NAMES,
+    BUILDING_CLASS_CODES,
+    BUILDING_CLASS_PATTERN,
+    DESCRIPTIVE_HEADER_RE,
+    HAS_DIGIT_RE,
+    LIST_SECTION_HEADER_RE,
+    LIST_SKIP_RE,
+    LIST_SKIP_SECTIONS,
+    MONTH_NAMES,
+    NUMERIC_ONLY_RE,
+    NUMERIC_WITH_COMMAS_RE,
+    OCCUPANCY_NAME_BLOCK_RE,
+    QUALITY_WORDS,
+    REPEATED_CHAR_RE,
+    SECTION_NAME_RE,
+    SEGREGATED_CATEGORY_RE,
+    SIZE_HEADER_FALLBACK_RE,
+    SIZE_HEADER_RE,
+    SIZE_UNITS_HEADER_RE,
+    SKIP_ITEM_RE,
+    compile_extract_rules,
+    list_line_is_protected_for_merge,
+    match_list_header,
+)
+from cce_extract_profile import load_cce_profile, profile_extraction_date
+from cce_occupancy_index import OccupancyIndex
+from cce_page_cache import DEFAULT_PAGE_CACHE_PATH, pdf_sha256
+from cce_page_classifier import page_is_pct_table
+from cce_pdf_pages import PdfPageSource, iter_page_data
 
 
 def parse_numeric(s: Optional[str]) -> Optional[float]:
@@ -177,6 +242,118 @@ def normalize_quality_type(s: Optional[str]) -> Optional[str]:
     return s
 
 
+def looks_like_headerless_cost_row(row_cells: list) -> bool:
+    """Occupancy grid row without a header: sq m / sq ft / cu ft costs, then class and/or quality cells."""
+    if not row_cells or len(row_cells) < 5:
+        return False
+    first_three = [parse_numeric(str(c or "").replace(",", "")) for c in row_cells[:3]]
+    if not all(n is not None and 0.1 < n < 10000 for n in first_three[:2]):
+        return False
+    class_candidates = [str(c or "").strip() for c in row_cells[3:6] if c]
+    has_class = any(
+        BUILDING_CLASS_PATTERN.match(c) or c.upper() in BUILDING_CLASS_CODES
+        for c in class_candidates
+    )
+    has_quality = any(
+        any(q in str(c or "").upper() for q in QUALITY_WORDS)
+        for c in row_cells[3:7]
+    )
+    return has_class or has_quality
+
+
+DEFAULT_JOB_STATUS_DIR = Path(__file__).resolve().parent.parent / "local_data" / "cce-jobs"
+
+# Parse helpers timed individually under --profile-report (wrapped in this module's globals only then)
+PROFILED_HELPERS = (
+    "join_list_continuation_scans",
+    "cached_normalize_component_item_name",
+    "build_component_extraction_flags",
+    "match_list_header",
+    "header_implies_multi_tier_costs",
+    "looks_like_headerless_cost_row",
+    "dedupe_component_rows",
+    "dedupe_cost_rows",
+)
+
+
+def open_sink(args: argparse.Namespace, extraction_date_str: str):
+    """Database sink for --sink (exits with a message when credentials / drivers are missing)."""
+    if args.sink == "postgres":
+        if not args.database_url:
+            print("Error: --sink postgres needs --database-url (or CCE_DATABASE_URL / DATABASE_URL)")
+            sys.exit(1)
+        try:
+            return SqlStagingSink.connect(args.database_url, extraction_date_str)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_SECRET_KEY")
+    if not url or not key:
+        print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY)")
+        sys.exit(1)
+    supabase: Client = create_client(url, key)
+    return SupabaseSink(
+        supabase,
+        extraction_date_str,
+        batch_rows=args.rest_batch_rows,
+        concurrency=args.rest_concurrency,
+    )
+
+
+def load_saved_run(args: argparse.Namespace, events) -> None:
+    """--load-from: push a saved --output-dir run through the database sink without re-parsing the PDF."""
+    conflicts = [
+        flag for flag, on in (
+            ("--pdf", args.pdf), ("--output-dir", args.output_dir), ("--stream", args.stream),
+            ("--checkpoint", args.checkpoint), ("--incremental", args.incremental), ("--diff", args.diff),
+        ) if on
+    ]
+    if conflicts:
+        print(f"Error: --load-from loads a finished run; not combinable with {', '.join(conflicts)}")
+        sys.exit(1)
+    try:
+        manifest, tables = load_extract_run(args.load_from)
+    except (FileNotFoundError, ValueError, RuntimeError, json.JSONDecodeError) as e:
+        print(f"Error: cannot load {args.load_from}: {e}")
+        sys.exit(1)
+    events.rows({name: len(rows) for name, rows in tables.items() if name != "extract_stats"}, run_dir=args.load_from)
+    counts = ", ".join(f"{name}={len(rows)}" for name, rows in tables.items() if name != "extract_stats")
+    print(
+        f"Saved run {args.load_from}: edition_id={manifest.get('edition_id')!r} "
+        f"extraction_date={manifest['extraction_date']} ({manifest['format']}) {counts}"
+    )
+    if args.dry_run:
+        print("Dry run: nothing loaded.")
+        return
+    sink = open_sink(args, manifest["extraction_date"])
+    events.stage("write", sink=args.sink)
+    push_extract_run(
+        sink,
+        tables,
+        manifest["metadata"],
+        clear_cost_rows=args.clear_first,
+        clear_cost_percentages=args.clear_cce_cost_percentages,
+        clear_component_costs=args.clear_cce_component_costs,
+        clear_modifiers=args.clear_cce_modifiers,
+    )
+    print("Done.")
+    if args.validation_report:
+        run_validation_report()
+
+
+def run_validation_report() -> None:
+    try:
+        script_dir = Path(__file__).resolve().parent
+        validate_script = script_dir / "validate-cce-extraction.py"
+        if validate_script.exists():
+            import subprocess
+            print("\n--- Validation Report ---")
+            subprocess.run([sys.executable, str(validate_script)], check=False, cwd=script_dir.parent)
+    except Exception as e:
+        print(f"Note: validation report skipped ({e})")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract CCE PDF data to Supabase")
     parser.add_argument("--dry-run", action="store_true", help="Extract but do not insert")
@@ -194,8 +371,147 @@ def main():
         default=None,
         help="CCE edition profile: name (e.g. march_2026), path to .json, or omit for config/cce-profiles/default.json",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for pdfplumber page reading (default 1 = serial); parsing stays in page order so output is identical",
+    )
+    parser.add_argument(
+        "--page-cache",
+        nargs="?",
+        const=str(DEFAULT_PAGE_CACHE_PATH),
+        default=os.environ.get("CCE_PAGE_CACHE") or None,
+        help="SQLite cache of per-page pdfplumber output keyed by PDF hash (default path: local_data/.cce-page-cache.sqlite; env CCE_PAGE_CACHE)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Insert rows in batches while parsing (background writer, bounded queue) instead of all at the end",
+    )
+    parser.add_argument(
+        "--stream-queue",
+        type=int,
+        default=16,
+        help="Max pending page writes before parsing waits for the writer (--stream, default 16)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="JSON file for parser state + last committed page (implies --stream; removed after a successful run)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=25,
+        help="Pages between checkpoints (--checkpoint, default 25)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the --checkpoint file (same PDF, profile and extraction date) instead of clearing and starting over",
+    )
+    parser.add_argument(
+        "--sink",
+        choices=("rest", "postgres"),
+        default="rest",
+        help="rest (default): Supabase REST batches; postgres: COPY into staging tables, merged in one transaction",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("CCE_DATABASE_URL") or os.environ.get("DATABASE_URL") or None,
+        help="Postgres URL for --sink postgres (env CCE_DATABASE_URL / DATABASE_URL); sqlite:///path for a local stand-in",
+    )
+    parser.add_argument(
+        "--rest-batch-rows",
+        type=int,
+        default=None,
+        help="Max rows per REST request for every table (default 200 modifiers / 500 components, cost % / 1000 cost rows); halved automatically on 413 / statement timeout",
+    )
+    parser.add_argument(
+        "--rest-concurrency",
+        type=int,
+        default=REST_CONCURRENCY,
+        help=f"Concurrent REST requests for component and cost-row inserts (default {REST_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Compare page fingerprints with the latest recorded edition and rewrite only changed pages (--clear-* apply only if none is recorded)",
+    )
+    parser.add_argument(
+        "--diff-report",
+        default=None,
+        help="Write the --diff change report (changed / added / removed pages, rows written) to this JSON file",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Write occupancies, cost rows, cost %%, components, modifiers and extract stats to DIR instead of Supabase",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="auto",
+        help="--output-dir file format (auto: Parquet when pyarrow is installed, else NDJSON)",
+    )
+    parser.add_argument(
+        "--load-from",
+        default=None,
+        help="Load a saved --output-dir run into the database (--sink, --clear-* apply) without parsing the PDF",
+    )
+    parser.add_argument(
+        "--profile-report",
+        default=None,
+        help="Write stage timings, slowest pages and per-page row counts to this JSON file, plus flame-graph stacks (.folded)",
+    )
+    parser.add_argument(
+        "--events",
+        choices=("ndjson",),
+        default=None,
+        help="Print progress / stage / row-count / error events as JSON lines on stdout (log goes to stderr)",
+    )
+    parser.add_argument(
+        "--job-id",
+        default=None,
+        help="Keep <status-dir>/<job-id>.json (latest state) and .events.ndjson up to date for pollers (generated with --events)",
+    )
+    parser.add_argument(
+        "--status-dir",
+        default=str(DEFAULT_JOB_STATUS_DIR),
+        help="Directory for --job-id status files (default: local_data/cce-jobs)",
+    )
     args = parser.parse_args()
 
+    # Progress events / job status file (cce_extract_events.py); NULL_EVENTS hooks are no-ops
+    try:
+        events = open_job_events(args.events, args.job_id, args.status_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    events.emit("start", argv=sys.argv[1:])
+
+    if args.load_from:
+        events.stage("load", run_dir=args.load_from)
+        load_saved_run(args, events)
+        return
+
+    # Stage timers (cce_extract_profiler.py); NULL_PROFILER hooks are no-ops
+    profiler = StageProfiler() if args.profile_report else NULL_PROFILER
+    profiler.instrument(globals(), PROFILED_HELPERS)
+    profiler.stage("setup")
+
+    def finish_profile() -> None:
+        if not profiler.enabled:
+            return
+        report, folded = profiler.write_report(
+            args.profile_report,
+            extra={"pdf_path": pdf_path, "workers": args.workers, "page_classes": page_class_counts},
+        )
+        for line in format_stage_summary(report):
+            print(line)
+        print(f"Wrote profile report {args.profile_report} (flame graph stacks: {folded})")
+
     base = Path(__file__).resolve().parent.parent
     pdf_path = args.pdf or str(base / "local_data" / "CCE_March_2026.pdf")
     if not os.path.isfile(pdf_path):
@@ -204,6 +520,8 @@ def main():
 
     try:
         profile = load_cce_profile(args.profile)
+        # Skip / block / header matchers for this profile, built once (cce_extract_rules.py)
+        rules = compile_extract_rules(profile)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -212,28 +530,53 @@ def main():
         sys.exit(1)
     print(
         f"CCE profile edition_id={profile.get('edition_id')!r} "
-        f"list_line_strategy={profile.get('list_line_strategy')!r}"
-    )
-    extra_trunc = frozenset(
-        x.strip().upper()
-        for x in (profile.get("truncated_and_junk_headers_extra") or [])
-        if isinstance(x, str) and x.strip()
-    )
-    extra_short = frozenset(
-        x.strip().upper()
-        for x in (profile.get("short_section_denylist_extra") or [])
-        if isinstance(x, str) and x.strip()
+        f"list_line_strategy={profile.get('list_line_strategy')!r} "
+        f"list_continuation_max_lines={rules.list_continuation_max_lines!r}"
     )
-    list_strategy = str(profile.get("list_line_strategy") or "auto").strip().lower()
-
-    supabase: Optional[Client] = None
-    if not args.dry_run:
-        url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_SECRET_KEY")
-        if not url or not key:
-            print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY)")
+    list_strategy = rules.list_strategy
+
+    extraction_date_str = profile_extraction_date(profile, pdf_path).isoformat()
+    events.stage("setup", pdf_path=pdf_path, edition_id=profile.get("edition_id"), extraction_date=extraction_date_str)
+    if args.sink == "postgres" and args.checkpoint and not args.dry_run:
+        # Staged rows are only committed at the end, so there is no committed page to record
+        print("Error: --checkpoint needs --sink rest (--sink postgres commits once, at the end)")
+        sys.exit(1)
+
+    if args.diff and not args.dry_run:
+        conflicts = [
+            flag for flag, on in (
+                ("--stream", args.stream), ("--checkpoint", args.checkpoint), ("--incremental", args.incremental),
+                ("--start-page", args.start_page != 1), ("--end-page", args.end_page), ("--sink postgres", args.sink == "postgres"),
+            ) if on
+        ]
+        if conflicts:
+            print(f"Error: --diff compares whole editions; not combinable with {', '.join(conflicts)}")
+            sys.exit(1)
+    elif args.diff:
+        print("Note: --diff ignored with --dry-run")
+        args.diff = False
+
+    if args.output_dir:
+        # Files replace the database sink: every row is kept until the end, like --dry-run
+        conflicts = [
+            flag for flag, on in (
+                ("--stream", args.stream), ("--checkpoint", args.checkpoint), ("--incremental", args.incremental),
+                ("--diff", args.diff), ("--sink postgres", args.sink == "postgres"),
+            ) if on
+        ]
+        if conflicts:
+            print(f"Error: --output-dir writes files, not the database; not combinable with {', '.join(conflicts)}")
+            sys.exit(1)
+        try:
+            resolve_output_format(args.output_format)
+        except RuntimeError as e:
+            print(f"Error: {e}")
             sys.exit(1)
-        supabase = create_client(url, key)
+
+    # Database writes (cce_extract_sink.py / cce_extract_sql_sink.py); None for --dry-run / --output-dir
+    sink = None
+    if not args.dry_run and not args.output_dir:
+        sink = open_sink(args, extraction_date_str)
 
     OCCUPANCY_NAME_CODE = re.compile(r"([A-Z][A-Za-z\s\-/]+?)\s*\((\d+)\)")
     SECTION_PAGE = re.compile(r"SECTION\s+(\d+)\s+PAGE\s+(\d+)", re.IGNORECASE)
@@ -260,62 +603,211 @@ def main():
     PCT_LINE_RE = re.compile(
         r"^(.+?)\s*[\.\s]{2,}\s+([\d\.\s]+)$"
     )
-    # List-style cost lines: parsed via parse_list_cost_line() (dot-first, then legacy / right-anchored)
-    # Subsection headers on list-style pages (e.g. "EXTERIOR BALCONIES/LANDINGS (Apply to balcony area)")
-    SUBSECTION_HEADER_RE = re.compile(
-        r"^([A-Z][A-Za-z\s/]+?)\s*\(Apply to\s+[^)]+\)\s*$",
-        re.IGNORECASE,
-    )
-    # Fallback: standalone section headings (e.g. "BALCONIES AND CANOPIES", "EXTERIOR BALCONIES")
-    LIST_SECTION_FALLBACK_RE = re.compile(
-        r"^([A-Z][A-Za-z\s/]+(?:AND|OR)\s+[A-Za-z\s/]+)\s*$",
-    )
-    LIST_SECTION_SIMPLE_RE = re.compile(
-        r"^([A-Z][A-Za-z\s/]+(?:BALCONIES|CANOPIES|LANDINGS|MARQUEES)[A-Za-z\s/]*)\s*$",
-    )
-    # Wall Costs, Doors, and similar list-style section headers
-    LIST_SECTION_HEADER_RE = re.compile(
-        r"^(WALL\s+COSTS|DOORS\s*-\s*RESIDENTIAL|GARAGE\s+DOORS|ORNAMENTAL\s+DOORWAYS|MISCELLANEOUS"
-        r"|[A-Z][A-Za-z\s,]+(?:\s*-\s*[A-Z][A-Za-z\s]+)?)\s*$",
-        re.IGNORECASE,
-    )
-    # Segregated cost method category (e.g. "SHEDS AND FARM BUILDINGS", "CHURCHES, THEATERS AND AUDITORIUMS")
-    SEGREGATED_CATEGORY_RE = re.compile(
-        r"^([A-Z][A-Za-z\s,]+(?:AND|OR)\s+[A-Za-z\s,]+)\s*$",
-    )
+    # List-style cost lines: parsed once via scan_list_cost_line() inside join_list_continuation_scans()
+    # (dot-first, then legacy / right-anchored, one scan);
+    # list section / subsection headers via match_list_header() (cce_extract_rules.py)
 
     # Incremental: fetch last extracted page from metadata
     start_idx = max(0, args.start_page - 1)
-    if args.incremental and not args.dry_run and supabase:
+    if args.incremental and sink:
         try:
-            r = supabase.table("cce_extraction_metadata").select("last_page_extracted, page_end").order("created_at", desc=True).limit(1).execute()
-            if r.data and len(r.data) > 0:
-                last = r.data[0]
-                resume_from = (last.get("last_page_extracted") or last.get("page_end") or 0)
-                if resume_from > 0:
-                    start_idx = max(resume_from, start_idx)  # Resume after last extracted page
-                    print(f"Incremental: resuming from page {start_idx + 1}")
+            resume_from = sink.last_extracted_page()
+            if resume_from:
+                start_idx = max(resume_from, start_idx)  # Resume after last extracted page
+                print(f"Incremental: resuming from page {start_idx + 1}")
         except Exception as e:
             print(f"Note: incremental lookup failed ({e}), starting from page {start_idx + 1}")
 
+    if args.stream and args.dry_run:
+        print("Note: --stream ignored with --dry-run")
+        args.stream = False
+    if args.checkpoint and args.dry_run:
+        print("Note: --checkpoint ignored with --dry-run")
+        args.checkpoint = None
+    if args.resume and not args.checkpoint:
+        print("Error: --resume requires --checkpoint PATH (and no --dry-run)")
+        sys.exit(1)
+    pdf_hash: Optional[str] = None
+    checkpoint: Optional[dict] = None
+    run_started_at = utc_now_iso()
+    if args.checkpoint:
+        # A checkpoint only records rows the stream writer has already committed
+        args.stream = True
+        pdf_hash = pdf_sha256(pdf_path)
+    if args.resume:
+        try:
+            checkpoint = load_checkpoint(args.checkpoint)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error: invalid checkpoint {args.checkpoint}: {e}")
+            sys.exit(1)
+        if checkpoint is None:
+            print(f"Note: no checkpoint at {args.checkpoint}; starting from page {start_idx + 1}")
+        else:
+            reason = checkpoint_mismatch(
+                checkpoint,
+                pdf_sha256=pdf_hash,
+                edition_id=profile.get("edition_id"),
+                extraction_date=extraction_date_str,
+            )
+            if reason:
+                print(f"Error: cannot resume from {args.checkpoint}: {reason}")
+                sys.exit(1)
+            current_section, current_section_name, occupancies, prev_occupancy = restore_parser_state(checkpoint)
+            start_idx = checkpoint["last_committed_page"]
+            run_started_at = checkpoint["run_started_at"]
+            if not args.end_page:
+                args.end_page = checkpoint["page_end"]
+            print(
+                f"Resuming from {args.checkpoint}: pages {checkpoint['page_start']}-{start_idx} committed, "
+                f"{len(occupancies)} occupancies restored"
+            )
+    page_start = checkpoint["page_start"] if checkpoint else start_idx + 1
+    # Page fingerprints for the next --diff: full-book REST loads that keep every row until the end
+    page_fps: Optional[dict[int, str]] = None
+    if isinstance(sink, SupabaseSink) and not args.stream and start_idx == 0:
+        page_fps = {}
+    ckpt_counters = (checkpoint or {}).get("counters") or {}
+
+    # --stream: clear/replace up front, then hand each page's rows to a background writer.
+    # cost_rows are deduped across the whole run, so only their unique keys are kept until the end.
+    stream_writer: Optional[StreamWriter] = None
+    stream_sink = None
+    streamed_occ_codes: set[int] = set()
+    stream_counts = {"cost": 0, "pct": 0, "component": 0, "component_raw": 0, "modifier": 0}
+    stream_counts.update(ckpt_counters.get("stream_counts") or {})
+    cost_rows_by_key: dict[tuple, dict] = {}
+    for r in (checkpoint or {}).get("pending_cost_rows") or []:
+        cost_rows_by_key[cost_row_key(r)] = r
+    if args.stream and sink:
+        stream_sink = sink
+        if checkpoint:
+            # Tables were cleared by the interrupted run; only its uncheckpointed pages are redone
+            stream_sink.restore_counters(ckpt_counters.get("sink") or {})
+            stream_sink.delete_after_page(start_idx, run_started_at)
+        else:
+            stream_sink.clear_existing(
+                clear_cost_rows=args.clear_first,
+                clear_cost_percentages=args.clear_cce_cost_percentages,
+                clear_component_costs=args.clear_cce_component_costs,
+                clear_modifiers=args.clear_cce_modifiers,
+            )
+        stream_writer = StreamWriter(stream_sink, max_pending=args.stream_queue)
+        print(f"Streaming inserts (queue {args.stream_queue} pages)")
+
+    def stream_page_rows() -> None:
+        """Move rows parsed so far to the writer (occupancies first, so component rows can link)."""
+        new_occ = [dict(o) for code, o in occupancies.items() if code not in streamed_occ_codes]
+        if new_occ:
+            streamed_occ_codes.update(o["occupancy_code"] for o in new_occ)
+            stream_writer.submit(stream_sink.upsert_occupancies, new_occ, refresh_all=False)
+        if modifier_rows:
+            stream_counts["modifier"] += len(modifier_rows)
+            stream_writer.submit(stream_sink.add_modifier_rows, list(modifier_rows))
+            modifier_rows.clear()
+        if component_rows:
+            # Dedupe key includes source_page, so per-page dedupe equals the end-of-run dedupe
+            deduped = dedupe_component_rows(component_rows, extraction_date_str)
+            stream_counts["component_raw"] += len(component_rows)
+            stream_counts["component"] += len(deduped)
+            stream_writer.submit(stream_sink.add_component_rows, deduped)
+            component_rows.clear()
+        if cost_pct_rows:
+            stream_counts["pct"] += len(cost_pct_rows)
+            stream_writer.submit(stream_sink.add_cost_pct_rows, list(cost_pct_rows))
+            cost_pct_rows.clear()
+        if cost_rows:
+            stream_counts["cost"] += len(cost_rows)
+            for r in cost_rows:
+                cost_rows_by_key[cost_row_key(r)] = r
+            cost_rows.clear()
+
+    def write_checkpoint(snapshot: dict) -> None:
+        # Runs on the writer thread after flush_pending, so every row up to the page is committed
+        # (or a batch was skipped: then this raises, the run fails and the previous checkpoint stays)
+        save_stream_checkpoint(args.checkpoint, snapshot, stream_sink)
+
+    def stream_checkpoint(last_page: int, page_class_counts: dict, tables_skipped: int) -> None:
+        """Flush partial batches, then record parser state as of `last_page` (call after stream_page_rows)."""
+        snapshot = build_checkpoint(
+            pdf_path=pdf_path,
+            pdf_sha256=pdf_hash,
+            edition_id=profile.get("edition_id"),
+            extraction_date=extraction_date_str,
+            page_start=page_start,
+            page_end=end_idx,
+            last_committed_page=last_page,
+            run_started_at=run_started_at,
+            current_section=current_section,
+            current_section_name=current_section_name,
+            occupancies=occupancies,
+            prev_occupancy=prev_occupancy,
+            pending_cost_rows=list(cost_rows_by_key.values()),
+            counters={
+                "stream_counts": stream_counts,
+                "extract_stats": extract_stats,
+                "page_class_counts": page_class_counts,
+                "tables_skipped": tables_skipped,
+            },
+        )
+        stream_writer.submit(stream_sink.flush_pending)
+        stream_writer.submit(write_checkpoint, snapshot)
+
     print(f"Opening PDF: {pdf_path}")
-    extract_stats: dict = {
+    extract_stats: dict = ckpt_counters.get("extract_stats") or {
         "rejected_non_monotonic": 0,
         "non_mono_samples": [],
         "sparse_tier_hint_rows": 0,
     }
-    with pdfplumber.open(pdf_path) as pdf:
-        total_pages = len(pdf.pages)
+    if args.page_cache:
+        print(f"Page cache: {args.page_cache}")
+    with PdfPageSource(pdf_path, cache_path=args.page_cache, pdf_hash=pdf_hash) as source:
+        total_pages = source.total_pages
         end_idx = min(total_pages, args.end_page) if args.end_page else total_pages
         end_idx = max(start_idx, end_idx)
         print(f"Total pages: {total_pages}, extracting pages {start_idx + 1}-{end_idx}")
+        page_nums = [i + 1 for i in range(start_idx, end_idx) if not profile.skip_page(i + 1)]
+        page_class_counts: dict[str, int] = dict(ckpt_counters.get("page_class_counts") or {})
+        tables_skipped = int(ckpt_counters.get("tables_skipped") or 0)
+        pages_read = 0
+        last_page_num = start_idx
+        # Page -> active occupancy (greatest page_start covering the page), kept in step with `occupancies`
+        occ_index = OccupancyIndex.from_occupancies(occupancies.values())
+        if args.workers > 1:
+            print(f"Reading pages with {args.workers} worker processes")
+
+        def row_totals() -> dict[str, int]:
+            """Rows parsed so far, for profile page counters and progress events (--stream moves rows into stream_counts)."""
+            return {
+                "occupancies": len(occupancies),
+                "cost_rows": len(cost_rows) + stream_counts["cost"],
+                "cost_pct_rows": len(cost_pct_rows) + stream_counts["pct"],
+                "component_rows": len(component_rows) + stream_counts["component_raw"],
+                "modifier_rows": len(modifier_rows) + stream_counts["modifier"],
+            }
 
-        for i in range(start_idx, end_idx):
-            page_num = i + 1
-            if profile_skip_page(profile, page_num):
-                continue
-            page = pdf.pages[i]
-            text = page.extract_text() or ""
+        profiler.counters = row_totals
+        events.start_pages(len(page_nums), row_totals)
+
+        # Pages arrive in order whatever --workers is; section/occupancy state below is rebuilt serially
+        pages_iter = iter_page_data(source, page_nums, profile, workers=args.workers, timings=profiler.enabled)
+        for page_data in profiler.pages(pages_iter):
+            if stream_writer:
+                profiler.stage("write;stream_submit")
+                stream_page_rows()  # previous page's rows (the body below has many early `continue`s)
+                if args.checkpoint and pages_read and pages_read % max(1, args.checkpoint_every) == 0:
+                    stream_checkpoint(last_page_num, page_class_counts, tables_skipped)
+            page_num = page_data["page_num"]
+            profiler.begin_page(page_num, page_data.get("timings"), page_data["page_class"]["label"])
+            last_page_num = page_num
+            pages_read += 1
+            events.page(page_num, pages_read)
+            text = page_data["text"]
+            if page_fps is not None:
+                page_fps[page_num] = page_fingerprint(text, page_data["tables"] if page_data["tables_read"] else None)
+            page_label = page_data["page_class"]["label"]
+            page_class_counts[page_label] = page_class_counts.get(page_label, 0) + 1
+            if not page_data["tables_read"]:
+                tables_skipped += 1
             text_upper = text.upper()
             is_life_expectancy_page = "LIFE EXPECTANCY" in text_upper
 
@@ -324,28 +816,17 @@ def main():
             if sec_match:
                 current_section = int(sec_match.group(1))
             # Detect section name (e.g. ELECTRICAL, APARTMENTS) - exclude dates, brand names, garbled text
-            sec_name_match = re.search(r"SECTION\s+\d+\s+PAGE\s+\d+\s+([A-Z][A-Za-z\s]+?)(?:\s|$|\n)", text)
+            sec_name_match = SECTION_NAME_RE.search(text)
             if sec_name_match:
                 raw_name = sec_name_match.group(1).strip()
-                if section_name_is_weak_short(raw_name, extra=extra_short):
+                if rules.section_name_is_weak_short(raw_name):
                     raw_name = ""  # skip updating section to ambiguous short fragment
-                # Blocklist: dates, brand names, common false positives from PDF layout
-                BLOCKED_SECTION_NAMES = frozenset({
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December",
-                    "Marshall", "MARSHALL", "Calculator", "CALCULATOR", "Method", "Notes", "Outline",
-                    "Table", "TTAABBLLEE", "December", "June", "March", "May", "November",
-                    "February", "August", "October", "September", "April", "July",
-                    "CLASS", "Type", "Exterior", "INDEX", "ALTERNATE", "OUTLINE",
-                })
                 # Also block names containing brand/layout junk (case-insensitive)
                 raw_upper = raw_name.upper()
-                month_names = ("JANUARY", "FEBRUARY", "MARCH", "APRIL", "MAY", "JUNE",
-                              "JULY", "AUGUST", "SEPTEMBER", "OCTOBER", "NOVEMBER", "DECEMBER")
                 is_brand_or_junk = (
                     "MARSHALL" in raw_upper or "VALUATION SERVICE" in raw_upper
                     or raw_upper.startswith("SECTION PAGE") or "SECTION PAGE SECTION" in raw_upper
-                    or any(raw_upper.startswith(m) for m in month_names)
+                    or raw_upper.startswith(MONTH_NAMES)
                 )
                 if raw_name and raw_name not in BLOCKED_SECTION_NAMES and not is_brand_or_junk and len(raw_name) >= 3:
                     # Skip table headers, TOC entries, and garbled text
@@ -353,19 +834,15 @@ def main():
                         "EXTERIOR WALLS" in raw_name or "INTERIOR FINISH" in raw_name
                         or raw_name.startswith("CLASS ") or "TYPE " in raw_name[:10]
                         or "SEGREGATED COST" in raw_name or "COST SECTIONS" in raw_name
-                        or re.search(r"(.)\1{3,}", raw_name) or len(raw_name) > 40
+                        or REPEATED_CHAR_RE.search(raw_name) or len(raw_name) > 40
                     )
                     if not skip:
-                        current_section_name = apply_section_alias(profile, raw_name)
+                        current_section_name = profile.section_alias(raw_name)
 
             # --- Cost percentage tables (ELECTRICAL, PLUMBING, HVAC, etc.) ---
+            profiler.stage("parse;pct_tables")
             # Broaden detection: any section with OCCUPANCY + LOW + MEDIAN (percentage-of-total tables)
-            is_pct_table = (
-                "OCCUPANCY" in text
-                and "LOW" in text
-                and "MEDIAN" in text
-                and ("HIGH" in text or "TOTAL" in text or "ELECTRICAL" in text or "PLUMBING" in text or "HVAC" in text)
-            )
+            is_pct_table = page_is_pct_table(text)
             if is_pct_table:
                 section_name = current_section_name or "ELECTRICAL"
                 pending_occ: Optional[str] = None
@@ -373,7 +850,7 @@ def main():
                     m = PCT_LINE_RE.match(line.strip())
                     if not m:
                         stripped = line.strip()
-                        if stripped and not re.search(r"\d", stripped) and 2 < len(stripped) < 50:
+                        if stripped and not HAS_DIGIT_RE.search(stripped) and 2 < len(stripped) < 50:
                             pending_occ = (pending_occ + " " + stripped) if pending_occ else stripped
                         continue
                     occ_name = m.group(1).strip()
@@ -390,7 +867,7 @@ def main():
                     if len(occ_name) < 3:
                         continue
                     # Skip header-like lines
-                    if occ_name.upper() in ("OCCUPANCY", "OCCUPANCIES") or re.match(r"^[\d\.\s]+$", occ_name):
+                    if occ_name.upper() in ("OCCUPANCY", "OCCUPANCIES") or NUMERIC_ONLY_RE.match(occ_name):
                         continue
                     # Skip footnote lines
                     if occ_name.startswith("*") or occ_name.startswith("†") or "footnote" in occ_name.lower():
@@ -427,10 +904,7 @@ def main():
                                 })
 
             # Detect occupancy name + code (filter false positives from license text)
-            OCCUPANCY_NAME_BLOCKLIST = (
-                "proprietary", "license", "agreement", "msb ", " msb", "information (",
-                "welcome", "dear ", "customer", "subscription", "renewal",
-            )
+            profiler.stage("parse;occupancies")
             occ_matches = OCCUPANCY_NAME_CODE.findall(text)
             if occ_matches:
                 for name, code_str in occ_matches:
@@ -443,7 +917,7 @@ def main():
                         continue
                     # Skip names containing license/proprietary phrases
                     name_lower = name_clean.lower()
-                    if any(phrase in name_lower for phrase in OCCUPANCY_NAME_BLOCKLIST):
+                    if OCCUPANCY_NAME_BLOCK_RE.search(name_lower):
                         continue
                     if code not in occupancies:
                         occupancies[code] = {
@@ -453,43 +927,23 @@ def main():
                             "page_start": page_num,
                             "page_end": page_num,
                         }
-                    occupancies[code]["page_end"] = page_num
+                        occ_index.add(occupancies[code])
+                    occ_index.set_page_end(code, page_num)
                     prev_occupancy = occupancies[code]
             else:
                 # No new occupancy on this page; extend previous occupancy's range
                 if prev_occupancy:
-                    prev_occupancy["page_end"] = page_num
+                    occ_index.set_page_end(prev_occupancy["occupancy_code"], page_num)
 
             # Occupancy for this page (for occupancy-specific component linking)
-            occ_for_page = None
-            candidates = [
-                occ for occ in occupancies.values()
-                if occ["page_start"] <= page_num <= occ["page_end"]
-            ]
-            if candidates:
-                occ_for_page = max(candidates, key=lambda o: o["page_start"])
+            occ_for_page = occ_index.active(page_num)
 
-            # Extract tables
-            tables = page.extract_tables()
+            tables = page_data["tables"]
 
             # --- List-style cost data: run for ALL pages (with or without grid tables) ---
+            profiler.stage("parse;list_lines")
             # Parse lines like "Concrete .........32.75 43.00 55.50 72.00"
             # Both list-style and grid tables are extracted; list_seen dedupes across both
-            LIST_SKIP_PATTERNS = (
-                r"^dear\b", r"^dear\s+customer", r"^it is a pleasure", r"^customer\b",
-                r"^(excellent|very good|good|average|fair|low|cheap)$",
-                r"^(excellent|very good|good|average|fair|low|cheap)\s*[|\|]\s*[\d\.]+",  # "Good | 18.1"
-                r"^(i|ii|iii|iv|v|vi)$", r"^section\s+[ivxlcdm]+\s*$", r"^for\s+",
-                r"^see\s+section\s+", r"^deduct\s+",
-            )
-            LIST_SKIP_SECTIONS = frozenset({
-                "January", "February", "March", "April", "May", "June",
-                "July", "August", "September", "October", "November", "December",
-                "LIFE EXPECTANCY", "LIFE EXPECTANCY GUIDELINES",
-                "MARSHALL", "Marshall", "MARSHALL VALUATION SERVICE", "VALUATION SERVICE",
-            })
-            # Block "Add for X" - these are sub-headers/add-ons, not main sections
-            ADD_FOR_PATTERN = re.compile(r"^[Aa]dd\s+for\s+", re.I)
             list_section_name = current_section_name
             # Segregated cost pages: use category from page (e.g. "SHEDS AND FARM BUILDINGS")
             is_segregated_page = "SEGREGATED COST METHOD" in text_upper and not tables
@@ -499,7 +953,7 @@ def main():
                     cat_match = SEGREGATED_CATEGORY_RE.match(early_line)
                     if cat_match and 10 <= len(early_line) <= 60:
                         seg_cat = cat_match.group(1).strip()
-                        if not list_section_header_is_truncated_junk(seg_cat, extra_trunc):
+                        if not rules.header_is_truncated_junk(seg_cat):
                             list_section_name = seg_cat
                         break
             # Fallback: when current_section_name is a blocked date, scan first lines for WALL COSTS etc.
@@ -509,27 +963,23 @@ def main():
                     header_match = LIST_SECTION_HEADER_RE.match(early_line)
                     if header_match and 5 <= len(early_line) <= 50:
                         cand = header_match.group(1).strip().rstrip(",;")
-                        if ADD_FOR_PATTERN.match(cand) or list_section_header_is_truncated_junk(cand, extra_trunc):
+                        if not rules.section_candidate_ok(cand):
                             continue
                         list_section_name = cand
                         break
             list_seen: set[tuple[str, str, int]] = set()  # (section, item, page) for dedupe
             if not is_life_expectancy_page:
-                page_rules_pr = profile.get("page_rules") or {}
-                force_crop = page_rules_pr.get("force_segregated_crop", True)
-                if is_segregated_page and force_crop:
-                    try:
-                        w, h = float(page.width), float(page.height)
-                        left = page.crop((0, 0.1 * h, 0.5 * w, 0.95 * h))
-                        right = page.crop((0.5 * w, 0.1 * h, w, 0.95 * h))
-                        text_blocks = [left.extract_text() or "", right.extract_text() or ""]
-                    except Exception:
-                        text_blocks = [text]
-                else:
-                    text_blocks = [text]
-
-                def append_component_from_list_line(item_raw: str, nums_str: str, *, layout_parsed: bool = False) -> None:
-                    nums = [parse_numeric(x) for x in nums_str.split()]
+                # Segregated half-page crops are read with the page (cce_pdf_pages.read_page)
+                text_blocks = page_data["text_blocks"] or [text]
+
+                def append_component_from_list_line(
+                    item_raw: str,
+                    nums_str: str,
+                    *,
+                    layout_parsed: bool = False,
+                    values: Optional[list[Optional[float]]] = None,
+                ) -> None:
+                    nums = values if values is not None else [parse_numeric(x) for x in nums_str.split()]
                     if len(nums) < 2:
                         return
                     nums = nums[:4]
@@ -543,15 +993,14 @@ def main():
                                 "source": "layout" if layout_parsed else "list",
                             })
                         return
-                    item_final = normalize_component_item_name(item_raw)[:ITEM_MAX_LEN]
-                    if len(item_final) < 2 or re.match(r"^[\d\.\s]+$", item_final):
+                    item_final = cached_normalize_component_item_name(item_raw)[:ITEM_MAX_LEN]
+                    if len(item_final) < 2 or NUMERIC_ONLY_RE.match(item_final):
                         return
-                    item_lower = item_final.lower()
-                    if any(re.search(p, item_lower) for p in LIST_SKIP_PATTERNS):
+                    if LIST_SKIP_RE.search(item_final.lower()):
                         return
                     if not list_section_name or list_section_name in LIST_SKIP_SECTIONS or ADD_FOR_PATTERN.match(list_section_name):
                         return
-                    sec_row = apply_section_alias(profile, list_section_name) or (list_section_name or "")
+                    sec_row = profile.section_alias(list_section_name) or (list_section_name or "")
                     n_non_null = sum(1 for x in nums if x is not None)
                     sparse = n_non_null in (1, 2)
                     flags = build_component_extraction_flags(
@@ -581,72 +1030,48 @@ def main():
                         row_data["occupancy_code"] = occ_for_page["occupancy_code"]
                     component_rows.append(row_data)
 
-                def list_line_is_protected_for_merge(line: str) -> bool:
-                    """Same structural lines as the list parser: do not glue across section/subsection headers."""
-                    if SUBSECTION_HEADER_RE.match(line):
-                        return True
-                    if LIST_SECTION_FALLBACK_RE.match(line) and len(line) >= 15:
-                        return True
-                    if LIST_SECTION_SIMPLE_RE.match(line) and len(line) >= 10:
-                        return True
-                    if LIST_SECTION_HEADER_RE.match(line) and 5 <= len(line) <= 50:
+                def apply_list_header(line: str) -> bool:
+                    """Subsection, "X AND Y", balconies/canopies, or plain list section header."""
+                    nonlocal list_section_name
+                    header = match_list_header(line)
+                    if not header:
+                        return False
+                    kind, header_match = header
+                    cand = header_match.group(1).strip().rstrip(",;")
+                    if kind == "header" and (
+                        "SECTION PAGE" in cand.upper() or "MARSHALL" in cand.upper() or "VALUATION SERVICE" in cand.upper()
+                    ):
                         return True
-                    return False
+                    if rules.section_candidate_ok(cand):
+                        list_section_name = cand
+                    return True
 
                 def process_list_lines(lines: list[str]) -> None:
-                    nonlocal list_section_name
-                    merged_lines = join_list_continuation_lines(
+                    merged = join_list_continuation_scans(
                         lines,
                         strategy=list_strategy,
                         line_is_protected=list_line_is_protected_for_merge,
+                        max_continuation_lines=rules.list_continuation_max_lines,
                     )
-                    for line in merged_lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        sub_match = SUBSECTION_HEADER_RE.match(line)
-                        if sub_match:
-                            cand = sub_match.group(1).strip().rstrip(",;")
-                            if not ADD_FOR_PATTERN.match(cand) and not list_section_header_is_truncated_junk(cand, extra_trunc):
-                                list_section_name = cand
-                            continue
-                        fallback_match = LIST_SECTION_FALLBACK_RE.match(line)
-                        if fallback_match and len(line) >= 15:
-                            cand = fallback_match.group(1).strip().rstrip(",;")
-                            if not ADD_FOR_PATTERN.match(cand) and not list_section_header_is_truncated_junk(cand, extra_trunc):
-                                list_section_name = cand
-                            continue
-                        simple_match = LIST_SECTION_SIMPLE_RE.match(line)
-                        if simple_match and len(line) >= 10:
-                            cand = simple_match.group(1).strip().rstrip(",;")
-                            if not ADD_FOR_PATTERN.match(cand) and not list_section_header_is_truncated_junk(cand, extra_trunc):
-                                list_section_name = cand
-                            continue
-                        header_match = LIST_SECTION_HEADER_RE.match(line)
-                        if header_match and 5 <= len(line) <= 50:
-                            cand = header_match.group(1).strip().rstrip(",;")
-                            if "SECTION PAGE" in cand.upper() or "MARSHALL" in cand.upper() or "VALUATION SERVICE" in cand.upper():
-                                continue
-                            if ADD_FOR_PATTERN.match(cand):
-                                continue
-                            if list_section_header_is_truncated_junk(cand, extra_trunc):
-                                continue
-                            list_section_name = cand
+                    for line, parsed_line in merged:
+                        if apply_list_header(line):
                             continue
-                        parsed_line = parse_list_cost_line(line, list_strategy)
                         if not parsed_line:
                             continue
-                        append_component_from_list_line(parsed_line[0], parsed_line[1], layout_parsed=False)
-
-                layout_cfg = profile.get("layout") or {}
-                layout_pairs: list[tuple[str, str]] = []
-                if profile_layout_list_enabled_for_page(profile, page_num):
-                    from cce_layout_list_parse import parse_layout_list_lines
-
-                    layout_pairs = parse_layout_list_lines(page, layout_cfg)
+                        item_raw, nums_str, values = parsed_line
+                        append_component_from_list_line(item_raw, nums_str, layout_parsed=False, values=values)
 
+                # (item_raw, nums_str); nums_str "" marks header / description lines (layout.auto_columns)
+                layout_pairs: list[tuple[str, str]] = page_data["layout_pairs"]
                 if layout_pairs:
-                    for item_raw, nums_str in layout_pairs:
+                    for item_raw, nums_str in join_layout_continuation_pairs(
+                        layout_pairs,
+                        line_is_protected=list_line_is_protected_for_merge,
+                        max_continuation_lines=rules.list_continuation_max_lines,
+                    ):
+                        if not nums_str:
+                            apply_list_header(item_raw)
+                            continue
                         append_component_from_list_line(item_raw, nums_str, layout_parsed=True)
                 else:
                     for block in text_blocks:
@@ -655,6 +1080,7 @@ def main():
             if not tables:
                 continue
 
+            profiler.stage("parse;grid_tables")
             for table in tables:
                 if not table or len(table) < 2:
                     continue
@@ -702,52 +1128,36 @@ def main():
                         elif parse_numeric(cell_str.replace(",", "")) is not None and idx > 0:
                             # Numeric header (e.g. 25,000 or capacity/size columns)
                             cost_cols.append(idx)
-                        elif idx > 0 and re.match(r"^[\d¼½¾⅛⅜⅝⅞\/\"\'\s\.]+$", cell_str):
+                        elif idx > 0 and SIZE_HEADER_RE.match(cell_str):
                             # Size header (e.g. ¼", ½", ¾", 1", 25,000)
                             cost_cols.append(idx)
-                        elif idx > 0 and re.match(r"^[\d\s\.\'\"ftm]+$", cell_str, re.I):
+                        elif idx > 0 and SIZE_UNITS_HEADER_RE.match(cell_str):
                             # Size with units: "1\"", "2'", "10 FT", "10mm"
                             cost_cols.append(idx)
-                        elif idx > 0 and re.match(r"^[A-Z][A-Za-z\s\-]+$", cell_str) and 2 <= len(cell_str) <= 25:
+                        elif idx > 0 and DESCRIPTIVE_HEADER_RE.match(cell_str) and 2 <= len(cell_str) <= 25:
                             # Descriptive header (SPHEROID, HEMISPHEROID, WOOD TANK) - exclude CLASS/TYPE
                             if "CLASS" not in c and "TYPE" not in c and "OCCUPANCY" not in c:
                                 cost_cols.append(idx)
                     # Broaden only when profile allows (default off — avoids multiplier / area grids)
                     if not cost_cols and len(header) >= 3 and component_table_allow_numeric_fallback(profile):
                         first_cell = str(header[0] or "").strip()
-                        if first_cell and not re.match(r"^[\d\.\s,]+$", first_cell) and len(first_cell) >= 2:
+                        if first_cell and not NUMERIC_WITH_COMMAS_RE.match(first_cell) and len(first_cell) >= 2:
                             numeric_count = sum(
                                 1 for j in range(1, min(len(header), 6))
                                  if parse_numeric(str(header[j] or "").replace(",", "")) is not None
-                                 or (j < len(header) and re.match(r"^[\d¼½¾\/\"\'\s\.]+$", str(header[j] or "").strip()))
+                                 or (j < len(header) and SIZE_HEADER_FALLBACK_RE.match(str(header[j] or "").strip()))
                             )
                             if numeric_count >= 2:
                                 cost_cols = list(range(1, min(5, len(header))))
-                    # Skip false positives: letters, quality words, building classes, TOC
-                    SKIP_ITEM_PATTERNS = (
-                        r"^dear\b",
-                        r"^dear\s+customer",
-                        r"^it is a pleasure",
-                        r"^customer\b",
-                        r"^(excellent|very good|good|average|fair|low|cheap)$",
-                        r"^(excellent|very good|good|average|fair|low|cheap)\s*[|\|]\s*[\d\.]+",
-                        r"^(i|ii|iii|iv|v|vi)$",
-                        r"^section\s+[ivxlcdm]+\s*$",
-                        r"^[a-ds]\s*$",  # Single letter (building class)
-                        r"^(a-b|c-d-s|d\s*pole|s\s*slant|d\s*hoop|cds)$",
-                        r"^[a-ds]\s+pole$",
-                        r"^[a-ds]\s+slant",
-                        r"^[a-ds]\s+hoop",
-                    )
                     if cost_cols and current_section_name and not is_life_expectancy_page:
                         for row in table[1:]:
                             if not row:
                                 continue
                             item = coalesce(row[desc_col] if desc_col < len(row) else None)
-                            if not item or len(item) < 3 or re.match(r"^[\d\.\s]+$", item):
+                            if not item or len(item) < 3 or NUMERIC_ONLY_RE.match(item):
                                 continue
-                            item_lower = item.lower()
-                            if any(re.search(p, item_lower) for p in SKIP_ITEM_PATTERNS):
+                            # Skip false positives: letters, quality words, building classes, TOC
+                            if SKIP_ITEM_RE.search(item.lower()):
                                 continue
                             nums = [parse_numeric(row[j] if j < len(row) else None) for j in cost_cols[:4]]
                             if any(n is not None for n in nums):
@@ -765,8 +1175,8 @@ def main():
                                 sparse_hint = n_non_null in (1, 2) and header_implies_multi_tier_costs(header_str, len(cost_cols))
                                 if sparse_hint:
                                     extract_stats["sparse_tier_hint_rows"] += 1
-                                item_trim = normalize_component_item_name(item)[:ITEM_MAX_LEN]
-                                sec_tbl = apply_section_alias(profile, current_section_name) or (current_section_name or "")
+                                item_trim = cached_normalize_component_item_name(item)[:ITEM_MAX_LEN]
+                                sec_tbl = profile.section_alias(current_section_name) or (current_section_name or "")
                                 flags_tbl = build_component_extraction_flags(
                                     item_raw=item,
                                     item_final=item_trim,
@@ -796,41 +1206,17 @@ def main():
                     continue
 
                 # Find occupancy for this page (use most recent one that started on or before this page)
-                candidates = [
-                    occ for occ in occupancies.values()
-                    if occ["page_start"] <= page_num <= occ["page_end"]
-                ]
-                occ_for_page = max(candidates, key=lambda o: o["page_start"]) if candidates else None
+                occ_for_page = occ_index.active(page_num)
                 if not occ_for_page:
                     continue
 
                 # --- Alternate format E2: Headerless tables where row 0 is data (e.g. 26.50 | 265.00 | C | EXCELLENT | FINE INTERIOR...) ---
-                QUALITY_WORDS = {"EXCELLENT", "GOOD", "AVERAGE", "FAIR", "LOW", "CHEAP"}
-                BUILDING_CLASS_PATTERN = re.compile(r"^[A-DS](-[A-DS]+)?$", re.I)
-
-                def _looks_like_headerless_cost_row(row_cells: list) -> bool:
-                    if not row_cells or len(row_cells) < 5:
-                        return False
-                    first_three = [parse_numeric(str(c or "").replace(",", "")) for c in row_cells[:3]]
-                    if not all(n is not None and 0.1 < n < 10000 for n in first_three[:2]):
-                        return False
-                    class_candidates = [str(c or "").strip() for c in row_cells[3:6] if c]
-                    has_class = any(
-                        BUILDING_CLASS_PATTERN.match(c) or c.upper() in {"A", "B", "C", "D", "S", "A-B", "C-D-S"}
-                        for c in class_candidates
-                    )
-                    has_quality = any(
-                        any(q in str(c or "").upper() for q in QUALITY_WORDS)
-                        for c in row_cells[3:7]
-                    )
-                    return has_class or has_quality
-
-                if _looks_like_headerless_cost_row(header):
+                if looks_like_headerless_cost_row(header):
                     last_class = None
                     for row in table:
                         if not row or len(row) < 5:
                             continue
-                        if not _looks_like_headerless_cost_row(row):
+                        if not looks_like_headerless_cost_row(row):
                             continue
                         sq_m = parse_numeric(str(row[0] or "").replace(",", ""))
                         sq_ft = parse_numeric(str(row[1] or "").replace(",", ""))
@@ -1007,9 +1393,75 @@ def main():
                         "source_page": page_num,
                     })
 
+        if stream_writer:
+            profiler.stage("write;stream_submit")
+            stream_page_rows()
+            if args.checkpoint:
+                stream_checkpoint(end_idx, page_class_counts, tables_skipped)
+        profiler.stage("finish")
+        if page_class_counts:
+            print(
+                "Page classes: " + ", ".join(f"{k}={v}" for k, v in sorted(page_class_counts.items()))
+                + f" (extract_tables skipped on {tables_skipped} pages)"
+            )
+        cache_stats = source.cache_stats()
+        if cache_stats and args.workers <= 1:
+            print(f"Page cache: {cache_stats[0]} hits, {cache_stats[1]} misses")
+
     # Dedupe occupancies by code (keep first)
     occ_list = list(occupancies.values())
-    print(f"Found {len(occ_list)} occupancies, {len(cost_rows)} cost rows, {len(cost_pct_rows)} cost % rows, {len(component_rows)} component rows, {len(modifier_rows)} modifier rows")
+    if stream_writer:
+        n_cost, n_pct = stream_counts["cost"], stream_counts["pct"]
+        n_comp, n_mod = stream_counts["component_raw"], stream_counts["modifier"]
+    else:
+        n_cost, n_pct, n_comp, n_mod = len(cost_rows), len(cost_pct_rows), len(component_rows), len(modifier_rows)
+    print(f"Found {len(occ_list)} occupancies, {n_cost} cost rows, {n_pct} cost % rows, {n_comp} component rows, {n_mod} modifier rows")
+    events.rows({
+        "occupancies": len(occ_list),
+        "cost_rows": n_cost,
+        "cost_pct_rows": n_pct,
+        "component_rows": n_comp,
+        "modifier_rows": n_mod,
+    })
+
+    if args.output_dir:
+        events.stage("output_dir", output_dir=args.output_dir)
+        profiler.stage("write;output_dir")
+        rows_by_table = final_rows(component_rows, cost_rows, cost_pct_rows, modifier_rows, extraction_date_str)
+        if not occ_list:
+            rows_by_table["cce_cost_rows"] = []
+        rows_by_table.update(cce_occupancies=occ_list, extract_stats=[extract_stats])
+        manifest = write_extract_run(
+            args.output_dir,
+            rows_by_table,
+            fmt=args.output_format,
+            extraction_date=extraction_date_str,
+            edition_id=profile.get("edition_id"),
+            pdf_sha256=pdf_hash or pdf_sha256(pdf_path),
+            metadata={
+                "pdf_path": pdf_path,
+                "pdf_filename": os.path.basename(pdf_path),
+                "page_start": page_start,
+                "page_end": end_idx,
+                "total_pages": total_pages,
+                "occupancies_count": len(occ_list),
+                "cost_rows_count": n_cost,
+                "cost_pct_rows_count": n_pct,
+                "component_rows_count": len(rows_by_table["cce_component_costs"]),
+                "modifier_rows_count": n_mod,
+                "incremental": False,
+                "last_page_extracted": end_idx,
+                "status": "completed",
+            },
+        )
+        print(
+            f"Wrote {manifest['format']} run to {args.output_dir}: "
+            + ", ".join(f"{name}={entry['rows']}" for name, entry in manifest["tables"].items())
+        )
+        if not args.dry_run:
+            print(f"Load it with: python3 scripts/extract-cce-pdf.py --load-from {args.output_dir}")
+            finish_profile()
+            return
 
     if args.dry_run:
         print("\n--- DRY RUN ANALYSIS ---")
@@ -1054,206 +1506,145 @@ def main():
             print(f"\nModifier rows: {len(modifier_rows)}")
             for row in modifier_rows[:5]:
                 print(f"  {row.get('modifier_type')} | h_ft={row.get('height_ft')} sq_ft_mult={row.get('sq_ft_multiplier')}")
+        finish_profile()
         return
 
-    extraction_date_str = profile_extraction_date(profile, pdf_path).isoformat()
-
-    if args.clear_first and supabase:
-        supabase.table("cce_cost_rows").delete().gte("source_page", 0).execute()
-        print("Cleared cce_cost_rows")
-    elif supabase:
-        # Replace same-month data (delete rows with same extraction_date before insert)
-        try:
-            r = supabase.table("cce_cost_rows").delete().eq("extraction_date", extraction_date_str).execute()
-            print(f"Replaced existing rows for extraction_date={extraction_date_str}")
-        except Exception as e:
-            if "extraction_date" in str(e).lower() or "column" in str(e).lower():
-                pass  # Column may not exist yet
-            else:
-                print(f"Note: delete by extraction_date skipped ({e})")
-
-    if args.clear_cce_cost_percentages and supabase:
-        supabase.table("cce_cost_percentages").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-        print("Cleared cce_cost_percentages")
-
-    if args.clear_cce_component_costs and supabase:
-        supabase.table("cce_component_costs").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-        print("Cleared cce_component_costs")
-    elif supabase:
-        try:
-            supabase.table("cce_component_costs").delete().eq("extraction_date", extraction_date_str).execute()
-            print(f"Replaced existing component rows for extraction_date={extraction_date_str}")
-        except Exception as e:
-            if "extraction_date" in str(e).lower() or "column" in str(e).lower():
-                pass
-            else:
-                print(f"Note: delete cce_component_costs by extraction_date skipped ({e})")
-
-    if args.clear_cce_modifiers and supabase:
-        try:
-            supabase.table("cce_modifiers").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-            print("Cleared cce_modifiers")
-        except Exception as e:
-            print(f"Note: cce_modifiers clear skipped ({e})")
-
-    # Insert occupancies first (needed for occupancy_id on component_rows)
-    occ_id_map: dict[int, str] = {}
-    if occ_list and supabase:
-        occ_rows = [
-            {
-                "occupancy_code": o["occupancy_code"],
-                "occupancy_name": o["occupancy_name"],
-                "section_number": o.get("section_number"),
-                "page_start": o.get("page_start"),
-                "page_end": o.get("page_end"),
-            }
-            for o in occ_list
-        ]
-        supabase.table("cce_occupancies").upsert(occ_rows, on_conflict="occupancy_code").execute()
-        r = supabase.table("cce_occupancies").select("id, occupancy_code").execute()
-        occ_id_map = {row["occupancy_code"]: row["id"] for row in (r.data or [])}
-
-    # Insert modifier rows (if table exists)
-    if modifier_rows and supabase:
-        try:
-            BATCH_MOD = 20
-            for i in range(0, len(modifier_rows), BATCH_MOD):
-                batch = modifier_rows[i : i + BATCH_MOD]
-                supabase.table("cce_modifiers").insert(batch).execute()
-            print(f"Inserted {len(modifier_rows)} modifier rows")
-        except Exception as e:
-            print(f"Note: cce_modifiers insert skipped ({e}). Run create-cce-modifier-tables.sql")
-
-    # Dedupe component_rows by (section_name, item_name, source_page, extraction_date) - keep last occurrence
-    if component_rows:
-        seen_comp: dict[tuple, dict] = {}
-        for r in component_rows:
-            k = (r.get("section_name"), r.get("item_name"), r.get("source_page"), extraction_date_str)
-            seen_comp[k] = r
-        prev_len = len(component_rows)
-        component_rows = list(seen_comp.values())
-        if len(component_rows) < prev_len:
-            print(f"Deduped component rows: {prev_len} -> {len(component_rows)}")
-
-    # Insert component costs (with optional occupancy_id)
-    if component_rows and supabase:
-        BATCH_COMP = 50
-        for i in range(0, len(component_rows), BATCH_COMP):
-            batch = []
-            for row in component_rows[i : i + BATCH_COMP]:
-                r = dict(row)
-                occ_code = r.pop("occupancy_code", None)
-                occ_id = occ_id_map.get(occ_code) if occ_code else None
-                if occ_id:
-                    r["occupancy_id"] = occ_id
-                r["extraction_date"] = extraction_date_str
-                batch.append(r)
+    # --diff base + this run's page records (page_fps is only kept for whole-book, non-stream REST loads)
+    page_records: Optional[dict[int, dict]] = None
+    rows_by_table: dict[str, list[dict]] = {}
+    diff_base = None
+    if page_fps is not None and end_idx < total_pages:
+        print("Note: page fingerprints are only recorded for whole-book runs")
+        page_fps = None
+    if page_fps is not None:
+        rows_by_table = final_rows(component_rows, cost_rows, cost_pct_rows, modifier_rows, extraction_date_str)
+        page_records = build_page_records(page_fps, rows_by_table)
+        if args.diff:
             try:
-                supabase.table("cce_component_costs").insert(batch).execute()
-                print(f"Inserted component batch {i // BATCH_COMP + 1} ({len(batch)} rows)")
+                diff_base = sink.load_page_fingerprints()
             except Exception as e:
-                print(f"Note: cce_component_costs insert skipped ({e})")
+                print(f"Note: page fingerprints unavailable ({e}). Run create-cce-page-fingerprints.sql")
+            if diff_base is None:
+                print("Note: no previous edition fingerprints; doing a full load")
+
+    events.stage("write", sink=args.sink, stream=bool(stream_writer), diff=diff_base is not None)
+    if stream_writer:
+        # Final page ranges for occupancies, then remaining partial batches; cost rows need every page
+        profiler.stage("write;stream_drain")
+        stream_writer.submit(stream_sink.finish_modifier_rows)
+        stream_writer.submit(stream_sink.finish_component_rows)
+        stream_writer.submit(stream_sink.finish_cost_pct_rows)
+        stream_writer.submit(stream_sink.upsert_occupancies, occ_list)
+        stream_writer.close()
+        if stream_counts["component"] < stream_counts["component_raw"]:
+            print(f"Deduped component rows: {stream_counts['component_raw']} -> {stream_counts['component']}")
+        cost_rows_deduped = list(cost_rows_by_key.values())
+        n_comp = stream_counts["component"]
+    elif diff_base is not None:
+        # Delta write: only pages whose content or extracted rows changed since the previous edition
+        prev_date, prev_records = diff_base
+        diff_report = diff_editions(prev_records, page_records)
+        diff_report.update(previous_extraction_date=prev_date, extraction_date=extraction_date_str)
+        profiler.stage("write;diff")
+        sink.upsert_occupancies(occ_list)
+        apply_edition_diff(sink, previous_extraction_date=prev_date, report=diff_report, rows_by_table=rows_by_table)
+        for line in format_change_report(diff_report):
+            print(line)
+        if args.diff_report:
+            Path(args.diff_report).write_text(json.dumps(diff_report, indent=2) + "\n")
+            print(f"Wrote change report {args.diff_report}")
+        cost_rows_deduped = []
+        n_comp = len(rows_by_table["cce_component_costs"])
+    else:
+        profiler.stage("write;clear")
+        sink.clear_existing(
+            clear_cost_rows=args.clear_first,
+            clear_cost_percentages=args.clear_cce_cost_percentages,
+            clear_component_costs=args.clear_cce_component_costs,
+            clear_modifiers=args.clear_cce_modifiers,
+        )
 
-    # Insert cost percentage rows (upsert to avoid duplicates with unique constraint)
-    if cost_pct_rows and supabase:
-        BATCH_PCT = 50
-        for i in range(0, len(cost_pct_rows), BATCH_PCT):
-            batch = cost_pct_rows[i : i + BATCH_PCT]
-            try:
-                supabase.table("cce_cost_percentages").upsert(
-                    batch, on_conflict="section_name,occupancy,category"
-                ).execute()
-                print(f"Upserted cost % batch {i // BATCH_PCT + 1} ({len(batch)} rows)")
-            except Exception as e:
-                print(f"Note: cce_cost_percentages upsert skipped ({e}). Run cce-audit-fixes migration.")
+        # Insert occupancies first (needed for occupancy_id on component_rows)
+        profiler.stage("write;occupancies")
+        sink.upsert_occupancies(occ_list)
+
+        # Insert modifier rows (if table exists)
+        profiler.stage("write;modifiers")
+        sink.add_modifier_rows(modifier_rows)
+        sink.finish_modifier_rows()
+
+        # Dedupe component_rows by (section_name, item_name, source_page, extraction_date) - keep last occurrence
+        profiler.stage("write;components")
+        if component_rows:
+            prev_len = len(component_rows)
+            component_rows = dedupe_component_rows(component_rows, extraction_date_str)
+            if len(component_rows) < prev_len:
+                print(f"Deduped component rows: {prev_len} -> {len(component_rows)}")
+
+        # Insert component costs (with optional occupancy_id)
+        sink.add_component_rows(component_rows)
+        sink.finish_component_rows()
+
+        # Insert cost percentage rows (upsert to avoid duplicates with unique constraint)
+        profiler.stage("write;cost_pct")
+        sink.add_cost_pct_rows(cost_pct_rows)
+        sink.finish_cost_pct_rows()
+        cost_rows_deduped = dedupe_cost_rows(cost_rows) if occ_list else []
+        n_comp = len(component_rows)
 
     # Insert cost rows (batch) - occ_id_map already computed above
+    profiler.stage("write;cost_rows")
     if not occ_list:
         print("No occupancies extracted; skipping cce_cost_rows.")
     else:
-        # Dedupe cost_rows by logical key (keep last occurrence)
-        seen: dict[tuple, dict] = {}
-        for r in cost_rows:
-            key = (
-                r["occupancy_code"],
-                r.get("building_class") or "",
-                r.get("quality_type") or "",
-                r.get("exterior_walls") or "",
-                r.get("interior_finish") or "",
-                r.get("lighting_plumbing") or "",
-                r.get("heat") or "",
-            )
-            seen[key] = r
-        cost_rows_deduped = list(seen.values())
-
-        BATCH = 100
-        for i in range(0, len(cost_rows_deduped), BATCH):
-            batch = cost_rows_deduped[i : i + BATCH]
-            rows_to_insert = []
-            for r in batch:
-                occ_id = occ_id_map.get(r["occupancy_code"])
-                if not occ_id:
-                    continue
-                rows_to_insert.append({
-                    "occupancy_id": occ_id,
-                    "building_class": r["building_class"],
-                    "quality_type": r["quality_type"],
-                    "exterior_walls": r["exterior_walls"],
-                    "interior_finish": r["interior_finish"],
-                    "lighting_plumbing": r["lighting_plumbing"],
-                    "heat": r["heat"],
-                    "cost_sq_m": r["cost_sq_m"],
-                    "cost_cu_ft": r["cost_cu_ft"],
-                    "cost_sq_ft": r["cost_sq_ft"],
-                    "source_page": r["source_page"],
-                    "extraction_date": extraction_date_str,
-                })
-            if rows_to_insert:
-                supabase.table("cce_cost_rows").insert(rows_to_insert).execute()
-                print(f"Inserted batch {i // BATCH + 1} ({len(rows_to_insert)} rows)")
+        sink.write_cost_rows(cost_rows_deduped)
+    if page_records is not None:
+        profiler.stage("write;page_fingerprints")
+        sink.save_page_fingerprints(page_records, pdf_hash or pdf_sha256(pdf_path))
 
     # Insert extraction metadata (audit trail)
-    if supabase:
-        try:
-            meta = {
-                "pdf_path": pdf_path,
-                "pdf_filename": os.path.basename(pdf_path),
-                "page_start": start_idx + 1,
-                "page_end": end_idx,
-                "total_pages": total_pages,
-                "occupancies_count": len(occ_list),
-                "cost_rows_count": len(cost_rows),
-                "cost_pct_rows_count": len(cost_pct_rows),
-                "component_rows_count": len(component_rows),
-                "modifier_rows_count": len(modifier_rows),
-                "incremental": args.incremental,
-                "last_page_extracted": end_idx,
-                "status": "completed",
-            }
-            supabase.table("cce_extraction_metadata").insert(meta).execute()
-            print("Recorded extraction metadata")
-        except Exception as e:
-            print(f"Note: cce_extraction_metadata insert skipped ({e}). Run create-cce-extraction-metadata.sql")
+    profiler.stage("write;metadata")
+    sink.write_metadata({
+        "pdf_path": pdf_path,
+        "pdf_filename": os.path.basename(pdf_path),
+        "page_start": page_start,
+        "page_end": end_idx,
+        "total_pages": total_pages,
+        "occupancies_count": len(occ_list),
+        "cost_rows_count": n_cost,
+        "cost_pct_rows_count": n_pct,
+        "component_rows_count": n_comp,
+        "modifier_rows_count": n_mod,
+        "incremental": args.incremental or checkpoint is not None,
+        "last_page_extracted": end_idx,
+        "status": "completed",
+    })
+    sink.close()
+    profiler.stage(None)
+
+    if args.checkpoint:
+        Path(args.checkpoint).unlink(missing_ok=True)
+        print(f"Removed checkpoint {args.checkpoint}")
 
     print("Done.")
+    events.finish("completed", rows={
+        "occupancies": len(occ_list),
+        "cost_rows": n_cost,
+        "cost_pct_rows": n_pct,
+        "component_rows": n_comp,
+        "modifier_rows": n_mod,
+    })
     if extract_stats.get("rejected_non_monotonic") or extract_stats.get("sparse_tier_hint_rows"):
         print(
             f"Component extract stats: rejected_non_monotonic={extract_stats.get('rejected_non_monotonic', 0)} "
             f"sparse_tier_hints={extract_stats.get('sparse_tier_hint_rows', 0)}"
         )
+    finish_profile()
 
     # Optional: run validation report
-    if args.validation_report and not args.dry_run and supabase:
-        try:
-            script_dir = Path(__file__).resolve().parent
-            validate_script = script_dir / "validate-cce-extraction.py"
-            if validate_script.exists():
-                import subprocess
-                print("\n--- Validation Report ---")
-                subprocess.run([sys.executable, str(validate_script)], check=False, cwd=script_dir.parent)
-        except Exception as e:
-            print(f"Note: validation report skipped ({e})")
+    if args.validation_report and not args.dry_run:
+        run_validation_report()
 
 
 if __name__ == "__main__":
-    main()
+    run_with_job_events(main)
@@ -0,0 +1,176 @@
+-- CCE component validation aggregated in Postgres (validate-cce-extraction.py)
+-- Run in Supabase SQL Editor after add-cce-component-occupancy-id.sql
+--
+-- cce_component_validation() returns the component_validation block of the validate report
+-- (same keys as scripts/cce_validation.py ComponentValidator) in one round trip, so the script
+-- no longer pages every cce_component_costs row to the client. Names are compared trimmed;
+-- samples are listed only for checks with 1-5 hits (1-3 duplicate groups), in id order.
+-- col_1 p1 / p99 are exact: the sorted value at rank floor(n * 0.01) / floor(n * 0.99) - 1
+-- (min / max up to 100 values), as the client-side report has always used.
+-- tier_rtol / tier_atol mirror cce_component_item_extract.TIER_RTOL / TIER_ATOL; the script
+-- passes its values. When this function is missing the script falls back to the client pass.
+
+CREATE OR REPLACE FUNCTION public.cce_component_validation(
+  tier_rtol numeric DEFAULT 0.005,
+  tier_atol numeric DEFAULT 0.02
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  WITH c AS (
+    SELECT
+      id,
+      btrim(coalesce(section_name, '')) AS section,
+      btrim(coalesce(item_name, '')) AS item,
+      col_1, col_2, col_3, col_4, source_page, occupancy_id
+    FROM public.cce_component_costs
+  ),
+  occ AS (
+    SELECT id, page_start, page_end
+    FROM public.cce_occupancies
+    WHERE page_start IS NOT NULL AND page_end IS NOT NULL
+  ),
+  -- Active occupancy per page: the covering one with the greatest page_start (cce_occupancy_index)
+  linked AS (
+    SELECT c.occupancy_id, a.id AS active_id
+    FROM c
+    JOIN LATERAL (
+      SELECT o.id FROM occ o
+      WHERE o.page_start <= c.source_page AND c.source_page <= o.page_end
+      ORDER BY o.page_start DESC, o.id
+      LIMIT 1
+    ) a ON true
+  ),
+  flagged AS (
+    SELECT
+      c.*,
+      c.col_1 IS NOT NULL AND c.col_2 IS NOT NULL AND c.col_2 < c.col_1 * 0.5 AS low_gt_high,
+      c.section ~ '^[Aa]dd\s+for\s+' AS section_add_for,
+      c.item ~ '\y\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\y' AS item_cost_bleed,
+      c.item ~ '\.{3,}' AS item_toc_dot_runs,
+      EXISTS (
+        SELECT 1
+        FROM (
+          SELECT v, lag(v) OVER (ORDER BY i) AS prev
+          FROM unnest(ARRAY[c.col_1, c.col_2, c.col_3, c.col_4]) WITH ORDINALITY AS t(v, i)
+          WHERE v IS NOT NULL
+        ) s
+        WHERE s.v + greatest(tier_atol, tier_rtol * greatest(abs(s.prev), 1e-9)) < s.prev
+      ) AS tier_violation
+    FROM c
+  ),
+  n AS (
+    SELECT count(col_1) AS n, min(col_1) AS lo, max(col_1) AS hi FROM c
+  ),
+  pct AS (
+    SELECT
+      n.n, n.lo, n.hi,
+      CASE WHEN n.n > 100
+        THEN (SELECT col_1 FROM c WHERE col_1 IS NOT NULL ORDER BY col_1 OFFSET floor(n.n * 0.01)::bigint LIMIT 1)
+        ELSE n.lo END AS p1,
+      CASE WHEN n.n > 100
+        THEN (SELECT col_1 FROM c WHERE col_1 IS NOT NULL ORDER BY col_1 OFFSET floor(n.n * 0.99)::bigint - 1 LIMIT 1)
+        ELSE n.hi END AS p99
+    FROM n
+  ),
+  counts AS (
+    SELECT
+      count(*) AS total_rows,
+      count(occupancy_id) AS with_occupancy_id,
+      count(*) FILTER (WHERE low_gt_high) AS low_gt_high,
+      count(*) FILTER (WHERE section_add_for) AS section_add_for,
+      count(*) FILTER (WHERE item_cost_bleed) AS item_cost_bleed,
+      count(*) FILTER (WHERE item_toc_dot_runs) AS item_toc_dot_runs,
+      count(*) FILTER (WHERE tier_violation) AS tier_violations,
+      count(*) FILTER (WHERE section = '') AS missing_section,
+      count(*) FILTER (WHERE item = '') AS missing_item,
+      count(*) FILTER (WHERE col_1 IS NULL) AS missing_col_1,
+      count(*) FILTER (WHERE col_1 < (SELECT p1 FROM pct)) AS below_p1,
+      count(*) FILTER (WHERE col_1 > (SELECT p99 FROM pct)) AS above_p99
+    FROM flagged
+  ),
+  dups AS (
+    SELECT section, item, source_page, count(*) AS n, (array_agg(id ORDER BY id))[2] AS second_id
+    FROM c
+    GROUP BY section, item, source_page
+    HAVING count(*) > 1
+  )
+  SELECT
+    jsonb_build_object(
+      'sections', coalesce((
+        SELECT jsonb_object_agg(name, n)
+        FROM (
+          SELECT CASE WHEN section = '' THEN '(null)' ELSE section END AS name, count(*) AS n
+          FROM c GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 20
+        ) s
+      ), '{}'::jsonb),
+      'total_rows', k.total_rows,
+      'with_occupancy_id', k.with_occupancy_id,
+      'without_occupancy_id', k.total_rows - k.with_occupancy_id
+    )
+    || CASE WHEN EXISTS (SELECT 1 FROM occ) THEN jsonb_build_object(
+      'occupancy_page_mismatch', (SELECT count(*) FROM linked WHERE occupancy_id IS NOT NULL AND occupancy_id <> active_id),
+      'unlinked_in_occupancy_range', (SELECT count(*) FROM linked WHERE occupancy_id IS NULL)
+    ) ELSE '{}'::jsonb END
+    || CASE WHEN p.n > 0 THEN jsonb_build_object(
+      'col_1_percentiles', jsonb_build_object(
+        'p1', round(p.p1, 2), 'p99', round(p.p99, 2), 'min', round(p.lo, 2), 'max', round(p.hi, 2), 'relative_error', 0
+      ),
+      'outliers_below_p1', k.below_p1,
+      'outliers_above_p99', k.above_p99
+    ) ELSE '{}'::jsonb END
+    || CASE WHEN k.below_p1 BETWEEN 1 AND 5 THEN jsonb_build_object('sample_outliers_low', (
+      SELECT jsonb_agg(jsonb_build_object('section', section, 'item', left(item, 40), 'col_1', col_1) ORDER BY id)
+      FROM c WHERE col_1 < p.p1
+    )) ELSE '{}'::jsonb END
+    || CASE WHEN k.above_p99 BETWEEN 1 AND 5 THEN jsonb_build_object('sample_outliers_high', (
+      SELECT jsonb_agg(jsonb_build_object('section', section, 'item', left(item, 40), 'col_1', col_1) ORDER BY id)
+      FROM c WHERE col_1 > p.p99
+    )) ELSE '{}'::jsonb END
+    || jsonb_build_object('low_gt_high_anomalies', k.low_gt_high)
+    || CASE WHEN k.low_gt_high BETWEEN 1 AND 5 THEN jsonb_build_object('sample_anomalies', (
+      SELECT jsonb_agg(jsonb_build_object('section', section, 'item', left(item, 40), 'col_1', col_1, 'col_2', col_2) ORDER BY id)
+      FROM flagged WHERE low_gt_high
+    )) ELSE '{}'::jsonb END
+    || jsonb_build_object(
+      'missing', jsonb_build_object('section_name', k.missing_section, 'item_name', k.missing_item, 'col_1', k.missing_col_1),
+      'section_add_for_count', k.section_add_for
+    )
+    || CASE WHEN k.section_add_for BETWEEN 1 AND 5 THEN jsonb_build_object('sample_add_for_sections', (
+      SELECT jsonb_agg(jsonb_build_object('section', section, 'item', left(item, 40)) ORDER BY id)
+      FROM flagged WHERE section_add_for
+    )) ELSE '{}'::jsonb END
+    || jsonb_build_object('duplicate_groups', (SELECT count(*) FROM dups))
+    || CASE WHEN (SELECT count(*) FROM dups) BETWEEN 1 AND 3 THEN jsonb_build_object('sample_duplicates', (
+      SELECT jsonb_agg(
+        jsonb_build_object('section', section, 'item', left(item, 40), 'page', source_page, 'count', n) ORDER BY second_id
+      )
+      FROM dups
+    )) ELSE '{}'::jsonb END
+    || jsonb_build_object(
+      'item_cost_bleed_count', k.item_cost_bleed,
+      'item_toc_dot_runs_count', k.item_toc_dot_runs,
+      'tier_order_violations', k.tier_violations
+    )
+    || CASE WHEN k.tier_violations BETWEEN 1 AND 5 THEN jsonb_build_object('sample_tier_violations', (
+      SELECT jsonb_agg(jsonb_build_object(
+        'section', section, 'item', left(item, 45), 'cols', jsonb_build_array(col_1, col_2, col_3, col_4), 'page', source_page
+      ) ORDER BY id)
+      FROM flagged WHERE tier_violation
+    )) ELSE '{}'::jsonb END
+  FROM counts k, pct p;
+$$;
+
+COMMENT ON FUNCTION public.cce_component_validation(numeric, numeric) IS
+  'component_validation block for scripts/validate-cce-extraction.py (one round trip; client pass is the fallback).';
+
+REVOKE ALL ON FUNCTION public.cce_component_validation(numeric, numeric) FROM PUBLIC;
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    GRANT EXECUTE ON FUNCTION public.cce_component_validation(numeric, numeric) TO service_role;
+  END IF;
+END $$;
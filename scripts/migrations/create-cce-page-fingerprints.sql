@@ -0,0 +1,30 @@
+-- CCE page fingerprints (edition-to-edition diff loads)
+-- Run in Supabase SQL Editor
+--
+-- One row per parsed PDF page per extraction_date, written by extract-cce-pdf.py on full-book runs.
+-- extract-cce-pdf.py --diff compares the next edition against the latest extraction_date here and
+-- only rewrites pages whose content (fingerprint) or extracted rows (row_digests) changed.
+
+CREATE TABLE IF NOT EXISTS cce_page_fingerprints (
+  extraction_date DATE NOT NULL,
+  page_number INTEGER NOT NULL,
+  fingerprint TEXT NOT NULL,
+  row_digests JSONB NOT NULL DEFAULT '{}'::jsonb,
+  pdf_sha256 TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (extraction_date, page_number)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cce_page_fingerprints_date
+  ON cce_page_fingerprints (extraction_date DESC);
+
+COMMENT ON COLUMN cce_page_fingerprints.fingerprint IS 'Hash of whitespace-normalized page text + table cells.';
+COMMENT ON COLUMN cce_page_fingerprints.row_digests IS 'Per target table, hash of the rows this page contributed (after dedupe).';
+
+-- --diff deletes by source_page on every CCE table
+CREATE INDEX IF NOT EXISTS idx_cce_component_costs_source_page ON cce_component_costs (source_page);
+CREATE INDEX IF NOT EXISTS idx_cce_cost_rows_source_page ON cce_cost_rows (source_page);
+CREATE INDEX IF NOT EXISTS idx_cce_cost_pct_source_page ON cce_cost_percentages (source_page);
+CREATE INDEX IF NOT EXISTS idx_cce_modifiers_source_page ON cce_modifiers (source_page);
+
+ALTER TABLE cce_page_fingerprints ENABLE ROW LEVEL SECURITY;
@@ -3,7 +3,9 @@
 Re-apply normalize_component_item_name to cce_component_costs.item_name without re-parsing the PDF.
 
 Uses NORMALIZATION_VERSION from cce_component_item_extract; only updates rows where
-normalization_version < current (or all rows with --force).
+normalization_version < current (or all rows with --force). Rows are read in keyset pages and
+written as batched upserts on a few threads; progress is checkpointed, so an interrupted run
+picks up where it stopped (see cce_component_reclean.py).
 
 Env: NEXT_PUBLIC_SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_SECRET_KEY)
 
@@ -11,9 +13,12 @@ Usage:
   python3 scripts/reclean-cce-component-items.py --dry-run
   python3 scripts/reclean-cce-component-items.py --extraction-date 2026-03-01
   python3 scripts/reclean-cce-component-items.py --force
+  python3 scripts/reclean-cce-component-items.py --workers 8 --batch-size 300
+  python3 scripts/reclean-cce-component-items.py --restart   # ignore local_data/.cce-reclean.checkpoint.json
 """
 
 import argparse
+import json
 import os
 import sys
 from pathlib import Path
@@ -31,12 +36,18 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from cce_component_item_extract import (  # noqa: E402
-    ITEM_MAX_LEN,
-    NORMALIZATION_VERSION,
-    build_component_extraction_flags,
-    normalize_component_item_name,
+from cce_component_item_extract import NORMALIZATION_VERSION  # noqa: E402
+from cce_component_reclean import (  # noqa: E402
+    RECLEAN_BATCH_ROWS,
+    RECLEAN_PAGE_ROWS,
+    RECLEAN_WORKERS,
+    checkpoint_mismatch,
+    reclean_settings,
+    run_reclean,
 )
+from cce_extract_checkpoint import load_checkpoint, save_checkpoint  # noqa: E402
+
+DEFAULT_CHECKPOINT = Path(__file__).resolve().parent.parent / "local_data" / ".cce-reclean.checkpoint.json"
 
 
 def main() -> None:
@@ -44,7 +55,19 @@ def main() -> None:
     p.add_argument("--dry-run", action="store_true", help="Print counts only, no updates")
     p.add_argument("--extraction-date", default=None, help="Only rows with this extraction_date (YYYY-MM-DD)")
     p.add_argument("--force", action="store_true", help="Update all rows regardless of normalization_version")
-    p.add_argument("--batch-size", type=int, default=200)
+    p.add_argument(
+        "--batch-size", type=int, default=RECLEAN_BATCH_ROWS, help=f"Rows per upsert request (default {RECLEAN_BATCH_ROWS})"
+    )
+    p.add_argument("--page-rows", type=int, default=RECLEAN_PAGE_ROWS, help=f"Rows per keyset page (default {RECLEAN_PAGE_ROWS})")
+    p.add_argument(
+        "--workers", type=int, default=RECLEAN_WORKERS, help=f"Concurrent upsert requests (default {RECLEAN_WORKERS})"
+    )
+    p.add_argument(
+        "--checkpoint",
+        default=str(DEFAULT_CHECKPOINT),
+        help="Progress file; a rerun with the same settings resumes from it (removed when the reclean completes)",
+    )
+    p.add_argument("--restart", action="store_true", help="Ignore an existing --checkpoint and start from the first row")
     args = p.parse_args()
 
     url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
@@ -54,63 +77,49 @@ def main() -> None:
         sys.exit(1)
 
     sb = create_client(url, key)
-    target_ver = NORMALIZATION_VERSION
-
-    sel = "id,item_name,normalization_version,extraction_date,extraction_flags"
-    base = sb.table("cce_component_costs").select(sel).order("id")
-    if args.extraction_date:
-        base = base.eq("extraction_date", args.extraction_date)
-
-    changed = 0
-    scanned = 0
-    from_idx = 0
-    batch_fetch = 500
 
-    while True:
+    resume_from = None
+    if not args.dry_run and not args.restart:
         try:
-            r = base.range(from_idx, from_idx + batch_fetch - 1).execute()
-        except Exception as e:
-            if "normalization_version" in str(e).lower() or "column" in str(e).lower():
-                print(
-                    "Error: run scripts/migrations/add-cce-component-costs-flags.sql first.",
-                    file=sys.stderr,
-                )
-            raise
-        rows = r.data or []
-        if not rows:
-            break
-        for row in rows:
-            scanned += 1
-            vid = row.get("id")
-            old = row.get("item_name") or ""
-            ver = row.get("normalization_version")
-            if not args.force and ver is not None and int(ver) >= target_ver:
-                continue
-            new = normalize_component_item_name(old)[:ITEM_MAX_LEN]
-            if new == old and not args.force:
-                continue
-            patch_flags = build_component_extraction_flags(item_raw=old, item_final=new)
-            prev = row.get("extraction_flags")
-            merged = dict(prev) if isinstance(prev, dict) else {}
-            merged.update(patch_flags)
-            changed += 1
-            if args.dry_run:
-                continue
-            try:
-                sb.table("cce_component_costs").update({
-                    "item_name": new,
-                    "normalization_version": target_ver,
-                    "extraction_flags": merged,
-                }).eq("id", vid).execute()
-            except Exception as e:
-                print(f"Update failed for {vid}: {e}", file=sys.stderr)
-        if len(rows) < batch_fetch:
-            break
-        from_idx += batch_fetch
+            resume_from = load_checkpoint(args.checkpoint)
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Error: {e} (pass --restart to ignore it)", file=sys.stderr)
+            sys.exit(1)
+        if resume_from is not None:
+            reason = checkpoint_mismatch(resume_from, reclean_settings(args.extraction_date, args.force))
+            if reason:
+                print(f"Error: {args.checkpoint} is from another reclean: {reason} (pass --restart)", file=sys.stderr)
+                sys.exit(1)
+            print(
+                f"Resuming after id {resume_from.get('last_id')} "
+                f"({resume_from.get('scanned', 0)} rows scanned, {resume_from.get('changed', 0)} changed so far)"
+            )
+
+    try:
+        progress = run_reclean(
+            sb,
+            extraction_date=args.extraction_date,
+            force=args.force,
+            dry_run=args.dry_run,
+            page_rows=args.page_rows,
+            batch_rows=max(1, args.batch_size),
+            workers=args.workers,
+            resume_from=resume_from,
+            save=None if args.dry_run else lambda data: save_checkpoint(args.checkpoint, data),
+        )
+    except Exception as e:
+        if "normalization_version" in str(e).lower() or "column" in str(e).lower():
+            print(
+                "Error: run scripts/migrations/add-cce-component-costs-flags.sql first.",
+                file=sys.stderr,
+            )
+        raise
+    if not args.dry_run:
+        Path(args.checkpoint).unlink(missing_ok=True)
 
     print(
-        f"Reclean: scanned={scanned} would_update/changed={changed} "
-        f"target_normalization_version={target_ver} dry_run={args.dry_run}"
+        f"Reclean: scanned={progress['scanned']} would_update/changed={progress['changed']} "
+        f"failed={progress['failed']} target_normalization_version={NORMALIZATION_VERSION} dry_run={args.dry_run}"
     )
 
 
@@ -10,23 +10,31 @@ Validates cce_component_costs against issues observed in Cost Explorer:
 - Trailing punctuation in section (e.g. "Add for ornate finishes,")
 - Low > High anomalies (col_2 < col_1)
 
+Rows are read in keyset pages (all of them, not the first 10k) or from a local --output-dir run,
+and checked in one pass by cce_validation.ComponentValidator (shared with validate-cce-extraction.py).
+
 Usage:
   python scripts/test-component-data-quality.py
   python scripts/test-component-data-quality.py --json
+  python scripts/test-component-data-quality.py --run-dir local_data/cce-run-2026-03
 """
 
 import argparse
 import json
 import os
-import re
 import sys
-from collections import defaultdict
 from pathlib import Path
 
 _scripts_dir = Path(__file__).resolve().parent
 if str(_scripts_dir) not in sys.path:
     sys.path.insert(0, str(_scripts_dir))
-from cce_component_item_extract import tier_order_ok  # noqa: E402
+from cce_extract_output import iter_extract_run_table  # noqa: E402
+from cce_validation import (  # noqa: E402
+    COMPONENT_VALIDATION_COLUMNS,
+    KEYSET_PAGE_ROWS,
+    ComponentValidator,
+    iter_table_rows,
+)
 
 # Load .env.local
 try:
@@ -35,166 +43,76 @@ try:
 except ImportError:
     pass
 
-try:
-    from supabase import create_client
-except ImportError:
-    print("Error: pip install supabase")
-    sys.exit(1)
-
 
-def parse_numeric(s):
-    if s is None:
-        return None
+def supabase_rows(page_rows: int):
     try:
-        return float(str(s).strip().replace(",", ""))
-    except (ValueError, TypeError):
-        return None
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Test CCE component data quality")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
-    args = parser.parse_args()
-
+        from supabase import create_client
+    except ImportError:
+        print("Error: pip install supabase")
+        sys.exit(1)
     url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_SECRET_KEY")
     if not url or not key:
-        print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+        print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or pass --run-dir)")
         sys.exit(1)
+    return iter_table_rows(create_client(url, key), "cce_component_costs", COMPONENT_VALIDATION_COLUMNS, page_rows=page_rows)
 
-    supabase = create_client(url, key)
-
-    # Fetch component rows
-    try:
-        r = supabase.table("cce_component_costs").select(
-            "id,section_name,item_name,col_1,col_2,col_3,col_4,source_page"
-        ).range(0, 9999).execute()
-        rows = r.data or []
-    except Exception as e:
-        print(f"Error fetching data: {e}")
-        sys.exit(1)
 
+def quality_report(v: ComponentValidator) -> dict:
+    """Issue lists (every hit; the validator runs with max_examples=None) and their counts."""
+    ex = v.examples
     report = {
-        "total_rows": len(rows),
-        "duplicates": [],
-        "section_add_for": [],
-        "section_trailing_punct": [],
-        "item_contains_cost_numbers": [],
-        "item_toc_dot_runs": [],
-        "tier_order_violations": [],
-        "column_shift_excellent_lt_good": [],
-        "low_gt_high": [],
-        "summary": {},
+        "total_rows": v.total_rows,
+        "duplicates": [
+            {"section_name": d["section_name"], "item_name": d["item_name"][:60], "source_page": d["source_page"], "count": d["count"]}
+            for d in v.duplicate_groups
+        ],
+        "section_add_for": [
+            {"section_name": e["section_name"], "item_name": e["item_name"][:50], "source_page": e["source_page"]}
+            for e in ex["section_add_for"]
+        ],
+        "section_trailing_punct": [
+            {"section_name": e["section_name"], "item_name": e["item_name"][:50], "source_page": e["source_page"]}
+            for e in ex["section_trailing_punct"]
+        ],
+        "item_contains_cost_numbers": [
+            {"section_name": e["section_name"][:40], "item_name": e["item_name"][:80], "source_page": e["source_page"]}
+            for e in ex["item_cost_bleed"]
+        ],
+        "item_toc_dot_runs": [
+            {"section_name": e["section_name"][:40], "item_name": e["item_name"][:70], "source_page": e["source_page"]}
+            for e in ex["item_toc_dot_runs"]
+        ],
+        "tier_order_violations": [
+            {
+                "section_name": e["section_name"][:40],
+                "item_name": e["item_name"][:50],
+                "cols": [e["col_1"], e["col_2"], e["col_3"], e["col_4"]],
+                "source_page": e["source_page"],
+            }
+            for e in ex["tier_order_violations"]
+        ],
+        "column_shift_excellent_lt_good": [
+            {
+                "section_name": e["section_name"][:40],
+                "item_name": e["item_name"][:50],
+                "col_3": e["col_3"],
+                "col_4": e["col_4"],
+                "source_page": e["source_page"],
+            }
+            for e in ex["column_shift"]
+        ],
+        "low_gt_high": [
+            {
+                "section_name": e["section_name"][:40],
+                "item_name": e["item_name"][:50],
+                "col_1": e["col_1"],
+                "col_2": e["col_2"],
+                "source_page": e["source_page"],
+            }
+            for e in ex["low_gt_high"]
+        ],
     }
-
-    # Cost-like number pattern: e.g. "34.34 57.80 97.31" or "3.19 5.37 9.04"
-    COST_NUMBERS_RE = re.compile(r"\b\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\b")
-    TOC_DOTS_RE = re.compile(r"\.{3,}")
-
-    def tier_cols(row):
-        out = []
-        for i in range(1, 5):
-            v = row.get(f"col_{i}")
-            if v is None:
-                out.append(None)
-            else:
-                try:
-                    out.append(float(v))
-                except (TypeError, ValueError):
-                    out.append(None)
-        return out
-
-    seen_keys: dict[tuple, list] = defaultdict(list)
-    for row in rows:
-        section = (row.get("section_name") or "").strip()
-        item = (row.get("item_name") or "").strip()
-        page = row.get("source_page")
-        key = (section, item, page)
-        seen_keys[key].append(row.get("id"))
-
-        # Duplicates
-        if len(seen_keys[key]) > 1:
-            report["duplicates"].append({
-                "section_name": section,
-                "item_name": item[:60],
-                "source_page": page,
-                "count": len(seen_keys[key]),
-            })
-
-        # Section: "add for" as section (sub-header used as main section)
-        if section and re.match(r"^[Aa]dd\s+for\s+", section):
-            report["section_add_for"].append({
-                "section_name": section,
-                "item_name": item[:50],
-                "source_page": page,
-            })
-
-        # Section: trailing comma or punctuation
-        if section and re.search(r"[,\;]$", section):
-            report["section_trailing_punct"].append({
-                "section_name": section,
-                "item_name": item[:50],
-                "source_page": page,
-            })
-
-        # Item: contains cost-like numbers (column bleed)
-        if item and COST_NUMBERS_RE.search(item):
-            report["item_contains_cost_numbers"].append({
-                "section_name": section[:40],
-                "item_name": item[:80],
-                "source_page": page,
-            })
-
-        # Item: TOC leader dots (3+)
-        if item and TOC_DOTS_RE.search(item):
-            report["item_toc_dot_runs"].append({
-                "section_name": section[:40],
-                "item_name": item[:70],
-                "source_page": page,
-            })
-
-        if not tier_order_ok(tier_cols(row)):
-            report["tier_order_violations"].append({
-                "section_name": section[:40],
-                "item_name": item[:50],
-                "cols": tier_cols(row),
-                "source_page": page,
-            })
-
-        # Column shift: col_4 < col_3 when both present and col_3 reasonable
-        c3 = parse_numeric(row.get("col_3"))
-        c4 = parse_numeric(row.get("col_4"))
-        if c3 is not None and c4 is not None and c3 > 1 and c4 < c3 * 0.5:
-            report["column_shift_excellent_lt_good"].append({
-                "section_name": section[:40],
-                "item_name": item[:50],
-                "col_3": c3,
-                "col_4": c4,
-                "source_page": page,
-            })
-
-        # Low > High
-        c1 = parse_numeric(row.get("col_1"))
-        c2 = parse_numeric(row.get("col_2"))
-        if c1 is not None and c2 is not None and c2 < c1 * 0.5:
-            report["low_gt_high"].append({
-                "section_name": section[:40],
-                "item_name": item[:50],
-                "col_1": c1,
-                "col_2": c2,
-                "source_page": page,
-            })
-
-    # Dedupe duplicate report (one per key)
-    seen_dup_keys = set()
-    deduped = []
-    for d in report["duplicates"]:
-        k = (d["section_name"], d["item_name"], d["source_page"])
-        if k not in seen_dup_keys:
-            seen_dup_keys.add(k)
-            deduped.append(d)
-    report["duplicates"] = deduped
-
     report["summary"] = {
         "duplicate_groups": len(report["duplicates"]),
         "section_add_for_count": len(report["section_add_for"]),
@@ -205,6 +123,32 @@ def main():
         "column_shift_count": len(report["column_shift_excellent_lt_good"]),
         "low_gt_high_count": len(report["low_gt_high"]),
     }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test CCE component data quality")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--run-dir", default=None, help="Check a local extract-cce-pdf.py --output-dir run instead of Supabase")
+    parser.add_argument("--page-rows", type=int, default=KEYSET_PAGE_ROWS, help="Rows per keyset page from Supabase")
+    args = parser.parse_args()
+
+    if args.run_dir:
+        try:
+            _, rows = iter_extract_run_table(args.run_dir, "cce_component_costs")
+        except (FileNotFoundError, KeyError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    else:
+        rows = supabase_rows(args.page_rows)
+
+    validator = ComponentValidator(max_examples=None)
+    try:
+        validator.add_rows(rows)
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        sys.exit(1)
+    report = quality_report(validator)
 
     if args.json:
         print(json.dumps(report, indent=2))
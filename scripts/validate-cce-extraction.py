@@ -2,30 +2,44 @@
 """
 CCE Extraction Validation Report
 
-Validates CCE data in Supabase and prints a report with:
+Validates CCE data in Supabase (or a local --output-dir run) and prints a report with:
 - Row counts by section/table
-- Cost outliers (col_1 outside 1st-99th percentile)
+- Cost outliers (col_1 outside 1st-99th percentile, approximate: see cce_validation.py)
 - Missing values
 - Low > High anomalies (col_2 < col_1 when both present)
 - Occupancy-linked component stats
 - Suggested fixes
 
+Component checks run in Postgres (cce_component_validation RPC, one round trip; see
+scripts/migrations/create-cce-component-validation-rpc.sql). Without that function, or with
+--client-side, every cce_component_costs row is read (keyset pages) and checked in one streaming pass.
+
 Usage:
   python scripts/validate-cce-extraction.py
   python scripts/validate-cce-extraction.py --json  # Machine-readable output
+  python scripts/validate-cce-extraction.py --client-side  # Skip the RPC
+  python scripts/validate-cce-extraction.py --run-dir local_data/cce-run-2026-03  # extract-cce-pdf.py --output-dir
 """
 
 import argparse
 import json
 import os
 import sys
-from collections import Counter, defaultdict
+from itertools import chain
 from pathlib import Path
 
 _scripts_dir = Path(__file__).resolve().parent
 if str(_scripts_dir) not in sys.path:
     sys.path.insert(0, str(_scripts_dir))
-from cce_component_item_extract import tier_order_ok  # noqa: E402
+from cce_extract_output import iter_extract_run_table  # noqa: E402
+from cce_occupancy_index import OccupancyIndex  # noqa: E402
+from cce_validation import (  # noqa: E402
+    COMPONENT_VALIDATION_COLUMNS,
+    KEYSET_PAGE_ROWS,
+    ComponentValidator,
+    iter_table_rows,
+    server_component_validation,
+)
 
 # Load .env.local
 try:
@@ -34,194 +48,144 @@ try:
 except ImportError:
     pass
 
-try:
-    from supabase import create_client
-except ImportError:
-    print("Error: pip install supabase")
-    sys.exit(1)
-
+TABLE_LABELS = (
+    ("cce_occupancies", "Occupancies"),
+    ("cce_cost_rows", "Cost rows"),
+    ("cce_cost_percentages", "Cost % rows"),
+    ("cce_component_costs", "Component costs"),
+    ("cce_modifiers", "Modifiers"),
+)
 
-def main():
-    parser = argparse.ArgumentParser(description="Validate CCE extraction data in Supabase")
-    parser.add_argument("--json", action="store_true", help="Output as JSON")
-    args = parser.parse_args()
 
+def supabase_client():
+    try:
+        from supabase import create_client
+    except ImportError:
+        print("Error: pip install supabase")
+        sys.exit(1)
     url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_SECRET_KEY")
     if not url or not key:
-        print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+        print("Error: Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY (or pass --run-dir)")
         sys.exit(1)
+    return create_client(url, key)
+
+
+def component_rows(supabase, page_rows: int):
+    """All cce_component_costs rows in keyset pages; without occupancy_id if that column is not migrated yet."""
+    try:
+        rows = iter_table_rows(
+            supabase, "cce_component_costs", COMPONENT_VALIDATION_COLUMNS + ",occupancy_id", page_rows=page_rows
+        )
+        first = next(rows, None)
+    except Exception:
+        rows = iter_table_rows(supabase, "cce_component_costs", COMPONENT_VALIDATION_COLUMNS, page_rows=page_rows)
+        first = next(rows, None)
+    return chain([first], rows) if first is not None else iter(())
 
-    supabase = create_client(url, key)
-    report = {"tables": {}, "component_validation": {}, "suggestions": []}
+
+def validate_supabase(report: dict, page_rows: int, client_side: bool = False) -> None:
+    supabase = supabase_client()
 
     # --- Row counts ---
-    for table, label in [
-        ("cce_occupancies", "Occupancies"),
-        ("cce_cost_rows", "Cost rows"),
-        ("cce_cost_percentages", "Cost % rows"),
-        ("cce_component_costs", "Component costs"),
-        ("cce_modifiers", "Modifiers"),
-    ]:
+    for table, label in TABLE_LABELS:
         try:
-            r = supabase.table(table).select("id", count="exact").execute()
+            r = supabase.table(table).select("id", count="exact").limit(1).execute()
             count = r.count or 0
             report["tables"][table] = {"count": count, "label": label}
         except Exception as e:
             report["tables"][table] = {"count": 0, "label": label, "error": str(e)}
 
-    # --- Component validation ---
-    try:
-        # Fetch up to 10k rows for validation (Supabase default limit is 1000)
-        cols = "section_name,item_name,col_1,col_2,col_3,col_4,source_page"
+    # --- Component validation: in Postgres, else every row in one client pass ---
+    cv = None
+    if not client_side:
         try:
-            r = supabase.table("cce_component_costs").select(cols + ",occupancy_id").range(0, 9999).execute()
-        except Exception:
-            r = supabase.table("cce_component_costs").select(cols).range(0, 9999).execute()
-        rows = r.data or []
-    except Exception as e:
-        report["component_validation"]["error"] = str(e)
-        rows = []
-
-    if rows:
-        # Section distribution
-        sections = Counter(r.get("section_name") or "(null)" for r in rows)
-        report["component_validation"]["sections"] = dict(sections.most_common(20))
-        report["component_validation"]["total_rows"] = len(rows)
-
-        # Occupancy-linked count (0 if occupancy_id column not yet migrated)
-        with_occ = sum(1 for r in rows if r.get("occupancy_id"))
-        report["component_validation"]["with_occupancy_id"] = with_occ
-        report["component_validation"]["without_occupancy_id"] = len(rows) - with_occ
-
-        # Cost values for outlier detection
-        col1_vals = [float(r["col_1"]) for r in rows if r.get("col_1") is not None]
-        if col1_vals:
-            col1_vals.sort()
-            n = len(col1_vals)
-            p1 = col1_vals[int(n * 0.01)] if n > 100 else col1_vals[0]
-            p99 = col1_vals[int(n * 0.99) - 1] if n > 100 else col1_vals[-1]
-            report["component_validation"]["col_1_percentiles"] = {
-                "p1": round(p1, 2),
-                "p99": round(p99, 2),
-                "min": round(min(col1_vals), 2),
-                "max": round(max(col1_vals), 2),
-            }
+            cv = server_component_validation(supabase)
+            cv["source"] = "rpc"
+        except Exception as e:
+            print(f"Note: cce_component_validation RPC unavailable ({e}); checking rows client-side", file=sys.stderr)
+    if cv is None:
+        cv = client_component_validation(supabase, page_rows)
+    if cv.get("total_rows") or cv.get("error"):
+        report["component_validation"] = cv
 
-            # Outliers: outside p1-p99
-            outliers_low = [r for r in rows if r.get("col_1") is not None and float(r["col_1"]) < p1]
-            outliers_high = [r for r in rows if r.get("col_1") is not None and float(r["col_1"]) > p99]
-            report["component_validation"]["outliers_below_p1"] = len(outliers_low)
-            report["component_validation"]["outliers_above_p99"] = len(outliers_high)
-            if outliers_low and len(outliers_low) <= 5:
-                report["component_validation"]["sample_outliers_low"] = [
-                    {"section": r.get("section_name"), "item": (r.get("item_name") or "")[:40], "col_1": r.get("col_1")}
-                    for r in outliers_low[:5]
-                ]
-            if outliers_high and len(outliers_high) <= 5:
-                report["component_validation"]["sample_outliers_high"] = [
-                    {"section": r.get("section_name"), "item": (r.get("item_name") or "")[:40], "col_1": r.get("col_1")}
-                    for r in outliers_high[:5]
-                ]
+    # --- Extraction metadata (last run) ---
+    try:
+        r = supabase.table("cce_extraction_metadata").select("*").order("created_at", desc=True).limit(1).execute()
+        if r.data and len(r.data) > 0:
+            report["last_extraction"] = last_extraction(r.data[0])
+    except Exception:
+        pass
 
-        # Low > High anomalies (col_2 < col_1 when both present)
-        anomalies = [
-            r for r in rows
-            if r.get("col_1") is not None and r.get("col_2") is not None
-            and float(r["col_2"]) < float(r["col_1"]) * 0.5
-        ]
-        report["component_validation"]["low_gt_high_anomalies"] = len(anomalies)
-        if anomalies and len(anomalies) <= 5:
-            report["component_validation"]["sample_anomalies"] = [
-                {"section": r.get("section_name"), "item": (r.get("item_name") or "")[:40], "col_1": r.get("col_1"), "col_2": r.get("col_2")}
-                for r in anomalies[:5]
-            ]
 
-        # Missing values
-        missing_section = sum(1 for r in rows if not r.get("section_name"))
-        missing_item = sum(1 for r in rows if not r.get("item_name"))
-        missing_col1 = sum(1 for r in rows if r.get("col_1") is None)
-        report["component_validation"]["missing"] = {
-            "section_name": missing_section,
-            "item_name": missing_item,
-            "col_1": missing_col1,
-        }
+def client_component_validation(supabase, page_rows: int) -> dict:
+    """component_validation from every cce_component_costs row, streamed through ComponentValidator."""
+    try:
+        occ_rows = iter_table_rows(supabase, "cce_occupancies", "id,occupancy_code,page_start,page_end", page_rows=page_rows)
+        occ_index = OccupancyIndex.from_occupancies(list(occ_rows))
+    except Exception:
+        occ_index = OccupancyIndex()
+    validator = ComponentValidator(occupancy_index=occ_index)
+    try:
+        validator.add_rows(component_rows(supabase, page_rows))
+    except Exception as e:
+        return {"error": str(e)}
+    cv = validator.component_validation()
+    cv["source"] = "client"
+    return cv
 
-        # Section quality: "add for" used as section (sub-header, not main section)
-        import re as _re
-        add_for_sections = [r for r in rows if r.get("section_name") and _re.match(r"^[Aa]dd\s+for\s+", str(r.get("section_name", "")))]
-        report["component_validation"]["section_add_for_count"] = len(add_for_sections)
-        if add_for_sections and len(add_for_sections) <= 5:
-            report["component_validation"]["sample_add_for_sections"] = [
-                {"section": r.get("section_name"), "item": (r.get("item_name") or "")[:40]}
-                for r in add_for_sections[:5]
-            ]
 
-        # Duplicates (same section, item, page)
-        seen = defaultdict(list)
-        for r in rows:
-            k = (r.get("section_name"), r.get("item_name"), r.get("source_page"))
-            seen[k].append(r.get("id"))
-        dup_groups = [(k, v) for k, v in seen.items() if len(v) > 1]
-        report["component_validation"]["duplicate_groups"] = len(dup_groups)
-        if dup_groups and len(dup_groups) <= 3:
-            report["component_validation"]["sample_duplicates"] = [
-                {"section": k[0], "item": (k[1] or "")[:40], "page": k[2], "count": len(v)}
-                for k, v in dup_groups[:3]
-            ]
+def validate_run_dir(report: dict, run_dir: str) -> None:
+    """Same checks on a local extract-cce-pdf.py --output-dir run (components link occupancy_code)."""
+    try:
+        manifest, occupancies = iter_extract_run_table(run_dir, "cce_occupancies")
+        occ_index = OccupancyIndex.from_occupancies(list(occupancies))
+        _, rows = iter_extract_run_table(run_dir, "cce_component_costs")
+    except (FileNotFoundError, KeyError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    for table, label in TABLE_LABELS:
+        report["tables"][table] = {"count": (manifest["tables"].get(table) or {}).get("rows", 0), "label": label}
+    validator = ComponentValidator(occupancy_index=occ_index, link_field="occupancy_code", active_field="occupancy_code")
+    validator.add_rows(rows)
+    if validator.total_rows:
+        report["component_validation"] = validator.component_validation()
+        report["component_validation"]["source"] = "client"
+    report["last_extraction"] = last_extraction(manifest.get("metadata") or {})
 
-        # Item contains cost-like numbers (column bleed)
-        cost_nums_re = _re.compile(r"\b\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\s+\d{1,2}\.\d{2}\b")
-        item_bleed = [r for r in rows if r.get("item_name") and cost_nums_re.search(str(r.get("item_name", "")))]
-        report["component_validation"]["item_cost_bleed_count"] = len(item_bleed)
 
-        # TOC-style leader dots still in item (post-normalize quality signal)
-        toc_dots_re = _re.compile(r"\.{3,}")
-        item_toc_dots = [r for r in rows if r.get("item_name") and toc_dots_re.search(str(r.get("item_name", "")))]
-        report["component_validation"]["item_toc_dot_runs_count"] = len(item_toc_dots)
+def last_extraction(m: dict) -> dict:
+    return {
+        "pdf_filename": m.get("pdf_filename"),
+        "page_start": m.get("page_start"),
+        "page_end": m.get("page_end"),
+        "status": m.get("status"),
+        "component_rows_count": m.get("component_rows_count"),
+        "occupancies_count": m.get("occupancies_count"),
+    }
 
-        # Tier monotonicity (same rules as extract; DB may contain legacy rows)
-        def _tier_cols(row):
-            out = []
-            for i in range(1, 5):
-                v = row.get(f"col_{i}")
-                if v is None:
-                    out.append(None)
-                else:
-                    try:
-                        out.append(float(v))
-                    except (TypeError, ValueError):
-                        out.append(None)
-            return out
 
-        tier_violations = [r for r in rows if not tier_order_ok(_tier_cols(r))]
-        report["component_validation"]["tier_order_violations"] = len(tier_violations)
-        if tier_violations and len(tier_violations) <= 5:
-            report["component_validation"]["sample_tier_violations"] = [
-                {
-                    "section": r.get("section_name"),
-                    "item": (r.get("item_name") or "")[:45],
-                    "cols": _tier_cols(r),
-                    "page": r.get("source_page"),
-                }
-                for r in tier_violations[:5]
-            ]
+def main():
+    parser = argparse.ArgumentParser(description="Validate CCE extraction data in Supabase or a local run directory")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--run-dir",
+        default=None,
+        help="Validate a local extract-cce-pdf.py --output-dir run instead of Supabase (no credentials needed)",
+    )
+    parser.add_argument("--page-rows", type=int, default=KEYSET_PAGE_ROWS, help="Rows per keyset page from Supabase")
+    parser.add_argument(
+        "--client-side",
+        action="store_true",
+        help="Check component rows in Python even when the cce_component_validation RPC exists",
+    )
+    args = parser.parse_args()
 
-    # --- Extraction metadata (last run) ---
-    try:
-        r = supabase.table("cce_extraction_metadata").select("*").order("created_at", desc=True).limit(1).execute()
-        if r.data and len(r.data) > 0:
-            m = r.data[0]
-            report["last_extraction"] = {
-                "pdf_filename": m.get("pdf_filename"),
-                "page_start": m.get("page_start"),
-                "page_end": m.get("page_end"),
-                "status": m.get("status"),
-                "component_rows_count": m.get("component_rows_count"),
-                "occupancies_count": m.get("occupancies_count"),
-            }
-    except Exception:
-        pass
+    report = {"tables": {}, "component_validation": {}, "suggestions": []}
+    if args.run_dir:
+        validate_run_dir(report, args.run_dir)
+    else:
+        validate_supabase(report, args.page_rows, args.client_side)
 
     # --- Suggestions ---
     if report.get("component_validation", {}).get("low_gt_high_anomalies", 0) > 0:
@@ -240,6 +204,10 @@ def main():
         report["suggestions"].append(
             "No occupancy-linked components. Run migration add-cce-component-occupancy-id.sql and re-extract."
         )
+    if report.get("component_validation", {}).get("occupancy_page_mismatch", 0) > 0:
+        report["suggestions"].append(
+            "Some components link an occupancy whose page range does not cover source_page (occupancy ranges changed since extraction?). Re-extract to refresh links."
+        )
     if report.get("component_validation", {}).get("section_add_for_count", 0) > 0:
         report["suggestions"].append(
             "Section names starting with 'Add for' are sub-headers, not main sections. Block these in extraction (LIST_SECTION_HEADER_RE / blocklist)."
@@ -279,8 +247,12 @@ def main():
         if report.get("component_validation"):
             cv = report["component_validation"]
             print("\nComponent validation:")
-            print(f"  Total rows: {cv.get('total_rows', 0)}")
+            print(f"  Total rows: {cv.get('total_rows', 0)} (checked {'in Postgres' if cv.get('source') == 'rpc' else 'client-side'})")
             print(f"  With occupancy_id: {cv.get('with_occupancy_id', 0)}")
+            if cv.get("occupancy_page_mismatch", 0) > 0:
+                print(f"  occupancy_id not active for source_page: {cv['occupancy_page_mismatch']}")
+            if cv.get("unlinked_in_occupancy_range", 0) > 0:
+                print(f"  Unlinked rows inside an occupancy page range: {cv['unlinked_in_occupancy_range']}")
             print(f"  Low > High anomalies: {cv.get('low_gt_high_anomalies', 0)}")
             if cv.get("col_1_percentiles"):
                 print(f"  col_1 range: {cv['col_1_percentiles']['min']} - {cv['col_1_percentiles']['max']}")